@@ -0,0 +1 @@
+"""오프라인 성능 벤치마크 — 합성 입력으로 파서/변환 경로의 처리량·메모리를 잰다."""
@@ -0,0 +1,334 @@
+"""
+오프라인 파서/변환 벤치마크 실행기.
+
+각 케이스는 합성 입력(benchmarks.synthetic)을 만든 뒤 실제 파이프라인 함수를 돌려
+처리량(rows/sec, 최선 회차 기준)과 tracemalloc 최대 메모리를 잰다. 결과는
+benchmarks/baselines.json 과 비교해 처리량이 threshold 이상 떨어지거나 메모리가
+threshold 이상 늘면 실패(exit 1)한다.
+
+사용 예:
+    python -m benchmarks.run                      # 전체 실행 + 기준선 비교
+    python -m benchmarks.run --only realtime      # 이름에 'realtime' 이 들어간 케이스만
+    python -m benchmarks.run --update-baseline    # 현재 결과를 기준선으로 저장
+    python -m benchmarks.run --scale 0.1 --no-compare
+
+기준선은 측정한 머신에 묶인 값이다. 다른 머신에서 처음 돌릴 때는 --update-baseline
+으로 다시 잡고, 임계값은 잡음 수준(기본 25%)보다 크게 둔다.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks import synthetic
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[Path, float], Any]   # (작업 디렉터리, scale) -> ctx
+    run: Callable[[Any], int]             # ctx -> 처리 행 수
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int
+    best_sec: float
+    rows_per_sec: float
+    peak_mb: float
+
+
+# ─── 케이스 ───────────────────────────────────────────────────────────────────
+
+def _expand_setup(workdir: Path, scale: float):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(synthetic.realtime_table_html(scale), "lxml")
+    return soup.find("table")
+
+
+def _expand_run(table) -> int:
+    from fetch_data.smp.smp_scraper import _expand_table_to_grid
+
+    grid = _expand_table_to_grid(table)
+    return sum(len(row) for row in grid)
+
+
+def _realtime_setup(workdir: Path, scale: float):
+    return synthetic.realtime_grid(scale)
+
+
+def _realtime_run(grid) -> int:
+    from fetch_data.smp.smp_realtime import parse_realtime_grid
+
+    return len(parse_realtime_grid(grid, synthetic.REALTIME_REF))
+
+
+def _namdong_setup(workdir: Path, scale: float):
+    src = workdir / "pv_raw"
+    wide = synthetic.write_koen_months(src, "south_pv_{:%Y%m}.csv", unit_label="KWh", scale=scale)
+    return src, workdir / "pv_long", wide * 24
+
+
+def _namdong_run(ctx) -> int:
+    from fetch_data.pv.namdong_transform import merge_to_long
+
+    src, out, rows = ctx
+    shutil.rmtree(out, ignore_errors=True)  # 캐시 없는 전체 변환을 잰다(증분 재실행은 거의 0)
+    merge_to_long(src, out)
+    return rows
+
+
+def _transform_gen_setup(workdir: Path, scale: float):
+    raw = workdir / "gen_raw"
+    wide = synthetic.write_koen_months(raw / "bench", "koen_{:%Y%m}.csv", scale=scale)
+    return raw, wide
+
+
+def _transform_gen_run(ctx) -> int:
+    from fetch_data.gen.transform_gen import merge_category_wide, transform_wide_to_long
+
+    raw, _ = ctx
+    return len(transform_wide_to_long(merge_category_wide("bench", raw)))
+
+
+def _demand_setup(workdir: Path, scale: float):
+    body, _ = synthetic.demand_csv_bytes(scale=scale)
+    return body
+
+
+def _demand_run(body: bytes) -> int:
+    from fetch_data.demand.collect import parse_csv, prepare_records
+
+    return len(prepare_records(parse_csv(body)))
+
+
+def _asos_setup(workdir: Path, scale: float):
+    pages, _ = synthetic.asos_json_pages(scale=scale)
+    return pages
+
+
+def _asos_run(pages: List[bytes]) -> int:
+    from fetch_data.weather.asos_collect import normalize_weather_data
+    from fetch_data.weather.database import _asos_records
+
+    frames = [pd.DataFrame(json.loads(p)["response"]["body"]["items"]["item"]) for p in pages]
+    df = pd.concat(frames, ignore_index=True)[["tm", "hm", "ta", "stnNm", "icsr"]]
+    return len(_asos_records(normalize_weather_data(df)))
+
+
+def _asos_copy_setup(workdir: Path, scale: float):
+    from fetch_data.weather.asos_collect import normalize_weather_data
+
+    pages, _ = synthetic.asos_json_pages(scale=scale)
+    frames = [pd.DataFrame(json.loads(p)["response"]["body"]["items"]["item"]) for p in pages]
+    df = pd.concat(frames, ignore_index=True)[["tm", "hm", "ta", "stnNm", "icsr"]]
+    return normalize_weather_data(df)
+
+
+def _asos_copy_run(df: pd.DataFrame) -> int:
+    # COPY 경로의 클라이언트 쪽 비용: 타입 정리 + CSV 버퍼 인코딩(서버 병합은 제외)
+    from fetch_data.weather.database import _COLUMNS, _asos_frame, _copy_chunks
+
+    frame = _asos_frame(df)
+    for buf in _copy_chunks(frame[list(_COLUMNS)]):
+        buf.getvalue()
+    return len(frame)
+
+
+def _merge_all_setup(workdir: Path, scale: float):
+    new_path, merged_path, rows = synthetic.write_asos_csvs(workdir / "asos", scale=scale)
+    return new_path, merged_path, workdir / "asos" / "work_merged.csv", rows
+
+
+def _merge_all_run(ctx) -> int:
+    from prefect_flows.merge_to_all import merge_to_all_csv
+
+    new_path, merged_path, work, rows = ctx
+    shutil.copyfile(merged_path, work)  # 매 회차 같은 출발점(merge 는 제자리 갱신)
+    with contextlib.redirect_stdout(io.StringIO()):
+        merge_to_all_csv(new_path, work)
+    return rows
+
+
+def _merge_store_setup(workdir: Path, scale: float):
+    from fetch_data.weather.asos_store import AsosStore
+
+    new_path, merged_path, _ = synthetic.write_asos_csvs(workdir / "asos", scale=scale)
+    store_dir = workdir / "asos_store"
+    AsosStore(store_dir).import_csv(merged_path)
+    return new_path, store_dir, len(pd.read_csv(new_path, encoding="utf-8-sig"))
+
+
+def _merge_store_run(ctx) -> int:
+    from prefect_flows.merge_to_all import merge_to_store
+
+    new_path, store_dir, rows = ctx
+    with contextlib.redirect_stdout(io.StringIO()):
+        merge_to_store(new_path, store_dir, legacy_csv_path=None)
+    return rows
+
+
+CASES: List[Case] = [
+    Case("smp_scraper.expand_table_to_grid", _expand_setup, _expand_run),
+    Case("smp_realtime.parse_realtime_grid", _realtime_setup, _realtime_run),
+    Case("namdong_transform.merge_to_long", _namdong_setup, _namdong_run),
+    Case("transform_gen.merge_category_wide", _transform_gen_setup, _transform_gen_run),
+    Case("demand.prepare_records", _demand_setup, _demand_run),
+    Case("weather.asos_records", _asos_setup, _asos_run),
+    Case("weather.asos_copy_buffer", _asos_copy_setup, _asos_copy_run),
+    Case("merge_to_all.merge_to_all_csv", _merge_all_setup, _merge_all_run),
+    Case("merge_to_all.merge_to_store", _merge_store_setup, _merge_store_run),
+]
+
+
+# ─── 측정 ─────────────────────────────────────────────────────────────────────
+
+def measure(case: Case, workdir: Path, *, scale: float = 1.0, repeat: int = 3) -> Result:
+    """시간은 tracemalloc 없이 repeat 회 중 최선, 메모리는 별도 1회로 잰다."""
+    ctx = case.setup(workdir, scale)
+    case.run(ctx)  # 워밍업(지연 import, 정규식 컴파일)
+    best = float("inf")
+    rows = 0
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        rows = case.run(ctx)
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(
+        name=case.name,
+        rows=rows,
+        best_sec=round(best, 6),
+        rows_per_sec=round(rows / best, 1) if best > 0 else 0.0,
+        peak_mb=round(peak / 1024 / 1024, 2),
+    )
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """기준선 대비 회귀 목록. 기준선에 없는 케이스는 건너뛴다."""
+    problems = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            continue
+        floor = base["rows_per_sec"] * (1 - threshold)
+        if r.rows_per_sec < floor:
+            problems.append(
+                f"{r.name}: 처리량 {r.rows_per_sec:,.0f} rows/s < 기준 {base['rows_per_sec']:,.0f} "
+                f"(-{threshold:.0%} 허용)"
+            )
+        ceiling = base["peak_mb"] * (1 + threshold)
+        if base["peak_mb"] > 0 and r.peak_mb > ceiling:
+            problems.append(
+                f"{r.name}: 최대 메모리 {r.peak_mb:.1f}MB > 기준 {base['peak_mb']:.1f}MB "
+                f"(+{threshold:.0%} 허용)"
+            )
+    return problems
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("cases", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results: List[Result], scale: float, path: Path = BASELINE_PATH) -> None:
+    payload = {
+        "scale": scale,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cases": {r.name: asdict(r) for r in results},
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def run_cases(cases: List[Case], *, scale: float = 1.0, repeat: int = 3) -> List[Result]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        for case in cases:
+            workdir = Path(tmp) / case.name
+            workdir.mkdir()
+            results.append(measure(case, workdir, scale=scale, repeat=repeat))
+    return results
+
+
+def _print_table(results: List[Result], baseline: Dict[str, dict]) -> None:
+    print(f"{'case':<38} {'rows':>10} {'best(s)':>9} {'rows/s':>13} {'vs base':>8} {'peak MB':>8}")
+    for r in results:
+        base = baseline.get(r.name)
+        delta = f"{r.rows_per_sec / base['rows_per_sec'] - 1:+.0%}" if base and base["rows_per_sec"] else "-"
+        print(f"{r.name:<38} {r.rows:>10,} {r.best_sec:>9.3f} {r.rows_per_sec:>13,.0f} {delta:>8} {r.peak_mb:>8.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 파서/변환 벤치마크")
+    parser.add_argument("--only", default=None, help="케이스 이름 부분 일치 필터")
+    parser.add_argument("--scale", type=float, default=1.0, help="합성 입력 크기 배율 (기본 1.0)")
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (최선값 채택)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"허용 회귀 비율 (기본 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="기준선 JSON 경로")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 기준선으로 저장")
+    parser.add_argument("--no-compare", action="store_true", help="기준선 비교 생략")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 INFO 로그 출력")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        logging.disable(logging.INFO)  # 반복 실행마다 찍히는 진행 로그가 측정을 흐리지 않게
+
+    cases = [c for c in CASES if not args.only or args.only in c.name]
+    if not cases:
+        print(f"일치하는 케이스가 없습니다: {args.only}", file=sys.stderr)
+        return 2
+
+    results = run_cases(cases, scale=args.scale, repeat=args.repeat)
+    baseline = load_baseline(args.baseline)
+    _print_table(results, baseline)
+
+    if args.update_baseline:
+        merged = {**baseline, **{r.name: asdict(r) for r in results}}
+        save_baseline([Result(**v) for v in merged.values()], args.scale, args.baseline)
+        print(f"기준선 저장: {args.baseline}")
+        return 0
+    if args.no_compare:
+        return 0
+    if baseline and args.scale != json.loads(args.baseline.read_text(encoding="utf-8")).get("scale"):
+        print("경고: 기준선과 scale 이 달라 비교를 건너뜁니다.", file=sys.stderr)
+        return 0
+
+    problems = compare(results, baseline, args.threshold)
+    for p in problems:
+        print(f"REGRESSION {p}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
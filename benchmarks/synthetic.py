@@ -0,0 +1,186 @@
+"""
+벤치마크용 합성 입력 — 실제 원천 응답과 같은 모양, 네트워크/DB 없이 결정적으로 생성.
+
+모든 생성기는 scale(기본 1.0)로 크기를 줄이거나 키울 수 있다. 스모크 테스트는
+작은 scale 로 같은 경로를 한 번씩만 돌린다.
+"""
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+REALTIME_DATES = 852          # 실측 KPX 실시간 표 열 수(2024-03-01 ~ 2026-06-30)
+REALTIME_REF = date(2026, 6, 30)
+SLOTS = 96
+
+
+def _scaled(n: int, scale: float, minimum: int = 1) -> int:
+    return max(minimum, int(round(n * scale)))
+
+
+# ─── KPX 실시간 SMP 표 ─────────────────────────────────────────────────────────
+
+def realtime_dates(scale: float = 1.0) -> List[date]:
+    n = _scaled(REALTIME_DATES, scale, minimum=2)
+    return [REALTIME_REF - timedelta(days=n - 1 - i) for i in range(n)]
+
+
+def realtime_grid(scale: float = 1.0) -> List[List[str]]:
+    """_expand_table_to_grid 출력과 같은 2D 그리드(헤더 + 96 구간 행)."""
+    rng = random.Random(7)
+    dates = realtime_dates(scale)
+    grid = [["시간", "구간", *(d.strftime("%m.%d") for d in dates)]]
+    for slot in range(SLOTS):
+        row = [f"{slot // 4 + 1}h", f"{slot % 4 + 1}구간"]
+        row.extend(f"{rng.uniform(80, 260):,.2f}" for _ in dates)
+        grid.append(row)
+    return grid
+
+
+def realtime_table_html(scale: float = 1.0) -> str:
+    """KPX 실시간 표 HTML. 시간 셀은 rowspan=4, 헤더 첫 칸은 colspan=2."""
+    grid = realtime_grid(scale)
+    header, rows = grid[0], grid[1:]
+    parts = ["<table><thead><tr><th colspan=\"2\">구분</th>"]
+    parts.extend(f"<th>{c}</th>" for c in header[2:])
+    parts.append("</tr></thead><tbody>")
+    for slot, row in enumerate(rows):
+        parts.append("<tr>")
+        if slot % 4 == 0:
+            parts.append(f"<td rowspan=\"4\">{row[0]}</td>")
+        parts.extend(f"<td>{c}</td>" for c in row[1:])
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+# ─── KOEN 와이드 CSV (월 단위, cp949) ──────────────────────────────────────────
+
+def _koen_month_frame(month_start: date, plants: int, units: int, unit_label: str, rng: random.Random) -> pd.DataFrame:
+    next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    days = pd.date_range(month_start, next_month - timedelta(days=1), freq="D")
+    rows = []
+    for day in days:
+        for p in range(plants):
+            for u in range(1, units + 1):
+                row = {"발전구분": f"합성발전소{p:02d}", "호기": u, "일자": day.strftime("%Y-%m-%d")}
+                for h in range(1, 25):
+                    row[f"{h}시 발전량({unit_label})"] = round(rng.uniform(0, 900), 3)
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def write_koen_months(
+    out_dir: Path,
+    pattern: str,
+    *,
+    months: int = 12,
+    plants: int = 20,
+    units: int = 2,
+    unit_label: str = "MWh",
+    scale: float = 1.0,
+) -> int:
+    """월별 KOEN 와이드 CSV 를 out_dir 에 쓴다. 반환값은 와이드 행 수 합계.
+
+    pattern 은 월 시작일로 채울 파일명 형식(예: "koen_{:%Y%m}.csv").
+    """
+    rng = random.Random(11)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_months = _scaled(months, scale)
+    n_plants = _scaled(plants, scale)
+    total = 0
+    month = date(2024, 1, 1)
+    for _ in range(n_months):
+        frame = _koen_month_frame(month, n_plants, units, unit_label, rng)
+        frame.to_csv(out_dir / pattern.format(month), index=False, encoding="cp949")
+        total += len(frame)
+        month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return total
+
+
+# ─── KPX 5분 수요 CSV ──────────────────────────────────────────────────────────
+
+def demand_csv_bytes(days: int = 31, scale: float = 1.0) -> tuple[bytes, int]:
+    """KPX 수급 CSV 다운로드 본문(euc-kr, 기준일시=YYYYMMDDHHMMSS)과 행 수."""
+    rng = random.Random(3)
+    n = _scaled(days, scale) * 288
+    start = datetime(2025, 1, 1, 0, 5)
+    lines = ["기준일시,공급능력(MW),현재수요(MW),최대예측수요(MW),공급예비력(MW),공급예비율(%),운영예비력(MW)"]
+    for i in range(n):
+        ts = start + timedelta(minutes=5 * i)
+        demand = rng.uniform(55000, 90000)
+        supply = demand + rng.uniform(5000, 15000)
+        lines.append(
+            f"{ts:%Y%m%d%H%M%S},{supply:.0f},{demand:.0f},{demand * 1.02:.0f},"
+            f"{supply - demand:.0f},{(supply - demand) / demand * 100:.2f},{(supply - demand) * 0.8:.0f}"
+        )
+    return ("\n".join(lines) + "\n").encode("euc-kr"), n
+
+
+# ─── ASOS JSON 페이지 ─────────────────────────────────────────────────────────
+
+def asos_json_pages(stations: int = 95, days: int = 31, scale: float = 1.0) -> tuple[List[bytes], int]:
+    """지점별 data.go.kr ASOS 시간자료 JSON 응답 본문과 전체 item 수."""
+    rng = random.Random(5)
+    n_stations = _scaled(stations, scale)
+    hours = _scaled(days, scale) * 24
+    start = datetime(2025, 7, 1)
+    pages = []
+    for s in range(n_stations):
+        items = []
+        for h in range(hours):
+            ts = start + timedelta(hours=h)
+            items.append({
+                "tm": ts.strftime("%Y-%m-%d %H:%M"),
+                "stnId": str(90 + s),
+                "stnNm": f"지점{s:03d}",
+                "ta": f"{rng.uniform(-5, 35):.1f}",
+                "hm": f"{rng.uniform(10, 100):.0f}",
+                "icsr": "" if ts.hour < 6 or ts.hour > 19 else f"{rng.uniform(0, 3.5):.2f}",
+            })
+        payload = {
+            "response": {
+                "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+                "body": {"dataType": "JSON", "items": {"item": items}, "totalCount": len(items)},
+            }
+        }
+        pages.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return pages, n_stations * hours
+
+
+# ─── merge_to_all 입력 ─────────────────────────────────────────────────────────
+
+def write_asos_csvs(out_dir: Path, stations: int = 95, days: int = 365, scale: float = 1.0) -> tuple[Path, Path, int]:
+    """(신규 일별 CSV, 기존 통합 CSV, 통합 행 수). 신규 파일은 마지막 날을 다시 담아 중복 제거를 태운다."""
+    rng = random.Random(9)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_stations = _scaled(stations, scale)
+    hours = _scaled(days, scale) * 24
+    start = datetime(2024, 1, 1)
+
+    def frame(first_hour: int, n_hours: int) -> pd.DataFrame:
+        rows = []
+        for h in range(first_hour, first_hour + n_hours):
+            ts = start + timedelta(hours=h)
+            for s in range(n_stations):
+                rows.append({
+                    "date": ts.strftime("%Y-%m-%d %H:%M"),
+                    "hour": ts.hour,
+                    "station_name": f"지점{s:03d}",
+                    "temperature": round(rng.uniform(-5, 35), 1),
+                    "humidity": round(rng.uniform(10, 100)),
+                    "solar radiation": round(rng.uniform(0, 3.5), 2),
+                })
+        return pd.DataFrame(rows)
+
+    merged = frame(0, hours)
+    merged_path = out_dir / "asos_all_merged.csv"
+    merged.to_csv(merged_path, index=False, encoding="utf-8-sig")
+    new_path = out_dir / "asos_new.csv"
+    frame(hours - 24, 48).to_csv(new_path, index=False, encoding="utf-8-sig")
+    return new_path, merged_path, len(merged) + n_stations * 24
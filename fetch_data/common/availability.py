@@ -0,0 +1,185 @@
+"""
+월 단위 가용 범위 탐지 — "원천이 몇 월부터 몇 월까지 데이터를 주나" 를 적은 요청으로 찾는다.
+
+남동 비태양광 --full 과 제주 계통수급 --full 이 각자 탐지 루프를 갖고 있었다(최신월은
+직전월부터 한 달씩 거슬러 올라가고, 최초월은 고정 하한부터 이분 탐색). 여기서는 하나의
+prober 가 두 끝을 찾는다:
+
+    최신월  직전 완결월부터 1, 2, 4, 8 … 개월씩 뒤로 뛰며(galloping) 데이터가 있는 달을
+            만나면, 그 사이를 이분 탐색해 마지막 데이터월을 정한다.
+    최초월  [하한, 최신월] 을 이분 탐색해 데이터가 처음 나타나는 달을 정한다.
+
+데이터가 [최초월, 최신월] 에 끊김 없이 있다는 단조성을 가정한다. 처음에는 약
+log2(개월 수) 번, 캐시(AvailabilityCache)가 있으면 양 끝만 다시 확인한다 — 최초월이
+아직 있는지 1번, 캐시의 최신월 이후 새 달이 생겼는지 (캐시 최신월, 직전 완결월] 이분
+탐색(월간 실행이면 1번). 캐시 최초월이 사라졌으면 처음부터 다시 탐지한다.
+
+    async def has_data(month: date) -> bool: ...
+    first, last = await probe_range("koen_gen:thermal", has_data, floor=date(2021, 1, 1))
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "data" / "availability.json"
+
+MonthProbe = Callable[[date], Awaitable[bool]]
+MonthRange = Tuple[date, date]
+
+
+def month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def month_of(index: int) -> date:
+    y, m = divmod(index, 12)
+    return date(y, m + 1, 1)
+
+
+class AvailabilityCache:
+    """{key: {"first": "YYYY-MM", "last": "YYYY-MM", "checked": "YYYY-MM-DD"}} JSON 파일."""
+
+    def __init__(self, path: Path | str = DEFAULT_CACHE_PATH, refresh: bool = False):
+        self.path = Path(path)
+        self.refresh = refresh  # True 면 읽지 않고(처음부터 탐지) 결과만 덮어쓴다
+
+    def _read(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"[availability] 캐시 읽기 실패, 무시: {self.path} ({e})")
+            return {}
+
+    def get(self, key: str) -> Optional[MonthRange]:
+        if self.refresh:
+            return None
+        entry = self._read().get(key)
+        if not entry:
+            return None
+        return (
+            date.fromisoformat(f"{entry['first']}-01"),
+            date.fromisoformat(f"{entry['last']}-01"),
+        )
+
+    def put(self, key: str, rng: MonthRange) -> None:
+        # 다른 키를 덮지 않도록 매번 다시 읽어 한 키만 바꾼 뒤 바꿔 끼운다
+        data = self._read()
+        data[key] = {
+            "first": rng[0].strftime("%Y-%m"),
+            "last": rng[1].strftime("%Y-%m"),
+            "checked": date.today().isoformat(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class _Counter:
+    def __init__(self, has_data: MonthProbe):
+        self.has_data = has_data
+        self.requests = 0
+
+    async def __call__(self, index: int) -> bool:
+        self.requests += 1
+        return await self.has_data(month_of(index))
+
+
+async def _last_true(probe: _Counter, lo: int, hi: int) -> int:
+    """lo 는 데이터가 있는 달. (lo, hi] 에서 데이터가 있는 마지막 달(없으면 lo)."""
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if await probe(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+async def _first_true(probe: _Counter, lo: int, hi: int) -> int:
+    """hi 는 데이터가 있는 달. [lo, hi) 에서 데이터가 처음 나타나는 달(없으면 hi)."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if await probe(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return hi
+
+
+async def _gallop_latest(probe: _Counter, floor: int, top: int) -> Optional[int]:
+    """top 부터 1, 2, 4 … 개월씩 뒤로 뛰어 데이터월을 찾고 그 위를 이분 탐색."""
+    above, step, cur = top + 1, 1, top
+    while cur >= floor:
+        if await probe(cur):
+            return await _last_true(probe, cur, above - 1)
+        above, cur, step = cur, cur - step, step * 2
+    if above > floor and await probe(floor):
+        return await _last_true(probe, floor, above - 1)
+    return None
+
+
+async def probe_range(
+    key: str,
+    has_data: MonthProbe,
+    floor: date,
+    ref: Optional[date] = None,
+    cache: Optional[AvailabilityCache] = None,
+) -> Optional[MonthRange]:
+    """(최초 데이터월, 최신 데이터월) 의 1일. 직전 완결월까지 데이터가 전혀 없으면 None.
+
+    key: 캐시 키(원천:범주). cache=None 이면 매번 처음부터 탐지한다.
+    has_data 는 빈 달에만 False 를 돌려주고 요청 실패는 예외로 올려야 한다 — 오류를 '없음' 으로
+    보면 탐색이 틀어진다. 예외가 나면 그대로 올라가고 캐시는 갱신하지 않는다.
+    """
+    ref = ref or date.today()
+    lo = month_index(floor)
+    top = month_index(ref) - 1  # 직전 완결월
+    probe = _Counter(has_data)
+
+    cached = cache.get(key) if cache is not None else None
+    first = last = None
+    if cached is not None:
+        c_first, c_last = max(month_index(cached[0]), lo), min(month_index(cached[1]), top)
+        if c_first <= c_last and await probe(c_first):
+            # 최초월이 남아 있으면 (단조성) 캐시 최신월까지도 있다 — 그 뒤 새 달만 본다
+            first, last = c_first, await _last_true(probe, c_last, top)
+        else:
+            logger.info(f"[availability] {key} 캐시 최초월 {cached[0]:%Y-%m} 에 데이터 없음 — 다시 탐지")
+
+    if first is None:
+        last = await _gallop_latest(probe, lo, top)
+        if last is None:
+            logger.warning(f"[availability] {key} {floor:%Y-%m}~{month_of(top):%Y-%m} 데이터 없음 ({probe.requests}회 확인)")
+            return None
+        first = await _first_true(probe, lo, last)
+
+    rng = (month_of(first), month_of(last))
+    if cache is not None:
+        cache.put(key, rng)
+    logger.info(
+        f"[availability] {key} 가용 범위 {rng[0]:%Y-%m} ~ {rng[1]:%Y-%m} "
+        f"({probe.requests}회 확인{', 캐시 갱신' if cached else ''})"
+    )
+    return rng
+
+
+def add_cli_args(parser) -> None:
+    parser.add_argument("--reprobe", action="store_true",
+                        help=f"가용 범위 캐시({DEFAULT_CACHE_PATH.name})를 무시하고 처음부터 탐지해 덮어쓰기")
+
+
+def cache_from_args(args) -> AvailabilityCache:
+    """--reprobe 면 캐시를 읽지 않고 처음부터 탐지한 결과로 덮어쓴다."""
+    return AvailabilityCache(refresh=getattr(args, "reprobe", False))
@@ -0,0 +1,423 @@
+"""
+재개 가능한 구간 백필 엔진 — 샤드 원장(backfill_ledger) + 제한 병렬 + 진행률/ETA.
+
+긴 백필(ASOS 일사량, 남부 PV, 제주 실시간 SMP, 남동 비태양광 --full, 제주 계통수급
+--full)은 체크포인트가 없어 60개 청크 중 37번째에서 죽으면 처음부터 다시 돌았다.
+여기서는 구간을 샤드로 나누고 샤드마다 상태(pending/running/done/failed, 행 수,
+소요 시간)를 원장에 남긴다. 같은 명령을 다시 실행하면 done 샤드는 건너뛴다.
+
+소스 어댑터(BackfillSource):
+    name                      원장의 job 이름
+    shards(start, end)        [start, end] 폐구간 → [(샤드 시작, 샤드 끝), ...]
+    fetch(start, end)         원천 응답. 코루틴·동기 함수(스레드에서 실행)·비동기
+                              제너레이터(부분 응답을 끝나는 대로 흘려보냄) 모두 가능
+    parse(raw, start, end)    응답 → 적재 단위, None 이면 적재 생략 (스레드에서 실행)
+    load(parsed, start, end)  적재, 반환값은 행 수 (스레드에서 실행)
+    finish(start, end)        (선택) 샤드 끝 훅 — 성공/실패와 무관하게 호출
+    fatal                     (선택) 이 예외가 나면 남은 샤드를 멈추고 다시 올린다
+                              (예: 일일 요청 한도). 그 샤드는 pending 으로 돌아간다.
+
+원장:
+    DbLedger      backfill_ledger 테이블(없으면 생성). 프로세스가 죽어 running 으로
+                  남은 샤드는 다음 실행에서 다시 돈다.
+    MemoryLedger  재개 없이 같은 인터페이스 — 테스트·일상 수집(재실행 시 전부 다시 받음).
+
+아직 확정되지 않았을 수 있는 최근 샤드(끝 >= settled_before, 기본 오늘)는 done 이어도
+다시 돈다. --restart 로 job 원장을 비우면 처음부터 다시 한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from fetch_data.common import metrics
+from fetch_data.common.date_utils import add_months, month_end
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+Shard = Tuple[date, date]
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# ─── 샤드 분할 ────────────────────────────────────────────────────────────────
+
+def day_shards(start: date, end: date, days: int) -> List[Shard]:
+    """[start, end] 폐구간을 days 일 단위 연속 구간으로 쪼갠다(마지막은 짧을 수 있음)."""
+    if days < 1:
+        raise ValueError("샤드 길이(days)는 1 이상이어야 합니다.")
+    shards = []
+    cur = start
+    while cur <= end:
+        shard_end = min(cur + timedelta(days=days - 1), end)
+        shards.append((cur, shard_end))
+        cur = shard_end + timedelta(days=1)
+    return shards
+
+
+def month_shards(start: date, end: date) -> List[Shard]:
+    """[start, end] 를 달력 월 단위로 쪼갠다(양끝 달은 잘린 구간)."""
+    shards = []
+    cur = start
+    while cur <= end:
+        shards.append((cur, min(month_end(cur), end)))
+        cur = add_months(cur.replace(day=1), 1)
+    return shards
+
+
+# ─── 어댑터 ───────────────────────────────────────────────────────────────────
+
+class BackfillSource(Protocol):
+    name: str
+
+    def shards(self, start: date, end: date) -> List[Shard]: ...
+
+    def fetch(self, start: date, end: date): ...
+
+    def parse(self, raw, start: date, end: date): ...
+
+    def load(self, parsed, start: date, end: date) -> int: ...
+
+
+# ─── 원장 ─────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ShardRecord:
+    state: str
+    rows: int = 0
+    duration_sec: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class MemoryLedger:
+    """프로세스 안에서만 유지되는 원장(재개 없음)."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[Shard, ShardRecord]] = {}
+
+    def load(self, job: str) -> Dict[Shard, ShardRecord]:
+        return dict(self._jobs.get(job, {}))
+
+    def plan(self, job: str, shards: Iterable[Shard]) -> None:
+        records = self._jobs.setdefault(job, {})
+        for shard in shards:
+            records.setdefault(shard, ShardRecord(PENDING))
+
+    def mark(self, job: str, shard: Shard, state: str, rows: int = 0,
+             duration_sec: float = 0.0, error: Optional[str] = None) -> None:
+        records = self._jobs.setdefault(job, {})
+        previous = records.get(shard, ShardRecord(PENDING))
+        attempts = previous.attempts + (1 if state == RUNNING else 0)
+        records[shard] = ShardRecord(state, rows, duration_sec, attempts, error)
+
+    def reset(self, job: str) -> None:
+        self._jobs.pop(job, None)
+
+
+_CREATE_LEDGER = text("""
+    CREATE TABLE IF NOT EXISTS backfill_ledger (
+        job          text             NOT NULL,
+        shard_start  date             NOT NULL,
+        shard_end    date             NOT NULL,
+        state        text             NOT NULL,
+        rows         bigint           NOT NULL DEFAULT 0,
+        duration_sec double precision NOT NULL DEFAULT 0,
+        attempts     integer          NOT NULL DEFAULT 0,
+        error        text,
+        updated_at   timestamptz      NOT NULL DEFAULT now(),
+        PRIMARY KEY (job, shard_start, shard_end)
+    )
+""")
+
+_SELECT_LEDGER = text("""
+    SELECT shard_start, shard_end, state, rows, duration_sec, attempts, error
+    FROM backfill_ledger
+    WHERE job = :job
+""")
+
+_PLAN_SHARD = text("""
+    INSERT INTO backfill_ledger (job, shard_start, shard_end, state)
+    VALUES (:job, :shard_start, :shard_end, 'pending')
+    ON CONFLICT (job, shard_start, shard_end) DO NOTHING
+""")
+
+_MARK_SHARD = text("""
+    INSERT INTO backfill_ledger
+        (job, shard_start, shard_end, state, rows, duration_sec, attempts, error, updated_at)
+    VALUES (:job, :shard_start, :shard_end, :state, :rows, :duration_sec, :attempt, :error, now())
+    ON CONFLICT (job, shard_start, shard_end) DO UPDATE SET
+        state = EXCLUDED.state,
+        rows = EXCLUDED.rows,
+        duration_sec = EXCLUDED.duration_sec,
+        attempts = backfill_ledger.attempts + EXCLUDED.attempts,
+        error = EXCLUDED.error,
+        updated_at = now()
+""")
+
+_RESET_JOB = text("DELETE FROM backfill_ledger WHERE job = :job")
+
+
+class DbLedger:
+    """backfill_ledger 테이블 원장 — 프로세스가 죽어도 샤드 상태가 남는다."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._ready = False
+
+    def _ensure(self) -> None:
+        if not self._ready:
+            with self.engine.begin() as conn:
+                conn.execute(_CREATE_LEDGER)
+            self._ready = True
+
+    def load(self, job: str) -> Dict[Shard, ShardRecord]:
+        self._ensure()
+        with self.engine.connect() as conn:
+            rows = conn.execute(_SELECT_LEDGER, {"job": job}).mappings().all()
+        return {
+            (row["shard_start"], row["shard_end"]): ShardRecord(
+                row["state"], int(row["rows"] or 0), float(row["duration_sec"] or 0.0),
+                int(row["attempts"] or 0), row["error"],
+            )
+            for row in rows
+        }
+
+    def plan(self, job: str, shards: Iterable[Shard]) -> None:
+        params = [{"job": job, "shard_start": s, "shard_end": e} for s, e in shards]
+        if not params:
+            return
+        self._ensure()
+        with self.engine.begin() as conn:
+            conn.execute(_PLAN_SHARD, params)
+
+    def mark(self, job: str, shard: Shard, state: str, rows: int = 0,
+             duration_sec: float = 0.0, error: Optional[str] = None) -> None:
+        self._ensure()
+        with self.engine.begin() as conn:
+            conn.execute(_MARK_SHARD, {
+                "job": job, "shard_start": shard[0], "shard_end": shard[1],
+                "state": state, "rows": rows, "duration_sec": duration_sec,
+                "attempt": 1 if state == RUNNING else 0, "error": error,
+            })
+
+    def reset(self, job: str) -> None:
+        self._ensure()
+        with self.engine.begin() as conn:
+            conn.execute(_RESET_JOB, {"job": job})
+
+
+def default_ledger(db_url: Optional[str] = None):
+    """DB 가 잡히면 DbLedger, 아니면 경고 후 MemoryLedger(재개 불가)."""
+    from fetch_data.common.db_base import get_engine
+
+    try:
+        return DbLedger(get_engine(db_url))
+    except RuntimeError as e:
+        logger.warning(f"[backfill] DB 원장 사용 불가 — 이번 실행은 재개 지점을 남기지 않음 ({e})")
+        return MemoryLedger()
+
+
+# ─── 진행률 ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class BackfillProgress:
+    """이번 실행의 진행 상황. skipped 는 원장에서 이미 done 이라 건너뛴 샤드."""
+
+    job: str
+    total: int
+    skipped: int = 0
+    done: int = 0
+    failed: int = 0
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.failed
+
+    @property
+    def elapsed_sec(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def eta_sec(self) -> Optional[float]:
+        """남은 샤드 예상 시간 — 이번 실행의 벽시계 처리 속도 기준(병렬도 반영)."""
+        if not self.finished:
+            return None
+        return self.elapsed_sec / self.finished * (self.total - self.finished)
+
+    def __str__(self) -> str:
+        pct = 100.0 * self.finished / self.total if self.total else 100.0
+        eta = self.eta_sec
+        eta_text = "?" if eta is None else f"{int(eta // 60)}m{int(eta % 60):02d}s"
+        return (
+            f"{self.finished}/{self.total} ({pct:.0f}%) · 실패 {self.failed} · "
+            f"{self.rows}행 · 건너뜀 {self.skipped} · ETA {eta_text}"
+        )
+
+
+@dataclass
+class BackfillReport:
+    job: str
+    rows: int = 0
+    done: List[Shard] = field(default_factory=list)
+    skipped: List[Shard] = field(default_factory=list)
+    failed: Dict[Shard, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+# ─── 실행 ─────────────────────────────────────────────────────────────────────
+
+async def _fetch_parts(source: BackfillSource, start: date, end: date) -> AsyncIterator:
+    fetch = source.fetch
+    if inspect.isasyncgenfunction(fetch):
+        async for part in fetch(start, end):
+            yield part
+    elif inspect.iscoroutinefunction(fetch):
+        yield await fetch(start, end)
+    else:
+        yield await asyncio.to_thread(fetch, start, end)
+
+
+async def _run_shard(source: BackfillSource, start: date, end: date) -> int:
+    rows = 0
+    try:
+        async for raw in _fetch_parts(source, start, end):
+            parsed = await asyncio.to_thread(source.parse, raw, start, end)
+            if parsed is not None:
+                rows += int(await asyncio.to_thread(source.load, parsed, start, end) or 0)
+    finally:
+        finish = getattr(source, "finish", None)
+        if finish is not None:
+            await asyncio.to_thread(finish, start, end)
+    return rows
+
+
+async def run_backfill(
+    source: BackfillSource,
+    start: date,
+    end: date,
+    ledger=None,
+    concurrency: int = 1,
+    settled_before: Optional[date] = None,
+    restart: bool = False,
+    on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+) -> BackfillReport:
+    """[start, end] 를 source.shards 로 나눠 원장에 없는(또는 미완료) 샤드만 실행한다.
+
+    샤드 하나가 실패해도 나머지는 계속 돈다 — 실패 목록은 report.failed 로 돌려주고,
+    어떻게 다룰지(예외/경고)는 호출하는 CLI 가 정한다. source.fatal 예외만 전체를 멈춘다.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency는 1 이상이어야 합니다.")
+    ledger = ledger if ledger is not None else MemoryLedger()
+    settled_before = settled_before or date.today()
+    fatal = tuple(getattr(source, "fatal", ()))
+    job = source.name
+
+    if restart:
+        await asyncio.to_thread(ledger.reset, job)
+    shards = source.shards(start, end)
+    known = await asyncio.to_thread(ledger.load, job)
+    await asyncio.to_thread(ledger.plan, job, shards)
+
+    report = BackfillReport(job)
+    todo: List[Shard] = []
+    for shard in shards:
+        record = known.get(shard)
+        if record is not None and record.state == DONE and shard[1] < settled_before:
+            report.skipped.append(shard)
+        else:
+            todo.append(shard)
+    progress = BackfillProgress(job, total=len(todo), skipped=len(report.skipped))
+    logger.info(
+        f"[backfill:{job}] {start}~{end}: 샤드 {len(shards)}개 중 {len(todo)}개 실행"
+        f" (완료 {len(report.skipped)}개 건너뜀, 동시 {concurrency})"
+    )
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(shard: Shard) -> None:
+        async with sem:
+            s, e = shard
+            started = time.monotonic()
+            try:
+                await asyncio.to_thread(ledger.mark, job, shard, RUNNING)
+                rows = await _run_shard(source, s, e)
+            except asyncio.CancelledError:
+                # 원장 기록이 실패해도 취소는 그대로 올린다
+                try:
+                    await asyncio.to_thread(ledger.mark, job, shard, PENDING)
+                except Exception as exc:
+                    logger.warning(f"[backfill:{job}] {s}~{e} 취소 기록 실패: {type(exc).__name__}: {exc}")
+                raise
+            except fatal:
+                await asyncio.to_thread(ledger.mark, job, shard, PENDING)
+                raise
+            except Exception as exc:
+                duration = time.monotonic() - started
+                error = f"{type(exc).__name__}: {exc}"
+                await asyncio.to_thread(ledger.mark, job, shard, FAILED, 0, duration, error)
+                report.failed[shard] = error
+                progress.failed += 1
+                metrics.incr("backfill_shards_total", job=job, state=FAILED)
+                logger.error(f"[backfill:{job}] {s}~{e} 실패: {error} — {progress}")
+            else:
+                duration = time.monotonic() - started
+                await asyncio.to_thread(ledger.mark, job, shard, DONE, rows, duration)
+                report.done.append(shard)
+                report.rows += rows
+                progress.done += 1
+                progress.rows += rows
+                metrics.incr("backfill_shards_total", job=job, state=DONE)
+                metrics.incr("backfill_rows_total", rows, job=job)
+                metrics.observe("backfill_shard_seconds", duration, job=job)
+                logger.info(f"[backfill:{job}] {s}~{e}: {rows}행 ({duration:.1f}s) — {progress}")
+            if on_progress is not None:
+                on_progress(progress)
+
+    tasks = [asyncio.create_task(one(shard)) for shard in todo]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    report.done.sort()
+    logger.info(
+        f"[backfill:{job}] 종료: 완료 {len(report.done)} · 실패 {len(report.failed)}"
+        f" · 건너뜀 {len(report.skipped)} · {report.rows}행 ({progress.elapsed_sec:.1f}s)"
+    )
+    return report
+
+
+def add_cli_args(parser) -> None:
+    """백필 CLI 공통 옵션(--concurrency 는 각 CLI 가 기본값과 함께 따로 둔다)."""
+    parser.add_argument("--restart", action="store_true", help="백필 원장을 비우고 처음부터 다시 실행")
+    parser.add_argument("--no-ledger", action="store_true", help="DB 원장 없이 실행(재개 지점을 남기지 않음)")
+
+
+def ledger_from_args(args, db_url: Optional[str] = None):
+    """--no-ledger 또는 --replay(캐시 재적재는 done 샤드도 다시 돌아야 함)면 MemoryLedger."""
+    from fetch_data.common import response_cache
+
+    if getattr(args, "no_ledger", False) or response_cache.is_replay():
+        return MemoryLedger()
+    return default_ledger(db_url)
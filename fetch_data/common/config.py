@@ -1,18 +1,51 @@
 """
 환경변수 중앙 관리 모듈.
 모든 파일에서 os.getenv() 직접 호출 대신 이 모듈을 사용합니다.
+
+.env 는 import 시점이 아니라 첫 조회(getenv/get_*) 때 한 번만 읽는다.
 """
+import functools
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Optional
+
+ENV_FILE = Path(__file__).parents[2] / ".env"
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> bool:
+    """프로젝트 루트 .env 를 로딩한다(프로세스당 1회, 이미 설정된 값은 덮지 않음)."""
+    from dotenv import load_dotenv
+
+    return load_dotenv(ENV_FILE, override=False)
 
-# 프로젝트 루트에서 .env 로딩 (중복 호출 안전)
-load_dotenv(Path(__file__).parents[2] / ".env", override=False)
+
+def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+    """os.getenv 와 같되 .env 를 먼저 로딩한다."""
+    load_env()
+    return os.getenv(name, default)
 
 
 def get_nambu_api_key() -> str:
-    return os.getenv("NAMBU_API_KEY", "")
+    return getenv("NAMBU_API_KEY", "")
 
 
 def get_service_key() -> str:
-    return os.getenv("SERVICE_KEY") or os.getenv("NAMDONG_WIND_KEY", "")
+    return getenv("SERVICE_KEY") or getenv("NAMDONG_WIND_KEY", "")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(getenv(name, ""))
+    except ValueError:
+        return default
+
+
+def get_db_pool_config() -> dict:
+    """공유 DB 엔진 풀 설정 (DB_POOL_SIZE/DB_MAX_OVERFLOW/DB_POOL_RECYCLE/DB_POOL_TIMEOUT)."""
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+    }
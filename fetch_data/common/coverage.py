@@ -0,0 +1,288 @@
+"""
+데이터 커버리지 원장(data_coverage) — 소스·엔티티·일 단위로 관측된 슬롯을 기록한다.
+
+결측 판단이 수집기마다 제각각이었다: nambu_state.find_incomplete_days 는 generation
+원본에 COUNT(DISTINCT EXTRACT(HOUR …)) 를 돌리고, demand 는 _valid_demand_intervals,
+smp_realtime 은 확정일 검사를 따로 한다. 여기서는 적재 함수가 upsert 하는 같은
+트랜잭션 안에서 (source, entity, day) 행의 관측 슬롯 배열을 합집합으로 갱신하고,
+"무엇이 비었나" 는 이 원장의 PK 범위 조회만으로 답한다 — 사실 테이블을 훑지 않는다.
+
+소스(COVERAGE_SOURCES):
+    generation    entity = plant_id,      1시간 슬롯(24/일)
+    weather_asos  entity = station_name,  1시간 슬롯(24/일)
+    demand_5min   entity = 'kpx',         5분 슬롯(288/일, current_demand 있는 행만)
+    smp_realtime  entity = region,        15분 슬롯(96/일, 확정 행만)
+
+슬롯은 "그 날 자정부터 몇 번째 구간인가"(0-base) 정수다. 같은 슬롯을 다시 적재해도
+배열 합집합이라 observed 가 부풀지 않는다.
+
+원장이 생기기 전에 적재된 구간은 seed_coverage(또는 CLI) 로 사실 테이블에서 한 번
+채운다:
+    python -m fetch_data.common.coverage seed generation --start 2025-01-01 --end 2026-10-16
+    python -m fetch_data.common.coverage missing generation 17 --start 2026-01-01 --end 2026-10-16
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+DayRange = Tuple[date, date]
+
+
+@dataclass(frozen=True)
+class CoverageSource:
+    slot_minutes: int
+    # 사실 테이블에서 [start, end) 의 커버리지를 다시 계산하는 SELECT
+    # (entity, day, slot) 을 돌려줘야 한다. seed_coverage 가 원장에 덮어쓴다.
+    seed_select: str
+
+    @property
+    def slots_per_day(self) -> int:
+        return 24 * 60 // self.slot_minutes
+
+
+COVERAGE_SOURCES: Dict[str, CoverageSource] = {
+    "generation": CoverageSource(60, """
+        SELECT plant_id::text AS entity, timestamp::date AS day,
+               EXTRACT(HOUR FROM timestamp)::smallint AS slot
+        FROM generation
+        WHERE timestamp >= :start AND timestamp < :end
+    """),
+    "weather_asos": CoverageSource(60, """
+        SELECT station_name AS entity, timestamp::date AS day,
+               EXTRACT(HOUR FROM timestamp)::smallint AS slot
+        FROM weather_asos
+        WHERE timestamp >= :start AND timestamp < :end
+    """),
+    "demand_5min": CoverageSource(5, """
+        SELECT 'kpx' AS entity, timestamp::date AS day,
+               ((EXTRACT(HOUR FROM timestamp) * 60 + EXTRACT(MINUTE FROM timestamp)) / 5)::smallint AS slot
+        FROM demand_5min
+        WHERE timestamp >= :start AND timestamp < :end
+          AND current_demand IS NOT NULL
+    """),
+    "smp_realtime": CoverageSource(15, """
+        SELECT region AS entity, timestamp::date AS day,
+               ((EXTRACT(HOUR FROM timestamp) * 60 + EXTRACT(MINUTE FROM timestamp)) / 15)::smallint AS slot
+        FROM smp_realtime_jeju
+        WHERE timestamp >= :start AND timestamp < :end
+          AND is_confirmed
+    """),
+}
+
+
+_CREATE_COVERAGE = text("""
+    CREATE TABLE IF NOT EXISTS data_coverage (
+        source      TEXT NOT NULL,
+        entity      TEXT NOT NULL,
+        day         DATE NOT NULL,
+        slots       SMALLINT[] NOT NULL,
+        observed    SMALLINT GENERATED ALWAYS AS (cardinality(slots)) STORED,
+        expected    SMALLINT NOT NULL,
+        updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (source, entity, day)
+    )
+""")
+
+# 같은 날을 여러 번 나눠 적재해도 관측 슬롯은 합집합으로만 는다.
+_RECORD_COVERAGE = text("""
+    INSERT INTO data_coverage (source, entity, day, slots, expected)
+    VALUES (:source, :entity, :day, CAST(:slots AS SMALLINT[]), :expected)
+    ON CONFLICT (source, entity, day) DO UPDATE SET
+        slots = ARRAY(
+            SELECT DISTINCT s FROM unnest(data_coverage.slots || EXCLUDED.slots) AS s ORDER BY s
+        ),
+        expected = EXCLUDED.expected,
+        updated_at = now()
+""")
+
+_SELECT_OBSERVED = text("""
+    SELECT day, observed, expected
+    FROM data_coverage
+    WHERE source = :source AND entity = :entity
+      AND day BETWEEN :start AND :end
+""")
+
+_SEED_COVERAGE = """
+    INSERT INTO data_coverage (source, entity, day, slots, expected)
+    SELECT :source, entity, day, ARRAY_AGG(DISTINCT slot ORDER BY slot), :expected
+    FROM ({select}) f
+    GROUP BY entity, day
+    ON CONFLICT (source, entity, day) DO UPDATE SET
+        slots = EXCLUDED.slots,
+        expected = EXCLUDED.expected,
+        updated_at = now()
+"""
+
+_ready: set = set()
+
+
+def _source(source: str) -> CoverageSource:
+    try:
+        return COVERAGE_SOURCES[source]
+    except KeyError:
+        raise ValueError(f"알 수 없는 커버리지 소스: {source} (가능: {sorted(COVERAGE_SOURCES)})")
+
+
+def ensure_table(conn) -> None:
+    """data_coverage 가 없으면 만든다(엔진당 한 번)."""
+    engine = getattr(conn, "engine", None)
+    key = str(getattr(engine, "url", "")) or None
+    if key is not None and key in _ready:
+        return
+    conn.execute(_CREATE_COVERAGE)
+    if key is not None:
+        _ready.add(key)
+
+
+# ─── 쓰기 ─────────────────────────────────────────────────────────────────────
+
+def day_slots(timestamps, entities, slot_minutes: int) -> List[dict]:
+    """(timestamp, entity) 쌍 → [{entity, day, slots}] (일·엔티티별 관측 슬롯 정렬 목록)."""
+    ts = pd.to_datetime(pd.Series(timestamps).reset_index(drop=True), errors="coerce")
+    if isinstance(entities, pd.Series):
+        entities = entities.to_numpy()
+    frame = pd.DataFrame({"entity": pd.Series(entities, index=ts.index).astype(str), "ts": ts})
+    frame = frame.dropna(subset=["ts"])
+    if frame.empty:
+        return []
+    frame["day"] = frame["ts"].dt.date
+    frame["slot"] = (frame["ts"].dt.hour * 60 + frame["ts"].dt.minute) // slot_minutes
+    grouped = frame.drop_duplicates(["entity", "day", "slot"]).sort_values("slot") \
+        .groupby(["entity", "day"], sort=True)["slot"].agg(list)
+    return [
+        {"entity": entity, "day": day, "slots": [int(s) for s in slots]}
+        for (entity, day), slots in grouped.items()
+    ]
+
+
+def record_coverage(conn, source: str, timestamps, entities) -> int:
+    """적재 트랜잭션(conn) 안에서 관측 슬롯을 원장에 합친다. 반환: 갱신한 (entity, day) 수.
+
+    entities 는 timestamps 와 같은 길이의 시퀀스 또는 스칼라(단일 엔티티).
+    """
+    spec = _source(source)
+    params = [
+        {**row, "source": source, "expected": spec.slots_per_day}
+        for row in day_slots(timestamps, entities, spec.slot_minutes)
+    ]
+    if not params:
+        return 0
+    ensure_table(conn)
+    conn.execute(_RECORD_COVERAGE, params)
+    return len(params)
+
+
+def seed_coverage(engine: Engine, source: str, start: date, end: date) -> int:
+    """[start, end] 의 커버리지를 사실 테이블에서 다시 계산해 덮어쓴다(원장 도입 전 구간용)."""
+    spec = _source(source)
+    with engine.begin() as conn:
+        ensure_table(conn)
+        result = conn.execute(
+            text(_SEED_COVERAGE.format(select=spec.seed_select)),
+            {
+                "source": source,
+                "expected": spec.slots_per_day,
+                "start": datetime.combine(start, datetime.min.time()),
+                "end": datetime.combine(end + timedelta(days=1), datetime.min.time()),
+            },
+        )
+    n = int(result.rowcount or 0)
+    logger.info(f"[coverage] {source} {start}~{end} 시드: {n:,}개 (entity, day)")
+    return n
+
+
+# ─── 읽기 ─────────────────────────────────────────────────────────────────────
+
+def observed_days(engine: Engine, source: str, entity, start: date, end: date) -> Dict[date, int]:
+    """[start, end] 안에서 원장에 있는 날 → 관측 슬롯 수."""
+    _source(source)
+    with engine.begin() as conn:
+        ensure_table(conn)
+        rows = conn.execute(_SELECT_OBSERVED, {
+            "source": source, "entity": str(entity), "start": start, "end": end,
+        }).mappings().all()
+    return {row["day"]: int(row["observed"] or 0) for row in rows}
+
+
+def missing_days(
+    engine: Engine,
+    source: str,
+    entity,
+    start: date,
+    end: date,
+    min_slots: Optional[int] = None,
+) -> List[date]:
+    """관측 슬롯이 min_slots(기본: 하루 전체) 미만이거나 원장에 없는 날."""
+    need = _source(source).slots_per_day if min_slots is None else min_slots
+    observed = observed_days(engine, source, entity, start, end)
+    return [
+        start + timedelta(days=offset)
+        for offset in range((end - start).days + 1)
+        if observed.get(start + timedelta(days=offset), 0) < need
+    ]
+
+
+def to_ranges(days: List[date]) -> List[DayRange]:
+    """정렬된 날짜 목록 → 연속 구간 [(시작, 끝), ...] (양끝 포함)."""
+    ranges: List[DayRange] = []
+    for day in days:
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def missing_ranges(
+    engine: Engine,
+    source: str,
+    entity,
+    start: date,
+    end: date,
+    min_slots: Optional[int] = None,
+) -> List[DayRange]:
+    """[start, end] 에서 채워지지 않은 날을 연속 구간으로 묶어 돌려준다."""
+    return to_ranges(missing_days(engine, source, entity, start, end, min_slots))
+
+
+def main() -> None:
+    from fetch_data.common.db_base import get_engine
+
+    parser = argparse.ArgumentParser(description="데이터 커버리지 원장 시드/조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+    seed = sub.add_parser("seed", help="사실 테이블에서 커버리지 재계산")
+    seed.add_argument("source", choices=sorted(COVERAGE_SOURCES))
+    missing = sub.add_parser("missing", help="빈 구간 조회")
+    missing.add_argument("source", choices=sorted(COVERAGE_SOURCES))
+    missing.add_argument("entity")
+    missing.add_argument("--min-slots", type=int, default=None)
+    for p in (seed, missing):
+        p.add_argument("--start", type=date.fromisoformat, required=True)
+        p.add_argument("--end", type=date.fromisoformat, required=True)
+        p.add_argument("--db-url", default=None)
+    args = parser.parse_args()
+
+    engine = get_engine(args.db_url)
+    if args.command == "seed":
+        seed_coverage(engine, args.source, args.start, args.end)
+        return
+    ranges = missing_ranges(engine, args.source, args.entity, args.start, args.end, args.min_slots)
+    for first, last in ranges:
+        print(f"{first}~{last} ({(last - first).days + 1}일)")
+    if not ranges:
+        print("빈 구간 없음")
+
+
+if __name__ == "__main__":
+    main()
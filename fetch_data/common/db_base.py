@@ -5,26 +5,149 @@ pv/wind/smp 등 모든 모듈이 동일한 DB(pv-data-postgres)에 접속하므
 엔진/세션 생성 보일러플레이트를 여기 한 곳으로 통일한다.
 URL은 resolve_db_url로 해소(컨테이너/호스트 자동 전환, 호스트 기본 localhost:5436=메인).
 모델/Base는 각 소스 모듈(pv/wind/smp의 database.py)에 그대로 둔다.
+
+엔진 레지스트리:
+  해소된 URL 하나당 풀링 엔진 하나를 프로세스 전체가 공유한다. 5·10분 주기 flow가
+  실행마다 create_engine 으로 TCP/인증을 새로 맺던 비용을 없애기 위함이다.
+  풀 설정(pool_pre_ping, size/overflow/recycle/timeout)은 config.get_db_pool_config 에서,
+  풀 통계(연결 생성·체크아웃 수, 체크아웃 대기 시간)는 engine_pool_stats() 로 본다.
 """
-from typing import Optional
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from fetch_data.common.config import get_db_pool_config
+from fetch_data.common.db_utils import redact_db_url, resolve_db_url
+
+
+@dataclass
+class PoolStats:
+    """엔진 하나의 누적 풀 통계."""
+
+    connects: int = 0        # 새로 맺은 DB 연결 수
+    checkouts: int = 0       # 풀에서 꺼낸 횟수
+    checkins: int = 0        # 풀에 반납한 횟수
+    invalidated: int = 0     # pre_ping 등으로 폐기된 연결 수
+    wait_total_sec: float = 0.0
+    wait_max_sec: float = 0.0
+
+    def record_wait(self, sec: float) -> None:
+        self.wait_total_sec += sec
+        self.wait_max_sec = max(self.wait_max_sec, sec)
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["wait_avg_sec"] = self.wait_total_sec / self.checkouts if self.checkouts else 0.0
+        return d
+
+
+class _TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간(빈 슬롯을 기다리거나 새 연결을 맺는 시간)을 재는 QueuePool."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
 
-from fetch_data.common.db_utils import resolve_db_url
 
-_engine: Optional[Engine] = None
+_engines: Dict[str, Engine] = {}
+_stats: Dict[str, PoolStats] = {}
+_lock = threading.Lock()
+
+
+def _attach_stats(engine: Engine, stats: PoolStats) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):  # noqa: ARG001
+        stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):  # noqa: ARG001
+        stats.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):  # noqa: ARG001
+        stats.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exc):  # noqa: ARG001
+        stats.invalidated += 1
+
+
+def _create_pooled_engine(url: str, stats: PoolStats) -> Engine:
+    if url.startswith("sqlite"):
+        # sqlite 는 드라이버 기본 풀(SingletonThreadPool 등)을 그대로 쓴다
+        engine = create_engine(url, echo=False)
+    else:
+        cfg = get_db_pool_config()
+        engine = create_engine(
+            url,
+            echo=False,
+            poolclass=_TimedQueuePool,
+            pool_pre_ping=True,
+            pool_size=cfg["pool_size"],
+            max_overflow=cfg["max_overflow"],
+            pool_recycle=cfg["pool_recycle"],
+            pool_timeout=cfg["pool_timeout"],
+        )
+        engine.pool.stats = stats
+    _attach_stats(engine, stats)
+    return engine
 
 
 def get_engine(db_url: Optional[str] = None) -> Engine:
-    """공유 SQLAlchemy 엔진(싱글톤). db_url 지정 시 그 URL로 별도 엔진 생성."""
-    global _engine
-    if db_url:
-        return create_engine(db_url, echo=False)
-    if _engine is None:
-        _engine = create_engine(resolve_db_url(), echo=False)
-    return _engine
+    """URL별 공유 풀링 엔진. db_url 미지정 시 resolve_db_url() 결과를 쓴다.
+
+    같은 URL 이면 프로세스 안에서 항상 같은 엔진을 돌려준다.
+    """
+    url = resolve_db_url(db_url)
+    if not url:
+        raise RuntimeError("DB_URL이 설정되지 않았습니다.")
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            stats = _stats.setdefault(url, PoolStats())
+            engine = _create_pooled_engine(url, stats)
+            _engines[url] = engine
+    return engine
+
+
+def engine_pool_stats() -> Dict[str, dict]:
+    """{마스킹된 URL: 풀 통계} — 로그/메트릭 출력용."""
+    out: Dict[str, dict] = {}
+    for url, engine in list(_engines.items()):
+        d = _stats[url].as_dict()
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            d.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        out[redact_db_url(url)] = d
+    return out
+
+
+def dispose_engines() -> None:
+    """레지스트리의 모든 엔진을 닫고 비운다(프로세스 종료·fork 직후·테스트용)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _stats.clear()
 
 
 def get_session(db_url: Optional[str] = None):
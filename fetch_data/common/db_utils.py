@@ -1,18 +1,21 @@
 """
-DB 접속 URL 해석 유틸리티
+DB 접속 URL 해석 / DBAPI 커서 유틸리티
 
 실행 환경(Docker / 호스트)에 따라 적절한 DB URL을 결정합니다.
+COPY 스테이징 적재가 쓰는 DBAPI 커서(copy_cursor)도 여기서 엽니다.
 """
 
-import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from urllib.parse import urlparse, urlunparse
 
+from fetch_data.common.config import getenv
+
 
 def running_in_docker() -> bool:
     """Docker 컨테이너 내부에서 실행 중인지 판별합니다."""
-    return Path("/.dockerenv").exists() or os.getenv("RUNNING_IN_DOCKER") == "1"
+    return Path("/.dockerenv").exists() or getenv("RUNNING_IN_DOCKER") == "1"
 
 
 def resolve_db_url(cli_db_url: Optional[str] = None) -> str:
@@ -30,12 +33,12 @@ def resolve_db_url(cli_db_url: Optional[str] = None) -> str:
     if cli_db_url:
         return cli_db_url
 
-    db_url = os.getenv("DB_URL")
+    db_url = getenv("DB_URL")
     if db_url:
         return db_url
 
-    pv_db_url = os.getenv("PV_DATABASE_URL") or ""
-    local_db_url = os.getenv("LOCAL_DB_URL") or ""
+    pv_db_url = getenv("PV_DATABASE_URL") or ""
+    local_db_url = getenv("LOCAL_DB_URL") or ""
 
     if not running_in_docker() and pv_db_url:
         try:
@@ -43,7 +46,7 @@ def resolve_db_url(cli_db_url: Optional[str] = None) -> str:
             if u.hostname == "pv-db" and local_db_url:
                 return local_db_url
             if u.hostname == "pv-db":
-                host_port = int(os.getenv("PV_DB_PORT_FORWARD", "5436"))
+                host_port = int(getenv("PV_DB_PORT_FORWARD", "5436"))
                 if u.username and u.password:
                     netloc = f"{u.username}:{u.password}@localhost:{host_port}"
                 elif u.username:
@@ -67,3 +70,20 @@ def redact_db_url(db_url: str) -> str:
         return urlunparse(u._replace(netloc=netloc))
     except Exception:
         return "<unparseable db url>"
+
+
+@contextmanager
+def copy_cursor(connection) -> Iterator[Optional[object]]:
+    """COPY 가능한 DBAPI 커서(psycopg2)를 열고 블록이 끝나면 닫습니다.
+
+    copy_expert 가 없는 드라이버/가짜 연결이면 None 을 넘깁니다(연 커서는 닫음).
+    """
+    try:
+        cursor = connection.connection.cursor()
+    except Exception:
+        yield None
+        return
+    try:
+        yield cursor if hasattr(cursor, "copy_expert") else None
+    finally:
+        cursor.close()
@@ -6,18 +6,32 @@ dual-write 트리거(scripts/migrations/p4_dual_write_triggers.sql)가 구테이
   · plants 보장: _ensure_plant 동등 (ON CONFLICT (plant_name, unit_no) DO NOTHING, 최소행)
   · generation UPSERT: ON CONFLICT (timestamp, plant_id) DO UPDATE, source='api'
 
+generation 적재는 COPY FROM STDIN 으로 임시 스테이징 테이블에 흘려 넣은 뒤
+INSERT … SELECT … ON CONFLICT 한 번으로 병합한다(psycopg2 executemany 는 행마다
+왕복이라 EWP/EKR 전체 재적재·KOEN 백필에서 수 분이 걸렸다). COPY 를 못 쓰는
+드라이버(copy_expert 없음)면 기존 배치 executemany 로 돌아간다.
+
 입력 df 필수 컬럼: timestamp, plant_name, generation
 선택 컬럼: unit_no(기본 '1'), plant_code(기본 None)
+
+수집 경계(collection_frontier): operator/fuel 별 발전기마다 마지막 적재 시각과 그 날의
+적재 시간 수를 한 쿼리로 돌려준다 — 증분 수집기가 "어디서부터 다시 받을지" 정할 때 쓴다.
 """
 
 from __future__ import annotations
 
+import io
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
-from fetch_data.common.db_utils import resolve_db_url
+from fetch_data.common import metrics
+from fetch_data.common.coverage import record_coverage
+from fetch_data.common.db_base import get_engine
+from fetch_data.common.db_utils import copy_cursor
 from fetch_data.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,6 +49,59 @@ _UPSERT_GEN = text("""
     DO UPDATE SET gen_kwh = EXCLUDED.gen_kwh, source = 'api'
 """)
 
+_CREATE_STAGE = text("""
+    CREATE TEMP TABLE IF NOT EXISTS _generation_stage (
+        timestamp timestamp,
+        plant_id  integer,
+        gen_kwh   double precision
+    ) ON COMMIT DROP
+""")
+
+_COPY_STAGE = "COPY _generation_stage (timestamp, plant_id, gen_kwh) FROM STDIN WITH (FORMAT csv)"
+
+_MERGE_STAGE = text("""
+    INSERT INTO generation (timestamp, plant_id, gen_kwh, source)
+    SELECT timestamp, plant_id, gen_kwh, 'api' FROM _generation_stage
+    ON CONFLICT (timestamp, plant_id)
+    DO UPDATE SET gen_kwh = EXCLUDED.gen_kwh, source = 'api'
+""")
+
+
+# 충돌 시 gen_kwh 만 갱신하고 source 는 보존 (gen.load_gen — 기존 backfill 이력 유지)
+_MERGE_STAGE_KEEP_SOURCE = text("""
+    INSERT INTO generation (timestamp, plant_id, gen_kwh, source)
+    SELECT timestamp, plant_id, gen_kwh, 'api' FROM _generation_stage
+    ON CONFLICT (timestamp, plant_id)
+    DO UPDATE SET gen_kwh = EXCLUDED.gen_kwh
+""")
+
+
+def copy_merge_generation(conn, frame: pd.DataFrame, keep_source: bool = False) -> bool:
+    """[timestamp, plant_id, gen_kwh] frame 을 COPY 스테이징 후 한 번에 병합.
+
+    같은 트랜잭션(conn) 안에서 돈다 — 임시 테이블은 ON COMMIT DROP.
+    같은 (timestamp, plant_id) 가 frame 안에 두 번 있으면 ON CONFLICT 가 한 문장에서
+    같은 행을 두 번 갱신하게 되어 실패하므로 마지막 값만 남긴다(executemany 와 같은 결과).
+    keep_source=True 면 기존 행의 source 를 건드리지 않는다.
+    COPY 를 못 쓰는 연결이면 아무것도 하지 않고 False.
+    """
+    with copy_cursor(conn) as cur:
+        if cur is None:
+            return False
+
+        stage = frame.drop_duplicates(subset=["timestamp", "plant_id"], keep="last")
+        buf = io.StringIO()
+        stage[["timestamp", "plant_id", "gen_kwh"]].to_csv(
+            buf, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S"
+        )
+        buf.seek(0)
+
+        conn.execute(_CREATE_STAGE)
+        conn.execute(text("TRUNCATE _generation_stage"))
+        cur.copy_expert(_COPY_STAGE, buf)
+    conn.execute(_MERGE_STAGE_KEEP_SOURCE if keep_source else _MERGE_STAGE)
+    return True
+
 
 def upsert_generation(
     df: pd.DataFrame,
@@ -66,9 +133,10 @@ def upsert_generation(
     if df.empty:
         return 0
 
-    eng = engine if engine is not None else create_engine(resolve_db_url(db_url))
+    eng = engine if engine is not None else get_engine(db_url)
 
-    with eng.begin() as conn:
+    with metrics.stage("load", source=operator, fuel=fuel_type, table="generation") as st, \
+            eng.begin() as conn:
         # 1) plants 보장 (없으면 최소행 생성, 있으면 그대로)
         keys = df[["plant_name", "unit_no", "plant_code"]].drop_duplicates()
         for r in keys.itertuples(index=False):
@@ -95,13 +163,103 @@ def upsert_generation(
         df = df[df["plant_id"].notna()].copy()
         df["plant_id"] = df["plant_id"].astype(int)
 
-        # 3) generation UPSERT
-        records = [
-            {"ts": t, "pid": int(p), "kwh": (None if pd.isna(g) else float(g))}
-            for t, p, g in zip(df["timestamp"], df["plant_id"], df["generation"])
-        ]
-        for i in range(0, len(records), batch):
-            conn.execute(_UPSERT_GEN, records[i:i + batch])
+        # 3) generation UPSERT (COPY 스테이징 -> 단일 병합, 불가하면 배치 executemany)
+        #    + 같은 트랜잭션에서 data_coverage 갱신
+        n = len(df)
+        stage = pd.DataFrame({
+            "timestamp": pd.to_datetime(df["timestamp"]),
+            "plant_id": df["plant_id"].to_numpy(),
+            "gen_kwh": pd.to_numeric(df["generation"], errors="coerce"),
+        })
+        if n and not copy_merge_generation(conn, stage):
+            records = [
+                {"ts": t, "pid": int(p), "kwh": (None if pd.isna(g) else float(g))}
+                for t, p, g in zip(df["timestamp"], df["plant_id"], df["generation"])
+            ]
+            for i in range(0, len(records), batch):
+                conn.execute(_UPSERT_GEN, records[i:i + batch])
+        if n:
+            record_coverage(conn, "generation", stage["timestamp"], stage["plant_id"])
+        st.rows = n
+
+    logger.info(f"[core] {operator}/{fuel_type} generation UPSERT {n:,}행")
+    return n
+
+
+# ─── 수집 경계 ────────────────────────────────────────────────────────────────
+
+# 발전기마다 LATERAL 로 ix_generation_plant_ts(plant_id, timestamp DESC) 를 두 번 짚는다:
+# 최신 1행(인덱스 첫 항목)과 그 날 구간(최대 24~288행) — generation 전체 집계가 없다.
+_FRONTIER = """
+    SELECT
+      p.plant_id,
+      p.plant_code,
+      p.unit_no,
+      p.plant_name,
+      last.ts AS last_ts,
+      COALESCE(day.hours, 0) AS last_day_hours
+    FROM plants p
+    LEFT JOIN LATERAL (
+      SELECT g.timestamp AS ts
+      FROM generation g
+      WHERE g.plant_id = p.plant_id
+      ORDER BY g.timestamp DESC
+      LIMIT 1
+    ) last ON true
+    LEFT JOIN LATERAL (
+      SELECT COUNT(DISTINCT EXTRACT(HOUR FROM g.timestamp)) AS hours
+      FROM generation g
+      WHERE g.plant_id = p.plant_id
+        AND g.timestamp >= date_trunc('day', last.ts)
+        AND g.timestamp < date_trunc('day', last.ts) + interval '1 day'
+    ) day ON true
+    WHERE p.operator = :operator
+      {filters}
+    ORDER BY p.plant_code, p.unit_no
+"""
 
-    logger.info(f"[core] {operator}/{fuel_type} generation UPSERT {len(records):,}행")
-    return len(records)
+
+@dataclass(frozen=True)
+class PlantFrontier:
+    """발전기 하나의 수집 경계."""
+
+    plant_id: int
+    plant_code: Optional[str]
+    unit_no: Optional[str]
+    plant_name: str
+    last_ts: Optional[datetime]     # 마지막 적재 시각(없으면 None)
+    last_day_hours: int             # last_ts 가 속한 날의 적재된 서로 다른 시(hour) 수
+
+
+def collection_frontier(
+    engine,
+    operator: str,
+    fuel_type: Optional[str] = None,
+    *,
+    require_code: bool = False,
+) -> list[PlantFrontier]:
+    """operator(+fuel_type) 발전기 전체의 수집 경계를 한 번의 왕복으로 조회한다.
+
+    require_code=True 면 plant_code 가 있는 발전기만(API 호출에 코드가 필요한 수집기용).
+    """
+    filters = []
+    params = {"operator": operator}
+    if fuel_type is not None:
+        filters.append("AND p.fuel_type = :fuel_type")
+        params["fuel_type"] = fuel_type
+    if require_code:
+        filters.append("AND p.plant_code IS NOT NULL")
+    sql = text(_FRONTIER.format(filters="\n      ".join(filters)))
+    with engine.connect() as conn:
+        rows = conn.execute(sql, params).mappings().all()
+    return [
+        PlantFrontier(
+            plant_id=int(row["plant_id"]),
+            plant_code=row["plant_code"],
+            unit_no=row["unit_no"],
+            plant_name=row["plant_name"],
+            last_ts=row["last_ts"],
+            last_day_hours=int(row["last_day_hours"] or 0),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,439 @@
+"""
+공통 비동기 HTTP 클라이언트 (호스트별 속도 제한 + 적응형 동시성 + 재시도).
+
+KPX·data.go.kr·koenergy.kr 수집기가 각자 들고 있던 재시도/백오프/세마포어를
+한 곳으로 모은다. 호스트 단위 상태(HostState)는 프로세스 전체가 공유하므로,
+서로 다른 수집기가 같은 호스트를 동시에 두드려도 한 예산 안에서 움직인다.
+
+  - 토큰 버킷: 호스트별 초당 요청 수(rate)와 순간 허용량(burst)
+  - AIMD 동시성: 성공이 쌓이면 +1, 429/503/방화벽 페이지면 절반으로
+  - 재시도: 지수 백오프 + full jitter, Retry-After 헤더 존중
+  - 메트릭: 호스트별 요청/성공/실패/차단 횟수와 응답 시간(http_stats(), metrics 의 http_* 시계열)
+
+세션은 두 가지로 쓴다.
+  1) `async with HttpClient() as client:` — 호스트별 keep-alive 세션(DNS 캐시)을 클라이언트가 소유
+  2) `await request(..., session=s)` — 쿠키를 쥔 호출 측 세션을 그대로 쓰되 제한/재시도/메트릭만 공유
+
+상태는 asyncio 동기화 객체를 쓰지 않아 asyncio.run() 을 여러 번 돌려도 재사용된다.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from fetch_data.common import metrics
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+BLOCK_MARKERS = ("firewall", "blocked", "access denied")
+THROTTLE_STATUSES = (429, 503)
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """호스트별 요청 예산."""
+
+    rate: float = 5.0           # 초당 토큰 보충량
+    burst: int = 5              # 버킷 용량
+    concurrency: int = 4        # 시작 동시성
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    increase_every: int = 5     # 연속 성공 N회마다 동시성 +1
+
+
+DEFAULT_POLICY = HostPolicy()
+
+# 호스트 접미사 → 정책. 방화벽이 민감한 KPX/koenergy 는 보수적으로 시작한다.
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "kpx.or.kr": HostPolicy(rate=2.5, burst=2, concurrency=2, max_concurrency=6),
+    "koenergy.kr": HostPolicy(rate=2.0, burst=2, concurrency=2, max_concurrency=6),
+    "data.go.kr": HostPolicy(rate=10.0, burst=10, concurrency=4, max_concurrency=16),
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """재시도 정책. delay(n) = uniform(0, min(cap, base * 2**n)) (full jitter)."""
+
+    attempts: int = 3
+    base: float = 1.0
+    cap: float = 30.0
+    throttle_base: float = 5.0  # 차단 응답 뒤에는 더 길게 쉰다
+
+    def delay(self, attempt: int, throttled: bool = False) -> float:
+        base = self.throttle_base if throttled else self.base
+        return random.uniform(0, min(self.cap, base * (2 ** attempt)))
+
+
+DEFAULT_RETRY = RetryPolicy()
+
+
+class HttpRequestError(RuntimeError):
+    """재시도를 모두 소진한 요청."""
+
+    def __init__(self, method: str, url: str, attempts: int, last_status: Optional[int] = None):
+        self.method = method
+        self.url = url
+        self.attempts = attempts
+        self.last_status = last_status
+        super().__init__(
+            f"{method} {url} 실패 ({attempts}회 시도, 마지막 상태={last_status})"
+        )
+
+
+@dataclass
+class HttpResponse:
+    """읽기가 끝난 응답(본문 포함). 세션 컨텍스트 밖에서도 안전하게 쓸 수 있다."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    url: str
+    elapsed: float
+
+    @property
+    def content_type(self) -> str:
+        return (self.headers.get("Content-Type", "") or "").lower()
+
+    def text(self, encoding: str = "utf-8", errors: str = "replace") -> str:
+        return self.body.decode(encoding, errors=errors)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class TokenBucket:
+    """락 없는 토큰 버킷. 토큰이 모자라면 음수로 '예약'하고 그만큼 잔다."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1.0
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self) -> None:
+        """동기(requests) 수집기용."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """AIMD 동시성 제한기. 대기자는 호출 시점의 루프에서 future 로 깨운다."""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.limit = policy.concurrency
+        self.in_flight = 0
+        self._streak = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.limit:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                elif fut.done() and not fut.cancelled():
+                    self._wake()  # 깨워진 뒤 취소됨 — 받은 자리를 다음 대기자에게 넘긴다
+                raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        self._streak += 1
+        if self._streak >= self.policy.increase_every and self.limit < self.policy.max_concurrency:
+            self.limit += 1
+            self._streak = 0
+            self._wake()
+
+    def on_throttle(self) -> None:
+        self._streak = 0
+        self.limit = max(self.policy.min_concurrency, self.limit // 2)
+
+
+@dataclass
+class HostStats:
+    """호스트별 누적 요청 메트릭."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    throttled: int = 0
+    retries: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, elapsed: float, status: Optional[int]) -> None:
+        self.requests += 1
+        self.total_sec += elapsed
+        self.max_sec = max(self.max_sec, elapsed)
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+@dataclass
+class HostState:
+    host: str
+    policy: HostPolicy
+    bucket: TokenBucket
+    limiter: AdaptiveLimiter
+    stats: HostStats
+
+
+_hosts: Dict[str, HostState] = {}
+
+
+def policy_for(host: str) -> HostPolicy:
+    if host in HOST_POLICIES:
+        return HOST_POLICIES[host]
+    for suffix, policy in HOST_POLICIES.items():
+        if host == suffix or host.endswith("." + suffix):
+            return policy
+    return DEFAULT_POLICY
+
+
+def host_state(url_or_host: str) -> HostState:
+    """URL(또는 호스트명)의 공유 상태. 없으면 정책대로 새로 만든다."""
+    host = urlparse(url_or_host).hostname or url_or_host
+    state = _hosts.get(host)
+    if state is None:
+        policy = policy_for(host)
+        state = HostState(
+            host=host,
+            policy=policy,
+            bucket=TokenBucket(policy.rate, policy.burst),
+            limiter=AdaptiveLimiter(policy),
+            stats=HostStats(),
+        )
+        _hosts[host] = state
+    return state
+
+
+def configure_host(host: str, **overrides) -> HostPolicy:
+    """특정 호스트 정책을 덮어쓴다(CLI 옵션·테스트용). 기존 상태는 새 정책으로 재생성."""
+    policy = replace(policy_for(host), **overrides)
+    HOST_POLICIES[host] = policy
+    _hosts.pop(host, None)
+    return policy
+
+
+def reset_hosts() -> None:
+    """공유 호스트 상태를 비운다(테스트용)."""
+    _hosts.clear()
+
+
+def http_stats() -> Dict[str, dict]:
+    """{호스트: 요청 메트릭 + 현재 동시성 한도}."""
+    out: Dict[str, dict] = {}
+    for host, state in _hosts.items():
+        d = asdict(state.stats)
+        d["avg_sec"] = state.stats.total_sec / state.stats.requests if state.stats.requests else 0.0
+        d["concurrency_limit"] = state.limiter.limit
+        out[host] = d
+    return out
+
+
+def looks_blocked(status: int, text: str) -> bool:
+    """403/429 또는 방화벽 안내 페이지(본문 마커)면 차단으로 본다."""
+    if status in (403, 429):
+        return True
+    low = text.lower()
+    return any(m in low for m in BLOCK_MARKERS)
+
+
+def _default_ok(resp: HttpResponse) -> bool:
+    return resp.status == 200
+
+
+def _retry_after(resp: HttpResponse) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    session: aiohttp.ClientSession,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    ok: Callable[[HttpResponse], bool] = _default_ok,
+    is_blocked: Optional[Callable[[HttpResponse], bool]] = None,
+    label: str = "",
+    **kwargs,
+) -> HttpResponse:
+    """호스트 예산 안에서 요청하고, ok(resp) 가 참이 될 때까지 재시도한다.
+
+    Args:
+        session: 요청에 쓸 aiohttp 세션(쿠키·헤더는 세션 쪽 책임).
+        ok: 성공 판정. 기본은 200.
+        is_blocked: 차단(방화벽 페이지 등) 판정. 참이면 동시성을 절반으로 줄이고 길게 쉰다.
+            429/503 은 항상 차단으로 본다.
+        kwargs: session.request 에 그대로 전달(params/data/json/headers/timeout).
+
+    Raises:
+        HttpRequestError: retry.attempts 회 모두 실패.
+    """
+    state = host_state(url)
+    tag = label or state.host
+    last_status: Optional[int] = None
+    last_error: Optional[BaseException] = None
+
+    for attempt in range(retry.attempts):
+        if attempt:
+            state.stats.retries += 1
+        await state.limiter.acquire()
+        throttled = False
+        wait_hint: Optional[float] = None
+        started = time.perf_counter()
+        try:
+            await state.bucket.acquire()
+            try:
+                async with session.request(method, url, **kwargs) as r:
+                    body = await r.read()
+                    resp = HttpResponse(
+                        status=r.status,
+                        headers=dict(r.headers or {}),
+                        body=body,
+                        url=url,
+                        elapsed=time.perf_counter() - started,
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionResetError) as error:
+                last_error = error
+                elapsed = time.perf_counter() - started
+                state.stats.record(elapsed, None)
+                state.stats.failures += 1
+                metrics.observe("http_request_seconds", elapsed, host=state.host, status="error")
+                logger.warning(f"[http] {tag} {method} 예외 (시도 {attempt + 1}/{retry.attempts}): {error}")
+            else:
+                last_status = resp.status
+                state.stats.record(resp.elapsed, resp.status)
+                metrics.observe("http_request_seconds", resp.elapsed, host=state.host, status=resp.status)
+                throttled = resp.status in THROTTLE_STATUSES or bool(is_blocked and is_blocked(resp))
+                if not throttled and ok(resp):
+                    state.stats.successes += 1
+                    state.limiter.on_success()
+                    metrics.incr("http_requests_total", host=state.host, outcome="ok")
+                    metrics.incr("http_response_bytes_total", len(resp.body), host=state.host)
+                    return resp
+                state.stats.failures += 1
+                metrics.incr("http_requests_total", host=state.host, outcome="throttled" if throttled else "bad")
+                if throttled:
+                    state.stats.throttled += 1
+                    state.limiter.on_throttle()
+                    wait_hint = _retry_after(resp)
+                    logger.warning(
+                        f"[http] {tag} 차단/제한 응답 status={resp.status} "
+                        f"→ 동시성 {state.limiter.limit} (시도 {attempt + 1}/{retry.attempts})"
+                    )
+                else:
+                    logger.warning(
+                        f"[http] {tag} {method} 비정상 응답 status={resp.status} "
+                        f"size={len(resp.body)} (시도 {attempt + 1}/{retry.attempts})"
+                    )
+        finally:
+            state.limiter.release()
+
+        if attempt + 1 < retry.attempts:
+            delay = retry.delay(attempt, throttled)
+            if wait_hint is not None:
+                delay = max(delay, min(wait_hint, retry.cap))
+            await asyncio.sleep(delay)
+
+    raise HttpRequestError(method, url, retry.attempts, last_status) from last_error
+
+
+class HttpClient:
+    """호스트별 keep-alive 세션을 소유하는 클라이언트.
+
+    >>> async with HttpClient() as client:
+    ...     resp = await client.get(url, params=...)
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 60.0,
+        headers: Optional[dict] = None,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+    ):
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._headers = headers or {}
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    def session_for(self, url: str) -> aiohttp.ClientSession:
+        state = host_state(url)
+        session = self._sessions.get(state.host)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=state.policy.max_concurrency,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout, headers=self._headers
+            )
+            self._sessions[state.host] = session
+        return session
+
+    async def request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        return await request(method, url, session=self.session_for(url), **kwargs)
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+    async def __aenter__(self) -> "HttpClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
@@ -1,4 +1,4 @@
-"""koenergy.kr 공용 헬퍼 — SSL 보충, CSV 응답 판별, 월 분할, 유연 CSV 리더.
+"""koenergy.kr 공용 헬퍼 — SSL 보충, CSV 응답 판별, 월 분할, 유연 CSV 리더(고속 경로).
 
 koenergy.kr 는 TLS 핸드셰이크에서 중간 인증서를 누락한다. 여기의
 get_koen_ssl_context() 가 AIA URL 에서 중간 인증서를 받아 보충한다.
@@ -6,8 +6,11 @@ get_koen_ssl_context() 가 AIA URL 에서 중간 인증서를 받아 보충한
 """
 from __future__ import annotations
 
-import os
+import csv
+import io
 import ssl
+import warnings
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from pathlib import Path
 from typing import List, Optional, Tuple, Union
@@ -15,6 +18,7 @@ from urllib.request import urlopen
 
 import pandas as pd
 
+from fetch_data.common.config import getenv
 from fetch_data.common.date_utils import month_end, to_yyyymmdd
 from fetch_data.common.logger import get_logger
 
@@ -33,7 +37,7 @@ def _ensure_intermediate_pem() -> Optional[Path]:
     """서버가 누락한 중간 인증서를 AIA URL에서 받아 PEM으로 캐시."""
     if _INTERMEDIATE_CACHE.exists():
         return _INTERMEDIATE_CACHE
-    url = os.getenv("KOEN_INTERMEDIATE_AIA_URL", KOEN_INTERMEDIATE_AIA_URL)
+    url = getenv("KOEN_INTERMEDIATE_AIA_URL", KOEN_INTERMEDIATE_AIA_URL)
     try:
         der = urlopen(url, timeout=30).read()  # noqa: S310 (http AIA endpoint)
         pem = ssl.DER_cert_to_PEM_cert(der)
@@ -52,7 +56,7 @@ def get_koen_ssl_context() -> Union[ssl.SSLContext, bool]:
     KOEN_SSL_NO_VERIFY=1 이면 검증을 끈다(비권장, 명시적 탈출구).
     """
     global _SSL_CTX
-    if os.getenv("KOEN_SSL_NO_VERIFY", "").strip().lower() in ("1", "true", "yes"):
+    if getenv("KOEN_SSL_NO_VERIFY", "").strip().lower() in ("1", "true", "yes"):
         logger.warning("[SSL] KOEN_SSL_NO_VERIFY 활성화 -> TLS 검증 비활성화(비권장)")
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
@@ -113,28 +117,121 @@ def normalize_columns(cols: List[str]) -> List[str]:
     return list(s)
 
 
-def read_csv_flexible(fp: Path) -> pd.DataFrame:
+# 인코딩 스니핑 순서: BOM → utf-8(엄격) → cp949(euc-kr 상위집합)
+_SNIFF_ENCODINGS = ("utf-8", "cp949")
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+@dataclass
+class CsvReadReport:
+    """read_csv_flexible 한 번의 결과 요약. bad_lines 는 (물리 행 번호, 원문) 일부."""
+
+    path: str
+    encoding: str
+    engine: str
+    rows: int = 0
+    bad_line_count: int = 0
+    bad_lines: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def sniff_encoding(raw: bytes) -> str:
+    """원시 바이트에서 인코딩을 한 번에 결정한다(전체 재파싱 반복 없음)."""
+    if raw.startswith(_UTF8_BOM):
+        return "utf-8-sig"
+    for enc in _SNIFF_ENCODINGS:
+        try:
+            raw.decode(enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    raise UnicodeDecodeError("cp949", raw, 0, len(raw), "utf-8/cp949 모두 디코딩 불가")
+
+
+_CSV_KW = dict(sep=",", index_col=False, skipinitialspace=True)
+
+
+def _find_bad_records(text: str) -> Tuple[int, List[Tuple[int, int, List[str]]]]:
+    """헤더보다 필드가 많은 레코드 → (레코드 순번, 물리 행 번호, 필드). C 엔진이 거부하는 행들."""
+    reader = csv.reader(io.StringIO(text), skipinitialspace=True)
+    header = next(reader, [])
+    ncols = len(header)
+    bad: List[Tuple[int, int, List[str]]] = []
+    pos = 0
+    for row in reader:
+        if not row:
+            continue  # 빈 줄은 pandas 도 건너뛴다
+        if len(row) > ncols:
+            bad.append((pos, reader.line_num, row))
+        pos += 1
+    return ncols, bad
+
+
+def _parse_with_fallback(text: str, report: CsvReadReport) -> pd.DataFrame:
+    """C 엔진 고속 경로. 깨진 행이 있으면 그 행만 python 엔진으로 다시 읽어 제자리에 끼운다."""
+    try:
+        return pd.read_csv(io.StringIO(text), engine="c", **_CSV_KW)
+    except pd.errors.ParserError:
+        pass
+
+    ncols, bad = _find_bad_records(text)
+    good = pd.read_csv(io.StringIO(text), engine="c", on_bad_lines="skip", **_CSV_KW)
+    report.engine = "c+python"
+    report.bad_line_count = len(bad)
+    report.bad_lines = [(line_no, ",".join(row)[:200]) for _, line_no, row in bad[:20]]
+    if not bad:
+        return good
+
+    header_line = text.splitlines()[0]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for _, _, row in bad:
+        writer.writerow(row)
+    with warnings.catch_warnings():
+        # index_col=False 의 '초과 필드 버림' 경고 — 보고서로 대신한다
+        warnings.simplefilter("ignore", pd.errors.ParserWarning)
+        salvaged = pd.read_csv(io.StringIO(header_line + "\n" + buf.getvalue()), engine="python", **_CSV_KW)
+    salvaged.columns = good.columns
+
+    bad_pos = [pos for pos, _, _ in bad]
+    total = len(good) + len(bad)
+    good_pos = sorted(set(range(total)) - set(bad_pos))
+    good.index = good_pos
+    salvaged.index = bad_pos
+    return pd.concat([good, salvaged]).sort_index().reset_index(drop=True)
+
+
+def read_csv_report(fp: Path) -> Tuple[pd.DataFrame, CsvReadReport]:
+    """read_csv_flexible 과 같되 인코딩/엔진/깨진 행 보고서를 함께 돌려준다."""
+    raw = Path(fp).read_bytes()
+    try:
+        encoding = sniff_encoding(raw)
+    except UnicodeDecodeError as e:
+        raise RuntimeError(f"CSV 읽기 실패: {fp} / last_err={e}") from e
+    report = CsvReadReport(path=str(fp), encoding=encoding, engine="c")
+    try:
+        df = _parse_with_fallback(raw.decode(encoding), report)
+    except Exception as e:
+        raise RuntimeError(f"CSV 읽기 실패: {fp} / last_err={e}") from e
+    df.columns = normalize_columns(df.columns.tolist())
+    report.rows = len(df)
+    if report.bad_line_count:
+        sample = ", ".join(str(n) for n, _ in report.bad_lines[:5])
+        logger.warning(
+            f"[csv] {Path(fp).name}: 필드 초과 {report.bad_line_count}행 python 엔진 보정 (행 {sample} ...)"
+        )
+    return df, report
+
+
+def read_csv_flexible(fp: Path, as_arrow: bool = False):
     """
-    - cp949/euc-kr/utf-8-sig/utf-8 순서로 시도
+    - 원시 바이트에서 인코딩을 한 번만 스니핑(BOM → utf-8 → cp949)
     - 콤마 뒤 공백 자동 제거(skipinitialspace=True) -> ' 호기' 같은 문제 해결
-    - python engine 사용(깨진 행이 섞인 경우가 있어 C엔진보다 안전)
+    - C 엔진으로 파싱, 필드가 넘치는 깨진 행만 python 엔진으로 보정(초과 필드 버림)
+    - as_arrow=True 면 pyarrow.Table 로 반환
     """
-    encodings = ["cp949", "euc-kr", "utf-8-sig", "utf-8"]
+    df, _ = read_csv_report(fp)
+    if as_arrow:
+        import pyarrow as pa
 
-    last_err: Optional[Exception] = None
-    for enc in encodings:
-        try:
-            df = pd.read_csv(
-                fp,
-                encoding=enc,
-                sep=",",
-                engine="python",
-                index_col=False,
-                skipinitialspace=True,   # ★ 핵심: 콤마 뒤 공백 제거
-            )
-            df.columns = normalize_columns(df.columns.tolist())
-            return df
-        except Exception as e:
-            last_err = e
-
-    raise RuntimeError(f"CSV 읽기 실패: {fp} / last_err={last_err}")
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df
@@ -0,0 +1,178 @@
+"""
+한국 달력 특성 테이블 (2000-01-01 ~ 2040-12-31) — 벡터화 조회.
+
+5분 수요 행마다 workalendar 를 row-by-row 로 부르면(apply) 수백만 행에서 수 초가 걸린다.
+여기서는 기간 전체를 일 단위 NumPy 배열로 한 번 만들어 두고, 타임스탬프를 '기준일로부터
+며칠째' 인덱스로 바꿔 배열에서 바로 꺼낸다.
+
+컬럼:
+  is_holiday             workalendar SouthKorea 공휴일 (기존 demand_5min 값과 동일 규칙)
+  day_type               0=평일, 1=주말, 2=공휴일
+  is_substitute_holiday  대체공휴일 (workalendar 에 없음 — 아래 규칙으로 계산, is_holiday 와 별개)
+  is_bridge_day          징검다리 평일 (전날·다음날이 모두 휴일/주말/대체공휴일)
+
+대체공휴일 규칙:
+  - 2014~ : 설·추석 연휴가 일요일/다른 공휴일과 겹치면, 어린이날이 토·일/다른 공휴일과 겹치면
+  - 2021-08~ : 3·1절, 광복절, 개천절, 한글날이 토·일이면
+  - 2023-05~ : 부처님오신날, 성탄절이 토·일이면
+  → 연휴(또는 해당일) 다음 첫 비공휴 평일.
+음력 명절 날짜는 workalendar 환산을 그대로 따른다(is_holiday 와 같은 기준).
+
+테이블 범위 밖 날짜는 workalendar 로 하루씩 계산한다(is_holiday/day_type 만, 나머지는 False).
+"""
+from __future__ import annotations
+
+import functools
+import warnings
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+CALENDAR_START = date(2000, 1, 1)
+CALENDAR_END = date(2040, 12, 31)
+
+_LUNAR_BLOCKS = ("Korean New Year's Day", "Midautumn Festival")
+_NATIONAL_DAYS = ("Independence Day", "Liberation Day", "National Foundation Day", "Hangul Day")
+_NATIONAL_FROM = date(2021, 8, 4)
+_LATE_DAYS = ("Buddha's Birthday", "Christmas Day")
+_LATE_FROM = date(2023, 5, 4)
+
+
+@dataclass(frozen=True)
+class CalendarTable:
+    start: np.datetime64
+    is_holiday: np.ndarray             # bool
+    day_type: np.ndarray               # int8
+    is_substitute_holiday: np.ndarray  # bool
+    is_bridge_day: np.ndarray          # bool
+
+    def __len__(self) -> int:
+        return len(self.is_holiday)
+
+
+@functools.lru_cache(maxsize=1)
+def _workalendar():
+    from workalendar.asia import SouthKorea
+
+    return SouthKorea()
+
+
+@functools.lru_cache(maxsize=None)
+def _holidays(year: int) -> tuple:
+    with warnings.catch_warnings():
+        # workalendar 음력 변환의 DeprecationWarning(toSolarDate) — 41년치를 만들면 수백 건
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return tuple(_workalendar().holidays(year))
+
+
+def _named_holidays(year: int) -> Dict[date, Set[str]]:
+    named: Dict[date, Set[str]] = {}
+    for day, label in _holidays(year):
+        named.setdefault(day, set()).add(label)
+    return named
+
+
+def _next_free_weekday(day: date, taken: Set[date]) -> date:
+    day += timedelta(days=1)
+    while day.weekday() >= 5 or day in taken:
+        day += timedelta(days=1)
+    return day
+
+
+def substitute_holidays(year: int) -> List[date]:
+    """해당 연도의 대체공휴일(2014년 제도 도입 이후)."""
+    if year < 2014:
+        return []
+    named = _named_holidays(year)
+    taken: Set[date] = set(named)
+    result: List[date] = []
+
+    def assign(after: date) -> None:
+        sub = _next_free_weekday(after, taken)
+        taken.add(sub)
+        result.append(sub)
+
+    for label in _LUNAR_BLOCKS:
+        block = sorted(d for d, labels in named.items() if label in labels)
+        if block and any(d.weekday() == 6 or len(named[d]) > 1 for d in block):
+            assign(block[-1])
+
+    for day, labels in sorted(named.items()):
+        if "Children's Day" in labels and (day.weekday() >= 5 or len(labels) > 1):
+            assign(day)
+        elif day >= _NATIONAL_FROM and labels & set(_NATIONAL_DAYS) and day.weekday() >= 5:
+            assign(day)
+        elif day >= _LATE_FROM and labels & set(_LATE_DAYS) and day.weekday() >= 5:
+            assign(day)
+    return sorted(result)
+
+
+@functools.lru_cache(maxsize=1)
+def calendar_table() -> CalendarTable:
+    """전체 기간 테이블(프로세스당 1회 생성)."""
+    start = np.datetime64(CALENDAR_START, "D")
+    days = np.arange(start, np.datetime64(CALENDAR_END, "D") + 1)
+    n = len(days)
+
+    holiday_days, substitute_days = [], []
+    for year in range(CALENDAR_START.year, CALENDAR_END.year + 1):
+        holiday_days.extend(d for d, _ in _holidays(year))
+        substitute_days.extend(substitute_holidays(year))
+
+    def mask(values) -> np.ndarray:
+        out = np.zeros(n, dtype=bool)
+        idx = (np.array(values, dtype="datetime64[D]") - start).astype(np.int64)
+        out[idx[(idx >= 0) & (idx < n)]] = True
+        return out
+
+    is_holiday = mask(holiday_days)
+    is_substitute = mask(substitute_days) & ~is_holiday
+    weekend = ((days.astype(np.int64) + 3) % 7) >= 5  # 1970-01-01 = 목요일(weekday 3)
+    day_type = np.where(is_holiday, 2, np.where(weekend, 1, 0)).astype(np.int8)
+
+    off = is_holiday | weekend | is_substitute
+    prev_off = np.concatenate(([False], off[:-1]))
+    next_off = np.concatenate((off[1:], [False]))
+    is_bridge = ~off & prev_off & next_off
+
+    return CalendarTable(start, is_holiday, day_type, is_substitute, is_bridge)
+
+
+def calendar_features(timestamps, extras: bool = False) -> pd.DataFrame:
+    """타임스탬프 시리즈 → is_holiday/day_type (extras=True 면 대체공휴일·징검다리 포함).
+
+    결과 인덱스는 입력과 같다. tz-aware 값은 현지 벽시계 날짜로 본다.
+
+    Raises:
+        ValueError: NaT 가 섞여 있을 때(호출부에서 먼저 걸러야 한다).
+    """
+    ts = pd.to_datetime(timestamps if isinstance(timestamps, pd.Series) else pd.Series(timestamps))
+    if getattr(ts.dt, "tz", None) is not None:
+        ts = ts.dt.tz_localize(None)
+    if ts.isna().any():
+        raise ValueError("calendar_features: NaT 타임스탬프가 있습니다.")
+
+    table = calendar_table()
+    idx = (ts.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]") - table.start).astype(np.int64)
+    inside = (idx >= 0) & (idx < len(table))
+    safe = np.where(inside, idx, 0)
+
+    columns = {
+        "is_holiday": table.is_holiday[safe],
+        "day_type": table.day_type[safe],
+    }
+    if extras:
+        columns["is_substitute_holiday"] = table.is_substitute_holiday[safe] & inside
+        columns["is_bridge_day"] = table.is_bridge_day[safe] & inside
+
+    if not inside.all():
+        for pos in np.flatnonzero(~inside):
+            day = ts.iloc[pos].date()
+            holiday = any(d == day for d, _ in _holidays(day.year))
+            columns["is_holiday"][pos] = holiday
+            columns["day_type"][pos] = 2 if holiday else (1 if day.weekday() >= 5 else 0)
+
+    return pd.DataFrame(columns, index=ts.index)
@@ -0,0 +1,272 @@
+"""
+파이프라인 계측 — 단계 타이머·카운터·히스토그램과 내보내기.
+
+수집기 성능 신호가 자유 형식 로그뿐이라 느려져도 어디가 느린지 알 수 없었다.
+여기서 fetch/parse/transform/load 단계 시간과 행 수를 같은 모양으로 모은다.
+
+사용:
+    with metrics.stage("load", source="nambu", table="generation") as st:
+        st.rows = upsert(...)
+
+    @metrics.timed("transform", source="koen_gen")
+    def merge_category_wide(...): ...
+
+    with metrics.tags(flow="demand_5min"):      # 안쪽 모든 기록에 flow 라벨
+        ...
+
+내보내기:
+  - 단계가 끝날 때마다 JSON 한 줄 로그(logger fetch_data.metrics, METRICS_JSON_LOG=0 이면 끔)
+  - render_prometheus(): Prometheus 텍스트 노출 형식(pushgateway 본문으로도 그대로 사용)
+  - METRICS_TEXTFILE=경로 → 프로세스 종료 시 node_exporter textfile 로 기록
+  - METRICS_PUSHGATEWAY=URL → 프로세스 종료 시 pushgateway 로 PUT
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from fetch_data.common.config import getenv
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_ambient: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("metrics_tags", default={})
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], "_Histogram"] = {}
+_exit_hook = False
+
+
+@dataclass
+class _Histogram:
+    buckets: Tuple[float, ...]
+    counts: list = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸 = +Inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(extra: Dict[str, object]) -> Labels:
+    merged = {**_ambient.get(), **{k: v for k, v in extra.items() if v is not None}}
+    return tuple(sorted((k, str(v)) for k, v in merged.items()))
+
+
+def _ensure_exit_hook() -> None:
+    global _exit_hook
+    if not _exit_hook and (getenv("METRICS_TEXTFILE") or getenv("METRICS_PUSHGATEWAY")):
+        atexit.register(flush)
+        _exit_hook = True
+
+
+def incr(name: str, value: float = 1.0, **labels) -> None:
+    """카운터 증가."""
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+    _ensure_exit_hook()
+
+
+def observe(name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels) -> None:
+    """히스토그램 관측값 기록."""
+    key = (name, _labels(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = _Histogram(buckets)
+        hist.observe(value)
+    _ensure_exit_hook()
+
+
+@contextmanager
+def tags(**labels) -> Iterator[None]:
+    """블록 안의 모든 기록에 라벨을 덧붙인다(source/flow 등)."""
+    token = _ambient.set({**_ambient.get(), **{k: str(v) for k, v in labels.items()}})
+    try:
+        yield
+    finally:
+        _ambient.reset(token)
+
+
+@dataclass
+class Stage:
+    """진행 중인 단계. 블록 안에서 rows 를 채우면 처리량이 함께 기록된다."""
+
+    name: str
+    labels: Dict[str, object]
+    rows: Optional[int] = None
+    started: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+
+def _emit_json(st: Stage, status: str) -> None:
+    if getenv("METRICS_JSON_LOG", "1") == "0":
+        return
+    payload = {"event": "stage", "stage": st.name, "status": status, "seconds": round(st.elapsed, 6)}
+    payload.update(dict(_labels(st.labels)))
+    if st.rows is not None:
+        payload["rows"] = st.rows
+        payload["rows_per_sec"] = round(st.rows / st.elapsed, 1) if st.elapsed > 0 else None
+    logger.info(json.dumps(payload, ensure_ascii=False))
+
+
+@contextmanager
+def stage(name: str, **labels) -> Iterator[Stage]:
+    """단계 타이머. pipeline_stage_seconds 히스토그램과 pipeline_rows_total 카운터를 남긴다."""
+    st = Stage(name, labels)
+    status = "ok"
+    try:
+        yield st
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        st.elapsed = time.perf_counter() - st.started
+        observe("pipeline_stage_seconds", st.elapsed, stage=name, status=status, **labels)
+        if st.rows is not None:
+            incr("pipeline_rows_total", st.rows, stage=name, **labels)
+        _emit_json(st, status)
+
+
+def timed(name: str, **labels):
+    """stage() 데코레이터판. 동기/비동기 함수 모두 지원, int 반환값은 행 수로 기록한다."""
+
+    def _rows(result) -> Optional[int]:
+        return result if isinstance(result, int) and not isinstance(result, bool) else None
+
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name, **labels) as st:
+                    result = await fn(*args, **kwargs)
+                    st.rows = _rows(result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name, **labels) as st:
+                result = fn(*args, **kwargs)
+                st.rows = _rows(result)
+                return result
+        return wrapper
+
+    return decorate
+
+
+def snapshot() -> dict:
+    """현재 값 사본 {"counters": {...}, "histograms": {...}} — 테스트/디버그용."""
+    with _lock:
+        counters = {(n, lbl): v for (n, lbl), v in _counters.items()}
+        histograms = {
+            (n, lbl): {"count": h.count, "sum": h.total, "buckets": dict(zip(h.buckets, h.counts))}
+            for (n, lbl), h in _histograms.items()
+        }
+    return {"counters": counters, "histograms": histograms}
+
+
+def reset() -> None:
+    """모든 값을 지운다(테스트용)."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 노출 형식(textfile collector·pushgateway 공용)."""
+    lines = []
+    with _lock:
+        for name in sorted({n for n, _ in _counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (n, labels), value in sorted(_counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+        for name in sorted({n for n, _ in _histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (n, labels), hist in sorted(_histograms.items(), key=lambda kv: kv[0]):
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', f'{bound:g}'),))} {cumulative}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {hist.count}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {hist.total:g}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Optional[str] = None) -> Optional[Path]:
+    """node_exporter textfile collector 용 파일을 원자적으로 쓴다(path 또는 METRICS_TEXTFILE)."""
+    target = path or getenv("METRICS_TEXTFILE")
+    if not target:
+        return None
+    out = Path(target)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    tmp.write_text(render_prometheus(), encoding="utf-8")
+    os.replace(tmp, out)
+    return out
+
+
+def push(url: Optional[str] = None, job: str = "energy_pipeline") -> bool:
+    """pushgateway 로 현재 값을 PUT 한다(url 또는 METRICS_PUSHGATEWAY)."""
+    base = url or getenv("METRICS_PUSHGATEWAY")
+    if not base:
+        return False
+    import requests
+
+    try:
+        resp = requests.put(
+            f"{base.rstrip('/')}/metrics/job/{job}",
+            data=render_prometheus().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4"},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        return True
+    except Exception as e:  # noqa: BLE001 — 계측 실패가 수집을 막으면 안 된다
+        logger.warning(f"[metrics] pushgateway 전송 실패: {e}")
+        return False
+
+
+def flush() -> None:
+    """설정된 내보내기 대상(textfile/pushgateway)에 현재 값을 쓴다."""
+    try:
+        write_textfile()
+    except OSError as e:
+        logger.warning(f"[metrics] textfile 기록 실패: {e}")
+    push()
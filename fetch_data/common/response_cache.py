@@ -0,0 +1,266 @@
+"""
+원천 응답 캐시 (content-addressed, 재생 가능한 백필용).
+
+백필은 같은 과거 구간을 몇 번이고 다시 받는다(변환 버그 수정 → 재적재). 응답 바이트를
+디스크에 남겨 두면 재처리는 네트워크 없이 CPU 만으로 끝난다.
+
+레이아웃 (root 기본 data/response_cache):
+  blobs/ab/<sha256>.gz                  — 본문(gzip), 같은 본문은 한 번만 저장
+  index/<source>/cd/<key>.json          — 요청 키 → blob 해시 + 수집 메타데이터
+
+요청 키 = sha256(source, endpoint, 정규화 params). serviceKey 같은 비밀값은 키에서 뺀다.
+
+정책(SOURCE_POLICIES):
+  - 닫힌 기간(period_end 가 오늘 - settle_days 이전)은 immutable — 만료 없음
+  - 진행 중인 기간은 ttl_sec 동안만 유효
+
+재생(replay) 모드: 캐시 미스면 CacheMiss 를 던지고 네트워크는 절대 타지 않는다.
+CLI 에서는 add_cli_args/configure_from_args 로 --cache-dir/--no-cache/--replay 를 붙인다.
+라이브러리 호출(Prefect flow 등)은 RESPONSE_CACHE_DIR 환경변수가 있을 때만 캐시한다.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Mapping, Optional
+
+from fetch_data.common.config import getenv
+from fetch_data.common.logger import get_logger
+from fetch_data.common.utils import today_kst
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "response_cache"
+
+# 키 계산에서 제외하는 파라미터(인증키 교체로 캐시가 무효화되지 않도록)
+SECRET_PARAMS = frozenset({"servicekey", "api_key", "apikey", "_csrf"})
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl_sec: float = 3600.0   # 진행 중 기간 응답의 유효 시간
+    settle_days: int = 1      # period_end 가 이만큼 지나야 '닫힌 기간'으로 본다
+
+
+SOURCE_POLICIES = {
+    "nambu": CachePolicy(ttl_sec=6 * 3600, settle_days=2),
+    "asos": CachePolicy(ttl_sec=3600, settle_days=1),
+    "smp_realtime": CachePolicy(ttl_sec=900, settle_days=1),
+    "koen_gen": CachePolicy(ttl_sec=6 * 3600, settle_days=7),
+    "jeju_sukub": CachePolicy(ttl_sec=3600, settle_days=1),
+}
+DEFAULT_POLICY = CachePolicy()
+
+
+class CacheMiss(RuntimeError):
+    """재생 모드에서 캐시에 없는 요청."""
+
+
+def normalize_params(params: Optional[Mapping]) -> dict:
+    """키 계산용 파라미터: 비밀값 제외, 값은 문자열, 키 정렬."""
+    return {
+        str(k): str(v)
+        for k, v in sorted((params or {}).items())
+        if str(k).lower() not in SECRET_PARAMS
+    }
+
+
+def request_key(source: str, endpoint: str, params: Optional[Mapping]) -> str:
+    payload = json.dumps(
+        {"source": source, "endpoint": endpoint, "params": normalize_params(params)},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ResponseCache:
+    """디스크 응답 캐시. replay=True 면 조회 전용(미스 시 CacheMiss)."""
+
+    def __init__(self, root: Path | str = DEFAULT_CACHE_DIR, replay: bool = False):
+        self.root = Path(root)
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+
+    def _index_path(self, source: str, key: str) -> Path:
+        return self.root / "index" / source / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}.gz"
+
+    def get(self, source: str, endpoint: str, params: Optional[Mapping] = None) -> Optional[bytes]:
+        """유효한 캐시 본문. 만료/없음이면 None (재생 모드는 만료를 무시)."""
+        key = request_key(source, endpoint, params)
+        index = self._index_path(source, key)
+        try:
+            meta = json.loads(index.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        expires_at = meta.get("expires_at")
+        if not self.replay and expires_at is not None and expires_at < time.time():
+            self.misses += 1
+            return None
+        try:
+            body = gzip.decompress(self._blob_path(meta["sha256"]).read_bytes())
+        except (OSError, EOFError, KeyError):
+            logger.warning(f"[cache] {source} blob 손상/누락 — 재수집 대상 ({key[:12]})")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def put(
+        self,
+        source: str,
+        endpoint: str,
+        params: Optional[Mapping],
+        body: bytes,
+        *,
+        period_end: Optional[date] = None,
+        status: int = 200,
+    ) -> str:
+        """본문을 저장하고 blob 해시를 반환한다."""
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            _write_atomic(blob, gzip.compress(body, compresslevel=6))
+
+        policy = SOURCE_POLICIES.get(source, DEFAULT_POLICY)
+        immutable = period_end is not None and period_end <= today_kst() - timedelta(days=policy.settle_days)
+        now = time.time()
+        meta = {
+            "source": source,
+            "endpoint": endpoint,
+            "params": normalize_params(params),
+            "sha256": digest,
+            "bytes": len(body),
+            "status": status,
+            "fetched_at": now,
+            "period_end": period_end.isoformat() if period_end else None,
+            "immutable": immutable,
+            "expires_at": None if immutable else now + policy.ttl_sec,
+        }
+        key = request_key(source, endpoint, params)
+        _write_atomic(
+            self._index_path(source, key),
+            json.dumps(meta, ensure_ascii=False, indent=1).encode("utf-8"),
+        )
+        return digest
+
+
+_cache: Optional[ResponseCache] = None
+_configured = False
+
+
+def configure(root: Path | str | None = None, *, replay: bool = False, enabled: bool = True) -> Optional[ResponseCache]:
+    """프로세스 전역 캐시 설정. enabled=False 면 캐시를 끈다(replay 와 함께 쓸 수 없음)."""
+    global _cache, _configured
+    if replay and not enabled:
+        raise ValueError("--replay 는 캐시 없이 쓸 수 없습니다.")
+    _cache = ResponseCache(root or DEFAULT_CACHE_DIR, replay=replay) if enabled else None
+    _configured = True
+    if _cache is not None:
+        mode = "재생(네트워크 없음)" if replay else "읽기/쓰기"
+        logger.info(f"[cache] 응답 캐시 {mode}: {_cache.root}")
+    return _cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """설정된 캐시. configure() 전이면 RESPONSE_CACHE_DIR 이 있을 때만 켠다."""
+    global _cache, _configured
+    if not _configured:
+        env_dir = getenv("RESPONSE_CACHE_DIR")
+        _cache = ResponseCache(env_dir, replay=getenv("RESPONSE_CACHE_REPLAY") == "1") if env_dir else None
+        _configured = True
+    return _cache
+
+
+def reset() -> None:
+    """전역 설정 초기화(테스트용)."""
+    global _cache, _configured
+    _cache, _configured = None, False
+
+
+def is_replay() -> bool:
+    cache = get_cache()
+    return cache is not None and cache.replay
+
+
+def add_cli_args(parser) -> None:
+    """argparse 에 --cache-dir/--no-cache/--replay 를 추가한다."""
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"원천 응답 캐시 디렉터리 (기본 RESPONSE_CACHE_DIR 또는 {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시 사용 안 함")
+    parser.add_argument("--replay", action="store_true",
+                        help="네트워크 없이 캐시된 응답만으로 재처리(미스는 실패 처리)")
+
+
+def configure_from_args(args) -> Optional[ResponseCache]:
+    """CLI 인자로 캐시를 켠다. CLI 실행은 기본으로 캐시를 쓴다."""
+    root = args.cache_dir or getenv("RESPONSE_CACHE_DIR") or DEFAULT_CACHE_DIR
+    return configure(root, replay=args.replay, enabled=not args.no_cache)
+
+
+def _lookup(source: str, endpoint: str, params: Optional[Mapping]) -> tuple[Optional[ResponseCache], Optional[bytes]]:
+    cache = get_cache()
+    if cache is None:
+        return None, None
+    body = cache.get(source, endpoint, params)
+    if body is None and cache.replay:
+        raise CacheMiss(f"[cache] 재생 모드 캐시 미스: {source} {endpoint} {normalize_params(params)}")
+    return cache, body
+
+
+async def fetch_cached(
+    source: str,
+    endpoint: str,
+    params: Optional[Mapping],
+    fetch: Callable[[], Awaitable[Optional[bytes]]],
+    *,
+    period_end: Optional[date] = None,
+) -> Optional[bytes]:
+    """캐시 우선 조회 후 미스면 fetch() 로 받아 저장한다. fetch 가 None 이면 저장하지 않는다.
+
+    Raises:
+        CacheMiss: 재생 모드에서 캐시에 없을 때.
+    """
+    cache, body = _lookup(source, endpoint, params)
+    if body is not None:
+        return body
+    body = await fetch()
+    if cache is not None and body is not None:
+        cache.put(source, endpoint, params, body, period_end=period_end)
+    return body
+
+
+def fetch_cached_sync(
+    source: str,
+    endpoint: str,
+    params: Optional[Mapping],
+    fetch: Callable[[], Optional[bytes]],
+    *,
+    period_end: Optional[date] = None,
+) -> Optional[bytes]:
+    """fetch_cached 의 동기(requests) 버전."""
+    cache, body = _lookup(source, endpoint, params)
+    if body is not None:
+        return body
+    body = fetch()
+    if cache is not None and body is not None:
+        cache.put(source, endpoint, params, body, period_end=period_end)
+    return body
@@ -6,12 +6,31 @@ from pathlib import Path
 import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
 
+from fetch_data.common.kr_calendar import calendar_features
+from fetch_data.common.logger import get_logger
 from fetch_data.demand.database import (
+    DEMAND_VIEWS,
+    clear_view_dirty,
+    get_dirty_views,
     get_first_unknown_timestamp,
     get_last_demand_weather_timestamp,
+    mark_views_dirty,
     upsert_demand_weather,
 )
+from fetch_data.demand.weather_source import CsvWeatherSource, WeatherSource
+
+logger = get_logger(__name__)
+
+# Row key of each dashboard view; REFRESH ... CONCURRENTLY needs a unique index on it.
+VIEW_KEYS = {
+    "mv_latest_weather": ("station_name",),
+    "mv_hourly_national": ("timestamp",),
+}
+# PostgreSQL object_not_in_prerequisite_state: no unique index, or view not yet populated.
+_NOT_READY_FOR_CONCURRENT = "55000"
+_indexed_engines: set[str] = set()
 
 
 def get_recovery_start(
@@ -52,20 +71,16 @@ def _complete_demand_hours(engine: Engine, start: datetime, end: datetime) -> pd
     )
     with engine.connect() as connection:
         rows = connection.execute(query, {"start": start, "end": end}).mappings().all()
-    return pd.DataFrame(rows, columns=["timestamp", "demand_avg", "is_holiday", "day_type"])
-
-
-def _load_weather(weather_csv: Path) -> pd.DataFrame:
-    weather = pd.read_csv(
-        weather_csv,
-        usecols=["date", "station_name", "temperature", "humidity"],
-        encoding="utf-8-sig",
-    )
-    weather["timestamp"] = pd.to_datetime(weather["date"], errors="coerce").dt.floor("h")
-    weather = weather.dropna(subset=["timestamp", "station_name"])
-    weather = weather[weather["station_name"] != "UNKNOWN"]
-    weather = weather.dropna(subset=["temperature", "humidity"])
-    return weather.drop_duplicates(subset=["timestamp", "station_name"], keep="last")
+    demand = pd.DataFrame(rows, columns=["timestamp", "demand_avg", "is_holiday", "day_type"])
+    # Rows stored before calendar tagging carry NULL flags; derive them from the calendar table.
+    missing = demand["is_holiday"].isna() | demand["day_type"].isna()
+    if missing.any():
+        features = calendar_features(pd.to_datetime(demand.loc[missing, "timestamp"]))
+        demand["is_holiday"] = demand["is_holiday"].astype(object)
+        demand["day_type"] = demand["day_type"].astype(object)
+        demand.loc[missing, "is_holiday"] = features["is_holiday"].map(bool)
+        demand.loc[missing, "day_type"] = features["day_type"].map(int)
+    return demand
 
 
 def remove_repaired_unknowns(engine: Engine, start: datetime, end: datetime) -> int:
@@ -87,20 +102,75 @@ def remove_repaired_unknowns(engine: Engine, start: datetime, end: datetime) ->
         return connection.execute(statement, {"start": start, "end": end}).rowcount
 
 
-def refresh_demand_views(engine: Engine) -> None:
-    """Refresh both dashboard views; database errors deliberately propagate."""
-    with engine.begin() as connection:
-        connection.execute(text("REFRESH MATERIALIZED VIEW mv_latest_weather"))
-        connection.execute(text("REFRESH MATERIALIZED VIEW mv_hourly_national"))
+def ensure_view_indexes(engine: Engine) -> None:
+    """Create the unique key indexes concurrent refresh needs; failures only warn."""
+    for view, columns in VIEW_KEYS.items():
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{view}_key "
+                        f"ON {view} ({', '.join(columns)})"
+                    )
+                )
+        except DBAPIError as error:
+            logger.warning(f"[demand] {view} unique index not created: {error}")
+
+
+def _refresh_view(connection, view: str) -> None:
+    savepoint = connection.begin_nested()
+    try:
+        connection.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+        savepoint.commit()
+    except DBAPIError as error:
+        savepoint.rollback()
+        if getattr(error.orig, "pgcode", None) != _NOT_READY_FOR_CONCURRENT:
+            raise
+        logger.warning(f"[demand] {view} cannot refresh concurrently, using blocking refresh")
+        connection.execute(text(f"REFRESH MATERIALIZED VIEW {view}"))
+
+
+def refresh_demand_views(engine: Engine, force: bool = False) -> list[str]:
+    """Refresh dashboard views with pending hourly writes without blocking readers.
+
+    Only views marked dirty by the aggregation (or all, with ``force``) are refreshed,
+    each with ``REFRESH ... CONCURRENTLY`` in its own transaction. Database errors
+    deliberately propagate and leave the dirty range for the next run.
+    """
+    dirty = get_dirty_views(engine)
+    views = [view for view in DEMAND_VIEWS if force or view in dirty]
+    if views and str(engine.url) not in _indexed_engines:
+        ensure_view_indexes(engine)
+        _indexed_engines.add(str(engine.url))
+
+    for view in views:
+        with engine.begin() as connection:
+            _refresh_view(connection, view)
+            if view in dirty:
+                clear_view_dirty(connection, view, dirty[view].marked_at)
+                logger.info(
+                    f"[demand] {view} refreshed for "
+                    f"{dirty[view].dirty_from} ~ {dirty[view].dirty_to}"
+                )
+    return views
 
 
 def aggregate_demand_weather(
     engine: Engine,
-    weather_csv: Path,
+    weather_source: WeatherSource | Path,
     recover: bool = False,
     now: datetime | None = None,
 ) -> int:
-    """Upsert real ASOS rows for complete hourly demand intervals only."""
+    """Upsert real ASOS rows for complete hourly demand intervals only.
+
+    Weather is read through ``weather_source.load(start, current_hour)`` so only the
+    aggregation window is loaded; a plain path is read as the merged ASOS CSV.
+    """
+    source = (
+        CsvWeatherSource(weather_source)
+        if isinstance(weather_source, (str, Path))
+        else weather_source
+    )
     current_hour = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
     fallback = current_hour - timedelta(hours=48)
     start = (
@@ -117,14 +187,14 @@ def aggregate_demand_weather(
         return 0
 
     demand["timestamp"] = pd.to_datetime(demand["timestamp"])
-    weather = _load_weather(weather_csv)
+    weather = source.load(start, current_hour)
     latest_weather = weather["timestamp"].max() if not weather.empty else None
     end = get_common_end(demand["timestamp"].max(), latest_weather)
     if end is None or end <= start:
         return 0
 
     demand = demand[(demand["timestamp"] >= start) & (demand["timestamp"] < end)]
-    weather = weather[(weather["timestamp"] >= start) & (weather["timestamp"] < end)]
+    weather = weather[weather["timestamp"] < end]
     merged = demand.merge(weather, on="timestamp", how="inner")
     if merged.empty:
         return 0
@@ -145,4 +215,5 @@ def aggregate_demand_weather(
 
     saved = upsert_demand_weather(engine, records)
     remove_repaired_unknowns(engine, start, end)
+    mark_views_dirty(engine, start, end)
     return saved
@@ -1,7 +1,6 @@
 """Download and persist nationwide five-minute KPX demand data."""
 
 import asyncio
-import random
 import re
 from datetime import date, datetime, timedelta
 from io import StringIO
@@ -9,16 +8,20 @@ from io import StringIO
 import aiohttp
 import pandas as pd
 from sqlalchemy.engine import Engine
-from workalendar.asia import SouthKorea
 
+from fetch_data.common import http
+from fetch_data.common.kr_calendar import calendar_features
+from fetch_data.demand.changes import SlotChangeTracker
 from fetch_data.demand.database import get_last_5min_timestamp, upsert_demand_5min
 
 BASE_URL = "https://openapi.kpx.or.kr"
 SUKUB_URL = f"{BASE_URL}/sukub.do"
 DOWNLOAD_URL = f"{BASE_URL}/downloadSukubCSV.do"
-BACKOFF_SCHEDULE = [1, 5, 10, 20, 30]
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
 BASE_THROTTLE_SECONDS = 0.4
 REQUEST_TIMEOUT = 30
+BACKFILL_CONCURRENCY = 4
 EXPECTED_INTERVALS_PER_DAY = 288
 # KPX 원천 자체가 5분 슬롯을 드물게 빠뜨린다(예: 2026-08-05 287/288).
 # 재시도로 메꿀 수 없는 결손이므로 이 하한 이상이면 수용하고 넘어간다.
@@ -33,9 +36,11 @@ COLUMN_MAPPING = {
     "공급예비율(%)": "reserve_rate",
     "운영예비력(MW)": "operation_reserve",
 }
-
-_calendar = SouthKorea()
-_holiday_cache: dict[str, bool] = {}
+VALUE_COLUMNS = (
+    *(column for column in COLUMN_MAPPING.values() if column != "timestamp"),
+    "is_holiday",
+    "day_type",
+)
 
 
 def _as_date(value: date | str) -> date:
@@ -62,20 +67,25 @@ async def request_with_retry(
     expect_csv: bool = False,
     max_attempts: int = 5,
 ) -> bytes:
-    """Request KPX data with retry handling for transient and HTML failures."""
-    last_error: Exception | None = None
-    for attempt in range(max_attempts):
-        try:
-            async with session.request(method, url, data=data) as response:
-                raw = await response.read()
-                if response.status == 200 and (
-                    not expect_csv or not _is_html_error(raw, response.headers.get("Content-Type", ""))
-                ):
-                    return raw
-        except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionResetError) as error:
-            last_error = error
-        await asyncio.sleep(BACKOFF_SCHEDULE[min(attempt, len(BACKOFF_SCHEDULE) - 1)] + random.uniform(0, 0.6))
-    raise RuntimeError(f"Request failed after {max_attempts} attempts: {url}") from last_error
+    """Request KPX data through the shared rate-limited client.
+
+    HTML error pages in place of the expected CSV are KPX's firewall response, so
+    they count as throttling (the host's concurrency is halved and the retry waits
+    longer) rather than as ordinary failures.
+    """
+    try:
+        response = await http.request(
+            method,
+            url,
+            session=session,
+            data=data,
+            retry=http.RetryPolicy(attempts=max_attempts, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS),
+            is_blocked=(lambda r: _is_html_error(r.body, r.content_type)) if expect_csv else None,
+            label="kpx-demand",
+        )
+    except http.HttpRequestError as error:
+        raise RuntimeError(f"Request failed after {max_attempts} attempts: {url}") from error
+    return response.body
 
 
 def _normalize_csv_timestamps(content: str) -> str:
@@ -86,6 +96,11 @@ def _normalize_csv_timestamps(content: str) -> str:
     )
 
 
+def parse_csv(raw: bytes) -> pd.DataFrame:
+    """Decode a KPX demand CSV body and normalize its compact timestamps."""
+    return pd.read_csv(StringIO(_normalize_csv_timestamps(raw.decode("euc-kr", errors="ignore"))))
+
+
 def _valid_demand_intervals(frame: pd.DataFrame, expected_day: date) -> int:
     if "현재수요(MW)" not in frame.columns or frame.empty:
         return 0
@@ -124,7 +139,47 @@ async def download_segment(
     raw = await request_with_retry(
         session, "POST", DOWNLOAD_URL, data={"startDate": start, "endDate": end}, expect_csv=True
     )
-    return pd.read_csv(StringIO(_normalize_csv_timestamps(raw.decode("euc-kr", errors="ignore"))))
+    return parse_csv(raw)
+
+
+async def download_day(
+    session: aiohttp.ClientSession,
+    day: date,
+    throttle_seconds: float = BASE_THROTTLE_SECONDS,
+    max_retries: int = 3,
+) -> pd.DataFrame:
+    """Download one day, merging retries until the day passes the completeness checks."""
+    attempts: list[pd.DataFrame] = []
+    last_error: Exception | None = None
+    for attempt in range(max_retries):
+        try:
+            frame = _filter_requested_day(await download_segment(session, day, day), day)
+            if not frame.empty:
+                attempts.append(frame)
+                merged = _merge_attempts(attempts)
+                if _valid_demand_intervals(merged, day) >= EXPECTED_INTERVALS_PER_DAY:
+                    break
+        except Exception as error:
+            last_error = error
+        if attempt < max_retries - 1:
+            await asyncio.sleep(throttle_seconds)
+
+    if not attempts:
+        raise RuntimeError(f"failed KPX demand data for {day.isoformat()}") from last_error
+
+    merged = _merge_attempts(attempts)
+    valid_intervals = _valid_demand_intervals(merged, day)
+    if valid_intervals < MIN_VALID_INTERVALS_PER_DAY and day != date.today():
+        raise RuntimeError(
+            f"incomplete KPX demand data for {day.isoformat()}: "
+            f"{valid_intervals}/{EXPECTED_INTERVALS_PER_DAY} valid rows"
+        )
+    if valid_intervals < EXPECTED_INTERVALS_PER_DAY and day != date.today():
+        print(
+            f"[demand] {day.isoformat()} 원천 결손 수용: "
+            f"{valid_intervals}/{EXPECTED_INTERVALS_PER_DAY} valid rows"
+        )
+    return merged
 
 
 async def download_range(
@@ -144,55 +199,18 @@ async def download_range(
     async with aiohttp.ClientSession(timeout=timeout) as session:
         current = start
         while current <= end:
-            attempts: list[pd.DataFrame] = []
-            last_error: Exception | None = None
-            for attempt in range(max_retries):
-                try:
-                    frame = _filter_requested_day(
-                        await download_segment(session, current, current), current
-                    )
-                    if not frame.empty:
-                        attempts.append(frame)
-                        merged = _merge_attempts(attempts)
-                        if _valid_demand_intervals(merged, current) >= EXPECTED_INTERVALS_PER_DAY:
-                            break
-                except Exception as error:
-                    last_error = error
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(throttle_seconds)
-
-            if not attempts:
-                raise RuntimeError(f"failed KPX demand data for {current.isoformat()}") from last_error
-
-            merged = _merge_attempts(attempts)
-            valid_intervals = _valid_demand_intervals(merged, current)
-            if valid_intervals < MIN_VALID_INTERVALS_PER_DAY and current != date.today():
-                raise RuntimeError(
-                    f"incomplete KPX demand data for {current.isoformat()}: "
-                    f"{valid_intervals}/{EXPECTED_INTERVALS_PER_DAY} valid rows"
-                )
-            if valid_intervals < EXPECTED_INTERVALS_PER_DAY and current != date.today():
-                print(
-                    f"[demand] {current.isoformat()} 원천 결손 수용: "
-                    f"{valid_intervals}/{EXPECTED_INTERVALS_PER_DAY} valid rows"
-                )
-            frames.append(merged)
+            frames.append(await download_day(session, current, throttle_seconds, max_retries))
             current += timedelta(days=1)
 
     return _merge_attempts(frames)
 
 
 def is_holiday(timestamp: datetime) -> bool:
-    key = timestamp.date().isoformat()
-    if key not in _holiday_cache:
-        _holiday_cache[key] = _calendar.is_holiday(timestamp.date())
-    return _holiday_cache[key]
+    return bool(calendar_features([timestamp])["is_holiday"].iat[0])
 
 
 def get_day_type(timestamp: datetime) -> int:
-    if is_holiday(timestamp):
-        return 2
-    return 1 if timestamp.weekday() >= 5 else 0
+    return int(calendar_features([timestamp])["day_type"].iat[0])
 
 
 def prepare_records(dataframe: pd.DataFrame) -> list[dict]:
@@ -208,8 +226,9 @@ def prepare_records(dataframe: pd.DataFrame) -> list[dict]:
             dataframe = dataframe.dropna(subset=["timestamp", "current_demand"])
         else:
             dataframe = dataframe.iloc[0:0]
-        dataframe["is_holiday"] = dataframe["timestamp"].apply(is_holiday)
-        dataframe["day_type"] = dataframe["timestamp"].apply(get_day_type)
+        features = calendar_features(dataframe["timestamp"])
+        dataframe["is_holiday"] = features["is_holiday"]
+        dataframe["day_type"] = features["day_type"]
     return dataframe.where(pd.notnull(dataframe), None).to_dict(orient="records")
 
 
@@ -222,8 +241,17 @@ def get_collection_start(
     return (now - timedelta(hours=recent_hours)).date()
 
 
-async def collect_range(engine: Engine, start_date: date, end_date: date) -> int:
-    """Persist each completed day before advancing to the next date."""
+async def collect_range(
+    engine: Engine,
+    start_date: date,
+    end_date: date,
+    tracker: SlotChangeTracker | None = None,
+) -> int:
+    """Persist each completed day before advancing to the next date.
+
+    With a ``tracker`` only new or revised slots are written; the return value is
+    the number of rows sent to the database either way.
+    """
     total = 0
     current = start_date
     while current <= end_date:
@@ -231,16 +259,104 @@ async def collect_range(engine: Engine, start_date: date, end_date: date) -> int
         records = prepare_records(dataframe)
         if not records:
             raise RuntimeError("수집된 전력수요 데이터가 없습니다")
-        total += upsert_demand_5min(engine, records)
+        if tracker is None:
+            total += upsert_demand_5min(engine, records)
+        else:
+            stats = tracker.ingest(records, upsert_demand_5min)
+            print(f"[demand] {current.isoformat()} slots {stats}")
+            total += stats.written
         current += timedelta(days=1)
     return total
 
 
 async def collect_latest(engine: Engine, now: datetime | None = None) -> int:
-    """Collect from the last persisted day through the current day."""
+    """Collect from the last persisted day through the current day, writing changes only."""
     current_time = now or datetime.now()
     return await collect_range(
         engine,
         get_collection_start(get_last_5min_timestamp(engine), current_time),
         current_time.date(),
+        tracker=SlotChangeTracker(engine, "demand_5min", VALUE_COLUMNS),
     )
+
+
+async def backfill_range(
+    engine: Engine,
+    start_date: date | str,
+    end_date: date | str,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    throttle_seconds: float = BASE_THROTTLE_SECONDS,
+    max_retries: int = 3,
+) -> int:
+    """Recover a multi-day gap by downloading days concurrently.
+
+    Each day runs on its own cookie session (KPX keeps the search form state per
+    session, so days cannot share one), at most ``concurrency`` days at a time; the
+    shared kpx.or.kr host budget still caps the request rate across all sessions.
+    Days are upserted as soon as they pass the completeness checks, in completion
+    order. Failed days do not stop the others; they are reported together at the
+    end. Because later days may already be persisted, ``collect_latest`` will not
+    revisit a failed day on its own — rerun the backfill for the listed dates.
+    """
+    start = _as_date(start_date)
+    end = _as_date(end_date)
+    if end < start:
+        return 0
+
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async def fetch(day: date) -> tuple[date, pd.DataFrame | None, Exception | None]:
+        async with semaphore:
+            try:
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    return day, await download_day(session, day, throttle_seconds, max_retries), None
+            except Exception as error:
+                return day, None, error
+
+    total = 0
+    failed: dict[date, Exception] = {}
+    for next_done in asyncio.as_completed([fetch(day) for day in days]):
+        day, frame, error = await next_done
+        if error is None:
+            records = prepare_records(frame)
+            if records:
+                total += await asyncio.to_thread(upsert_demand_5min, engine, records)
+                continue
+            error = RuntimeError("수집된 전력수요 데이터가 없습니다")
+        failed[day] = error
+        print(f"[demand] backfill {day.isoformat()} 실패: {error}")
+
+    if failed:
+        listed = ", ".join(day.isoformat() for day in sorted(failed))
+        raise RuntimeError(
+            f"KPX demand backfill failed for {len(failed)}/{len(days)} days: {listed}"
+        ) from failed[min(failed)]
+    return total
+
+
+def main() -> None:
+    import argparse
+
+    from fetch_data.demand.database import get_demand_engine
+
+    parser = argparse.ArgumentParser(description="Backfill nationwide five-minute KPX demand")
+    parser.add_argument("--start", required=True, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="last day (YYYY-MM-DD)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY,
+                        help=f"days fetched in parallel (default {BACKFILL_CONCURRENCY})")
+    parser.add_argument("--db-url", default=None, help="demand DB URL (default DEMAND_DB_URL)")
+    args = parser.parse_args()
+
+    rows = asyncio.run(backfill_range(
+        get_demand_engine(args.db_url),
+        date.fromisoformat(args.start),
+        date.fromisoformat(args.end),
+        concurrency=args.concurrency,
+    ))
+    print(f"[demand] backfill 완료: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,9 @@ from typing import Optional
 import requests
 
 from fetch_data.common.logger import get_logger
+from fetch_data.demand.changes import SlotChangeTracker
 from fetch_data.demand.database import (
+    GEN_MIX_COLUMNS,
     get_demand_engine,
     upsert_gen_mix_5min,
 )
@@ -92,11 +94,14 @@ def run(db_url: Optional[str] = None) -> int:
         logger.warning("[genmix] 수집된 레코드 없음")
         return 0
     engine = get_demand_engine(db_url)
-    n = upsert_gen_mix_5min(engine, records)
+    stats = SlotChangeTracker(engine, "gen_mix_5min", GEN_MIX_COLUMNS).ingest(
+        records, upsert_gen_mix_5min
+    )
     logger.info(
-        f"[genmix] {n}행 UPSERT ({records[0]['timestamp']} ~ {records[-1]['timestamp']})"
+        f"[genmix] {stats.written}행 UPSERT — 신규 {stats.new}, 수정 {stats.revised}, "
+        f"동일 {stats.unchanged} ({records[0]['timestamp']} ~ {records[-1]['timestamp']})"
     )
-    return n
+    return stats.written
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""Windowed ASOS weather sources for the hourly demand-weather aggregation.
+
+Every source returns real station rows in ``[start, end)`` only, with the columns
+``timestamp`` (floored to the hour), ``station_name``, ``temperature`` and
+``humidity``. The table source pushes the window down to ``weather_asos`` so the
+cost of a run follows the window, not the length of the archive. The month-
+partitioned Parquet store opens only the overlapping months; the merged CSV source
+stays available as a last fallback for hosts that still have only the CSV.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+WEATHER_COLUMNS = ["timestamp", "station_name", "temperature", "humidity"]
+CSV_CHUNK_ROWS = 200_000
+
+
+class WeatherSource(Protocol):
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Return deduplicated real station rows with ``start <= timestamp < end``."""
+
+
+def normalize_weather(weather: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """Floor to the hour, drop placeholders and incomplete rows, keep the last duplicate."""
+    weather = weather.copy()
+    weather["timestamp"] = pd.to_datetime(weather["timestamp"], errors="coerce").dt.floor("h")
+    weather = weather.dropna(subset=["timestamp", "station_name"])
+    weather = weather[weather["station_name"] != "UNKNOWN"]
+    weather = weather.dropna(subset=["temperature", "humidity"])
+    weather = weather[(weather["timestamp"] >= start) & (weather["timestamp"] < end)]
+    weather = weather.drop_duplicates(subset=["timestamp", "station_name"], keep="last")
+    return weather[WEATHER_COLUMNS].reset_index(drop=True)
+
+
+class CsvWeatherSource:
+    """Read the merged ASOS CSV in chunks, keeping only rows inside the window."""
+
+    def __init__(self, path: Path | str, chunksize: int = CSV_CHUNK_ROWS):
+        self.path = Path(path)
+        self.chunksize = chunksize
+
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        # Filter each chunk on the floored hour so a 10:30 row still counts as 10:00.
+        frames = []
+        for chunk in pd.read_csv(
+            self.path,
+            usecols=["date", "station_name", "temperature", "humidity"],
+            encoding="utf-8-sig",
+            chunksize=self.chunksize,
+        ):
+            chunk = chunk.rename(columns={"date": "timestamp"})
+            hours = pd.to_datetime(chunk["timestamp"], errors="coerce").dt.floor("h")
+            frames.append(chunk[(hours >= start) & (hours < end)])
+        if not frames:
+            return pd.DataFrame(columns=WEATHER_COLUMNS)
+        return normalize_weather(pd.concat(frames, ignore_index=True), start, end)
+
+
+class ParquetWeatherSource:
+    """Read the month partitions of the ASOS Parquet store that overlap the window."""
+
+    def __init__(self, store_dir: Path | str | None = None):
+        from fetch_data.weather.asos_store import DEFAULT_STORE_DIR
+
+        self.store_dir = Path(store_dir) if store_dir is not None else DEFAULT_STORE_DIR
+
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        from fetch_data.weather.asos_store import AsosStore
+
+        frame = AsosStore(self.store_dir).read(start, end, columns=WEATHER_COLUMNS)
+        return normalize_weather(frame, start, end)
+
+
+class DbWeatherSource:
+    """Query ``weather_asos`` for the window; optionally fall back on database errors."""
+
+    QUERY = text(
+        """
+        SELECT timestamp, station_name, temperature, humidity
+        FROM weather_asos
+        WHERE timestamp >= :start AND timestamp < :end
+        ORDER BY timestamp, id
+        """
+    )
+
+    def __init__(self, engine: Engine | None = None, fallback: WeatherSource | None = None):
+        self._engine = engine
+        self.fallback = fallback
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            from fetch_data.common.db_base import get_engine
+
+            self._engine = get_engine()
+        return self._engine
+
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        try:
+            with self.engine.connect() as connection:
+                rows = connection.execute(self.QUERY, {"start": start, "end": end}).mappings().all()
+        except (SQLAlchemyError, RuntimeError) as error:
+            if self.fallback is None:
+                raise
+            logger.warning(f"[weather_source] weather_asos 조회 실패, 대체 소스 사용: {error}")
+            return self.fallback.load(start, end)
+        return normalize_weather(pd.DataFrame(rows, columns=WEATHER_COLUMNS), start, end)
+
+
+def default_weather_source(
+    weather_csv: Path | str | None = None, store_dir: Path | str | None = None
+) -> WeatherSource:
+    """Prefer ``weather_asos``; fall back to the Parquet store if populated, else the CSV."""
+    fallback: WeatherSource | None = None
+    if store_dir is not None and any(Path(store_dir).glob("month=*/part.parquet")):
+        fallback = ParquetWeatherSource(store_dir)
+    elif weather_csv is not None:
+        fallback = CsvWeatherSource(weather_csv)
+    return DbWeatherSource(fallback=fallback)
@@ -7,11 +7,20 @@ plants/generation 코어 테이블에 멱등 UPSERT 한다. 구테이블·dual-w
 
 - plants     : (plant_name, unit_no='1') 기준 upsert. operator='namdong'(=KOEN 한국남동발전),
                fuel_type=카테고리 매핑, 용량/좌표는 capacities/locations 에서 보강.
-               이미 있으면 건드리지 않음(ON CONFLICT DO NOTHING).
+               이미 있으면 건드리지 않음(ON CONFLICT DO NOTHING). 카테고리의 발전소 전부를
+               unnest 배열 한 문장으로 넣고 RETURNING + 기존행 조회로 plant_id 를 받는다.
 - generation : plant_name -> plant_id 매핑 후 (timestamp, plant_id) upsert.
                gen_kwh = CSV generation 값 그대로 (원본 헤더는 MWh지만 실제 kWh — 변환 안 함).
                source='api'.
 
+적재 전에 코어와 비교해 실제로 바뀐 행만 남긴다(diff_against_core):
+  · 발전소별 마지막 적재 시각(last_ts)보다 뒤 → 신규
+  · last_ts 이하 → 그 발전소 입력의 [최소 timestamp, last_ts] 구간 코어 값과
+    (timestamp, plant_id, gen_kwh) 해시 비교, 다르거나 없으면 갱신
+    (달력 월로 자르지 않는다 — hour 24 가 다음 달 1일 00시라 last_ts 의 달은 겹치는 달이 아니다)
+남은 행만 COPY 스테이징 후 한 번에 병합하므로 월간 flow(--delta)는 재수집한 달만 비교해 수천 행만 쓴다.
+--force 는 비교 없이 전부 upsert.
+
 ※ 선행 조건: plants 의 KOEN 비태양광 operator 가 'namdong' 으로 통일돼 있어야 한다
   (scripts/p_unify_koen_operator.sql). 'koen' 인 채로 두면 plant_id 매핑이 비어 적재가 0이 된다.
 
@@ -21,6 +30,12 @@ plants/generation 코어 테이블에 멱등 UPSERT 한다. 구테이블·dual-w
 
     # 일부 카테고리만
     uv run python -m fetch_data.gen.load_gen --types thermal,fuel_cell
+
+    # 마지막 변환 이후 바뀐 원본의 행만 (월간 flow 기본)
+    uv run python -m fetch_data.gen.load_gen --delta
+
+    # 코어와 비교 없이 전부 upsert (옛 달 정정 반영)
+    uv run python -m fetch_data.gen.load_gen --force
 """
 
 from __future__ import annotations
@@ -30,13 +45,16 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
-from fetch_data.common.db_utils import resolve_db_url
+from fetch_data.common import metrics
+from fetch_data.common.coverage import record_coverage
+from fetch_data.common.db_base import get_engine
+from fetch_data.common.generation_core import copy_merge_generation
 from fetch_data.common.logger import get_logger
 from fetch_data.gen.capacities import resolve_capacity
 from fetch_data.gen.locations import resolve_location
-from fetch_data.gen.transform_gen import DEFAULT_OUT_DIR
+from fetch_data.gen.transform_gen import DEFAULT_OUT_DIR, delta_path
 
 logger = get_logger(__name__)
 
@@ -51,12 +69,29 @@ FUEL_MAP: Dict[str, str] = {
     "thermal": "thermal",
 }
 
-UPSERT_PLANT = text("""
-    INSERT INTO plants (plant_name, unit_no, fuel_type, operator, region,
-                        capacity_mw, capacity_confidence, lat, lon, address, site_name)
-    VALUES (:name, '1', :fuel, :op, 'mainland',
-            :cap_mw, :conf, :lat, :lon, :addr, :site)
-    ON CONFLICT (plant_name, unit_no) DO NOTHING
+# 카테고리 발전소 전부를 한 문장으로. DO NOTHING 은 기존 행을 RETURNING 하지 않으므로
+# 같은 스냅샷의 plants 조회와 합친다(CTE 는 서로의 변경을 보지 않아 중복이 없다).
+UPSERT_PLANTS = text("""
+    WITH src AS (
+        SELECT * FROM unnest(
+            CAST(:names AS text[]), CAST(:cap_mw AS double precision[]), CAST(:conf AS text[]),
+            CAST(:lat AS double precision[]), CAST(:lon AS double precision[]),
+            CAST(:addr AS text[]), CAST(:site AS text[])
+        ) AS t(plant_name, capacity_mw, capacity_confidence, lat, lon, address, site_name)
+    ), ins AS (
+        INSERT INTO plants (plant_name, unit_no, fuel_type, operator, region,
+                            capacity_mw, capacity_confidence, lat, lon, address, site_name)
+        SELECT plant_name, '1', :fuel, :op, 'mainland',
+               capacity_mw, capacity_confidence, lat, lon, address, site_name
+        FROM src
+        ON CONFLICT (plant_name, unit_no) DO NOTHING
+        RETURNING plant_name, plant_id
+    )
+    SELECT plant_name, plant_id FROM ins
+    UNION ALL
+    SELECT p.plant_name, p.plant_id
+    FROM plants p JOIN src USING (plant_name)
+    WHERE p.operator = :op AND p.fuel_type = :fuel
 """)
 
 UPSERT_GEN = text("""
@@ -66,36 +101,118 @@ UPSERT_GEN = text("""
     DO UPDATE SET gen_kwh = EXCLUDED.gen_kwh
 """)  # 충돌 시 gen_kwh 만 갱신. source 는 보존(기존 backfill 이력 유지, 신규 월만 'api' insert).
 
+# 발전소별 마지막 적재 시각 — ix_generation_plant_ts(plant_id, timestamp DESC) 첫 항목만 짚는다.
+SELECT_LAST_TS = text("""
+    SELECT ids.plant_id, last.ts AS last_ts
+    FROM unnest(CAST(:ids AS integer[])) AS ids(plant_id)
+    CROSS JOIN LATERAL (
+        SELECT g.timestamp AS ts FROM generation g
+        WHERE g.plant_id = ids.plant_id
+        ORDER BY g.timestamp DESC
+        LIMIT 1
+    ) last
+""")
+
+# 발전소별 [since, until] 구간의 코어 값 (입력이 덮는 구간만)
+SELECT_OVERLAP = text("""
+    SELECT g.timestamp, g.plant_id, g.gen_kwh
+    FROM unnest(
+        CAST(:ids AS integer[]), CAST(:since AS timestamp[]), CAST(:until AS timestamp[])
+    ) AS w(plant_id, since, until)
+    JOIN generation g ON g.plant_id = w.plant_id
+                     AND g.timestamp BETWEEN w.since AND w.until
+""")
+
 
 def _ensure_plants(conn, fuel: str, names) -> Dict[str, int]:
-    """카테고리 발전소들을 plants 에 upsert 하고 {plant_name: plant_id} 반환."""
-    for name in names:
-        cap = resolve_capacity(name)
-        loc = resolve_location(name)
-        conn.execute(UPSERT_PLANT, {
-            "name": name,
-            "fuel": fuel,
-            "op": OPERATOR,
-            "cap_mw": cap["capacity_mw"] if cap else None,
-            "conf": cap["confidence"] if cap else "불확실",
-            "lat": loc["lat"] if loc else None,
-            "lon": loc["lon"] if loc else None,
-            "addr": loc["address"] if loc else None,
-            "site": loc["site"] if loc else None,
-        })
-    return dict(conn.execute(text(
-        "SELECT plant_name, plant_id FROM plants WHERE operator = :op AND fuel_type = :f"
-    ), {"op": OPERATOR, "f": fuel}).fetchall())
-
-
-def load_category(engine, category: str, out_dir: Path) -> int:
-    """한 카테고리의 long CSV 를 코어에 적재. 적재(처리)한 generation 행수 반환."""
+    """카테고리 발전소들을 plants 에 한 번에 upsert 하고 {plant_name: plant_id} 반환."""
+    names = [str(n) for n in names]
+    if not names:
+        return {}
+    caps = [resolve_capacity(n) for n in names]
+    locs = [resolve_location(n) for n in names]
+    rows = conn.execute(UPSERT_PLANTS, {
+        "fuel": fuel,
+        "op": OPERATOR,
+        "names": names,
+        "cap_mw": [c["capacity_mw"] if c else None for c in caps],
+        "conf": [c["confidence"] if c else "불확실" for c in caps],
+        "lat": [loc["lat"] if loc else None for loc in locs],
+        "lon": [loc["lon"] if loc else None for loc in locs],
+        "addr": [loc["address"] if loc else None for loc in locs],
+        "site": [loc["site"] if loc else None for loc in locs],
+    }).fetchall()
+    return {name: pid for name, pid in rows}
+
+
+def _row_hash(frame: pd.DataFrame) -> pd.Series:
+    """(timestamp, plant_id, gen_kwh) 값 해시. NaN 끼리는 같은 값으로 본다."""
+    return pd.util.hash_pandas_object(pd.DataFrame({
+        "timestamp": pd.to_datetime(frame["timestamp"]).astype("datetime64[ns]"),
+        "plant_id": frame["plant_id"].astype("int64"),
+        "gen_kwh": pd.to_numeric(frame["gen_kwh"], errors="coerce").astype("float64"),
+    }), index=False)
+
+
+def diff_against_core(
+    frame: pd.DataFrame,
+    last_ts: Dict[int, pd.Timestamp],
+    overlap: pd.DataFrame,
+) -> pd.DataFrame:
+    """[timestamp, plant_id, gen_kwh] 중 코어에 없거나 값이 다른 행만.
+
+    last_ts: 발전소별 마지막 적재 시각(없는 발전소는 전부 신규).
+    overlap: last_ts 이하 입력 구간의 코어 행 [timestamp, plant_id, gen_kwh].
+    """
+    if frame.empty:
+        return frame
+    last = pd.to_datetime(frame["plant_id"].map(last_ts))
+    is_new = last.isna() | (pd.to_datetime(frame["timestamp"]) > last)
+
+    changed = pd.Series(False, index=frame.index)
+    if (~is_new).any():
+        known = set(_row_hash(overlap)) if len(overlap) else set()
+        changed[~is_new] = ~_row_hash(frame[~is_new]).isin(known).to_numpy()
+    return frame[is_new | changed]
+
+
+def _core_state(conn, frame: pd.DataFrame) -> tuple:
+    """(발전소별 last_ts, 입력의 [최소 timestamp, last_ts] 구간 코어 행)."""
+    ids = [int(i) for i in frame["plant_id"].unique()]
+    rows = conn.execute(SELECT_LAST_TS, {"ids": ids}).fetchall()
+    last_ts = {int(pid): pd.Timestamp(ts) for pid, ts in rows if ts is not None}
+    if not last_ts:
+        return last_ts, pd.DataFrame(columns=["timestamp", "plant_id", "gen_kwh"])
+    since = pd.to_datetime(frame["timestamp"]).groupby(frame["plant_id"]).min()
+    plants = [pid for pid in last_ts if since[pid] <= last_ts[pid]]
+    if not plants:
+        return last_ts, pd.DataFrame(columns=["timestamp", "plant_id", "gen_kwh"])
+    overlap = pd.DataFrame(
+        conn.execute(SELECT_OVERLAP, {
+            "ids": plants,
+            "since": [since[pid].to_pydatetime() for pid in plants],
+            "until": [last_ts[pid].to_pydatetime() for pid in plants],
+        }).fetchall(),
+        columns=["timestamp", "plant_id", "gen_kwh"],
+    )
+    return last_ts, overlap
+
+
+def load_category(engine, category: str, out_dir: Path, delta: bool = False, force: bool = False) -> int:
+    """한 카테고리의 long parquet 을 코어와 비교해 바뀐 행만 적재. 적재한 generation 행수 반환.
+
+    delta=True 면 transform_gen 이 쌓아 둔 변경분({category}_delta.parquet)만 읽고,
+    커밋에 성공하면 그 파일을 지운다. force=True 면 코어 비교 없이 전부 upsert.
+    """
     if category not in FUEL_MAP:
         raise ValueError(f"알 수 없는 카테고리: {category} (가능: {list(FUEL_MAP)})")
     fuel = FUEL_MAP[category]
-    src_path = Path(out_dir) / f"{category}_long.parquet"
+    src_path = delta_path(category, out_dir) if delta else Path(out_dir) / f"{category}_long.parquet"
     if not src_path.exists():
-        logger.warning(f"[{category}] {src_path} 없음 — 건너뜀")
+        if delta:
+            logger.info(f"[{category}] 적재 대기 변경분 없음")
+        else:
+            logger.warning(f"[{category}] {src_path} 없음 — 건너뜀")
         return 0
 
     df = pd.read_parquet(src_path)
@@ -104,7 +221,8 @@ def load_category(engine, category: str, out_dir: Path) -> int:
     df["plant_name"] = df["plant_name"].astype(str).str.strip()
     df = df.dropna(subset=["timestamp"])
 
-    with engine.begin() as conn:
+    with metrics.stage("load", source=OPERATOR, fuel=fuel, table="generation") as st, \
+            engine.begin() as conn:
         id_map = _ensure_plants(conn, fuel, df["plant_name"].unique())
         df["plant_id"] = df["plant_name"].map(id_map)
 
@@ -114,38 +232,54 @@ def load_category(engine, category: str, out_dir: Path) -> int:
                 f"[{category}] plant_id 미매핑 {len(unmapped)}종 (operator 통일 누락 의심): "
                 f"{unmapped[:5]}{' ...' if len(unmapped) > 5 else ''}"
             )
-        df = df[df["plant_id"].notna()].copy()
-        df["plant_id"] = df["plant_id"].astype(int)
-
-        records = [
-            {"ts": t, "pid": int(pid),
-             "kwh": None if pd.isna(g) else float(g), "src": SOURCE}
-            for t, pid, g in zip(df["timestamp"], df["plant_id"], df["generation"])
-        ]
-        before = conn.execute(text("SELECT count(*) FROM generation")).scalar()
-        batch = 5000
-        for i in range(0, len(records), batch):
-            conn.execute(UPSERT_GEN, records[i:i + batch])
-        after = conn.execute(text("SELECT count(*) FROM generation")).scalar()
-
+        df = df[df["plant_id"].notna()]
+        frame = pd.DataFrame({
+            "timestamp": df["timestamp"],
+            "plant_id": df["plant_id"].astype(int),
+            "gen_kwh": df["generation"],
+        }).drop_duplicates(subset=["timestamp", "plant_id"], keep="last")
+
+        if not force and len(frame):
+            last_ts, overlap = _core_state(conn, frame)
+            changes = diff_against_core(frame, last_ts, overlap)
+        else:
+            changes = frame
+
+        if len(changes) and not copy_merge_generation(conn, changes, keep_source=True):
+            records = [
+                {"ts": t, "pid": int(pid),
+                 "kwh": None if pd.isna(g) else float(g), "src": SOURCE}
+                for t, pid, g in zip(changes["timestamp"], changes["plant_id"], changes["gen_kwh"])
+            ]
+            batch = 5000
+            for i in range(0, len(records), batch):
+                conn.execute(UPSERT_GEN, records[i:i + batch])
+        if len(changes):
+            record_coverage(conn, "generation", changes["timestamp"], changes["plant_id"])
+        st.rows = len(changes)
+
+    if delta:
+        src_path.unlink()
     logger.info(
-        f"[{category}->{fuel}] CSV {len(df):,}행 upsert | "
-        f"generation 신규 {after - before:,} (총 {after:,})"
+        f"[{category}->{fuel}] {'변경분' if delta else '전체'} {len(frame):,}행 중 "
+        f"{len(changes):,}행 upsert (나머지는 코어와 동일)"
     )
-    return len(df)
+    return len(changes)
 
 
 def load_all(
     categories: Optional[List[str]] = None,
     out_dir: Path = DEFAULT_OUT_DIR,
     db_url: Optional[str] = None,
+    delta: bool = False,
+    force: bool = False,
 ) -> int:
-    """카테고리별 long CSV 를 generation 코어에 적재. 처리 총 행수 반환."""
+    """카테고리별 long parquet(delta=True 면 변경분)을 generation 코어에 적재. 적재 총 행수 반환."""
     categories = categories or list(FUEL_MAP.keys())
-    engine = create_engine(resolve_db_url(db_url))
+    engine = get_engine(db_url)
     total = 0
     for cat in categories:
-        total += load_category(engine, cat, Path(out_dir))
+        total += load_category(engine, cat, Path(out_dir), delta=delta, force=force)
     logger.info(f"비태양광 코어 적재 완료 — {total:,}행 처리 ({categories})")
     return total
 
@@ -172,12 +306,18 @@ def main() -> None:
     parser.add_argument("--out-dir", default=str(DEFAULT_OUT_DIR),
                         help="long CSV 디렉터리 (transform_gen 출력)")
     parser.add_argument("--db-url", default=None, help="DB 접속 URL override")
+    parser.add_argument("--delta", action="store_true",
+                        help="transform_gen 이 남긴 변경분({category}_delta.parquet)만 적재")
+    parser.add_argument("--force", action="store_true",
+                        help="코어와 비교하지 않고 전부 upsert (옛 달 정정 반영)")
     args = parser.parse_args()
 
     load_all(
         categories=_parse_types(args.types),
         out_dir=Path(args.out_dir),
         db_url=args.db_url,
+        delta=args.delta,
+        force=args.force,
     )
 
 
@@ -24,6 +24,10 @@ DB 적재는 추후. 현재는 CSV 저장까지만 수행한다.
     # 최근 5개월, 3개 발전원 전체
     uv run python -m fetch_data.gen.namdong_collect
 
+    # 가용 이력 전체 — 달마다 backfill_ledger 에 남아 재실행 시 끝난 달은 건너뜀.
+    # 가용 범위는 data/availability.json 에 남아 다음 실행은 양 끝만 확인(--reprobe 로 다시 탐지)
+    uv run python -m fetch_data.gen.namdong_collect --full
+
     # 기간/발전원/동시성 지정
     uv run python -m fetch_data.gen.namdong_collect \
         --start 20251201 --end 20260430 \
@@ -41,6 +45,7 @@ from typing import Dict, List, Optional, Tuple
 
 import aiohttp
 
+from fetch_data.common import availability, backfill, http, response_cache
 from fetch_data.common.koen import (
     get_koen_ssl_context,
     is_probably_csv,
@@ -143,39 +148,44 @@ async def _fetch_chunk(
         "User-Agent": USER_AGENT,
     }
 
-    async with sem:
-        for attempt in range(1, retries + 2):
-            try:
-                async with session.post(csv_url, data=data, headers=headers, timeout=120) as r:
-                    r.raise_for_status()
-                    content_type = (r.headers.get("Content-Type", "") or "").lower()
-                    body = await r.read()
-            except Exception as e:
-                logger.warning(f"[{label}] {ds}~{de} POST 실패(시도 {attempt}): {e}")
-                if attempt <= retries:
-                    await asyncio.sleep(backoff_sec * attempt)
-                continue
+    async def _post() -> bytes:
+        async with sem:
+            resp = await http.request(
+                "POST", csv_url, session=session, data=data, headers=headers, timeout=120,
+                retry=http.RetryPolicy(attempts=retries + 1, base=backoff_sec),
+                ok=_is_csv_response, is_blocked=_is_block_page, label=label,
+            )
+        return resp.body
+
+    try:
+        body = await response_cache.fetch_cached("koen_gen", csv_url, data, _post, period_end=_to_date(de))
+    except (http.HttpRequestError, response_cache.CacheMiss) as e:
+        logger.error(f"[{label}] {ds}~{de} 최종 실패 ({e})")
+        return None
+
+    out_path = out_dir / f"koen_{gen_key}_{ds}-{de}.csv"
+    out_path.write_text(decode_csv_bytes(body), encoding="utf-8-sig")
+    logger.info(f"[{label}] OK {ds}~{de} -> {out_path.name} ({len(body)} bytes, utf-8)")
+    return out_path
 
-            if "csv" not in content_type or not is_probably_csv(body):
-                logger.warning(
-                    f"[{label}] {ds}~{de} 비정상 응답(시도 {attempt}) "
-                    f"ct={content_type} size={len(body)} head={body[:120]!r}"
-                )
-                if attempt <= retries:
-                    await asyncio.sleep(backoff_sec * attempt)
-                continue
 
-            out_path = out_dir / f"koen_{gen_key}_{ds}-{de}.csv"
-            out_path.write_text(decode_csv_bytes(body), encoding="utf-8-sig")
-            logger.info(f"[{label}] OK {ds}~{de} -> {out_path.name} ({len(body)} bytes, utf-8)")
-            return out_path
+def _is_csv_response(resp: http.HttpResponse) -> bool:
+    return resp.status == 200 and "csv" in resp.content_type and is_probably_csv(resp.body)
 
-    logger.error(f"[{label}] {ds}~{de} 최종 실패")
-    return None
+
+def _is_block_page(resp: http.HttpResponse) -> bool:
+    """CSV 자리에 온 HTML 이 방화벽 안내문이면 차단으로 본다(빈 월 응답과 구분)."""
+    return "csv" not in resp.content_type and http.looks_blocked(
+        resp.status, resp.body[:4000].decode("utf-8", errors="ignore")
+    )
 
 
 async def _month_has_data(session: aiohttp.ClientSession, cfg: dict, d: date) -> bool:
-    """해당 월에 데이터가 있는지(빈 응답이 아닌지) 확인."""
+    """해당 월에 데이터가 있는지(빈 응답이 아닌지) 확인.
+
+    Raises:
+        http.HttpRequestError: 재시도 끝에 요청 실패(데이터 유무를 알 수 없음).
+    """
     ds, de = _to_str(d), _to_str(_month_end(d))
     main_url = _build_main_url(cfg["page"], cfg["menu_cd"], ds, de)
     data = {
@@ -189,14 +199,24 @@ async def _month_has_data(session: aiohttp.ClientSession, cfg: dict, d: date) ->
         "Referer": main_url,
         "User-Agent": USER_AGENT,
     }
+    csv_url = NamdongGenAPI.csv_url(cfg["page"])
+
+    async def _post() -> Optional[bytes]:
+        # 200 이면 받아 두고 CSV 여부로 판정 — 빈 달(비 CSV 응답)은 None 이라 캐시하지 않는다.
+        # 재시도 끝의 HTTP/전송 오류는 '데이터 없음' 이 아니므로 그대로 올린다.
+        resp = await http.request(
+            "POST", csv_url, session=session, data=data, headers=headers, timeout=60,
+            retry=http.RetryPolicy(attempts=3, base=3.0),
+            ok=lambda r: r.status == 200, is_blocked=_is_block_page, label=f"{cfg['label']} 탐지",
+        )
+        return resp.body if is_probably_csv(resp.body) else None
+
+    # 다운로드(_fetch_chunk)와 같은 캐시 키 — 탐지 때 받은 월은 다시 받지 않는다
     try:
-        async with session.post(
-            NamdongGenAPI.csv_url(cfg["page"]), data=data, headers=headers, timeout=60
-        ) as r:
-            body = await r.read()
-        return is_probably_csv(body)
-    except Exception:
-        return False
+        body = await response_cache.fetch_cached("koen_gen", csv_url, data, _post, period_end=_month_end(d))
+    except response_cache.CacheMiss:
+        return False  # 재생 모드: 캐시에 없는 달은 받은 적 없는 달
+    return body is not None
 
 
 async def detect_available_range(
@@ -204,45 +224,58 @@ async def detect_available_range(
     cfg: dict,
     floor: date = EARLIEST_FLOOR,
     ref: Optional[date] = None,
+    cache: Optional[availability.AvailabilityCache] = None,
 ) -> Optional[Tuple[date, date]]:
     """사이트가 제공하는 (가장 오래된 월, 가장 최신 월)을 자동 탐지.
 
-    - 최신: 직전 완결월부터 뒤로 가며 첫 데이터월 (최대 6개월 탐색)
-    - 최초: [floor, 최신] 구간에서 데이터가 처음 나타나는 월을 이분 탐색
-            (한번 데이터가 시작되면 이후 계속 존재한다는 단조성 가정)
+    공용 prober(availability.probe_range): 최신월은 직전 완결월부터 galloping, 최초월은
+    [floor, 최신] 이분 탐색. cache 가 있으면 지난번 범위의 양 끝만 다시 확인한다.
     """
-    ref = ref or date.today()
-    label = cfg["label"]
-
-    # 최신 가용월
-    latest: Optional[date] = None
-    probe = _add_months(date(ref.year, ref.month, 1), -1)
-    for _ in range(6):
-        if await _month_has_data(session, cfg, probe):
-            latest = probe
-            break
-        probe = _add_months(probe, -1)
-    if latest is None:
-        logger.warning(f"[{label}] 최신 가용월 탐지 실패")
+    async def has_data(month: date) -> bool:
+        return await _month_has_data(session, cfg, month)
+
+    try:
+        rng = await availability.probe_range(f"koen_gen:{cfg['page']}", has_data, floor, ref, cache)
+    except (http.HttpRequestError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"[{cfg['label']}] 가용 범위 탐지 중 요청 실패 — 이번 실행은 건너뜀(캐시 갱신 안 함): {e}")
+        return None
+    if rng is None:
+        logger.warning(f"[{cfg['label']}] 가용 범위 탐지 실패")
         return None
+    logger.info(f"[{cfg['label']}] 가용 범위 자동 탐지: {rng[0]} ~ {_month_end(rng[1])}")
+    return rng
 
-    # 최초 가용월 (이분 탐색)
-    floor = floor.replace(day=1)
-    lo = floor.year * 12 + (floor.month - 1)
-    hi = latest.year * 12 + (latest.month - 1)
-    best = hi
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        y, m = divmod(mid, 12)
-        if await _month_has_data(session, cfg, date(y, m + 1, 1)):
-            best = mid
-            hi = mid - 1
-        else:
-            lo = mid + 1
-    ey, em = divmod(best, 12)
-    earliest = date(ey, em + 1, 1)
-    logger.info(f"[{label}] 가용 범위 자동 탐지: {earliest} ~ {_month_end(latest)}")
-    return earliest, latest
+
+class NamdongGenSource:
+    """백필 엔진 어댑터: 한 발전원의 달 = 샤드. fetch 가 월 CSV 를 받아 원본 파일로 저장한다."""
+
+    def __init__(self, gen_key: str, cfg: dict, session: aiohttp.ClientSession,
+                 sem: asyncio.Semaphore, out_dir: Path):
+        self.name = f"namdong_gen:{gen_key}"
+        self.gen_key = gen_key
+        self.cfg = cfg
+        self.session = session
+        self.sem = sem
+        self.out_dir = out_dir
+        self.saved: Dict[Tuple[date, date], Path] = {}
+
+    def shards(self, start: date, end: date) -> List[Tuple[date, date]]:
+        return [(_to_date(ds), _to_date(de)) for ds, de in split_by_month(start, end)]
+
+    async def fetch(self, start: date, end: date) -> Optional[Path]:
+        return await _fetch_chunk(
+            self.session, self.sem, self.gen_key, self.cfg, _to_str(start), _to_str(end), self.out_dir
+        )
+
+    def parse(self, path: Optional[Path], start: date, end: date) -> Path:
+        if path is None:
+            raise RuntimeError(f"{_to_str(start)}~{_to_str(end)} 다운로드 실패")
+        return path
+
+    def load(self, path: Path, start: date, end: date) -> int:
+        self.saved[(start, end)] = path
+        with open(path, encoding="utf-8-sig") as fh:
+            return max(sum(1 for _ in fh) - 1, 0)  # 원본 CSV 데이터 행 수(헤더 제외)
 
 
 async def _download_type(
@@ -253,10 +286,15 @@ async def _download_type(
     month_ranges: Optional[List[Tuple[str, str]]] = None,
     floor: date = EARLIEST_FLOOR,
     ref: Optional[date] = None,
+    ledger=None,
+    restart: bool = False,
+    availability_cache: Optional[availability.AvailabilityCache] = None,
 ) -> List[Path]:
-    """한 발전원: 쿠키 1회 확보 후 월별 구간을 배치 병렬 수집.
+    """한 발전원: 쿠키 1회 확보 후 월별 구간을 백필 엔진으로 배치 병렬 수집.
 
     month_ranges 가 None 이면 사이트 가용 범위를 자동 탐지(최초~최신)한다.
+    ledger 가 DbLedger 면 이전 실행에서 끝난 달은 건너뛴다(반환 목록에서도 빠진다).
+    실패한 달이 있으면 (받은 달은 저장·기록한 뒤) RuntimeError — 다음 실행이 그 달만 다시 받는다.
     """
     out_dir = out_root / gen_key
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -265,28 +303,35 @@ async def _download_type(
     async with aiohttp.ClientSession(
         headers={"User-Agent": USER_AGENT}, connector=connector
     ) as session:
-        # 세션 쿠키(JSESSIONID) 확보
-        try:
-            async with session.get(_build_main_url(cfg["page"], cfg["menu_cd"]), timeout=30) as r:
-                r.raise_for_status()
-        except Exception as e:
-            logger.warning(f"[{cfg['label']}] 쿠키 확보 GET 실패(계속 진행): {e}")
+        # 세션 쿠키(JSESSIONID) 확보 — 재생 모드는 네트워크를 쓰지 않는다
+        if not response_cache.is_replay():
+            try:
+                async with session.get(_build_main_url(cfg["page"], cfg["menu_cd"]), timeout=30) as r:
+                    r.raise_for_status()
+            except Exception as e:
+                logger.warning(f"[{cfg['label']}] 쿠키 확보 GET 실패(계속 진행): {e}")
 
         if month_ranges is None:
-            rng = await detect_available_range(session, cfg, floor, ref)
+            rng = await detect_available_range(session, cfg, floor, ref, availability_cache)
             if rng is None:
                 return []
-            start, end = rng
-            month_ranges = split_by_month(start, _month_end(end))
-            logger.info(f"[{cfg['label']}] {len(month_ranges)}개월 수집 예정")
+            start, end = rng[0], _month_end(rng[1])
+            logger.info(f"[{cfg['label']}] {len(split_by_month(start, end))}개월 수집 예정")
+        else:
+            start, end = _to_date(month_ranges[0][0]), _to_date(month_ranges[-1][1])
 
-        tasks = [
-            _fetch_chunk(session, sem, gen_key, cfg, ds, de, out_dir)
-            for ds, de in month_ranges
-        ]
-        saved = await asyncio.gather(*tasks)
+        # 세마포어가 요청 동시성을 잡으므로 샤드는 전부 띄워 둔다
+        source = NamdongGenSource(gen_key, cfg, session, sem, out_dir)
+        report = await backfill.run_backfill(
+            source, start, end, ledger=ledger, concurrency=max(len(split_by_month(start, end)), 1),
+            restart=restart,
+        )
 
-    return [p for p in saved if p is not None]
+    if not report.ok:
+        raise RuntimeError(
+            f"[{cfg['label']}] 수집 실패 월: {', '.join(f'{s}~{e}' for s, e in report.failed)}"
+        )
+    return [source.saved[shard] for shard in sorted(source.saved)]
 
 
 async def download_all(
@@ -297,10 +342,14 @@ async def download_all(
     end: Optional[date] = None,
     full: bool = False,
     floor: date = EARLIEST_FLOOR,
+    ledger=None,
+    restart: bool = False,
+    availability_cache: Optional[availability.AvailabilityCache] = None,
 ) -> Dict[str, List[Path]]:
     """선택한 발전원들을 동시에, 월별 구간은 공용 세마포어로 배치 병렬 수집.
 
-    full=True 면 발전원별로 사이트 가용 범위(최초~최신)를 자동 탐지해 전부 수집.
+    full=True 면 발전원별로 사이트 가용 범위(최초~최신)를 동시에 탐지해 전부 수집
+    (availability_cache 가 있으면 지난 범위의 양 끝만 확인).
     그렇지 않으면 [start, end] 를 월 단위로 분할해 수집.
     """
     if full:
@@ -318,10 +367,15 @@ async def download_all(
     async def run_one(key: str):
         results[key] = await _download_type(
             key, NamdongGenAPI.GEN_TYPES[key], sem, out_root,
-            month_ranges=month_ranges, floor=floor,
+            month_ranges=month_ranges, floor=floor, ledger=ledger, restart=restart,
+            availability_cache=availability_cache,
         )
 
-    await asyncio.gather(*(run_one(k) for k in gen_keys))
+    # 한 발전원이 실패해도 나머지는 끝까지 받고, 실패는 모아서 올린다
+    outcomes = await asyncio.gather(*(run_one(k) for k in gen_keys), return_exceptions=True)
+    errors = [e for e in outcomes if isinstance(e, BaseException)]
+    if errors:
+        raise RuntimeError("; ".join(str(e) for e in errors)) from errors[0]
     return results
 
 
@@ -337,6 +391,9 @@ def run(
     out_root: Path = DEFAULT_RAW_DIR,
     loc_path: Path = DEFAULT_LOC_PATH,
     floor: date = EARLIEST_FLOOR,
+    ledger=None,
+    restart: bool = False,
+    availability_cache: Optional[availability.AvailabilityCache] = None,
 ) -> Dict[str, List[Path]]:
     logger.info("=" * 60)
     logger.info("남동발전 비태양광(해양소수력/연료전지/화력) 수집 시작")
@@ -348,6 +405,7 @@ def run(
         download_all(
             gen_keys, concurrency, out_root,
             start=start, end=end, full=full, floor=floor,
+            ledger=ledger, restart=restart, availability_cache=availability_cache,
         )
     )
 
@@ -399,7 +457,11 @@ def main():
         action="store_true",
         help="수집 생략, 디스크의 기존 원본 전체에서 위치 CSV + 호기별 용량 CSV만 재생성",
     )
+    backfill.add_cli_args(parser)
+    response_cache.add_cli_args(parser)
+    availability.add_cli_args(parser)
     args = parser.parse_args()
+    response_cache.configure_from_args(args)
 
     gen_keys = _parse_types(args.types)
 
@@ -414,6 +476,10 @@ def main():
             full=True,
             concurrency=args.concurrency,
             out_root=Path(args.out),
+            # 전체 이력은 달마다 backfill_ledger 에 남겨 중간에 죽어도 남은 달부터 이어 받는다
+            ledger=backfill.ledger_from_args(args),
+            restart=args.restart,
+            availability_cache=availability.cache_from_args(args),
         )
         return
 
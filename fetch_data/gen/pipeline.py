@@ -3,7 +3,7 @@
 
 이 모듈은 두 단계를 하나로 잇는 오케스트레이터다.
   1) 수집  : fetch_data.gen.namdong_collect (gen_data_raw/{category}/koen_*.csv)
-  2) 변환  : fetch_data.gen.transform_gen        (gen_data/{category}_long.csv, wind 패턴)
+  2) 변환  : fetch_data.gen.transform_gen        (gen_data/{category}_long.parquet + 변경분 {category}_delta.parquet)
 
 수집 모드:
 - latest (기본): 이미 수집된 원본에서 가장 최신 월을 찾아, 그 직전부터(overlap) 직전 완결월까지
@@ -37,6 +37,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from fetch_data.common.logger import get_logger
+from fetch_data.common.availability import AvailabilityCache
 from fetch_data.gen import namdong_collect as collect
 from fetch_data.gen import transform_gen as transform
 
@@ -122,7 +123,10 @@ def collect_step(
     """수집 단계. mode: latest | months | range | full."""
     if mode == "full":
         logger.info("[수집] full — 사이트 가용 범위 전체 자동 수집")
-        collect.run(gen_keys=gen_keys, full=True, concurrency=concurrency, out_root=raw_dir)
+        collect.run(
+            gen_keys=gen_keys, full=True, concurrency=concurrency, out_root=raw_dir,
+            availability_cache=AvailabilityCache(),
+        )
         return
 
     if mode == "range":
@@ -13,6 +13,12 @@
 
 카테고리별로 따로 변환해 카테고리당 하나의 long DataFrame을 만든다(적재 시 각각 별도 테이블).
 
+증분 변환(run): 원본 파일마다 long 변환 결과를 내용 checksum 키로 캐시한다
+(gen_data/_cache/{category}/<sha256>.parquet). 새로 생기거나 바뀐 원본만 파싱하고 나머지는
+캐시를 이어 붙인다. 이번에 파싱한 파일의 행은 gen_data/{category}_delta.parquet 에 쌓이고,
+load_gen --delta 가 적재에 성공하면 지운다 — 월간 실행은 새 달만 적재 대상이 된다.
+같은 (timestamp, plant_name) 이 여러 원본에 있으면 파일명 정렬상 뒤 파일이 이긴다.
+
 사용 예:
     # 3개 카테고리 전부 변환해 gen_data/{category}_long.csv 로 저장
     uv run python -m fetch_data.gen.transform_gen
@@ -24,9 +30,12 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -47,21 +56,31 @@ HOUR_RE = re.compile(r"^\s*(\d+)\s*시\s*발전량")
 
 # long 결과 컬럼 (wind 패턴)
 LONG_COLUMNS = ["timestamp", "plant_name", "generation"]
+KEY = ["timestamp", "plant_name"]
 
 
 # =========================================================
 # 결합 / 변환
 # =========================================================
-def merge_category_wide(category: str, raw_dir: Path = DEFAULT_RAW_DIR) -> pd.DataFrame:
-    """한 카테고리의 월별 원본 CSV를 모두 읽어 하나의 와이드 DataFrame으로 결합."""
+def _category_files(category: str, raw_dir: Path) -> List[Path]:
     cat_dir = Path(raw_dir) / category
     files = sorted(cat_dir.glob("koen_*.csv"))  # 파일명=기간 → 날짜순 정렬
     if not files:
         raise FileNotFoundError(f"{cat_dir}/koen_*.csv 파일이 없습니다.")
+    return files
 
-    df = pd.concat([read_csv_flexible(fp) for fp in files], ignore_index=True)
+
+def _read_wide(fp: Path) -> pd.DataFrame:
+    df = read_csv_flexible(fp)
     df["발전구분"] = df["발전구분"].astype(str).str.strip()
     df["호기"] = df["호기"].astype(str).str.strip()
+    return df
+
+
+def merge_category_wide(category: str, raw_dir: Path = DEFAULT_RAW_DIR) -> pd.DataFrame:
+    """한 카테고리의 월별 원본 CSV를 모두 읽어 하나의 와이드 DataFrame으로 결합."""
+    files = _category_files(category, raw_dir)
+    df = pd.concat([_read_wide(fp) for fp in files], ignore_index=True)
     logger.info(f"[{category}] {len(files)}개 파일 결합 -> 와이드 {df.shape}")
     return df
 
@@ -125,6 +144,112 @@ def transform_all(
     return {cat: transform_category(cat, raw_dir) for cat in categories}
 
 
+# =========================================================
+# 증분 변환 (원본 파일별 캐시)
+# =========================================================
+def file_checksum(fp: Path) -> str:
+    return hashlib.sha256(Path(fp).read_bytes()).hexdigest()
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """임시 파일에 쓴 뒤 바꿔 끼운다(읽는 쪽이 반쯤 쓴 파일을 보지 않게)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, path)
+
+
+def _finalize(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    if not parts:
+        return pd.DataFrame({
+            "timestamp": pd.Series(dtype="datetime64[ns]"),
+            "plant_name": pd.Series(dtype="object"),
+            "generation": pd.Series(dtype="float64"),
+        })
+    return (
+        pd.concat(parts, ignore_index=True)
+        .drop_duplicates(subset=KEY, keep="last")
+        .sort_values(["plant_name", "timestamp"])
+        .reset_index(drop=True)
+    )
+
+
+def cached_file_long(category: str, fp: Path, checksum: str, cache_dir: Path) -> Tuple[pd.DataFrame, bool]:
+    """원본 파일 하나의 long 변환 결과와 '이번에 파싱했는지' 여부."""
+    path = cache_dir / f"{checksum}.parquet"
+    if path.exists():
+        return pd.read_parquet(path), False
+    wide = _read_wide(fp)
+    long = transform_wide_to_long(wide)
+    _verify_lossless(f"{category}/{fp.name}", wide, long)
+    _write_parquet(long, path)
+    return long, True
+
+
+def _cache_dir(category: str, out_dir: Path) -> Path:
+    return Path(out_dir) / "_cache" / category
+
+
+def _load_sources(category: str, out_dir: Path) -> Dict[str, str]:
+    path = _cache_dir(category, out_dir) / "_sources.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def commit_sources(category: str, out_dir: Path, checksums: Dict[str, str]) -> None:
+    """변환 결과(long·delta)를 쓴 뒤에 원본 checksum 목록을 확정하고 안 쓰는 캐시를 지운다.
+
+    먼저 확정했다가 그 사이 실패하면 다음 실행이 '변경 없음' 으로 보고 변경분을 잃는다.
+    """
+    cache_dir = _cache_dir(category, out_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / "_sources.json"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(checksums, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    live = set(checksums.values())
+    for cached in cache_dir.glob("*.parquet"):
+        if cached.stem not in live:
+            cached.unlink()
+
+
+def transform_category_incremental(
+    category: str,
+    raw_dir: Path = DEFAULT_RAW_DIR,
+    out_dir: Path = DEFAULT_OUT_DIR,
+) -> Tuple[Optional[pd.DataFrame], pd.DataFrame, Dict[str, str]]:
+    """(전체 long 또는 변경 없으면 None, 이번에 새로 파싱한 원본의 행, 원본 checksum 목록).
+
+    checksum 목록은 호출부가 결과를 저장한 뒤 commit_sources 로 확정한다.
+    """
+    files = _category_files(category, raw_dir)
+    cache_dir = _cache_dir(category, out_dir)
+    sources = _load_sources(category, out_dir)
+
+    checksums = {fp.name: file_checksum(fp) for fp in files}
+    long_path = Path(out_dir) / f"{category}_long.parquet"
+    if checksums == sources and long_path.exists():
+        logger.info(f"[{category}] 원본 {len(files)}개 변경 없음 — 변환 생략")
+        return None, _finalize([]), checksums
+
+    parts: List[pd.DataFrame] = []
+    fresh: List[pd.DataFrame] = []
+    for fp in files:
+        long, parsed = cached_file_long(category, fp, checksums[fp.name], cache_dir)
+        parts.append(long)
+        if parsed or sources.get(fp.name) != checksums[fp.name]:
+            fresh.append(long)
+
+    full = _finalize(parts)
+    delta = _finalize(fresh)
+    logger.info(
+        f"[{category}] 원본 {len(files)}개 중 {len(fresh)}개 변경 -> long {full.shape} "
+        f"| 변경분 {len(delta):,}행"
+    )
+    return full, delta, checksums
+
+
 # =========================================================
 # 검증 / 저장
 # =========================================================
@@ -156,14 +281,36 @@ def save_datasets(
     return paths
 
 
+def delta_path(category: str, out_dir: Path = DEFAULT_OUT_DIR) -> Path:
+    """아직 적재되지 않은 변경분. load_gen --delta 가 적재 후 지운다."""
+    return Path(out_dir) / f"{category}_delta.parquet"
+
+
 def run(
     categories: Optional[List[str]] = None,
     raw_dir: Path = DEFAULT_RAW_DIR,
     out_dir: Path = DEFAULT_OUT_DIR,
 ) -> Dict[str, Path]:
-    """원본 결합 -> 변환 -> 카테고리별 long CSV 저장."""
-    datasets = transform_all(categories, raw_dir)
-    return save_datasets(datasets, out_dir)
+    """증분 변환 -> 카테고리별 long parquet 저장 + 변경분을 {category}_delta.parquet 에 누적."""
+    categories = categories or CATEGORIES
+    out_dir = Path(out_dir)
+    paths: Dict[str, Path] = {}
+    for category in categories:
+        full, delta, checksums = transform_category_incremental(category, raw_dir, out_dir)
+        long_path = out_dir / f"{category}_long.parquet"
+        if full is not None:
+            _write_parquet(full, long_path)
+            logger.info(f"saved: {long_path}  ({len(full):,} rows)")
+        if len(delta):
+            pending = delta_path(category, out_dir)
+            if pending.exists():  # 이전 변경분이 아직 적재되지 않았으면 이어 붙인다
+                delta = _finalize([pd.read_parquet(pending), delta])
+            _write_parquet(delta, pending)
+            logger.info(f"saved: {pending}  (적재 대기 {len(delta):,} rows)")
+        if full is not None:
+            commit_sources(category, out_dir, checksums)
+        paths[category] = long_path
+    return paths
 
 
 # =========================================================
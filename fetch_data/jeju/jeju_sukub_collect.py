@@ -16,7 +16,9 @@ KPX 제주 계통수급 5분 실적 수집기.
     # 특정 기간
     uv run python -m fetch_data.jeju.jeju_sukub_collect --start 2024-01-01 --end 2024-12-31
 
-    # 전체 이력 자동 수집 (탐지 방식)
+    # 전체 이력 자동 수집 (탐지 방식). 달마다 backfill_ledger 에 상태가 남아
+    # 중간에 죽어도 다시 실행하면 끝난 달은 건너뛴다(--restart 로 처음부터).
+    # 가용 범위는 data/availability.json 에 남아 다음 실행은 양 끝만 확인(--reprobe)
     uv run python -m fetch_data.jeju.jeju_sukub_collect --full
 """
 
@@ -32,6 +34,7 @@ from typing import List, Optional, Tuple
 import aiohttp
 import pandas as pd
 
+from fetch_data.common import availability, backfill, http, response_cache
 from fetch_data.common.logger import get_logger
 from fetch_data.jeju import jeju_csv_store
 
@@ -80,22 +83,21 @@ async def _fetch_month(
         "startDate": first.strftime("%Y-%m-%d"),
         "endDate": last.strftime("%Y-%m-%d"),
     }
-    async with sem:
-        for attempt in range(1, retries + 2):
-            try:
-                async with session.post(URL, data=data, timeout=aiohttp.ClientTimeout(total=60)) as r:
-                    r.raise_for_status()
-                    body = await r.read()
-                if len(body) < 200:
-                    logger.warning(f"  {first}~{last} 응답 너무 짧음 ({len(body)} bytes, 시도 {attempt})")
-                else:
-                    return body
-            except Exception as e:
-                logger.warning(f"  {first}~{last} 시도 {attempt} 실패: {e}")
-            if attempt <= retries:
-                await asyncio.sleep(2.0 * attempt)
-    logger.error(f"  {first}~{last} 최종 실패")
-    return None
+    async def _post() -> bytes:
+        async with sem:
+            resp = await http.request(
+                "POST", URL, session=session, data=data, timeout=aiohttp.ClientTimeout(total=60),
+                retry=http.RetryPolicy(attempts=retries + 1, base=2.0),
+                ok=lambda r: r.status == 200 and len(r.body) >= 200,
+                label=f"jeju-sukub {first}~{last}",
+            )
+        return resp.body
+
+    try:
+        return await response_cache.fetch_cached("jeju_sukub", URL, data, _post, period_end=last)
+    except (http.HttpRequestError, response_cache.CacheMiss) as e:
+        logger.error(f"  {first}~{last} 최종 실패 ({e})")
+        return None
 
 
 # ─── 저장 ─────────────────────────────────────────────────────────────────────
@@ -161,35 +163,76 @@ def _save_month(body: bytes, first: date) -> Optional[Path]:
 
 # ─── 탐지 ─────────────────────────────────────────────────────────────────────
 
-async def _detect_start(session: aiohttp.ClientSession) -> date:
-    """데이터 최초 가용월을 이분 탐색으로 탐지."""
-    ref = date.today().replace(day=1)
-    lo = EARLIEST_FLOOR.year * 12 + (EARLIEST_FLOOR.month - 1)
-    hi = ref.year * 12 + (ref.month - 2)
-    best = hi
-    sem = asyncio.Semaphore(1)
-
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        y, m = divmod(mid, 12)
-        probe = date(y, m + 1, 1)
-        body = await _fetch_month(session, sem, probe, _month_end(probe))
-        if body and len(body) > 500:
-            best = mid
-            hi = mid - 1
-        else:
-            lo = mid + 1
-        await asyncio.sleep(0.5)
-
-    y, m = divmod(best, 12)
-    result = date(y, m + 1, 1)
-    logger.info(f"[탐지] 최초 가용월: {result.strftime('%Y-%m')}")
-    return result
+async def _detect_range(
+    session: aiohttp.ClientSession,
+    cache: Optional[availability.AvailabilityCache] = None,
+) -> Optional[Tuple[date, date]]:
+    """데이터 (최초 가용월, 최신 가용월) 을 공용 prober 로 탐지 — 캐시가 있으면 양 끝만 확인.
+
+    Raises:
+        http.HttpRequestError: 탐지 요청이 재시도 끝에 실패(범위를 캐시에 남기지 않는다).
+    """
+    async def has_data(month: date) -> bool:
+        # _fetch_month 는 실패를 None 으로 삼키므로 여기서는 직접 요청한다 — 200 이면 크기로
+        # 판정(빈 달은 캐시하지 않음), 재시도 끝의 HTTP/전송 오류는 그대로 올린다.
+        last = _month_end(month)
+        data = {"startDate": month.strftime("%Y-%m-%d"), "endDate": last.strftime("%Y-%m-%d")}
+
+        async def _post() -> Optional[bytes]:
+            resp = await http.request(
+                "POST", URL, session=session, data=data, timeout=aiohttp.ClientTimeout(total=60),
+                retry=http.RetryPolicy(attempts=3, base=2.0),
+                ok=lambda r: r.status == 200, label=f"jeju-sukub 탐지 {month:%Y-%m}",
+            )
+            return resp.body if len(resp.body) >= 200 else None
+
+        try:
+            body = await response_cache.fetch_cached("jeju_sukub", URL, data, _post, period_end=last)
+        except response_cache.CacheMiss:
+            return False  # 재생 모드: 캐시에 없는 달은 받은 적 없는 달
+        if not response_cache.is_replay():
+            await asyncio.sleep(0.5)
+        return bool(body) and len(body) > 500
+
+    rng = await availability.probe_range("jeju_sukub", has_data, EARLIEST_FLOOR, cache=cache)
+    if rng is not None:
+        logger.info(f"[탐지] 가용 범위: {rng[0].strftime('%Y-%m')} ~ {rng[1].strftime('%Y-%m')}")
+    return rng
 
 
 # ─── 실행 ─────────────────────────────────────────────────────────────────────
 
-async def _run_async(start: date, end: date) -> List[Path]:
+class JejuSukubSource:
+    """백필 엔진 어댑터: 달 = 샤드, 월 CSV 를 받아 jeju_sukub_YYYYMM.csv 에 병합."""
+
+    name = "jeju_sukub"
+
+    def __init__(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore):
+        self.session = session
+        self.sem = sem
+        self.saved: dict = {}
+
+    def shards(self, start: date, end: date) -> List[Tuple[date, date]]:
+        return _month_ranges(start, end)
+
+    async def fetch(self, first: date, last: date) -> Optional[bytes]:
+        logger.info(f"  {first.strftime('%Y-%m')} 수집 중...")
+        return await _fetch_month(self.session, self.sem, first, last)
+
+    def parse(self, body: Optional[bytes], first: date, last: date) -> bytes:
+        if not body:
+            raise RuntimeError(f"{first.strftime('%Y-%m')} 응답 없음")
+        return body
+
+    def load(self, body: bytes, first: date, last: date) -> int:
+        path = _save_month(body, first)
+        if path is None:
+            raise RuntimeError(f"{first.strftime('%Y-%m')} 저장 생략(빈 응답/형식 오류)")
+        self.saved[(first, last)] = path
+        return max(body.count(b"\n") - 1, 0)  # 원천 CSV 데이터 행 수(헤더 제외)
+
+
+async def _run_async(start: date, end: date, ledger=None, restart: bool = False) -> List[Path]:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     ranges = _month_ranges(start, end)
     logger.info(f"제주 계통수급 수집 시작: {start} ~ {end} ({len(ranges)}개월)")
@@ -199,24 +242,16 @@ async def _run_async(start: date, end: date) -> List[Path]:
     async with aiohttp.ClientSession(
         headers={"User-Agent": USER_AGENT}, connector=connector
     ) as session:
-        async def handle(first: date, last: date) -> Optional[Path]:
-            logger.info(f"  {first.strftime('%Y-%m')} 수집 중...")
-            body = await _fetch_month(session, sem, first, last)
-            if body:
-                return _save_month(body, first)
-            return None
-
-        results = await asyncio.gather(*[handle(f, l) for f, l in ranges])
-
-    saved = [p for p in results if p]
-    if len(saved) != len(ranges):
-        failed = [
-            first.strftime("%Y-%m")
-            for (first, _), result in zip(ranges, results)
-            if not result
-        ]
+        source = JejuSukubSource(session, sem)
+        report = await backfill.run_backfill(
+            source, start, end, ledger=ledger, concurrency=CONCURRENCY, restart=restart
+        )
+
+    if not report.ok:
+        failed = [first.strftime("%Y-%m") for first, _ in sorted(report.failed)]
         raise RuntimeError(f"Jeju monthly collection failed: {', '.join(failed)}")
-    logger.info(f"완료: {len(saved)}개월 저장")
+    saved = [source.saved[shard] for shard in ranges if shard in source.saved]
+    logger.info(f"완료: {len(saved)}개월 저장 (이전 실행에서 완료 {len(report.skipped)}개월 건너뜀)")
     return saved
 
 
@@ -230,14 +265,23 @@ def main():
     parser.add_argument("--start", default=None, help="시작일 YYYY-MM-DD")
     parser.add_argument("--end", default=None, help="종료일 YYYY-MM-DD")
     parser.add_argument("--months", type=int, default=3, help="최근 N개월 (기본 3)")
+    backfill.add_cli_args(parser)
+    response_cache.add_cli_args(parser)
+    availability.add_cli_args(parser)
     args = parser.parse_args()
+    response_cache.configure_from_args(args)
 
     if args.full:
         async def _full():
             async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
-                start = await _detect_start(session)
-            end = _month_end(_add_months(date.today().replace(day=1), -1))
-            return await _run_async(start, end)
+                rng = await _detect_range(session, availability.cache_from_args(args))
+            if rng is None:
+                raise SystemExit("가용 범위 탐지 실패")
+            start, end = rng[0], _month_end(rng[1])
+            # 전체 이력은 월 원장(backfill_ledger)으로 이어 받는다 — 중간에 죽어도 재실행 시 남은 달부터
+            return await _run_async(
+                start, end, ledger=backfill.ledger_from_args(args), restart=args.restart
+            )
         asyncio.run(_full())
     elif args.start or args.end:
         if not (args.start and args.end):
@@ -7,13 +7,14 @@ CSV→수동 ETL 없이 실시간으로 유지한다. (jeju_realtime_collect가
 - 전체 백필:   run()                 # 모든 월 CSV
 - 10분 동기화: run(months_back=1)    # 당월만(델타, 멱등 UPSERT)
 """
-import os
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+from fetch_data.common.config import getenv
+from fetch_data.common.db_base import get_engine
 from fetch_data.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -62,8 +63,8 @@ def _read_sukub(months_back=None) -> pd.DataFrame:
 
 def run(db_url: str | None = None, months_back: int | None = None) -> int:
     """제주 수급 CSV를 demand DB로 upsert. 적재 행수 반환."""
-    url = db_url or os.getenv("DEMAND_DB_URL", DEFAULT_DEMAND_DB_URL)
-    engine = create_engine(url)
+    url = db_url or getenv("DEMAND_DB_URL", DEFAULT_DEMAND_DB_URL)
+    engine = get_engine(url)
     df = _read_sukub(months_back)
     records = df.to_dict("records")
     with engine.begin() as conn:
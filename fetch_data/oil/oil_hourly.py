@@ -26,7 +26,6 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -34,6 +33,8 @@ from typing import Any
 import aiohttp
 import polars as pl
 
+from fetch_data.common.config import getenv
+from fetch_data.common import http
 from fetch_data.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -69,7 +70,7 @@ KST = timezone(timedelta(hours=9))
 
 
 def data_dir() -> Path:
-    return Path(os.getenv("OIL_DATA_DIR", DEFAULT_DATA_DIR)).resolve()
+    return Path(getenv("OIL_DATA_DIR", DEFAULT_DATA_DIR)).resolve()
 
 
 # ---------------------------------------------------------------------------
@@ -94,30 +95,29 @@ async def fetch_candles(
         },
     }
 
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            async with session.post(
-                API_URL,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SEC),
-            ) as resp:
-                if resp.status != 200:
-                    logger.warning(
-                        f"{coin}: HTTP {resp.status} (시도 {attempt}/{MAX_RETRIES})")
-                else:
-                    data = await resp.json(content_type=None)
-                    if isinstance(data, list):
-                        logger.info(f"{coin}: {len(data)} 캔들 수신")
-                        return data
-                    logger.warning(f"{coin}: 응답 형식 이상 ({type(data).__name__})")
-        except Exception as exc:  # noqa: BLE001
-            logger.error(f"{coin}: 예외 (시도 {attempt}/{MAX_RETRIES}) — {exc}")
-        if attempt < MAX_RETRIES:
-            await asyncio.sleep(RETRY_DELAY_SEC)
-
-    logger.error(f"{coin}: {MAX_RETRIES}회 모두 실패")
-    return []
+    try:
+        resp = await http.request(
+            "POST", API_URL, session=session, json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SEC),
+            retry=http.RetryPolicy(attempts=MAX_RETRIES, base=RETRY_DELAY_SEC),
+            ok=_is_candle_list, label=coin,
+        )
+    except http.HttpRequestError:
+        logger.error(f"{coin}: {MAX_RETRIES}회 모두 실패")
+        return []
+    data = resp.json()
+    logger.info(f"{coin}: {len(data)} 캔들 수신")
+    return data
+
+
+def _is_candle_list(resp: http.HttpResponse) -> bool:
+    if resp.status != 200:
+        return False
+    try:
+        return isinstance(resp.json(), list)
+    except ValueError:
+        return False
 
 
 def _candles_to_df(candles: list[dict[str, Any]], short_name: str) -> pl.DataFrame:
@@ -30,8 +30,9 @@ from typing import Optional
 
 import pandas as pd
 import requests
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+from fetch_data.common.db_base import get_engine
 from fetch_data.common.db_utils import resolve_db_url
 from fetch_data.common.generation_core import upsert_generation
 from fetch_data.common.logger import get_logger
@@ -142,7 +143,7 @@ def run(db_url: Optional[str] = None) -> int:
 
     url = resolve_db_url(db_url)
     n = upsert_generation(df, operator=OPERATOR, fuel_type=FUEL, db_url=url)
-    _update_master(raw, create_engine(url))
+    _update_master(raw, get_engine(url))
     return n
 
 
@@ -12,9 +12,10 @@ from typing import Optional
 
 import aiohttp
 import pandas as pd
-from sqlalchemy import create_engine
 
+from fetch_data.common import backfill as backfill_engine, response_cache
 from fetch_data.common.config import get_nambu_api_key
+from fetch_data.common.db_base import get_engine
 from fetch_data.common.db_utils import resolve_db_url, redact_db_url
 from fetch_data.common.logger import get_logger
 from fetch_data.common.utils import parse_hour_column
@@ -28,6 +29,7 @@ logger = get_logger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 ENDPOINT = NamebuAPI.ENDPOINT
+DEFAULT_SHARD_DAYS = 31
 
 
 from fetch_data.common.date_utils import (
@@ -48,6 +50,33 @@ def _log_debug(msg: str, debug: bool, debug_log: Optional[list[str]]) -> None:
     debug_log.append(msg)
 
 
+# data.go.kr 정상(00)·데이터 없음(03) 외의 응답(키 오류·요청 한도 초과 등)은 캐시하지 않는다.
+_CACHEABLE_RESULT_CODES = frozenset({"00", "03"})
+
+
+class NambuFetchError(RuntimeError):
+    """남부 API 요청 실패(HTTP 오류·오류 응답·전송 오류) — '데이터 없음' 과 구분한다."""
+
+
+def _api_error(raw: bytes) -> Optional[str]:
+    """응답 XML 이 정상/데이터 없음이 아니면 사유 문자열, 정상이면 None.
+
+    게이트웨이 오류(SERVICE_KEY_IS_NOT_REGISTERED_ERROR, LIMITED_NUMBER_OF_SERVICE_REQUESTS…)는
+    <cmmMsgHeader><returnReasonCode> 로 온다.
+    """
+    try:
+        root = ET.fromstring(raw)
+    except ET.ParseError:
+        return "XML 아님"
+    reason = root.findtext(".//returnReasonCode")
+    if reason:
+        return f"returnReasonCode={reason} {root.findtext('.//returnAuthMsg') or root.findtext('.//errMsg') or ''}".strip()
+    code = (root.findtext(".//resultCode") or "").strip()
+    if code not in _CACHEABLE_RESULT_CODES:
+        return f"resultCode={code or '?'} {root.findtext('.//resultMsg') or ''}".strip()
+    return None
+
+
 async def _fetch_api_days(
     session: aiohttp.ClientSession,
     api_key: str,
@@ -74,9 +103,9 @@ async def _fetch_api_days(
         req_kwargs = {"url": url}
     else:
         req_kwargs = {"url": ENDPOINT, "params": {"serviceKey": api_key, **params}}
-    try:
+    async def _get() -> Optional[bytes]:
         async with session.get(timeout=20, **req_kwargs) as resp:
-            text_body = await resp.text()
+            raw = await resp.read()
             if resp.status != 200:
                 if debug:
                     _log_debug(
@@ -89,37 +118,49 @@ async def _fetch_api_days(
                         debug,
                         debug_log,
                     )
-                    _log_debug(f"  - body: {text_body[:300]}", debug, debug_log)
-                return []
-            root = ET.fromstring(text_body)
-            if debug:
-                result_code = root.findtext(".//resultCode")
-                result_msg = root.findtext(".//resultMsg")
-                if result_code or result_msg:
-                    _log_debug(
-                        f"  - API resultCode={result_code} resultMsg={result_msg}",
-                        debug,
-                        debug_log,
-                    )
-            # 응답 포맷이 두 가지:
-            # 1) <items><item>...</item></items>
-            # 2) <items><ymd>...</ymd>...</items>
-            items = root.findall(".//item")
-            if items:
-                return [{child.tag: child.text for child in item} for item in items]
-
-            items_node = root.find(".//items")
-            if items_node is not None:
-                return [{child.tag: child.text for child in items_node}]
-            return []
-    except Exception:
+                    _log_debug(f"  - body: {raw[:300].decode('utf-8', errors='replace')}", debug, debug_log)
+                raise NambuFetchError(f"{start_str}~{end_str} {gencd}_{hogi} HTTP {resp.status}")
+        error = _api_error(raw)
+        if error is not None:
+            # 오류 응답은 캐시하지 않는다(fetch_cached 는 예외면 저장하지 않음)
+            raise NambuFetchError(f"{start_str}~{end_str} {gencd}_{hogi} API 오류 응답: {error}")
+        return raw
+
+    try:
+        raw = await response_cache.fetch_cached(
+            "nambu", ENDPOINT, params, _get, period_end=_to_date(end_str)
+        )
+        root = ET.fromstring(raw)
+        if debug:
+            result_code = root.findtext(".//resultCode")
+            result_msg = root.findtext(".//resultMsg")
+            if result_code or result_msg:
+                _log_debug(
+                    f"  - API resultCode={result_code} resultMsg={result_msg}",
+                    debug,
+                    debug_log,
+                )
+        # 응답 포맷이 두 가지:
+        # 1) <items><item>...</item></items>
+        # 2) <items><ymd>...</ymd>...</items>
+        items = root.findall(".//item")
+        if items:
+            return [{child.tag: child.text for child in item} for item in items]
+
+        items_node = root.find(".//items")
+        if items_node is not None:
+            return [{child.tag: child.text for child in items_node}]
+        return []
+    except Exception as e:
         if debug:
             _log_debug(
                 f"  - API 예외: {start_str}~{end_str} {gencd}_{hogi}",
                 debug,
                 debug_log,
             )
-        return []
+        if isinstance(e, NambuFetchError):
+            raise
+        raise NambuFetchError(f"{start_str}~{end_str} {gencd}_{hogi} {type(e).__name__}: {e}") from e
 
 
 def _rows_from_api_payload(payloads: list[dict]) -> pd.DataFrame:
@@ -156,83 +197,145 @@ def _rows_from_api_payload(payloads: list[dict]) -> pd.DataFrame:
     ].dropna(subset=["datetime", "gencd", "hogi"])
 
 
-async def backfill(
-    engine,
-    api_key: str,
-    targets: list[dict],
-    start: date,
-    end: date,
-    sleep_sec: float,
-    debug: bool,
-    debug_log: Optional[list[str]] = None,
-) -> tuple[int, int]:
-    total_days = 0
-    total_rows = 0
-
-    async with aiohttp.ClientSession() as session:
-        for t in targets:
-            gencd = t["gencd"]
-            hogi = t["hogi"]
-            name = t.get("plant_name") or f"{gencd}_{hogi}"
-
-            missing_days = find_incomplete_days(engine, t["plant_id"], start, end)
+class NambuBackfillSource:
+    """백필 엔진 어댑터: 샤드(기본 31일) 안에서 대상별 누락/미완성 일자만 받아 UPSERT.
+
+    --gencd/--hogi 로 대상을 좁힌 실행은 job 이름을 따로 써서(nambu_pv:gencd:hogi)
+    전체 대상 원장과 섞이지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        engine,
+        api_key: str,
+        targets: list[dict],
+        session: aiohttp.ClientSession,
+        sleep_sec: float,
+        debug: bool,
+        debug_log: Optional[list[str]] = None,
+        shard_days: int = DEFAULT_SHARD_DAYS,
+        job: str = "nambu_pv",
+    ):
+        self.name = job
+        self.engine = engine
+        self.api_key = api_key
+        self.targets = targets
+        self.session = session
+        self.sleep_sec = sleep_sec
+        self.debug = debug
+        self.debug_log = debug_log
+        self.shard_days = shard_days
+        self.days = 0
+
+    def shards(self, start: date, end: date):
+        return backfill_engine.day_shards(start, end, self.shard_days)
+
+    async def fetch(self, start: date, end: date):
+        """대상별 누락일을 받아 내보낸다. 실패한 날은 건너뛰고 계속 받은 뒤, 샤드 끝에서
+        NambuFetchError 로 알린다 — 받은 날은 적재되고 샤드는 failed 로 남아 다음 실행에서 다시 돈다."""
+        failed: list[str] = []
+        for t in self.targets:
+            name = t.get("plant_name") or f"{t['gencd']}_{t['hogi']}"
+            missing_days = await asyncio.to_thread(
+                find_incomplete_days, self.engine, t["plant_id"], start, end
+            )
             if not missing_days:
-                print(f"✅ {name}: 누락 없음")
+                print(f"✅ {name} {start}~{end}: 누락 없음")
                 continue
 
-            print(f"📡 {name}: 누락/미완성 {len(missing_days)}일 백필")
+            print(f"📡 {name} {start}~{end}: 누락/미완성 {len(missing_days)}일 백필")
             for d in missing_days:
                 day_str = _to_yyyymmdd(d)
-                payloads = await _fetch_api_days(
-                    session,
-                    api_key,
-                    day_str,
-                    day_str,
-                    gencd,
-                    hogi,
-                    debug=debug,
-                    debug_log=debug_log,
-                )
-                if not payloads:
-                    # 일부 날짜는 end가 다음날이어야 응답되는 케이스 보정
-                    next_day = _to_yyyymmdd(d + timedelta(days=1))
+                try:
                     payloads = await _fetch_api_days(
-                        session,
-                        api_key,
+                        self.session,
+                        self.api_key,
+                        day_str,
                         day_str,
-                        next_day,
-                        gencd,
-                        hogi,
-                        debug=debug,
-                        debug_log=debug_log,
+                        t["gencd"],
+                        t["hogi"],
+                        debug=self.debug,
+                        debug_log=self.debug_log,
                     )
-                payloads = [p for p in payloads if (p.get("ymd") or "").replace("-", "") == day_str]
-
-                if not payloads:
-                    print(f"  - {day_str}: API 응답 없음/실패")
-                    await asyncio.sleep(sleep_sec)
+                    if not payloads:
+                        # 일부 날짜는 end가 다음날이어야 응답되는 케이스 보정
+                        next_day = _to_yyyymmdd(d + timedelta(days=1))
+                        payloads = await _fetch_api_days(
+                            self.session,
+                            self.api_key,
+                            day_str,
+                            next_day,
+                            t["gencd"],
+                            t["hogi"],
+                            debug=self.debug,
+                            debug_log=self.debug_log,
+                        )
+                except NambuFetchError as e:
+                    print(f"  - {day_str}: ❌ API 실패 ({e})")
+                    failed.append(f"{name}:{day_str}")
                     continue
+                yield t, day_str, [p for p in payloads if (p.get("ymd") or "").replace("-", "") == day_str]
+                await asyncio.sleep(self.sleep_sec)
+        if failed:
+            raise NambuFetchError(f"{len(failed)}일 수집 실패: {', '.join(failed[:5])}{' ...' if len(failed) > 5 else ''}")
+
+    def parse(self, raw, start: date, end: date):
+        t, day_str, payloads = raw
+        if not payloads:
+            print(f"  - {day_str}: API 데이터 없음")
+            return None
+
+        df = _rows_from_api_payload(payloads)
+        if df.empty:
+            print(f"  - {day_str}: 변환 결과 없음")
+            return None
+
+        # 신규 코어(plants/generation)에 직접 UPSERT
+        core_df = df.rename(
+            columns={"datetime": "timestamp", "gencd": "plant_code", "hogi": "unit_no"}
+        )[["timestamp", "plant_name", "unit_no", "plant_code", "generation"]].copy()
+        core_df["plant_name"] = t["plant_name"]
+        return day_str, core_df
+
+    def load(self, parsed, start: date, end: date) -> int:
+        day_str, core_df = parsed
+        upsert_generation(core_df, operator="nambu", fuel_type="solar", engine=self.engine)
+        self.days += 1
+        print(f"  - {day_str}: ✅ {len(core_df)}행 적재")
+        return len(core_df)
 
-                df = _rows_from_api_payload(payloads)
-                if df.empty:
-                    print(f"  - {day_str}: 변환 결과 없음")
-                    await asyncio.sleep(sleep_sec)
-                    continue
 
-                # 신규 코어(plants/generation)에 직접 UPSERT
-                core_df = df.rename(
-                    columns={"datetime": "timestamp", "gencd": "plant_code", "hogi": "unit_no"}
-                )[["timestamp", "plant_name", "unit_no", "plant_code", "generation"]].copy()
-                core_df["plant_name"] = t["plant_name"]
-                upsert_generation(core_df, operator="nambu", fuel_type="solar", engine=engine)
-
-                total_days += 1
-                total_rows += len(df)
-                print(f"  - {day_str}: ✅ {len(df)}행 적재")
-
-                await asyncio.sleep(sleep_sec)
+async def backfill(
+    engine,
+    api_key: str,
+    targets: list[dict],
+    start: date,
+    end: date,
+    sleep_sec: float,
+    debug: bool,
+    debug_log: Optional[list[str]] = None,
+    ledger=None,
+    concurrency: int = 1,
+    restart: bool = False,
+    job: str = "nambu_pv",
+) -> tuple[int, int]:
+    """[start, end] 를 샤드로 나눠 백필한다. 반환: (처리 일수, 적재 행수).
 
-    return total_days, total_rows
+    ledger 가 DbLedger 면 끝난 샤드는 다음 실행에서 건너뛴다. 샤드 안의 일자 선별은
+    여전히 generation 의 시간 수(24 미만)로 하므로, 원장 없이 다시 돌려도 안전하다.
+    """
+    async with aiohttp.ClientSession() as session:
+        source = NambuBackfillSource(
+            engine, api_key, targets, session, sleep_sec, debug, debug_log, job=job
+        )
+        report = await backfill_engine.run_backfill(
+            source, start, end, ledger=ledger, concurrency=concurrency, restart=restart
+        )
+    if not report.ok:
+        raise RuntimeError(
+            f"Nambu 백필 실패 샤드: {', '.join(f'{s}~{e}' for s, e in report.failed)}"
+        )
+    return source.days, report.rows
 
 
 def main() -> None:
@@ -250,7 +353,11 @@ def main() -> None:
     )
     parser.add_argument("--debug", action="store_true", help="API 응답 디버그 로그 출력")
     parser.add_argument("--debug-slack", action="store_true", help="디버그 로그를 Slack으로 전송 (최대 50줄)")
+    parser.add_argument("--concurrency", default=1, type=int, help="동시에 도는 샤드(31일) 수")
+    backfill_engine.add_cli_args(parser)
+    response_cache.add_cli_args(parser)
     args = parser.parse_args()
+    response_cache.configure_from_args(args)
 
     api_key = get_nambu_api_key()
     db_url = resolve_db_url(args.db_url)
@@ -270,7 +377,7 @@ def main() -> None:
         raise ValueError("end가 start보다 빠릅니다.")
 
     logger.info(f"DB_URL: {redact_db_url(db_url)}")
-    engine = create_engine(db_url)
+    engine = get_engine(db_url)
     targets = get_nambu_targets(engine, args.gencd, args.hogi)
     if not targets:
         raise RuntimeError("plants에서 Nambu 대상 발전소(gencd/hogi)를 찾지 못했습니다.")
@@ -282,7 +389,13 @@ def main() -> None:
     try:
         debug_log: Optional[list[str]] = [] if args.debug_slack else None
         days, rows = asyncio.run(
-            backfill(engine, api_key, targets, start, end, args.sleep_sec, args.debug, debug_log)
+            backfill(
+                engine, api_key, targets, start, end, args.sleep_sec, args.debug, debug_log,
+                ledger=backfill_engine.ledger_from_args(args, db_url),
+                concurrency=args.concurrency,
+                restart=args.restart,
+                job=":".join(str(x) for x in ("nambu_pv", args.gencd, args.hogi) if x is not None),
+            )
         )
         msg = f"{title}\n- 처리 일수: {days}\n- 적재 행수: {rows}"
         logger.info(msg)
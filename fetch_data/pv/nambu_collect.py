@@ -1,21 +1,21 @@
 import asyncio
 import aiohttp
+import functools
 import json
 import pandas as pd
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
 
+from fetch_data.common import http
 from fetch_data.common.config import get_nambu_api_key
-from fetch_data.common.db_utils import resolve_db_url
+from fetch_data.common.db_base import get_engine
 from fetch_data.common.logger import get_logger
 from fetch_data.common.utils import now_kst, parse_hour_column
 from fetch_data.constants import NamebuAPI
 from fetch_data.common.generation_core import upsert_generation
 from fetch_data.pv.nambu_state import (
     collection_start,
-    count_hours_for_day,
     get_nambu_targets,
 )
 
@@ -25,13 +25,18 @@ logger = get_logger(__name__)
 current_file = Path(__file__).resolve()
 PROJECT_ROOT = current_file.parent.parent.parent
 
-# plant.json에서 gencd -> plant_name 매핑 로드 (파일이 없으면 빈 dict)
 _PLANT_JSON = PROJECT_ROOT / "config" / "plant.json"
-GENCD_TO_NAME: dict[str, str] = {}
-if _PLANT_JSON.exists():
-    with open(_PLANT_JSON, "r", encoding="utf-8") as _f:
-        for _p in json.load(_f):
-            GENCD_TO_NAME.setdefault(_p["plant_code"], _p["plant_name"])
+
+
+@functools.lru_cache(maxsize=1)
+def gencd_to_name() -> dict[str, str]:
+    """plant.json 의 gencd -> plant_name 매핑 (첫 호출 때 1회 로드, 파일이 없으면 빈 dict)."""
+    mapping: dict[str, str] = {}
+    if _PLANT_JSON.exists():
+        with open(_PLANT_JSON, "r", encoding="utf-8") as f:
+            for p in json.load(f):
+                mapping.setdefault(p["plant_code"], p["plant_name"])
+    return mapping
 
 ENDPOINT = NamebuAPI.ENDPOINT
 
@@ -49,19 +54,18 @@ def _get_api_key() -> str:
 def _get_engine():
     global _engine
     if _engine is None:
-        _engine = create_engine(resolve_db_url())
+        _engine = get_engine()
     return _engine
 
 def get_active_targets(engine_):
-    """Core 테이블의 마지막 기록을 기준으로 수집 시작일을 결정합니다."""
+    """Core 테이블의 마지막 기록(수집 경계 한 번 조회)을 기준으로 수집 시작일을 결정합니다."""
     active_targets = []
     today = now_kst().date()
     yesterday = today - timedelta(days=1)
 
     for target in get_nambu_targets(engine_):
         last_dt = target["last_dt"]
-        hours = count_hours_for_day(engine_, target["plant_id"], last_dt.date()) if last_dt else 0
-        start_dt = collection_start(last_dt, hours, today)
+        start_dt = collection_start(last_dt, target["last_day_hours"], today)
         if start_dt is None:
             logger.info(
                 f"{target['gencd']} ({target['hogi']}호기): "
@@ -76,88 +80,170 @@ def get_active_targets(engine_):
     return active_targets
 
 # --- [Task 2: API 데이터 수집 및 전처리] ---
-async def fetch_api_data(session, date_str, gencd, hogi):
-    """API 호출 (strHoki 파라미터 사용)"""
+# 한 요청이 덮는 최대 일수. 응답은 (일자 × 호기) 1행이라 numOfRows=100 안에 들어간다.
+WINDOW_DAYS = 31
+# 한 웨이브에 띄우는 (발전소 × 기간) 요청 수. 웨이브가 끝나면 파싱 결과를 한 번에 적재한다.
+WAVE_SIZE = 64
+
+
+def _parse_items(body: bytes) -> list[dict]:
+    """응답 XML → item dict 목록. <items><item>…</item></items>(여러 날) 와
+    <items><ymd>…</ymd>…</items>(하루) 두 포맷을 모두 받는다."""
+    root = ET.fromstring(body)
+    items = root.findall(".//item")
+    if items:
+        return [{child.tag: child.text for child in item} for item in items]
+    items_node = root.find(".//items")
+    if items_node is not None and len(items_node):
+        return [{child.tag: child.text for child in items_node}]
+    return []
+
+
+def plan_windows(start, end) -> list[tuple[str, str]]:
+    """[start, end] 일자 구간 → WINDOW_DAYS 이하 (YYYYMMDD, YYYYMMDD) 창."""
+    windows = []
+    cur = start
+    while cur <= end:
+        last = min(cur + timedelta(days=WINDOW_DAYS - 1), end)
+        windows.append((cur.strftime("%Y%m%d"), last.strftime("%Y%m%d")))
+        cur = last + timedelta(days=1)
+    return windows
+
+
+async def fetch_api_data(session, start_str, end_str, gencd, hogi) -> list[dict] | None:
+    """[start_str, end_str] 구간 API 호출 (strHoki 파라미터 사용). 실패 시 None(데이터 없음은 []).
+
+    strEdate 는 하루 뒤로 보낸다 — 일부 날짜는 end 가 다음날이어야 응답된다
+    (nambu_backfill 에서 확인된 보정). 구간 밖 ymd 는 버린다.
+    data.go.kr 호스트 정책(토큰 버킷 + AIMD 동시성)이 전체 요청 속도를 묶는다.
+    """
+    next_day = (datetime.strptime(end_str, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d")
     params = {
         "serviceKey": _get_api_key(), "pageNo": "1", "numOfRows": "100",
-        "strSdate": date_str, "strEdate": date_str,
+        "strSdate": start_str, "strEdate": next_day,
         "strOrgCd": gencd, "strHoki": str(hogi)
     }
     try:
-        async with session.get(ENDPOINT, params=params, timeout=15) as response:
-            if response.status != 200: return None
-            root = ET.fromstring(await response.text())
-            items = root.find('.//items')
-            return {child.tag: child.text for child in items} if items is not None else None
-    except Exception as e:
-        logger.error(f"API 호출 실패: {e}")
+        resp = await http.request(
+            "GET", ENDPOINT, session=session, params=params, timeout=aiohttp.ClientTimeout(total=15),
+            retry=http.RetryPolicy(attempts=3, base=1.0),
+            label=f"nambu {gencd}_{hogi} {start_str}~{end_str}",
+        )
+        items = _parse_items(resp.body)
+    except (http.HttpRequestError, ET.ParseError) as e:
+        logger.error(f"API 호출 실패 {gencd}_{hogi} {start_str}~{end_str}: {e}")
         return None
+    return [
+        item for item in items
+        if start_str <= (item.get("ymd") or "").replace("-", "") <= end_str
+    ]
+
+
+def _to_core_frame(raw_data: list[dict], target: dict) -> pd.DataFrame:
+    """API item 목록 → 코어 generation 적재 DataFrame (24시간 데이터를 세로로 변환)."""
+    df_raw = pd.DataFrame(raw_data)
+    v_vars = [c for c in df_raw.columns if c.startswith('qhorgen')]
+    df_long = df_raw.melt(id_vars=["ymd", "hogi", "gencd", "ipptnm", "qvodgen", "qvodavg", "qvodmax", "qvodmin"], value_vars=v_vars,
+                          var_name='h_str', value_name='generation')
+
+    df_long["hour0"] = df_long["h_str"].apply(parse_hour_column).astype(int)
+    df_long["datetime"] = pd.to_datetime(df_long["ymd"]) + pd.to_timedelta(df_long["hour0"], unit="h")
+    df_long["generation"] = pd.to_numeric(df_long["generation"], errors="coerce").fillna(0)
+    df_long["plant_name"] = df_long["ipptnm"]
+    # API 응답에 ipptnm이 없는 경우 plant.json 매핑으로 대체
+    names = gencd_to_name()
+    if names:
+        mask_na = df_long["plant_name"].isna() | (df_long["plant_name"].astype(str) == "None")
+        df_long.loc[mask_na, "plant_name"] = df_long.loc[mask_na, "gencd"].map(names)
+    df_long["hogi"] = pd.to_numeric(df_long["hogi"], errors="coerce").astype("Int64")
+
+    final_df = df_long[["datetime", "gencd", "plant_name", "hogi", "generation"]].dropna(
+        subset=["datetime", "gencd", "hogi"]
+    )
+
+    # 신규 코어(plants/generation)에 직접 UPSERT
+    core_df = final_df.rename(
+        columns={"datetime": "timestamp", "gencd": "plant_code", "hogi": "unit_no"}
+    )[["timestamp", "plant_name", "unit_no", "plant_code", "generation"]].copy()
+    core_df["plant_name"] = target["plant_name"]
+    return core_df
+
+
+class _FetchFailed:
+    """창 요청 실패 표시 — 빈 응답(None 프레임)과 구분한다."""
+
+
+FETCH_FAILED = _FetchFailed()
+
+
+async def _fetch_item(session, target: dict, start_str: str, end_str: str):
+    """창 하나 → 코어 프레임, 빈 응답이면 None, 요청 실패면 FETCH_FAILED."""
+    raw_data = await fetch_api_data(session, start_str, end_str, target["gencd"], target["hogi"])
+    if raw_data is None:
+        return FETCH_FAILED
+    for data in raw_data:
+        data["gencd"], data["hogi"] = target["gencd"], str(target["hogi"])
+    if not raw_data:
+        logger.warning(f"{target.get('plant_name') or target['gencd']} ({target['hogi']}호기) {start_str}~{end_str}: 응답 없음")
+        return None
+    return _to_core_frame(raw_data, target)
+
+
+def _load_wave(engine_, frames: list[pd.DataFrame]) -> int:
+    if not frames:
+        return 0
+    core_df = pd.concat(frames, ignore_index=True)
+    return upsert_generation(core_df, operator="nambu", fuel_type="solar", engine=engine_)
+
 
 async def collect_and_save(engine_, targets):
-    """활성 발전소들에 대해 API 데이터를 수집하고 전처리하여 DB에 저장"""
+    """활성 발전소들에 대해 API 데이터를 수집하고 전처리하여 DB에 저장.
+
+    (발전소 × 최대 31일 창) 작업을 WAVE_SIZE 개씩 웨이브로 동시에 띄운다. 동시성과
+    초당 요청 수는 data.go.kr 호스트 정책이 전역으로 제한한다. 웨이브의 파싱 결과는
+    한 번의 upsert_generation 으로 적재하고, 그 적재(스레드)는 다음 웨이브 수신과 겹친다.
+
+    한 발전소의 창 요청이 실패하면 그 창 이후 창은 적재하지 않는다(이후 웨이브에서는 요청도
+    안 함) — 뒤 창이 적재되면 collection_frontier 가 구멍을 넘어가 다음 실행이 다시 보지 않는다.
+    """
     yesterday = now_kst().replace(tzinfo=None) - timedelta(days=1)
-    total_rows = 0
+    items = []
+    for target in targets:
+        windows = plan_windows(target["start_dt"].date(), yesterday.date())
+        if not windows:
+            continue
+        days = (yesterday.date() - target["start_dt"].date()).days + 1
+        logger.info(f"{target.get('plant_name') or target['gencd']} ({target['hogi']}호기) {days}일분 수집 예정 ({len(windows)}회 요청)")
+        items.extend((target, start_str, end_str) for start_str, end_str in windows)
 
+    waves = [items[i:i + WAVE_SIZE] for i in range(0, len(items), WAVE_SIZE)]
+    total_rows = 0
+    loading = None
     async with aiohttp.ClientSession() as session:
-        for target in targets:
-            date_list = pd.date_range(start=target["start_dt"].date(), end=yesterday.date()).strftime("%Y%m%d").tolist()
-            if not date_list: continue
-
-            logger.info(f"{target.get('plant_name') or target['gencd']} ({target['hogi']}호기) {len(date_list)}일분 수집 중...")
-
-            raw_data = []
-            for d_str in date_list:
-                data = await fetch_api_data(session, d_str, target["gencd"], target["hogi"])
-                if data:
-                    data["gencd"], data["hogi"] = target["gencd"], str(target["hogi"])
-                    raw_data.append(data)
-                await asyncio.sleep(0.05)
-
-            if raw_data:
-                # 전처리: 24시간 데이터를 세로로 변환
-                df_raw = pd.DataFrame(raw_data)
-                v_vars = [c for c in df_raw.columns if c.startswith('qhorgen')]
-                df_long = df_raw.melt(id_vars=["ymd", "hogi", "gencd", "ipptnm", "qvodgen", "qvodavg", "qvodmax", "qvodmin"], value_vars=v_vars,
-                                      var_name='h_str', value_name='generation')
-
-                df_long["hour0"] = df_long["h_str"].apply(parse_hour_column).astype(int)
-                df_long["datetime"] = pd.to_datetime(df_long["ymd"]) + pd.to_timedelta(df_long["hour0"], unit="h")
-                df_long["generation"] = pd.to_numeric(df_long["generation"], errors="coerce").fillna(0)
-                df_long["daily_total"] = pd.to_numeric(df_long["qvodgen"], errors="coerce")
-                df_long["daily_avg"] = pd.to_numeric(df_long["qvodavg"], errors="coerce")
-                df_long["daily_max"] = pd.to_numeric(df_long["qvodmax"], errors="coerce")
-                df_long["daily_min"] = pd.to_numeric(df_long["qvodmin"], errors="coerce")
-                df_long["plant_name"] = df_long["ipptnm"]
-                # API 응답에 ipptnm이 없는 경우 plant.json 매핑으로 대체
-                if GENCD_TO_NAME:
-                    mask_na = df_long["plant_name"].isna() | (df_long["plant_name"].astype(str) == "None")
-                    df_long.loc[mask_na, "plant_name"] = df_long.loc[mask_na, "gencd"].map(GENCD_TO_NAME)
-                df_long["hogi"] = pd.to_numeric(df_long["hogi"], errors="coerce").astype("Int64")
-
-                final_df = df_long[
-                    [
-                        "datetime",
-                        "gencd",
-                        "plant_name",
-                        "hogi",
-                        "generation",
-                        "daily_total",
-                        "daily_avg",
-                        "daily_max",
-                        "daily_min",
-                    ]
-                ].dropna(subset=["datetime", "gencd", "hogi"])
-
-                # 신규 코어(plants/generation)에 직접 UPSERT
-                core_df = final_df.rename(
-                    columns={"datetime": "timestamp", "gencd": "plant_code", "hogi": "unit_no"}
-                )[["timestamp", "plant_name", "unit_no", "plant_code", "generation"]].copy()
-                core_df["plant_name"] = target["plant_name"]
-                upsert_generation(core_df, operator="nambu", fuel_type="solar", engine=engine_)
-
-                total_rows += len(final_df)
-                logger.info(f"   -> {len(final_df)}행 저장 완료")
+        stopped: set = set()  # 창 요청이 실패한 (gencd, hogi) — 수집 경계를 그 창 앞에 둔다
+        for n, wave in enumerate(waves, start=1):
+            wave = [item for item in wave if (item[0]["gencd"], item[0]["hogi"]) not in stopped]
+            frames = await asyncio.gather(*(_fetch_item(session, *item) for item in wave))
+            kept = []
+            for (target, start_str, _), frame in zip(wave, frames):  # 발전소별 창은 날짜순
+                key = (target["gencd"], target["hogi"])
+                if frame is FETCH_FAILED and key not in stopped:
+                    stopped.add(key)
+                    logger.warning(
+                        f"{target.get('plant_name') or target['gencd']} ({target['hogi']}호기) "
+                        f"{start_str}~ 수집 실패 — 이후 창은 다음 실행에서 다시"
+                    )
+                if key in stopped or frame is None:
+                    continue
+                kept.append(frame)
+            if loading is not None:
+                total_rows += await loading
+            loading = asyncio.create_task(asyncio.to_thread(_load_wave, engine_, kept))
+            logger.info(f"웨이브 {n}/{len(waves)}: {len(wave)}개 요청 완료")
+        if loading is not None:
+            total_rows += await loading
 
+    logger.info(f"   -> 총 {total_rows}행 저장 완료")
     return total_rows
 
 def solar_automation_flow():
@@ -4,34 +4,9 @@ from datetime import date, datetime, timedelta
 
 from sqlalchemy import text
 
+from fetch_data.common.coverage import observed_days
+from fetch_data.common.generation_core import collection_frontier
 
-_TARGETS = text(
-    """
-    SELECT
-      p.plant_id,
-      p.plant_code AS gencd,
-      p.unit_no AS hogi,
-      p.plant_name,
-      MAX(g.timestamp) AS last_dt
-    FROM plants p
-    LEFT JOIN generation g ON g.plant_id = p.plant_id
-    WHERE p.operator = 'nambu'
-      AND p.fuel_type = 'solar'
-      AND p.plant_code IS NOT NULL
-    GROUP BY p.plant_id, p.plant_code, p.unit_no, p.plant_name
-    ORDER BY p.plant_code, p.unit_no
-    """
-)
-
-_HOURS_FOR_DAY = text(
-    """
-    SELECT COUNT(DISTINCT EXTRACT(HOUR FROM timestamp))
-    FROM generation
-    WHERE plant_id = :plant_id
-      AND timestamp >= :day_start
-      AND timestamp < :day_end
-    """
-)
 
 _HOURS_BY_DAY = text(
     """
@@ -61,46 +36,29 @@ def collection_start(
 
 
 def get_nambu_targets(engine, gencd: str | None = None, hogi: int | None = None) -> list[dict]:
-    with engine.connect() as conn:
-        rows = conn.execute(_TARGETS).mappings().all()
-
+    """Nambu solar units with their collection frontier (one set-based query)."""
     targets = []
-    for row in rows:
-        target_code = str(row["gencd"]).strip()
-        target_unit = int(str(row["hogi"]).strip())
+    for row in collection_frontier(engine, "nambu", "solar", require_code=True):
+        target_code = str(row.plant_code).strip()
+        target_unit = int(str(row.unit_no).strip())
         if gencd and target_code != gencd:
             continue
         if hogi is not None and target_unit != hogi:
             continue
         targets.append(
             {
-                "plant_id": int(row["plant_id"]),
+                "plant_id": row.plant_id,
                 "gencd": target_code,
                 "hogi": target_unit,
-                "plant_name": row["plant_name"],
-                "last_dt": row["last_dt"],
+                "plant_name": row.plant_name,
+                "last_dt": row.last_ts,
+                "last_day_hours": row.last_day_hours,
             }
         )
     return targets
 
 
-def count_hours_for_day(engine, plant_id: int, day: date) -> int:
-    day_start = datetime.combine(day, datetime.min.time())
-    with engine.connect() as conn:
-        hours = conn.execute(
-            _HOURS_FOR_DAY,
-            {
-                "plant_id": plant_id,
-                "day_start": day_start,
-                "day_end": day_start + timedelta(days=1),
-            },
-        ).scalar()
-    return int(hours or 0)
-
-
-def find_incomplete_days(
-    engine, plant_id: int, start: date, end: date
-) -> list[date]:
+def _hours_by_day(engine, plant_id: int, start: date, end: date) -> dict[date, int]:
     start_dt = datetime.combine(start, datetime.min.time())
     end_dt = datetime.combine(end + timedelta(days=1), datetime.min.time())
     with engine.connect() as conn:
@@ -108,10 +66,23 @@ def find_incomplete_days(
             _HOURS_BY_DAY,
             {"plant_id": plant_id, "start_dt": start_dt, "end_dt": end_dt},
         ).mappings()
-        complete = {row["day"] for row in rows if int(row["hours"] or 0) >= 24}
+        return {row["day"]: int(row["hours"] or 0) for row in rows}
+
+
+def find_incomplete_days(
+    engine, plant_id: int, start: date, end: date
+) -> list[date]:
+    """Days with fewer than 24 loaded hours, read from data_coverage.
+
+    Falls back to counting generation rows when the ledger has nothing for the
+    window yet (loaded before the ledger existed and not seeded).
+    """
+    hours = observed_days(engine, "generation", plant_id, start, end)
+    if not hours:
+        hours = _hours_by_day(engine, plant_id, start, end)
 
     return [
         start + timedelta(days=offset)
         for offset in range((end - start).days + 1)
-        if start + timedelta(days=offset) not in complete
+        if hours.get(start + timedelta(days=offset), 0) < 24
     ]
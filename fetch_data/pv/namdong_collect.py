@@ -1,15 +1,19 @@
 import asyncio
-import os
+import functools
+import hashlib
+import json
 import re
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
 import pandas as pd
-from prefect import task
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+from fetch_data.common import http
+from fetch_data.common.config import getenv
+from fetch_data.common.db_base import get_engine
 from fetch_data.common.db_utils import resolve_db_url
 from fetch_data.common.logger import get_logger
 from fetch_data.common.utils import now_kst
@@ -33,13 +37,30 @@ MAIN_URL = f"{BASE}/kosep/gv/nf/dt/nfdt21/main.do"
 
 # 저장 폴더
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
-_output_dir_env = os.getenv("NAMDONG_OUTPUT_DIR")
-OUTPUT_DIR = Path(_output_dir_env) if _output_dir_env else (PROJECT_ROOT / "pv_data_raw")
-NAMDONG_START_DATE = os.getenv("NAMDONG_START_DATE")
-NAMDONG_ORG_NO = os.getenv("NAMDONG_ORG_NO", "").strip()
-NAMDONG_HOKI_S = os.getenv("NAMDONG_HOKI_S", "").strip()
-NAMDONG_HOKI_E = os.getenv("NAMDONG_HOKI_E", "").strip()
-NAMDONG_PAGE_INDEX = os.getenv("NAMDONG_PAGE_INDEX", "1").strip() or "1"
+
+
+@functools.lru_cache(maxsize=1)
+def output_dir() -> Path:
+    """원본 CSV 저장 폴더 — NAMDONG_OUTPUT_DIR, 없으면 pv_data_raw (첫 호출 때 1회 읽는다)."""
+    env = getenv("NAMDONG_OUTPUT_DIR")
+    return Path(env) if env else (PROJECT_ROOT / "pv_data_raw")
+
+
+@functools.lru_cache(maxsize=1)
+def _env_settings() -> Dict[str, str]:
+    """NAMDONG_* 수집 조건(시작일·기관·호기 범위·페이지). 첫 호출 때 1회 읽는다."""
+    return {
+        "start_date": getenv("NAMDONG_START_DATE") or "",
+        "org_no": getenv("NAMDONG_ORG_NO", "").strip(),
+        "hoki_s": getenv("NAMDONG_HOKI_S", "").strip(),
+        "hoki_e": getenv("NAMDONG_HOKI_E", "").strip(),
+        "page_index": getenv("NAMDONG_PAGE_INDEX", "1").strip() or "1",
+    }
+
+
+# 받은 구간 기록(output_dir() 안). 동시에 받는 월 수 — 요청 간격은 koenergy.kr 호스트 예산이 정한다.
+MANIFEST_NAME = "_manifest.json"
+DEFAULT_CONCURRENCY = 4
 
 
 # -------------------------
@@ -88,7 +109,7 @@ def tag_for_filename(org_no: str, hoki_s: str, hoki_e: str) -> str:
 
 
 # -------------------------
-# Backfill helpers
+# Download manifest
 # -------------------------
 def _parse_date_range_from_filename(name: str) -> Optional[Tuple[str, str]]:
     m = re.search(r"_(\d{8})-(\d{8})\.csv$", name)
@@ -97,22 +118,96 @@ def _parse_date_range_from_filename(name: str) -> Optional[Tuple[str, str]]:
     return m.group(1), m.group(2)
 
 
+def _csv_rows(body: bytes) -> int:
+    """헤더를 뺀 비어 있지 않은 줄 수(인코딩 무관)."""
+    return max(sum(1 for line in body.splitlines() if line.strip()) - 1, 0)
+
+
+class DownloadManifest:
+    """output_dir()/_manifest.json — 받은 월 구간별 checksum·바이트·행수와 마지막 적재 checksum.
+
+    재개 지점(resume_from)과 "내용이 바뀌었나" 판정을 파일 목록 glob·파일명 정규식 파싱 없이
+    manifest 한 번 읽기로 끝낸다. manifest 가 없는 기존 폴더는 처음 한 번 CSV 를 훑어
+    만든다(예전 수집기는 받자마자 적재했으므로 적재 완료로 기록).
+
+    월은 병렬로 받으므로 앞 달이 실패하고 뒤 달이 성공할 수 있다 — 실패한 구간은
+    failed 에 남겨 다음 실행이 그 달부터 다시 받는다.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / MANIFEST_NAME
+        self.files: Dict[str, dict] = {}
+        self.failed: Dict[str, str] = {}  # 실패한 구간 시작 -> 끝 (YYYYMMDD)
+        if self.path.exists():
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+            self.files = saved.get("files", {})
+            self.failed = saved.get("failed", {})
+        elif output_dir.exists():
+            self._adopt(output_dir)
+
+    def _adopt(self, output_dir: Path) -> None:
+        for fp in sorted(output_dir.glob("south_pv_*.csv")):
+            parsed = _parse_date_range_from_filename(fp.name)
+            if parsed:
+                self.record(fp, fp.read_bytes(), *parsed)
+                self.files[fp.name]["loaded_sha256"] = self.files[fp.name]["sha256"]
+        if self.files:
+            logger.info(f"[manifest] 기존 CSV {len(self.files)}개로 manifest 생성")
+            self.save()
+
+    def record(self, path: Path, body: bytes, ds: str, de: str) -> bool:
+        """받은 구간을 기록. 마지막 적재본과 내용이 다르면(신규 포함) True."""
+        prev = self.files.get(path.name, {})
+        digest = hashlib.sha256(body).hexdigest()
+        self.files[path.name] = {
+            "start": ds,
+            "end": de,
+            "sha256": digest,
+            "bytes": len(body),
+            "rows": _csv_rows(body),
+            "downloaded_at": now_kst().strftime("%Y-%m-%d %H:%M:%S"),
+            "loaded_sha256": prev.get("loaded_sha256"),
+        }
+        return digest != prev.get("loaded_sha256")
+
+    def mark_loaded(self, paths: List[Path]) -> None:
+        for fp in paths:
+            entry = self.files.get(fp.name)
+            if entry is not None:
+                entry["loaded_sha256"] = entry["sha256"]
+        self.save()
+
+    def mark_failed(self, ds: str, de: str) -> None:
+        self.failed[ds] = de
+
+    def clear_failed(self, ds: str) -> None:
+        self.failed.pop(ds, None)
+
+    def latest_end(self) -> Optional[date]:
+        ends = [entry["end"] for entry in self.files.values()]
+        return _to_date_yyyymmdd(max(ends)) if ends else None
+
+    def resume_from(self) -> Optional[date]:
+        """다음 수집 시작일: 실패한 구간 중 가장 이른 시작, 없으면 latest_end 다음 날."""
+        if self.failed:
+            return _to_date_yyyymmdd(min(self.failed))
+        latest = self.latest_end()
+        return latest + timedelta(days=1) if latest else None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"files": self.files, "failed": self.failed}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
+
+
 def get_latest_collected_date(output_dir: Path) -> Optional[date]:
     if not output_dir.exists():
         return None
-    latest: Optional[date] = None
-    for fp in output_dir.glob("south_pv_*.csv"):
-        parsed = _parse_date_range_from_filename(fp.name)
-        if not parsed:
-            continue
-        _, end_str = parsed
-        try:
-            end_dt = _to_date_yyyymmdd(end_str)
-        except Exception:
-            continue
-        if latest is None or end_dt > latest:
-            latest = end_dt
-    return latest
+    return DownloadManifest(output_dir).latest_end()
 
 
 def resolve_backfill_range(
@@ -123,11 +218,11 @@ def resolve_backfill_range(
     if target_start:
         start_dt = _to_date_yyyymmdd(_validate_yyyymmdd(target_start))
     else:
-        latest = get_latest_collected_date(output_dir)
-        if latest:
-            start_dt = latest + timedelta(days=1)
-        elif NAMDONG_START_DATE:
-            start_dt = _to_date_yyyymmdd(_validate_yyyymmdd(NAMDONG_START_DATE))
+        resume = DownloadManifest(output_dir).resume_from() if output_dir.exists() else None
+        if resume:
+            start_dt = resume
+        elif _env_settings()["start_date"]:
+            start_dt = _to_date_yyyymmdd(_validate_yyyymmdd(_env_settings()["start_date"]))
         else:
             start_dt = date.today() - timedelta(days=365)
 
@@ -142,6 +237,67 @@ def resolve_backfill_range(
 # -------------------------
 # Main downloader
 # -------------------------
+def _is_csv_response(resp: http.HttpResponse) -> bool:
+    return resp.status == 200 and "csv" in resp.content_type and is_probably_csv(resp.body, min_len=2000)
+
+
+def _is_block_page(resp: http.HttpResponse) -> bool:
+    return "csv" not in resp.content_type and http.looks_blocked(
+        resp.status, resp.body[:4000].decode("utf-8", errors="ignore")
+    )
+
+
+async def _fetch_month(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    page_index: str,
+    org_no: str,
+    hoki_s: str,
+    hoki_e: str,
+    ds: str,
+    de: str,
+) -> Optional[bytes]:
+    """한 달치 CSV. 쿠키 확보용 main.do GET → csvDown POST. 실패하면 None
+    (download_monthly_csvs 가 manifest.failed 에 남겨 다음 실행이 그 달부터 다시 받는다)."""
+    main_url = build_main_url(page_index, org_no, hoki_s, hoki_e, ds, de)
+    data = {
+        "pageIndex": page_index,
+        "menuCd": MENU_CD,
+        "xmlText": "",
+        "strOrgNo": org_no,   # 빈값이면 전체
+        "strHokiS": hoki_s,   # 빈값이면 전체
+        "strHokiE": hoki_e,   # 빈값이면 전체
+        "strDateS": ds,
+        "strDateE": de,
+        "ptSignature": "",
+    }
+    headers = {
+        "Origin": BASE,
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Referer": main_url,
+    }
+    async with sem:
+        try:
+            await http.request(
+                "GET", main_url, session=session, timeout=aiohttp.ClientTimeout(total=30),
+                retry=http.RetryPolicy(attempts=2, base=3.0), label="namdong-pv",
+            )
+        except http.HttpRequestError as e:
+            logger.warning(f"main.do GET 실패 {ds}~{de}: {e}")
+            return None
+        try:
+            resp = await http.request(
+                "POST", CSV_URL, session=session, data=data, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=120),
+                retry=http.RetryPolicy(attempts=2, base=3.0),
+                ok=_is_csv_response, is_blocked=_is_block_page, label="namdong-pv",
+            )
+        except http.HttpRequestError as e:
+            logger.warning(f"csvDown POST 실패/비정상 응답 {ds}~{de}: {e}")
+            return None
+    return resp.body
+
+
 async def download_monthly_csvs(
     page_index: str,
     org_no: str,
@@ -149,91 +305,66 @@ async def download_monthly_csvs(
     hoki_e: str,
     date_s: str,
     date_e: str,
-    sleep_sec: int = 5,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    manifest: Optional[DownloadManifest] = None,
 ) -> List[Path]:
+    """월 구간을 제한 병렬로 받아 저장하고, 마지막 적재 이후 내용이 바뀐 파일만 돌려준다.
+
+    한 세션·커넥터(koen SSL 컨텍스트)를 공유한다. 구간 사이 고정 대기 대신
+    koenergy.kr 호스트 예산(http.HOST_POLICIES — 토큰 버킷 + 차단 시 동시성 절반)이
+    요청 간격을 정하고, concurrency 는 동시에 진행하는 월 수의 상한이다.
+    달마다 끝나는 대로 파일을 쓰고 manifest 를 저장한다 — 긴 재수집이 중간에 죽어도
+    받은 달은 남고, 본문은 한 달치씩만 메모리에 머문다.
+    """
     month_ranges = split_by_month(date_s, date_e)
-    logger.info(f"총 {len(month_ranges)}개 구간(월 단위)으로 분할")
+    logger.info(f"총 {len(month_ranges)}개 구간(월 단위)으로 분할, 동시 {concurrency}")
     for i, (ds, de) in enumerate(month_ranges, start=1):
         logger.info(f"  {i:>2}. {ds} ~ {de}")
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    out_dir = output_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = manifest if manifest is not None else DownloadManifest(out_dir)
     tag = tag_for_filename(org_no, hoki_s, hoki_e)
+    sem = asyncio.Semaphore(max(concurrency, 1))
 
-    headers_common = {
-        "Origin": BASE,
-        "Content-Type": "application/x-www-form-urlencoded",
-        "User-Agent": "Mozilla/5.0",
-    }
-
-    saved_files: List[Path] = []
+    async def fetch(ds: str, de: str):
+        return ds, de, await _fetch_month(session, sem, page_index, org_no, hoki_s, hoki_e, ds, de)
 
+    changed_files: List[Path] = []
     # koenergy.kr는 중간 인증서를 누락(불완전 체인) → 보충한 SSL 컨텍스트 사용
-    connector = aiohttp.TCPConnector(ssl=get_koen_ssl_context())
-    async with aiohttp.ClientSession(
-        headers={"User-Agent": headers_common["User-Agent"]}, connector=connector
-    ) as session:
-        for idx, (ds, de) in enumerate(month_ranges, start=1):
-            main_url = build_main_url(page_index, org_no, hoki_s, hoki_e, ds, de)
-
-            # 쿠키 확보용 GET (400/500이면 다음으로 넘어가게 처리)
-            try:
-                async with session.get(main_url, timeout=30) as r1:
-                    r1.raise_for_status()
-            except Exception as e:
-                logger.warning(f"main.do GET 실패 ({idx}/{len(month_ranges)}) {ds}~{de}: {e}")
-                if idx < len(month_ranges):
-                    await asyncio.sleep(sleep_sec)
-                continue
-
-            data = {
-                "pageIndex": page_index,
-                "menuCd": MENU_CD,
-                "xmlText": "",
-                "strOrgNo": org_no,   # 빈값이면 전체
-                "strHokiS": hoki_s,   # 빈값이면 전체
-                "strHokiE": hoki_e,   # 빈값이면 전체
-                "strDateS": ds,
-                "strDateE": de,
-                "ptSignature": "",
-            }
-
-            post_headers = dict(headers_common)
-            post_headers["Referer"] = main_url
-
-            try:
-                async with session.post(CSV_URL, data=data, headers=post_headers, timeout=120) as r2:
-                    r2.raise_for_status()
-                    content_type = (r2.headers.get("Content-Type", "") or "").lower()
-                    body = await r2.read()
-            except Exception as e:
-                logger.warning(f"csvDown POST 실패 ({idx}/{len(month_ranges)}) {ds}~{de}: {e}")
-                if idx < len(month_ranges):
-                    await asyncio.sleep(sleep_sec)
-                continue
-
-            if "csv" not in content_type or not is_probably_csv(body, min_len=2000):
-                logger.warning(f"비정상 응답 ({idx}/{len(month_ranges)}) {ds}~{de} "
-                               f"| Content-Type={content_type} | Size={len(body)}B | Head={body[:200]}")
+    connector = aiohttp.TCPConnector(ssl=get_koen_ssl_context(), limit_per_host=max(concurrency, 1))
+    async with aiohttp.ClientSession(headers={"User-Agent": "Mozilla/5.0"}, connector=connector) as session:
+        pending = [fetch(ds, de) for ds, de in month_ranges]
+        for idx, done in enumerate(asyncio.as_completed(pending), start=1):
+            ds, de, body = await done
+            if body is None:
+                manifest.mark_failed(ds, de)
             else:
-                out_name = _sanitize_filename(f"south_pv_{tag}_{ds}-{de}.csv")
-                out_path = OUTPUT_DIR / out_name
-                out_path.write_bytes(body)
-                saved_files.append(out_path)
-                logger.info(f"Saved ({idx}/{len(month_ranges)}): {out_path} ({len(body)} bytes)")
-
-            if idx < len(month_ranges):
-                logger.info(f"{sleep_sec}초 대기 후 다음 구간 수집")
-                await asyncio.sleep(sleep_sec)
+                manifest.clear_failed(ds)
+                out_path = out_dir / _sanitize_filename(f"south_pv_{tag}_{ds}-{de}.csv")
+                if manifest.record(out_path, body, ds, de):
+                    out_path.write_bytes(body)
+                    changed_files.append(out_path)
+                    logger.info(f"Saved ({idx}/{len(month_ranges)}): {out_path} ({len(body)} bytes)")
+                else:
+                    logger.info(f"변경 없음 ({idx}/{len(month_ranges)}): {out_path.name} — 적재 생략")
+            manifest.save()
 
-    return saved_files
+    return sorted(changed_files)
 
 
-def load_namdong_to_db(files: List[Path], start_dt: date, end_dt: date, db_url: Optional[str]) -> int:
+def load_namdong_to_db(
+    files: List[Path],
+    start_dt: date,
+    end_dt: date,
+    db_url: Optional[str],
+    manifest: Optional[DownloadManifest] = None,
+) -> int:
     resolved_url = resolve_db_url(db_url)
     if not resolved_url:
         raise RuntimeError("DB_URL(또는 PV_DATABASE_URL/LOCAL_DB_URL)이 설정되어 있지 않습니다.")
 
-    engine = create_engine(resolved_url)
+    engine = get_engine(resolved_url)
 
     long_parts: List[pd.DataFrame] = []
     for fp in files:
@@ -287,33 +418,12 @@ def load_namdong_to_db(files: List[Path], start_dt: date, end_dt: date, db_url:
     # merged["datetime"]는 이미 date+(hour-1) 구간시작 = 코어 timestamp 규약과 동일.
     core_df = merged.rename(columns={"datetime": "timestamp"})[["timestamp", "plant_name", "generation"]]
     upsert_generation(core_df, operator="namdong", fuel_type="solar", engine=engine)
+    if manifest is not None:
+        manifest.mark_loaded(files)
 
     return len(merged)
 
 
-@task(name="남동발전 CSV 수집", retries=3, retry_delay_seconds=300)
-def collect_namdong_csv(
-    page_index: str,
-    org_no: str,
-    hoki_s: str,
-    hoki_e: str,
-    start_dt: date,
-    end_dt: date,
-    sleep_sec: int = 5,
-) -> List[Path]:
-    return asyncio.run(
-        download_monthly_csvs(
-            page_index=page_index,
-            org_no=org_no,
-            hoki_s=hoki_s,
-            hoki_e=hoki_e,
-            date_s=_to_yyyymmdd(start_dt),
-            date_e=_to_yyyymmdd(end_dt),
-            sleep_sec=sleep_sec,
-        )
-    )
-
-
 def _collect_namdong_csv_sync(
     page_index: str,
     org_no: str,
@@ -321,7 +431,8 @@ def _collect_namdong_csv_sync(
     hoki_e: str,
     start_dt: date,
     end_dt: date,
-    sleep_sec: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    manifest: Optional[DownloadManifest] = None,
 ) -> List[Path]:
     return asyncio.run(
         download_monthly_csvs(
@@ -331,7 +442,8 @@ def _collect_namdong_csv_sync(
             hoki_e=hoki_e,
             date_s=_to_yyyymmdd(start_dt),
             date_e=_to_yyyymmdd(end_dt),
-            sleep_sec=sleep_sec,
+            concurrency=concurrency,
+            manifest=manifest,
         )
     )
 
@@ -339,7 +451,7 @@ def _collect_namdong_csv_sync(
 def run_namdong_collection(
     target_start: Optional[str] = None,
     target_end: Optional[str] = None,
-    sleep_sec: int = 5,
+    concurrency: int = DEFAULT_CONCURRENCY,
     db_url: Optional[str] = None,
 ) -> List[Path]:
     logger.info("=" * 60)
@@ -352,7 +464,7 @@ def run_namdong_collection(
             prev_start, prev_end = prev_month_range()
             start_dt, end_dt = prev_start, prev_end
         else:
-            start_dt, end_dt = resolve_backfill_range(OUTPUT_DIR, target_start, target_end)
+            start_dt, end_dt = resolve_backfill_range(output_dir(), target_start, target_end)
         if start_dt > end_dt:
             logger.info("수집 대상이 없습니다. 최신 상태입니다.")
             send_slack_message(
@@ -361,26 +473,29 @@ def run_namdong_collection(
             return []
 
         logger.info(f"수집 기간: {start_dt} ~ {end_dt}")
+        manifest = DownloadManifest(output_dir())
+        settings = _env_settings()
         saved_files = _collect_namdong_csv_sync(
-            NAMDONG_PAGE_INDEX,
-            NAMDONG_ORG_NO,
-            NAMDONG_HOKI_S,
-            NAMDONG_HOKI_E,
+            settings["page_index"],
+            settings["org_no"],
+            settings["hoki_s"],
+            settings["hoki_e"],
             start_dt,
             end_dt,
-            sleep_sec,
+            concurrency,
+            manifest,
         )
         if saved_files:
-            inserted_rows = load_namdong_to_db(saved_files, start_dt, end_dt, db_url)
+            inserted_rows = load_namdong_to_db(saved_files, start_dt, end_dt, db_url, manifest)
         else:
             inserted_rows = 0
 
         send_slack_message(
             f"[Namdong PV 완료]\n"
             f"- 기간: {_to_yyyymmdd(start_dt)}~{_to_yyyymmdd(end_dt)}\n"
-            f"- 저장 파일 수: {len(saved_files)}\n"
+            f"- 저장 파일 수(변경분): {len(saved_files)}\n"
             f"- 적재 행수: {inserted_rows}\n"
-            f"- 저장 폴더: {OUTPUT_DIR}"
+            f"- 저장 폴더: {output_dir()}"
         )
 
         return saved_files
@@ -398,13 +513,14 @@ def main():
     parser = argparse.ArgumentParser(description="남동발전 PV 수집")
     parser.add_argument("--start", default=None, help="시작일 (YYYYMMDD)")
     parser.add_argument("--end", default=None, help="종료일 (YYYYMMDD)")
-    parser.add_argument("--sleep", default=5, type=int, help="월별 다운로드 간 대기(초)")
+    parser.add_argument("--concurrency", default=DEFAULT_CONCURRENCY, type=int,
+                        help=f"동시에 받는 월 구간 수 (기본 {DEFAULT_CONCURRENCY}, 요청 간격은 호스트 예산)")
     args = parser.parse_args()
 
     run_namdong_collection(
         target_start=args.start,
         target_end=args.end,
-        sleep_sec=args.sleep,
+        concurrency=args.concurrency,
     )
 
 
@@ -1,8 +1,25 @@
+"""
+남동 PV 원본(south_pv_*.csv, 와이드) → 롱 포맷 데이터셋.
+
+원본 파일마다 롱 변환 결과를 내용 checksum 으로 키를 잡아 Parquet 으로 캐시하고
+(_cache/<sha256>.parquet), 최종 데이터셋은 관측월 파티션 Parquet 으로 쓴다:
+
+    pv_data/south_pv_long/month=YYYY-MM/part.parquet   컬럼: 일자, 발전소명, 시간, 발전량
+    pv_data/south_pv_long/_sources.json                원본 파일 → checksum·포함 월
+    pv_data/south_pv_long/_cache/<sha256>.parquet      원본 파일 하나의 롱 변환 결과
+
+매 실행은 checksum 이 바뀐(또는 새로 생긴·사라진) 원본만 변환하고, 그 파일이 닿는
+달의 파티션만 다시 쓴다 — 월간 수집 후에는 새 달 하나만 변환된다. 같은 (일자, 발전소명,
+시간)이 여러 원본에 있으면 파일명 정렬상 뒤 파일(같은 시작일이면 더 긴 구간)이 이긴다.
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
@@ -12,7 +29,9 @@ from fetch_data.common.logger import get_logger
 logger = get_logger(__name__)
 
 DEFAULT_INPUT_DIR = Path.cwd() / "pv_data_raw"   # 수집 스크립트 OUTPUT_DIR과 맞추기
-DEFAULT_OUT_PATH  = Path.cwd() / "pv_data" / "south_pv_all_long.csv"
+DEFAULT_OUT_DIR   = Path.cwd() / "pv_data" / "south_pv_long"
+LONG_COLUMNS = ["일자", "발전소명", "시간", "발전량"]
+KEY = ["일자", "발전소명", "시간"]
 
 
 def hour_columns(df: pd.DataFrame) -> List[str]:
@@ -28,82 +47,177 @@ def extract_hour(col: str) -> int:
     return int(m.group(1))
 
 
+# -------------------------
+# 원본 파일 하나 → 롱 포맷
+# -------------------------
+def file_checksum(fp: Path) -> str:
+    return hashlib.sha256(Path(fp).read_bytes()).hexdigest()
+
+
+def to_long(df: pd.DataFrame, name: str = "") -> pd.DataFrame:
+    """와이드 원본 DataFrame → [일자, 발전소명, 시간(1~24), 발전량] 롱 포맷."""
+    df = df.copy()
+    # 기본 컬럼 보정 (사이트 원본 기준)
+    # 발전소명 컬럼이 없으면 "발전구분"을 발전소명으로 사용 (전체 조회일 때 이게 사실상 발전소명)
+    if "발전소명" not in df.columns:
+        if "발전구분" in df.columns:
+            df["발전소명"] = df["발전구분"]
+        else:
+            raise ValueError(f"필수 컬럼(발전구분) 누락: {name} / cols={df.columns.tolist()[:15]}")
+
+    # 호기 정보가 있으면 발전소명에 호기 번호 추가 (예: "영흥태양광_1", "영흥태양광_2")
+    # 호기가 1개인 발전소는 호기 번호 생략, 여러 개인 경우만 추가
+    if "호기" in df.columns:
+        df["호기"] = df["호기"].astype(str).str.strip()
+        multi = df.groupby("발전소명")["호기"].transform("nunique") > 1
+        n_multi = df.loc[multi, "발전소명"].nunique()
+        df.loc[multi, "발전소명"] = df.loc[multi, "발전소명"].astype(str) + "_" + df.loc[multi, "호기"]
+        logger.info(f"호기 구분 적용: {n_multi}개 발전소")
+
+    # 일자 컬럼명도 케이스별로 정리
+    if "일자" not in df.columns:
+        raise ValueError(f"필수 컬럼(일자) 누락: {name} / cols={df.columns.tolist()[:15]}")
+
+    # 시간별 발전량 컬럼 찾기
+    hcols = hour_columns(df)
+    if not hcols:
+        raise ValueError(f"시간별 발전량 컬럼을 못 찾음: {name} / cols={df.columns.tolist()[:30]}")
+
+    df_long = pd.melt(
+        df,
+        id_vars=["일자", "발전소명"],
+        value_vars=hcols,
+        var_name="시간",
+        value_name="발전량",
+    )
+    # 시간 정수화(1~24) — 헤더 24개만 파싱해 매핑
+    df_long["시간"] = df_long["시간"].map({c: extract_hour(c) for c in hcols}).astype("int64")
+    df_long["일자"] = df_long["일자"].astype(str)
+    df_long["발전소명"] = df_long["발전소명"].astype(str)
+    df_long["발전량"] = pd.to_numeric(df_long["발전량"], errors="coerce").astype("float64")
+    return df_long[LONG_COLUMNS]
+
+
+def _month_of(long: pd.DataFrame) -> pd.Series:
+    """일자 → YYYY-MM (파싱 불가면 NaN). 고유 일자(파일당 ~31개)만 파싱한다."""
+    days = pd.unique(long["일자"])
+    months = pd.to_datetime(pd.Series(days), errors="coerce").dt.strftime("%Y-%m")
+    return long["일자"].map(dict(zip(days, months)))
+
+
+def cached_long(fp: Path, checksum: str, cache_dir: Path) -> pd.DataFrame:
+    """원본 파일의 롱 변환 결과. 같은 checksum 의 캐시가 있으면 파싱 없이 읽는다."""
+    path = cache_dir / f"{checksum}.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
+    logger.info(f"read: {Path(fp).name}")
+    long = to_long(read_csv_flexible(fp), Path(fp).name)
+    _write_parquet(long, path)
+    return long
+
+
+def _write_parquet(frame: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
 # -------------------------
 # Main
 # -------------------------
-def merge_to_long(input_dir: Path, out_path: Path) -> None:
+def _load_sources(out_dir: Path) -> Dict[str, dict]:
+    path = out_dir / "_sources.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("files", {})
+
+
+def _save_sources(out_dir: Path, sources: Dict[str, dict]) -> None:
+    path = out_dir / "_sources.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"files": sources}, ensure_ascii=False, indent=1), encoding="utf-8")
+    tmp.replace(path)
+
+
+def merge_to_long(input_dir: Path, out_dir: Path = DEFAULT_OUT_DIR) -> Dict[str, int]:
+    """바뀐 원본만 변환해 월 파티션을 갱신한다. 반환: {다시 쓴 달: 그 달 행 수(0=삭제)}."""
     input_dir = Path(input_dir)
-    out_path = Path(out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_dir = Path(out_dir)
+    cache_dir = out_dir / "_cache"
+    out_dir.mkdir(parents=True, exist_ok=True)
 
     files = sorted(input_dir.glob("south_pv_*.csv"))
     if not files:
         raise FileNotFoundError(f"입력 파일 없음: {input_dir}/south_pv_*.csv")
 
-    long_parts: List[pd.DataFrame] = []
-
-    for fp in files:
-        logger.info(f"read: {fp.name}")
-        df = read_csv_flexible(fp)
-
-        # 기본 컬럼 보정 (사이트 원본 기준)
-        # 발전소명 컬럼이 없으면 "발전구분"을 발전소명으로 사용 (전체 조회일 때 이게 사실상 발전소명)
-        if "발전소명" not in df.columns:
-            if "발전구분" in df.columns:
-                df["발전소명"] = df["발전구분"]
-            else:
-                raise ValueError(f"필수 컬럼(발전구분) 누락: {fp.name} / cols={df.columns.tolist()[:15]}")
-
-        # 호기 정보가 있으면 발전소명에 호기 번호 추가 (예: "영흥태양광_1", "영흥태양광_2")
-        if "호기" in df.columns:
-            df["호기"] = df["호기"].astype(str).str.strip()
-            # 호기가 1개인 발전소는 호기 번호 생략, 여러 개인 경우만 추가
-            hogi_counts = df.groupby("발전소명")["호기"].nunique()
-            multi_hogi_plants = hogi_counts[hogi_counts > 1].index.tolist()
-            
-            def add_hogi_suffix(row):
-                if row["발전소명"] in multi_hogi_plants:
-                    return f"{row['발전소명']}_{row['호기']}"
-                return row["발전소명"]
-            
-            df["발전소명"] = df.apply(add_hogi_suffix, axis=1)
-            logger.info(f"호기 구분 적용: {len(multi_hogi_plants)}개 발전소")
-
-        # 일자 컬럼명도 케이스별로 정리
-        if "일자" not in df.columns:
-            # 가끔 '일자' 대신 다른 형태면 여기서 추가 매핑
-            raise ValueError(f"필수 컬럼(일자) 누락: {fp.name} / cols={df.columns.tolist()[:15]}")
-
-        # 시간별 발전량 컬럼 찾기
-        hcols = hour_columns(df)
-        if not hcols:
-            raise ValueError(f"시간별 발전량 컬럼을 못 찾음: {fp.name} / cols={df.columns.tolist()[:30]}")
-
-        # melt (요청하신 방식: value_cols 미리 만들지 말고, regex로 잡은 hcols만 value_vars로)
-        df_long = pd.melt(
-            df,
-            id_vars=["일자", "발전소명"],
-            value_vars=hcols,
-            var_name="시간",
-            value_name="발전량",
+    sources = _load_sources(out_dir)
+    checksums = {fp.name: file_checksum(fp) for fp in files}
+    changed = [fp for fp in files if sources.get(fp.name, {}).get("sha256") != checksums[fp.name]]
+    removed = [name for name in sources if name not in checksums]
+    if not changed and not removed:
+        logger.info(f"변경 없음: 원본 {len(files)}개 모두 캐시와 같음")
+        return {}
+
+    stale = set()
+    for name in removed + [fp.name for fp in changed]:
+        stale.update(sources.pop(name, {}).get("months", []))
+    frames: Dict[str, pd.DataFrame] = {}
+    for fp in changed:
+        long = cached_long(fp, checksums[fp.name], cache_dir)
+        frames[fp.name] = long
+        months = sorted(_month_of(long).dropna().unique())
+        sources[fp.name] = {"sha256": checksums[fp.name], "months": months}
+        stale.update(months)
+
+    touched: Dict[str, int] = {}
+    for month in sorted(stale):
+        parts = []
+        for name in sorted(sources):
+            if month not in sources[name]["months"]:
+                continue
+            long = frames.get(name)
+            if long is None:
+                long = frames[name] = cached_long(input_dir / name, sources[name]["sha256"], cache_dir)
+            parts.append(long[_month_of(long) == month])
+        part_path = out_dir / f"month={month}" / "part.parquet"
+        if not parts:
+            part_path.unlink(missing_ok=True)
+            touched[month] = 0
+            continue
+        merged = (
+            pd.concat(parts, ignore_index=True)
+            .drop_duplicates(subset=KEY, keep="last")
+            .sort_values(KEY, kind="stable")
+            .reset_index(drop=True)
         )
-
-        # 시간 정수화(1~24)
-        df_long["시간"] = df_long["시간"].apply(extract_hour).astype("int64")
-
-        # 데이터 타입 정리(선택)
-        # df_long["일자"] = pd.to_datetime(df_long["일자"], errors="coerce")
-        df_long["발전량"] = pd.to_numeric(df_long["발전량"], errors="coerce")
-
-        long_parts.append(df_long)
-
-    merged = pd.concat(long_parts, ignore_index=True)
-
-    # 저장: utf-8-sig 추천(엑셀 호환) / 분석용이면 utf-8도 OK
-    merged.to_csv(out_path, index=False, encoding="utf-8-sig")
-    logger.info(f"merged saved: {out_path}")
-    logger.info(f"rows: {len(merged):,} / plants: {merged['발전소명'].nunique():,} / hours: {merged['시간'].nunique():,}")
+        _write_parquet(merged, part_path)
+        touched[month] = len(merged)
+
+    _save_sources(out_dir, sources)
+    live = {entry["sha256"] for entry in sources.values()}
+    for cached in cache_dir.glob("*.parquet"):
+        if cached.stem not in live:
+            cached.unlink()
+
+    logger.info(
+        f"merged saved: {out_dir} — 변환 {len(changed)}개 / 삭제 {len(removed)}개 원본, "
+        f"갱신 월 {', '.join(touched)} ({sum(touched.values()):,}행)"
+    )
+    return touched
+
+
+def read_long(out_dir: Path = DEFAULT_OUT_DIR, months: Optional[List[str]] = None) -> pd.DataFrame:
+    """월 파티션 데이터셋을 읽는다(months 를 주면 그 달만)."""
+    out_dir = Path(out_dir)
+    paths = sorted(out_dir.glob("month=*/part.parquet"))
+    if months is not None:
+        wanted = {f"month={m}" for m in months}
+        paths = [p for p in paths if p.parent.name in wanted]
+    if not paths:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+    return pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
 
 
 if __name__ == "__main__":
-    merge_to_long(DEFAULT_INPUT_DIR, DEFAULT_OUT_PATH)
+    merge_to_long(DEFAULT_INPUT_DIR, DEFAULT_OUT_DIR)
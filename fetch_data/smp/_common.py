@@ -8,9 +8,11 @@ from pathlib import Path
 from typing import List, Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
-from fetch_data.common.db_utils import resolve_db_url
+from fetch_data.common.db_base import get_engine
+from fetch_data.common import metrics
+from fetch_data.common.coverage import record_coverage
 from fetch_data.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -66,24 +68,24 @@ def parse_price(raw: Optional[str]) -> Optional[float]:
 
 def get_engine_for(db_url: Optional[str] = None):
     """적재용 엔진(도커/호스트 자동 전환). seobu/wind와 동일 헬퍼 사용."""
-    resolved = resolve_db_url(db_url)
-    if not resolved:
-        raise RuntimeError("DB_URL이 설정되지 않았습니다.")
-    return create_engine(resolved)
+    return get_engine(db_url)
 
 
-def _upsert(engine, sql: str, records: List[dict], label: str) -> int:
-    """배치 upsert 공통 루틴."""
+def _upsert(engine, sql: str, records: List[dict], label: str, after=None) -> int:
+    """배치 upsert 공통 루틴. after(conn) 는 같은 트랜잭션 끝에서 호출된다."""
     if not records:
         logger.info(f"[DB] {label}: 적재할 데이터 없음")
         return 0
     stmt = text(sql)
     total = 0
-    with engine.begin() as conn:
+    with metrics.stage("load", source="smp", table=label) as st, engine.begin() as conn:
         for i in range(0, len(records), BATCH_SIZE):
             batch = records[i : i + BATCH_SIZE]
             conn.execute(stmt, batch)
             total += len(batch)
+        if after is not None:
+            after(conn)
+        st.rows = total
     logger.info(f"[DB] {label}: {total}행 upsert 완료")
     return total
 
@@ -147,7 +149,13 @@ def upsert_realtime_jeju(df: pd.DataFrame, db_url: Optional[str] = None, engine=
             is_confirmed = EXCLUDED.is_confirmed
     """
     records = df[["timestamp", "region", "price", "is_confirmed"]].to_dict("records")
-    n = _upsert(engine, sql, records, "smp_realtime_jeju")
+    confirmed = df[df["is_confirmed"].astype(bool)]
+    n = _upsert(
+        engine, sql, records, "smp_realtime_jeju",
+        after=lambda conn: record_coverage(
+            conn, "smp_realtime", confirmed["timestamp"], confirmed["region"]
+        ),
+    )
     if n and mirror:
         mirror_table_to_csv(engine, "smp_realtime_jeju")
     return n
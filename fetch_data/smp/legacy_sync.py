@@ -20,13 +20,14 @@ weekly로 실행해 공통 DB의 SMP 3개 테이블을 개인 DB로 증분 복
 
 from __future__ import annotations
 
-import os
 from typing import Optional
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
-from fetch_data.common.db_utils import redact_db_url, resolve_db_url
+from fetch_data.common.config import getenv
+from fetch_data.common.db_base import get_engine
+from fetch_data.common.db_utils import redact_db_url
 from fetch_data.common.logger import get_logger
 from fetch_data.smp import _common as C
 from fetch_data.smp.database import Base
@@ -67,13 +68,13 @@ def _sync_table(src_engine, dst_engine, table: str, upsert_fn, ts_keyed: bool) -
 
 def run_legacy_sync() -> int:
     """개인 DB 백업 동기화 실행. 반환: 총 동기화 행수(미설정 시 0)."""
-    legacy_url = os.getenv(LEGACY_ENV)
+    legacy_url = getenv(LEGACY_ENV)
     if not legacy_url:
         logger.info(f"[legacy_sync] {LEGACY_ENV} 미설정 -> 백업 skip")
         return 0
 
-    src_engine = create_engine(resolve_db_url())
-    dst_engine = create_engine(legacy_url)
+    src_engine = get_engine()
+    dst_engine = get_engine(legacy_url)
     logger.info(f"[legacy_sync] 대상 개인 DB: {redact_db_url(legacy_url)}")
 
     # 개인 DB에 SMP 테이블 보장
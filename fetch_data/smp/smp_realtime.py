@@ -22,12 +22,15 @@ KPX 페이지(bidSmpLfdDataRt.es, GET)는 최근 6일치를 한 표로 준다.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import json
 import re
 from datetime import date, datetime, timedelta
 from typing import List, Optional
 
 import pandas as pd
 
+from fetch_data.common import backfill, response_cache
 from fetch_data.common.logger import get_logger
 from fetch_data.constants import SMPAPI
 from fetch_data.smp import _common as C
@@ -233,57 +236,102 @@ def run_realtime_collection(db_url: Optional[str] = None) -> int:
 REALTIME_FLOOR = date(2024, 3, 1)
 
 
+class RealtimeJejuBackfillSource:
+    """백필 엔진 어댑터: issue_date 1년 간격 = 샤드, 확정 96구간만 upsert."""
+
+    name = "smp_realtime_jeju"
+
+    def __init__(self, session, engine, end: date):
+        self.session = session
+        self.engine = engine
+        self.end = end
+
+    def shards(self, start: date, end: date):
+        shards = []
+        issue = start
+        while issue <= end:
+            next_issue = date(issue.year + 1, issue.month, issue.day)
+            shards.append((issue, min(next_issue - timedelta(days=1), end)))
+            issue = next_issue
+        return shards
+
+    def fetch(self, issue: date, period_end: date) -> list:
+        extra_params = {
+            "device": "pc",
+            "division": "smpDataRt",
+            "gubun": "day",
+            "issue_date": issue.strftime("%Y-%m-%d"),
+        }
+
+        def _fetch() -> Optional[bytes]:
+            fetched = fetch_grid(
+                self.session,
+                SMPAPI.REALTIME_JEJU_URL,
+                SMPAPI.REALTIME_JEJU_MID,
+                extra_params=extra_params,
+            )
+            return None if fetched is None else json.dumps(fetched, ensure_ascii=False).encode("utf-8")
+
+        # 파싱 전 그리드를 캐시 — 표 해석 로직을 고친 뒤 --replay 로 재적재
+        raw = response_cache.fetch_cached_sync(
+            "smp_realtime",
+            SMPAPI.REALTIME_JEJU_URL,
+            {"mid": SMPAPI.REALTIME_JEJU_MID, **extra_params},
+            _fetch,
+            period_end=period_end,
+        )
+        if raw is None:
+            raise RuntimeError("제주 실시간 SMP 원천 데이터가 비어 있습니다")
+        return json.loads(raw)
+
+    def parse(self, grid: list, issue: date, period_end: date) -> Optional[pd.DataFrame]:
+        # 각 호출의 ref는 해당 issue_date — MM.DD->연도 매핑을 정확히 한다
+        df = parse_realtime_grid(grid, ref=issue)
+        if df.empty:
+            return None
+        # end 이후 날짜는 제외(미래/미확정 방지)
+        df = df[df["timestamp"].dt.date <= self.end]
+        return None if df.empty else df
+
+    def load(self, df: pd.DataFrame, issue: date, period_end: date) -> int:
+        n = C.upsert_realtime_jeju(df, engine=self.engine)
+        logger.info(
+            f"[realtime-backfill] issue={issue} -> {n}행 "
+            f"({df['timestamp'].min()}~{df['timestamp'].max()})"
+        )
+        return n
+
+
 def run_realtime_backfill(
     start: Optional[date] = None,
     end: Optional[date] = None,
     db_url: Optional[str] = None,
+    ledger=None,
+    restart: bool = False,
 ) -> int:
     """제주 실시간 15분 SMP 과거 백필.
 
     KPX 실시간 페이지는 gubun=day&issue_date 로 그 issue_date가 포함된
     '연간(시범사업 개시~)' 전체 표를 한 번에 준다(확인됨: 한 호출에 822일).
     따라서 start의 issue_date 한 번 호출로 대부분 커버되지만, 안전하게
-    start~end 를 1년 간격으로 순회하며 확정 96구간만 upsert한다.
-    각 호출의 ref는 해당 issue_date로 넘겨 MM.DD->연도 매핑을 정확히 한다.
+    start~end 를 1년 간격(샤드)으로 순회하며 확정 96구간만 upsert한다.
+    ledger 가 DbLedger 면 끝난 issue_date 는 다음 실행에서 건너뛴다.
 
     기본: 2024-03-01(시범사업 개시) ~ 어제.
     """
     start = start or REALTIME_FLOOR
     end = end or (date.today() - timedelta(days=1))
-    session = make_session()
-    engine = C.get_engine_for(db_url)
+    source = RealtimeJejuBackfillSource(make_session(), C.get_engine_for(db_url), end)
+    # 확정은 D+1 18시 — 어제까지 걸친 샤드는 done 이어도 다음 실행에서 다시 받는다
+    report = asyncio.run(backfill.run_backfill(
+        source, start, end, ledger=ledger, restart=restart,
+        settled_before=date.today() - timedelta(days=1),
+    ))
+    if not report.ok:
+        raise RuntimeError(f"제주 실시간 SMP 백필 실패: {'; '.join(report.failed.values())}")
 
-    issue = start
-    total = 0
-    while issue <= end:
-        grid = fetch_grid(
-            session,
-            SMPAPI.REALTIME_JEJU_URL,
-            SMPAPI.REALTIME_JEJU_MID,
-            extra_params={
-                "device": "pc",
-                "division": "smpDataRt",
-                "gubun": "day",
-                "issue_date": issue.strftime("%Y-%m-%d"),
-            },
-        )
-        if grid is None:
-            raise RuntimeError("제주 실시간 SMP 원천 데이터가 비어 있습니다")
-        df = parse_realtime_grid(grid, ref=issue)
-        if not df.empty:
-            # end 이후 날짜는 제외(미래/미확정 방지)
-            df = df[df["timestamp"].dt.date <= end]
-            if not df.empty:
-                n = C.upsert_realtime_jeju(df, engine=engine)
-                total += n
-                logger.info(
-                    f"[realtime-backfill] issue={issue} -> {n}행 "
-                    f"({df['timestamp'].min()}~{df['timestamp'].max()})"
-                )
-        issue = date(issue.year + 1, issue.month, issue.day)
-
-    logger.info(f"[realtime-backfill] 완료: 총 {total}행 ({start}~{end})")
-    return total
+    logger.info(f"[realtime-backfill] 완료: 총 {report.rows}행 ({start}~{end})")
+    return report.rows
 
 
 def main() -> None:
@@ -292,12 +340,18 @@ def main() -> None:
     parser.add_argument("--start", default=None, help="백필 시작일 YYYY-MM-DD")
     parser.add_argument("--end", default=None, help="백필 종료일 YYYY-MM-DD")
     parser.add_argument("--db-url", default=None)
+    backfill.add_cli_args(parser)
+    response_cache.add_cli_args(parser)
     args = parser.parse_args()
     if args.backfill or args.start or args.end:
+        response_cache.configure_from_args(args)
         from datetime import datetime as _dt
         start = _dt.strptime(args.start, "%Y-%m-%d").date() if args.start else None
         end = _dt.strptime(args.end, "%Y-%m-%d").date() if args.end else None
-        run_realtime_backfill(start=start, end=end, db_url=args.db_url)
+        run_realtime_backfill(
+            start=start, end=end, db_url=args.db_url,
+            ledger=backfill.ledger_from_args(args, args.db_url), restart=args.restart,
+        )
     else:
         run_realtime_collection(args.db_url)
 
@@ -8,6 +8,7 @@ KPX SMP 스크래퍼 (외부 SMP_collector 레포의 SMPScraper 이식).
 
 차단 대응: 403/429 또는 본문에 firewall/blocked 감지 시 BLOCKED 반환.
 요청 간 랜덤 딜레이로 IP 차단을 회피한다(외부 레포와 동일).
+차단 판정과 호스트별 토큰 버킷은 fetch_data.common.http 와 공유한다(동기 requests 경로 유지).
 
 이 모듈은 '원시 그리드(2D list)'와 HTTP 세션만 책임진다.
 값 해석/정규화/적재는 호출 측(smp_collect/smp_aggregate/smp_realtime)에서 한다.
@@ -22,13 +23,12 @@ from typing import List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from fetch_data.common import http
 from fetch_data.common.logger import get_logger
 from fetch_data.constants import SMPAPI
 
 logger = get_logger(__name__)
 
-BLOCK_MARKERS = ("firewall", "blocked", "access denied")
-
 
 def make_session() -> requests.Session:
     """User-Agent가 설정된 requests 세션을 생성합니다."""
@@ -67,10 +67,7 @@ def _expand_table_to_grid(table) -> List[List[str]]:
 
 
 def _is_blocked(status: int, text: str) -> bool:
-    if status in (403, 429):
-        return True
-    low = text.lower()
-    return any(m in low for m in BLOCK_MARKERS)
+    return http.looks_blocked(status, text)
 
 
 def fetch_grid(
@@ -100,9 +97,11 @@ def fetch_grid(
     headers = {"Referer": f"{url}?mid={mid}&device=pc"}
     timeout = SMPAPI.TIMEOUT_SEC
 
+    bucket = http.host_state(url).bucket  # 비동기 KPX 수집기와 같은 호스트 예산을 쓴다
     last_err: Optional[str] = None
     for attempt in range(1, SMPAPI.MAX_RETRIES + 1):
         try:
+            bucket.acquire_sync()
             resp = session.get(url, params=params, headers=headers, timeout=timeout)
             if _is_blocked(resp.status_code, resp.text):
                 last_err = f"BLOCKED(GET status={resp.status_code})"
@@ -127,6 +126,7 @@ def fetch_grid(
                 time.sleep(random.uniform(*SMPAPI.WAIT_RANGE))
                 body = dict(post_data or {})
                 body["_csrf"] = csrf
+                bucket.acquire_sync()
                 resp = session.post(url, params=params, data=body, headers=headers, timeout=timeout)
                 if _is_blocked(resp.status_code, resp.text):
                     last_err = f"BLOCKED(POST status={resp.status_code})"
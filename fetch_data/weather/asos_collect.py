@@ -1,16 +1,19 @@
 # 해당 파일의 localhost 주소는  http://localhost:4300 임.
 
 import asyncio
+import functools
+import json
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import AsyncIterator
 
-import aiohttp
 import pandas as pd
 
+from fetch_data.common import http, response_cache
 from fetch_data.common.config import get_service_key
 from fetch_data.common.logger import get_logger
 from fetch_data.constants import WeatherAPI
-from prefect_flows.merge_to_all import merge_to_all_csv, DATA_DIR
 
 logger = get_logger(__name__)
 
@@ -18,10 +21,6 @@ logger = get_logger(__name__)
 # 이 파일 경로: /app/fetch_data/weather/collect_asos.py
 # 프로젝트 루트: /app
 
-# ===== 환경변수 / API 키 =====
-if not get_service_key():
-    logger.warning("[WARN] SERVICE_KEY 환경변수가 설정되지 않았습니다. 기상 데이터 수집 시 오류가 발생합니다.")
-
 API_URL = WeatherAPI.ENDPOINT
 
 # ===== 지점 목록 CSV 로드 =====
@@ -41,27 +40,87 @@ def load_station_ids() -> list[str]:
     return ids
 
 
-station_ids = load_station_ids()
+@functools.lru_cache(maxsize=1)
+def get_station_ids() -> tuple[str, ...]:
+    """지점 코드 목록(첫 호출 때 한 번만 읽는다 — import 시점 파일 I/O 없음)."""
+    return tuple(load_station_ids())
+
 
-# 일별 결과 저장 디렉토리 (data/ 아래)
-OUTPUT_DIR = DATA_DIR  # 그냥 data/ 바로 아래에 저장
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+# 일별 결과 저장 디렉토리 (data/ 아래, 스크립트 실행 시 생성)
+OUTPUT_DIR = PROJECT_ROOT / "data"
 
 
 # ===== API 호출 함수들 =====
 
-# 공공데이터포털 API rate limit 대응: 동시 요청 수 제한
-MAX_CONCURRENT = 10
+# 공공데이터포털 한 번 호출의 최대 행 수와 지점·하루당 행 수(시간자료 24건).
+# 요청 구간을 41일(=999//24) 단위 창으로 나누면 한 호출이 거의 꽉 찬 한 페이지가 된다.
+MAX_ROWS_PER_CALL = 999
+ROWS_PER_STATION_DAY = 24
 
+# data.go.kr 공통 resultCode: 00 정상, 03 데이터 없음, 05 서비스 지연(스로틀로 보고 동시성 절반 + 재시도),
+# 22 일일 요청 한도 초과(오늘은 더 받을 수 없으니 전체 중단).
+RESULT_OK = "00"
+RESULT_NO_DATA = "03"
+THROTTLE_RESULT_CODES = frozenset({"05"})
+QUOTA_RESULT_CODE = "22"
 
-async def fetch_city(
-    session, city_id, start, end, semaphore: asyncio.Semaphore, service_key: str, max_retries: int = 3
-) -> pd.DataFrame:
-    """단일 지점 데이터를 비동기 수집 (semaphore로 동시 요청 제한, 429 시 재시도)"""
+
+class AsosQuotaExceeded(RuntimeError):
+    """data.go.kr 일일 요청 한도 초과(resultCode 22) — 재시도해도 오늘은 실패한다."""
+
+
+class AsosIncomplete(RuntimeError):
+    """strict 수집에서 재시도 끝에 실패한 창이 있음. partial 은 받은 만큼의 결과."""
+
+    def __init__(self, city_id: str, failed: list[tuple[str, str]], partial: pd.DataFrame):
+        self.city_id = city_id
+        self.failed = failed
+        self.partial = partial
+        spans = ", ".join(f"{s}~{e}" for s, e in failed)
+        super().__init__(f"{city_id}: 창 {len(failed)}개 실패 ({spans})")
+
+
+def plan_windows(start: str, end: str, rows_per_call: int = MAX_ROWS_PER_CALL) -> list[tuple[str, str]]:
+    """[start, end](YYYYMMDD) 를 한 페이지에 들어가는 최대 일수 단위 창으로 나눈다."""
+    days = max(1, rows_per_call // ROWS_PER_STATION_DAY)
+    cur = datetime.strptime(start, "%Y%m%d").date()
+    last = datetime.strptime(end, "%Y%m%d").date()
+    windows = []
+    while cur <= last:
+        window_end = min(cur + timedelta(days=days - 1), last)
+        windows.append((cur.strftime("%Y%m%d"), window_end.strftime("%Y%m%d")))
+        cur = window_end + timedelta(days=1)
+    return windows
+
+
+def _result_code(response: http.HttpResponse) -> str:
+    try:
+        return str(response.json().get("response", {}).get("header", {}).get("resultCode", ""))
+    except (ValueError, AttributeError):
+        return ""
+
+
+def _is_json_ok(response: http.HttpResponse) -> bool:
+    """200 이면서 JSON 본문일 때만 성공 (키 오류 시 data.go.kr 은 200 + XML 을 준다)."""
+    if response.status != 200:
+        return False
+    try:
+        response.json()
+    except ValueError:
+        return False
+    return True
+
+
+def _is_throttled(response: http.HttpResponse) -> bool:
+    """HTTP 200 이지만 본문 resultCode 가 과부하 신호인 응답 — 429 와 같이 AIMD 감소."""
+    return response.status == 200 and _result_code(response) in THROTTLE_RESULT_CODES
+
+
+async def _fetch_page(session, city_id, start, end, page: int, service_key: str, max_retries: int) -> dict:
     params = {
         "serviceKey": service_key,
-        "pageNo": "1",
-        "numOfRows": "999",
+        "pageNo": str(page),
+        "numOfRows": str(MAX_ROWS_PER_CALL),
         "dataType": "JSON",
         "dataCd": "ASOS",
         "dateCd": "HR",
@@ -72,71 +131,124 @@ async def fetch_city(
         "stnIds": city_id,
     }
 
-    for attempt in range(1, max_retries + 1):
-        is_rate_limited = False
-        async with semaphore:
+    async def _get() -> bytes:
+        response = await http.request(
+            "GET", API_URL, session=session, params=params,
+            retry=http.RetryPolicy(attempts=max_retries, base=2.0),
+            ok=_is_json_ok, is_blocked=_is_throttled, label=f"asos:{city_id}",
+        )
+        # 정상(00)·데이터 없음(03) 페이지만 캐시에 남긴다 — 한도 초과·오류 응답을 저장하면
+        # 확정 기간은 불변으로 취급돼 이후 실행이 그 오류를 계속 재생한다.
+        code = _result_code(response)
+        if code == QUOTA_RESULT_CODE:
+            raise AsosQuotaExceeded(f"data.go.kr 요청 한도 초과 ({city_id} {start}~{end})")
+        if code not in (RESULT_OK, RESULT_NO_DATA):
+            raise http.HttpRequestError("GET", API_URL, max_retries, response.status)
+        return response.body
+
+    raw = await response_cache.fetch_cached(
+        "asos", API_URL, params, _get, period_end=datetime.strptime(end, "%Y%m%d").date()
+    )
+    return json.loads(raw)
+
+
+async def fetch_city(
+    session, city_id, start, end, service_key: str, max_retries: int = 3, strict: bool = False,
+) -> pd.DataFrame:
+    """단일 지점의 [start, end] 전체를 41일 창 × pageNo 페이지로 나눠 totalCount 까지 받는다.
+
+    동시성·속도 제한과 429/과부하 재시도는 공통 http(data.go.kr 호스트 AIMD)가 맡는다.
+    창 하나가 재시도 끝에 실패하면 그 창만 비우고(로그) 나머지는 계속 받는다.
+    strict=True(백필)면 나머지 창을 다 받은 뒤 AsosIncomplete 로 알린다 — 샤드가 failed 로
+    남아 다음 실행에서 다시 돈다.
+
+    Raises:
+        AsosQuotaExceeded: 일일 요청 한도 초과(resultCode 22).
+        AsosIncomplete: strict 이고 실패한 창이 있음.
+    """
+    items: list = []
+    failed: list[tuple[str, str]] = []
+    for window_start, window_end in plan_windows(start, end):
+        page = 1
+        while True:
             try:
-                async with session.get(API_URL, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # API 에러 응답 체크
-                        header = data.get("response", {}).get("header", {})
-                        result_code = header.get("resultCode", "")
-                        result_msg = header.get("resultMsg", "")
-
-                        if result_code != "00":
-                            logger.warning(f"{city_id}: API 에러 - 코드={result_code}, 메시지={result_msg}")
-                            return pd.DataFrame()
-
-                        items = (
-                            data.get("response", {})
-                            .get("body", {})
-                            .get("items", {})
-                            .get("item", [])
-                        )
-                        if items:
-                            logger.info(f"{city_id}: 데이터 {len(items)}건 수집 완료")
-                            return pd.DataFrame(items)
-                        else:
-                            logger.info(f"{city_id}: 데이터 없음 (날짜: {start}~{end})")
-                            return pd.DataFrame()
-
-                    elif response.status == 429:
-                        is_rate_limited = True
-                        logger.warning(
-                            f"{city_id}: 429 Rate Limit (시도 {attempt}/{max_retries})"
-                        )
-                    else:
-                        logger.warning(
-                            f"{city_id}: 요청 실패 (시도 {attempt}/{max_retries}) "
-                            f"상태코드={response.status}"
-                        )
-            except Exception as e:
-                logger.error(f"{city_id}: 예외 발생 (시도 {attempt}/{max_retries}) -> {e}")
-
-        # 재시도 전 대기 (429는 지수 백오프, 그 외 5초)
-        if attempt < max_retries:
-            delay = 2 ** attempt if is_rate_limited else 5
-            await asyncio.sleep(delay)
-
-    logger.error(f"{city_id}: {max_retries}회 실패 — 포기")
+                data = await _fetch_page(session, city_id, window_start, window_end, page, service_key, max_retries)
+            except (http.HttpRequestError, response_cache.CacheMiss) as e:
+                logger.error(f"{city_id}: {window_start}~{window_end} p{page} {max_retries}회 실패 — 포기 ({e})")
+                failed.append((window_start, window_end))
+                break
+
+            response = data.get("response", {})
+            header = response.get("header", {})
+            result_code = header.get("resultCode", "")
+            if result_code == QUOTA_RESULT_CODE:
+                raise AsosQuotaExceeded(f"data.go.kr 요청 한도 초과: {header.get('resultMsg', '')}")
+            if result_code == RESULT_NO_DATA:
+                break
+            if result_code != RESULT_OK:
+                logger.warning(f"{city_id}: API 에러 - 코드={result_code}, 메시지={header.get('resultMsg', '')}")
+                failed.append((window_start, window_end))
+                break
+
+            body = response.get("body", {})
+            page_items = (body.get("items") or {}).get("item", []) or []
+            items.extend(page_items)
+            total = int(body.get("totalCount") or 0)
+            if not page_items or page * MAX_ROWS_PER_CALL >= total:
+                break
+            page += 1
+
+    df = pd.DataFrame(items)
+    if strict and failed:
+        raise AsosIncomplete(city_id, failed, df)
+    if items:
+        logger.info(f"{city_id}: 데이터 {len(items)}건 수집 완료")
+        return df
+    logger.info(f"{city_id}: 데이터 없음 (날짜: {start}~{end})")
     return pd.DataFrame()
 
 
-async def select_data_async(city_list, start: str, end: str) -> pd.DataFrame:
-    """모든 지점 데이터를 비동기로 수집 (동시 요청 수 제한)"""
+async def stream_stations(
+    city_list, start: str, end: str, strict: bool = False,
+) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+    """지점별 결과를 끝나는 순서대로 내보낸다(빈 결과 제외). 호출부가 바로 적재할 수 있다.
+
+    요청 한도 초과면 남은 지점을 취소하고 AsosQuotaExceeded 를 올린다.
+    strict=True 면 창이 실패한 지점도 받은 만큼은 내보내고, 모든 지점이 끝난 뒤
+    RuntimeError 로 실패 지점을 알린다.
+    """
     service_key = get_service_key()
-    if not service_key:
+    if not service_key and not response_cache.is_replay():
         raise RuntimeError("SERVICE_KEY 또는 NAMDONG_WIND_KEY가 설정되지 않았습니다.")
 
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
-    async with aiohttp.ClientSession() as session:
-        tasks = [fetch_city(session, city, start, end, semaphore, service_key) for city in city_list]
-        results = await asyncio.gather(*tasks)
+    async with http.HttpClient() as client:
+        session = client.session_for(API_URL)
+
+        async def run(city):
+            return city, await fetch_city(session, city, start, end, service_key, strict=strict)
+
+        tasks = [asyncio.ensure_future(run(city)) for city in city_list]
+        incomplete: list[str] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    city, df = await next_done
+                except AsosIncomplete as e:
+                    incomplete.append(str(e))
+                    city, df = e.city_id, e.partial
+                if not df.empty:
+                    yield city, df
+            if incomplete:
+                raise RuntimeError(f"지점 {len(incomplete)}곳 일부 창 실패: {'; '.join(incomplete[:5])}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 
-    # 비어있는 DF가 섞여 있어도 concat 가능하게 필터링
-    results = [r for r in results if not r.empty]
+async def select_data_async(city_list, start: str, end: str) -> pd.DataFrame:
+    """모든 지점 데이터를 비동기로 수집 (동시성은 data.go.kr 호스트 AIMD 가 조절)"""
+    results = [df async for _, df in stream_stations(city_list, start, end)]
     if not results:
         logger.warning("수집된 데이터가 없습니다.")
         return pd.DataFrame()
@@ -175,7 +287,7 @@ def normalize_weather_data(df: pd.DataFrame) -> pd.DataFrame:
 
 if __name__ == "__main__":
     import argparse
-    from fetch_data.common.utils import today_kst
+    from prefect_flows.merge_to_all import merge_to_store
 
     parser = argparse.ArgumentParser(description="ASOS 기상 데이터 수집")
     parser.add_argument("--start", required=True, help="시작일 (YYYYMMDD)")
@@ -185,7 +297,7 @@ if __name__ == "__main__":
     end = args.end.strip()
 
     # 메인 비동기 루프 실행
-    df = asyncio.run(select_data_async(station_ids, start, end))
+    df = asyncio.run(select_data_async(get_station_ids(), start, end))
 
     if df.empty:
         logger.warning("다운로드된 데이터가 없어 종료합니다.")
@@ -198,13 +310,14 @@ if __name__ == "__main__":
     df = normalize_weather_data(df)
 
     # 일별 CSV 저장 (컨테이너 기준: /app/data/asos_YYYYMMDD_YYYYMMDD.csv)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     daily_path = OUTPUT_DIR / f"asos_{start}_{end}.csv"
     df.to_csv(daily_path, index=False, encoding="utf-8-sig")
     logger.info(f"일별 파일 저장 완료: {daily_path}")
 
-    # 누적 CSV에 머지 (컨테이너 기준: /app/data/asos_all_merged.csv)
-    merged_path = merge_to_all_csv(daily_path)
-    logger.info(f"누적 파일 갱신 완료: {merged_path}")
+    # 누적 저장소에 머지 (컨테이너 기준: /app/data/asos_store/month=YYYY-MM/)
+    merged_path = merge_to_store(daily_path)
+    logger.info(f"누적 저장소 갱신 완료: {merged_path}")
 
     logger.info("샘플 데이터:")
     logger.info(str(df.head()))
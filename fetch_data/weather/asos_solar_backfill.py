@@ -4,100 +4,157 @@ ASOS 과거 일사량(+기온/습도) 백필
 `data/asos_all_merged.csv`에는 일사량이 거의 없다(2019-01, 43개 지점 한 달치뿐).
 과거 CSV 자체에 일사량이 없으니 CSV 재적재로는 채울 수 없고, 기상청 API를
 과거 구간에 대해 다시 호출해야 한다. 이 스크립트는 기존 일일 수집기
-(`asos_collect.select_data_async`/`normalize_weather_data`)를 그대로 재사용해
-지정 구간을 조회하고 `weather_asos`에 UPSERT한다.
+(`asos_collect.stream_stations`/`normalize_weather_data`)를 그대로 재사용해
+지정 구간을 조회하고, 지점 하나가 끝날 때마다 바로 `weather_asos`에 UPSERT한다.
 
 - (timestamp, station_name) UPSERT + COALESCE라 재실행해도 안전하다(멱등).
   같은 값을 다시 적재해도 행 수가 늘지 않고, 새로 온 값이 NULL이어도 기존 값을
   지우지 않는다.
-- 기간이 길면 청크(기본 30일 — 지점당 numOfRows=999 한도 안에서 여유 있게)로
-  나눠 청크 사이에 대기(--sleep-sec)한다. 지점 간 동시 요청 수는 기존
-  asos_collect.MAX_CONCURRENT(세마포어)가 그대로 제한한다.
+- 같은 행을 월 파티션 Parquet 저장소(data/asos_store)에도 병합한다 — 닿는 달만
+  다시 쓴다. --no-store 로 끌 수 있다.
+- 지점별 요청은 41일 창 × pageNo 페이지로 totalCount 까지 받으므로 청크 길이에
+  잘림이 없다. 청크(기본 123일 = 창 3개)는 재개·Parquet 병합 단위다.
+  동시 요청 수는 data.go.kr 호스트 AIMD(429/resultCode 05 면 절반)가 정하고,
+  일일 요청 한도(resultCode 22)에 닿으면 그 자리에서 멈춘다 — 남은 청크는
+  원장에 pending 으로 남아 다음 날 같은 명령으로 이어서 돈다.
+- 청크는 공용 백필 엔진(common.backfill)의 샤드다. 샤드 상태는 backfill_ledger
+  원장에 남으므로 중간에 죽어도 같은 명령을 다시 실행하면 끝난 청크는 건너뛴다
+  (--restart 로 처음부터, --no-ledger 로 원장 없이). --concurrency 로 청크 병렬.
 
 사용법:
     uv run python -m fetch_data.weather.asos_solar_backfill --start 20190101 --end 20190131
     uv run python -m fetch_data.weather.asos_solar_backfill --start 20190101 --end 20191231 \
-        --chunk-days 30 --sleep-sec 2
+        --chunk-days 123 --concurrency 2
+    # 원천 응답은 data/response_cache 에 남는다 — 변환 수정 후 네트워크 없이 재적재
+    uv run python -m fetch_data.weather.asos_solar_backfill --start 20190101 --end 20191231 --replay
 """
 
 import argparse
 import asyncio
-from datetime import date, datetime, timedelta
-from typing import Iterator, Tuple
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import pandas as pd
+
+from fetch_data.common import backfill, response_cache
 from fetch_data.common.logger import get_logger
 from fetch_data.weather.asos_collect import (
+    AsosQuotaExceeded,
     normalize_weather_data,
-    select_data_async,
-    station_ids,
+    get_station_ids,
+    stream_stations,
 )
+from fetch_data.weather.asos_store import AsosStore
 from fetch_data.weather.database import init_db, load_asos_df
 
 logger = get_logger(__name__)
 
-DEFAULT_CHUNK_DAYS = 30
+DEFAULT_CHUNK_DAYS = 123
+JOB = "asos_solar"
 
 
 def _date_chunks(start: date, end: date, chunk_days: int) -> Iterator[Tuple[date, date]]:
     """[start, end] 폐구간을 chunk_days 단위 연속 구간으로 쪼갠다."""
-    if chunk_days < 1:
-        raise ValueError("chunk_days는 1 이상이어야 합니다.")
-    cur = start
-    while cur <= end:
-        chunk_end = min(cur + timedelta(days=chunk_days - 1), end)
-        yield cur, chunk_end
-        cur = chunk_end + timedelta(days=1)
+    yield from backfill.day_shards(start, end, chunk_days)
+
+
+class AsosSolarSource:
+    """백필 엔진 어댑터: 청크 = 샤드, 지점 응답이 끝나는 대로 파싱·UPSERT.
+
+    store 가 주어지면 샤드가 끝날 때(finish) 그 샤드의 지점 결과를 Parquet 저장소에
+    한 번에 병합한다 — 지점마다 달 파일을 다시 쓰지 않기 위함.
+    """
+
+    name = JOB
+    fatal = (AsosQuotaExceeded,)
+
+    def __init__(self, chunk_days: int = DEFAULT_CHUNK_DAYS, store: Optional[AsosStore] = None):
+        self.chunk_days = chunk_days
+        self.store = store
+        self._frames: Dict[Tuple[date, date], List[pd.DataFrame]] = {}
+
+    def shards(self, start: date, end: date):
+        return list(_date_chunks(start, end, self.chunk_days))
+
+    async def fetch(self, start: date, end: date):
+        s, e = start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+        # strict: 실패한 창이 있으면 받은 지점은 적재하고 샤드는 failed 로 — 다음 실행에서 다시
+        async for _, raw in stream_stations(get_station_ids(), s, e, strict=True):
+            yield raw
+
+    def parse(self, raw: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+        return normalize_weather_data(raw)
+
+    def load(self, df: pd.DataFrame, start: date, end: date) -> int:
+        self._frames.setdefault((start, end), []).append(df)
+        return load_asos_df(df)
+
+    def finish(self, start: date, end: date) -> None:
+        frames = self._frames.pop((start, end), [])
+        if not frames:
+            logger.warning(f"[solar-backfill] {start}~{end}: 수집 결과 없음")
+        elif self.store is not None:
+            self.store.upsert(pd.concat(frames, ignore_index=True))
 
 
 async def backfill_range(
     start: date,
     end: date,
     chunk_days: int = DEFAULT_CHUNK_DAYS,
-    sleep_sec: float = 1.0,
+    store: Optional[AsosStore] = None,
+    concurrency: int = 1,
+    ledger=None,
+    restart: bool = False,
 ) -> int:
-    """[start, end] 구간을 청크 단위로 수집 → 정규화 → weather_asos UPSERT.
+    """[start, end] 구간을 청크 샤드 단위로 수집 → 정규화 → weather_asos UPSERT.
+
+    ledger 가 DbLedger 면 이미 끝난 청크는 건너뛴다(기본은 재개 없는 MemoryLedger).
 
     Returns:
-        청크별 upsert 행수의 합(같은 (timestamp, station_name)이 여러 청크에
+        이번 실행에서 upsert 한 행수의 합(같은 (timestamp, station_name)이 여러 청크에
         걸쳐 다시 들어와도 매번 카운트되므로, 실제 DB 행 증가량과는 다를 수 있다).
+
+    Raises:
+        AsosQuotaExceeded: 일일 요청 한도 초과. 이미 끝난 청크는 원장에 done 으로 남는다.
+        RuntimeError: 실패한 청크가 있음(원장에 failed 로 남아 다음 실행에서 다시 돈다).
     """
     init_db()
-    chunks = list(_date_chunks(start, end, chunk_days))
-    total = 0
-    for i, (chunk_start, chunk_end) in enumerate(chunks, start=1):
-        s, e = chunk_start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d")
-        logger.info(f"[solar-backfill] 청크 {i}/{len(chunks)}: {s}~{e} ({len(station_ids)}개 지점)")
-
-        df = await select_data_async(station_ids, s, e)
-        if df.empty:
-            logger.warning(f"[solar-backfill] {s}~{e}: 수집 결과 없음")
-        else:
-            df = normalize_weather_data(df)
-            n = load_asos_df(df)
-            total += n
-            logger.info(f"[solar-backfill] {s}~{e}: {n}행 upsert")
-
-        if i < len(chunks):
-            await asyncio.sleep(sleep_sec)
-
-    logger.info(f"[solar-backfill] 완료: 총 {total}행 upsert ({start}~{end})")
-    return total
+    source = AsosSolarSource(chunk_days, store)
+    try:
+        report = await backfill.run_backfill(
+            source, start, end, ledger=ledger, concurrency=concurrency, restart=restart
+        )
+    except AsosQuotaExceeded:
+        logger.error("[solar-backfill] 요청 한도 초과 — 중단. 같은 명령을 다시 실행하면 남은 청크부터 이어서 돈다.")
+        raise
+    logger.info(f"[solar-backfill] 완료: 총 {report.rows}행 upsert ({start}~{end})")
+    if not report.ok:
+        raise RuntimeError(f"ASOS 백필 실패 청크: {', '.join(f'{s}~{e}' for s, e in report.failed)}")
+    return report.rows
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="ASOS 과거 일사량(+기온/습도) 백필")
     parser.add_argument("--start", required=True, help="시작일 YYYYMMDD")
     parser.add_argument("--end", required=True, help="종료일 YYYYMMDD")
-    parser.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS, help="청크 크기(일), 기본 30")
-    parser.add_argument("--sleep-sec", type=float, default=1.0, help="청크 사이 대기(초), 기본 1")
+    parser.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS, help=f"청크 크기(일), 기본 {DEFAULT_CHUNK_DAYS}")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 도는 청크 수, 기본 1")
+    parser.add_argument("--no-store", action="store_true", help="Parquet 저장소(data/asos_store) 병합 생략")
+    backfill.add_cli_args(parser)
+    response_cache.add_cli_args(parser)
     args = parser.parse_args()
+    response_cache.configure_from_args(args)
 
     start = datetime.strptime(args.start, "%Y%m%d").date()
     end = datetime.strptime(args.end, "%Y%m%d").date()
     if end < start:
         raise ValueError("end가 start보다 빠릅니다.")
 
-    asyncio.run(backfill_range(start, end, args.chunk_days, args.sleep_sec))
+    store = None if args.no_store else AsosStore()
+    asyncio.run(backfill_range(
+        start, end, args.chunk_days, store=store, concurrency=args.concurrency,
+        ledger=backfill.ledger_from_args(args), restart=args.restart,
+    ))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""
+ASOS 시간자료 월 파티션 Parquet 저장소 — asos_all_merged.csv 대체.
+
+누적 CSV 는 매일 전체를 읽고(날짜 재파싱) 중복 제거한 뒤 통째로 다시 쓴다 —
+이력에 비례해 느려진다. 여기서는 관측월별 파일 하나씩으로 나눠 두고, 새 데이터가
+닿는 달의 파일만 읽어 병합·재작성한다.
+
+구조:
+    data/asos_store/month=YYYY-MM/part.parquet
+    컬럼: timestamp, station_name, temperature, humidity, solar_radiation
+    각 파일은 (station_name, timestamp) 정렬, 같은 키는 나중 값이 이긴다(merge_to_all 과 동일).
+
+파일은 임시 파일에 쓴 뒤 os.replace 로 바꿔 끼우므로 읽는 쪽이 반쯤 쓴 파일을 보지 않는다.
+기존 CSV 가 필요한 곳을 위해 export_csv 가 같은 모양(date, hour, station_name, temperature,
+humidity, solar radiation)의 파일을 만들어 준다.
+
+사용법:
+    uv run python -m fetch_data.weather.asos_store import data/asos_all_merged.csv
+    uv run python -m fetch_data.weather.asos_store export data/asos_all_merged.csv --start 2026-01-01
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from fetch_data.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_STORE_DIR = PROJECT_ROOT / "data" / "asos_store"
+STORE_COLUMNS = ["timestamp", "station_name", "temperature", "humidity", "solar_radiation"]
+KEY = ["station_name", "timestamp"]
+IMPORT_CHUNK_ROWS = 500_000
+
+# CSV(normalize_weather_data 출력/누적 CSV) 컬럼 → 저장소 컬럼
+_CSV_COLUMNS = {"date": "timestamp", "solar radiation": "solar_radiation"}
+
+
+def to_store_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """CSV 모양(date, ..., solar radiation) 또는 저장소 모양 DataFrame → 저장소 스키마."""
+    frame = df.rename(columns=_CSV_COLUMNS)
+    for column in STORE_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = float("nan")
+    frame = frame[STORE_COLUMNS].copy()
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], format="mixed", errors="coerce")
+    frame = frame.dropna(subset=["timestamp", "station_name"])
+    frame["station_name"] = frame["station_name"].astype(str)
+    for column in ("temperature", "humidity", "solar_radiation"):
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    return frame
+
+
+def _window(frame: pd.DataFrame, start, end) -> pd.DataFrame:
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= frame["timestamp"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= frame["timestamp"] < pd.Timestamp(end)
+    return frame[mask].reset_index(drop=True)
+
+
+class AsosStore:
+    """월 파티션 Parquet 저장소. 쓰기는 닿는 달만, 읽기는 구간과 겹치는 달만."""
+
+    def __init__(self, root: str | Path = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    def _path(self, month: str) -> Path:
+        return self.root / f"month={month}" / "part.parquet"
+
+    def months(self) -> List[str]:
+        """저장된 달 목록(YYYY-MM, 오름차순)."""
+        return sorted(p.parent.name.split("=", 1)[1] for p in self.root.glob("month=*/part.parquet"))
+
+    def _months_between(self, start, end) -> List[str]:
+        """[start, end) 와 겹치는 저장된 달."""
+        first = pd.Timestamp(start).strftime("%Y-%m") if start is not None else None
+        last = (pd.Timestamp(end) - pd.Timedelta(microseconds=1)).strftime("%Y-%m") if end is not None else None
+        return [m for m in self.months() if (first is None or m >= first) and (last is None or m <= last)]
+
+    def exists(self) -> bool:
+        return bool(self.months())
+
+    def _read_month(self, month: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        path = self._path(month)
+        if not path.exists():
+            return pd.DataFrame(columns=columns or STORE_COLUMNS)
+        return pd.read_parquet(path, columns=columns)
+
+    def _write_month(self, month: str, frame: pd.DataFrame) -> None:
+        path = self._path(month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def upsert(self, df: pd.DataFrame) -> Dict[str, int]:
+        """새 관측을 병합한다. 반환값은 {갱신한 달: 그 달의 최종 행 수}."""
+        frame = to_store_frame(df)
+        if frame.empty:
+            return {}
+        touched: Dict[str, int] = {}
+        for month, part in frame.groupby(frame["timestamp"].dt.strftime("%Y-%m"), sort=True):
+            existing = self._read_month(month)
+            merged = pd.concat([existing, part], ignore_index=True) if len(existing) else part
+            merged = (
+                merged.drop_duplicates(subset=KEY, keep="last")
+                .sort_values(KEY, kind="stable")
+                .reset_index(drop=True)
+            )
+            self._write_month(month, merged)
+            touched[month] = len(merged)
+        logger.info(f"[asos_store] {len(frame)}행 병합 → {', '.join(touched)}")
+        return touched
+
+    def read(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """[start, end) 구간 행. 구간과 겹치는 달 파일만 연다."""
+        read_columns = None if columns is None else list(dict.fromkeys(["timestamp", *columns]))
+        frames = [self._read_month(m, read_columns) for m in self._months_between(start, end)]
+        if not frames:
+            return pd.DataFrame(columns=read_columns or STORE_COLUMNS)
+        frame = _window(pd.concat(frames, ignore_index=True), start, end)
+        return frame if columns is None else frame[columns]
+
+    def import_csv(self, csv_path: str | Path, chunksize: int = IMPORT_CHUNK_ROWS) -> int:
+        """누적 CSV 를 청크 단위로 저장소에 옮긴다(최초 1회 이전용). 반환값은 읽은 행 수."""
+        total = 0
+        for chunk in pd.read_csv(csv_path, encoding="utf-8-sig", chunksize=chunksize):
+            self.upsert(chunk)
+            total += len(chunk)
+        logger.info(f"[asos_store] CSV 이전 완료: {csv_path} ({total}행)")
+        return total
+
+    def export_csv(
+        self,
+        csv_path: str | Path,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> int:
+        """기존 asos_all_merged.csv 와 같은 모양으로 내보낸다(달 단위로 이어 써 메모리 일정)."""
+        csv_path = Path(csv_path)
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = csv_path.with_name(f".{csv_path.name}.{os.getpid()}.tmp")
+        total = 0
+        with open(tmp, "w", encoding="utf-8-sig", newline="") as fh:
+            header = True
+            for month in self._months_between(start, end):
+                frame = _window(self._read_month(month), start, end)
+                if frame.empty:
+                    continue
+                out = pd.DataFrame({
+                    "date": frame["timestamp"],
+                    "hour": frame["timestamp"].dt.hour,
+                    "station_name": frame["station_name"],
+                    "temperature": frame["temperature"],
+                    "humidity": frame["humidity"],
+                    "solar radiation": frame["solar_radiation"],
+                }).sort_values(["date", "station_name"], kind="stable")
+                out.to_csv(fh, index=False, header=header)
+                header = False
+                total += len(out)
+        os.replace(tmp, csv_path)
+        logger.info(f"[asos_store] CSV 내보내기: {csv_path} ({total}행)")
+        return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ASOS 월 파티션 Parquet 저장소")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_DIR, help="저장소 디렉터리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="누적 CSV → 저장소")
+    imp.add_argument("csv", type=Path)
+    exp = sub.add_parser("export", help="저장소 → 누적 CSV 모양")
+    exp.add_argument("csv", type=Path)
+    exp.add_argument("--start", default=None, help="시작 시각(포함, YYYY-MM-DD)")
+    exp.add_argument("--end", default=None, help="끝 시각(제외, YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    store = AsosStore(args.store)
+    if args.command == "import":
+        print(f"이전 행수: {store.import_csv(args.csv)}")
+    else:
+        start = pd.Timestamp(args.start) if args.start else None
+        end = pd.Timestamp(args.end) if args.end else None
+        print(f"내보낸 행수: {store.export_csv(args.csv, start, end)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,8 @@ Tables:
   차이를 보정하지는 않는다(원본 그대로 보존) — research 뷰(Task 3)에서 조인 시 참고할 것.
 """
 
-from typing import Optional
+import io
+from typing import Iterable, Iterator, Optional
 
 import pandas as pd
 from sqlalchemy import (
@@ -30,12 +31,16 @@ from sqlalchemy import (
     DateTime,
     Index,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base
 
+from fetch_data.common import metrics
+from fetch_data.common.coverage import record_coverage
 from fetch_data.common.db_base import get_engine
+from fetch_data.common.db_utils import copy_cursor
 from fetch_data.common.logger import get_logger
 
 logger = get_logger(__name__)
@@ -96,64 +101,100 @@ def init_db():
 # ========================================
 
 _VALUE_COLUMNS = ("temperature", "humidity", "solar_radiation")
+_COLUMNS = ("timestamp", "station_name", *_VALUE_COLUMNS)
+
+# COPY 스테이징 한 번에 흘려 넣는 행 수 — CSV 버퍼 메모리 상한(대략 행당 60바이트)
+COPY_CHUNK_ROWS = 200_000
+
+_CREATE_STAGE = text("""
+    CREATE TEMP TABLE IF NOT EXISTS _weather_asos_stage (
+        timestamp       timestamp,
+        station_name    varchar(50),
+        temperature     double precision,
+        humidity        double precision,
+        solar_radiation double precision
+    ) ON COMMIT DROP
+""")
+
+_COPY_STAGE = (
+    "COPY _weather_asos_stage (timestamp, station_name, temperature, humidity, solar_radiation) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
 
+# 스테이징 → weather_asos. load_asos_df 의 INSERT … VALUES 경로와 같은 COALESCE 규칙
+_MERGE_STAGE = text("""
+    INSERT INTO weather_asos (timestamp, station_name, temperature, humidity, solar_radiation)
+    SELECT timestamp, station_name, temperature, humidity, solar_radiation FROM _weather_asos_stage
+    ON CONFLICT (timestamp, station_name) DO UPDATE SET
+        temperature = COALESCE(EXCLUDED.temperature, weather_asos.temperature),
+        humidity = COALESCE(EXCLUDED.humidity, weather_asos.humidity),
+        solar_radiation = COALESCE(EXCLUDED.solar_radiation, weather_asos.solar_radiation)
+""")
 
-def load_asos_df(df: pd.DataFrame, engine: Optional[Engine] = None) -> int:
-    """ASOS DataFrame을 weather_asos에 UPSERT한다.
 
-    입력 컬럼은 원본 CSV(`date`, `humidity`, `temperature`, `station_name`,
-    `solar radiation`)나 정규화된 수집 결과(`normalize_weather_data` 출력,
-    `solar radiation` 컬럼이 항상 있다 — icsr 미제공/미관측이면 NaN) 어느
-    쪽이든 받는다. 없는 값 컬럼은 NULL로 채운다.
+def _asos_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """load_asos_df 입력을 weather_asos 컬럼의 타입 있는 DataFrame 으로 정리한다(DB 접근 없음).
 
-    (timestamp, station_name) 충돌 시 COALESCE로 갱신한다 — 들어온 값이 NULL이면
-    기존 값을 유지한다(예: 일사계 미관측 지점이나 야간 시간대는 solar_radiation이
-    NULL로 들어오므로, 매일 적재해도 백필로 채워둔 일사량이 지워지지 않는다). 기존
-    upsert_demand_5min과 동일한 패턴.
-
-    Returns:
-        upsert된 행 수 (timestamp/station_name이 없는 행은 제외, 같은 키 중복은
-        마지막 값만 남기고 1행으로 센다)
+    Raises:
+        ValueError: timestamp(date)/station_name 컬럼이 없을 때.
     """
-    if df is None or df.empty:
-        logger.info("[DB] 적재할 ASOS 데이터가 없습니다.")
-        return 0
-
-    frame = df.rename(columns={"date": "timestamp", "solar radiation": "solar_radiation"}).copy()
+    frame = df.rename(columns={"date": "timestamp", "solar radiation": "solar_radiation"})
 
     if "timestamp" not in frame.columns or "station_name" not in frame.columns:
         raise ValueError(
             f"필수 컬럼(timestamp/date, station_name)이 없습니다: {list(frame.columns)}"
         )
 
-    frame["timestamp"] = pd.to_datetime(frame["timestamp"], errors="coerce")
+    out = pd.DataFrame({"timestamp": pd.to_datetime(frame["timestamp"], errors="coerce")})
+    out["station_name"] = frame["station_name"]
     for col in _VALUE_COLUMNS:
-        if col not in frame.columns:
-            frame[col] = None
-        frame[col] = pd.to_numeric(frame[col], errors="coerce")
+        out[col] = (
+            pd.to_numeric(frame[col], errors="coerce").astype("float64")
+            if col in frame.columns else float("nan")
+        )
 
     # station_name의 결측(NaN)은 문자열로 바꾸기 전에 걸러야 한다. astype(str)을
     # 먼저 하면 NaN이 "nan"이라는 멀쩡해 보이는 문자열이 되어 dropna를 통과해버린다.
-    frame = frame.dropna(subset=["timestamp", "station_name"])
-    frame["station_name"] = frame["station_name"].astype(str).str.strip()
-    frame = frame[frame["station_name"] != ""]
-    if frame.empty:
-        logger.info("[DB] 유효한 ASOS 행이 없습니다(timestamp/station_name 결측).")
-        return 0
-
-    columns = ["timestamp", "station_name", *_VALUE_COLUMNS]
-    subset = frame[columns]
+    out = out.dropna(subset=["timestamp", "station_name"])
+    out["station_name"] = out["station_name"].astype(str).str.strip()
+    out = out[out["station_name"] != ""]
     # 같은 배치 안에 (timestamp, station_name) 중복이 있으면 Postgres INSERT가
     # CardinalityViolation으로 배치 전체를 롤백한다. UPSERT라 마지막 값이 이기는 게
     # 자연스러우니 keep="last"로 미리 정리한다.
-    subset = subset.drop_duplicates(subset=["timestamp", "station_name"], keep="last")
+    return out.drop_duplicates(subset=["timestamp", "station_name"], keep="last")
+
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    """정리된 frame → UPSERT 레코드(COPY 를 못 쓰는 연결용)."""
     # NaN -> None 명시 변환. object로 먼저 캐스팅해야 float 컬럼에서 None이
     # 다시 NaN으로 되돌아가지 않는다(NaN을 그대로 보내면 DB에 SQL NULL이 아니라
     # 부동소수점 NaN 리터럴이 저장되어 집계 함수가 오염된다).
-    records = subset.astype(object).where(pd.notnull(subset), None).to_dict("records")
+    return frame.astype(object).where(pd.notnull(frame), None).to_dict("records")
 
-    engine = engine or get_engine()
-    total = 0
+
+def _asos_records(df: pd.DataFrame) -> list[dict]:
+    """load_asos_df 입력을 weather_asos UPSERT 레코드로 바꾼다(DB 접근 없음)."""
+    frame = _asos_frame(df)
+    return _records(frame) if len(frame) else []
+
+
+def _copy_chunks(frame: pd.DataFrame, chunk_rows: int = COPY_CHUNK_ROWS) -> Iterator[io.StringIO]:
+    """정리된 frame 을 COPY csv 버퍼로 chunk_rows 씩 나눠 만든다.
+
+    NaN 은 따옴표 없는 빈 칸으로 나가고, COPY csv 는 이를 SQL NULL 로 읽는다(빈 문자열은
+    station_name 에서 이미 걸렀으므로 NULL 과 섞이지 않는다). 값은 repr 정밀도 그대로 쓴다.
+    """
+    for offset in range(0, len(frame), chunk_rows):
+        buf = io.StringIO()
+        frame.iloc[offset:offset + chunk_rows].to_csv(
+            buf, index=False, header=False, na_rep="", date_format="%Y-%m-%d %H:%M:%S"
+        )
+        buf.seek(0)
+        yield buf
+
+
+def _upsert_values(connection, records: list[dict]) -> None:
+    """INSERT … VALUES … ON CONFLICT (COPY 를 못 쓰는 연결용, BATCH_SIZE 씩)."""
     for offset in range(0, len(records), BATCH_SIZE):
         batch = records[offset:offset + BATCH_SIZE]
         statement = insert(WeatherASOS).values(batch)
@@ -164,15 +205,95 @@ def load_asos_df(df: pd.DataFrame, engine: Optional[Engine] = None) -> int:
                 for column in _VALUE_COLUMNS
             },
         )
-        with engine.begin() as connection:
-            connection.execute(statement)
-        total += len(batch)
-        logger.info(f"[DB] weather_asos upsert 진행: {total}/{len(records)}행")
+        connection.execute(statement)
+
 
+def _load_prepared(frames: Iterable[pd.DataFrame], engine: Optional[Engine]) -> int:
+    """_asos_frame 으로 정리된 frame 들을 한 트랜잭션으로 병합한다."""
+    engine = engine or get_engine()
+    total = 0
+    with metrics.stage("load", source="asos", table="weather_asos") as st, \
+            engine.begin() as connection, copy_cursor(connection) as cursor:
+        if cursor is not None:
+            connection.execute(_CREATE_STAGE)
+        for frame in frames:
+            if frame.empty:
+                continue
+            if cursor is None:
+                _upsert_values(connection, _records(frame))
+            else:
+                connection.execute(text("TRUNCATE _weather_asos_stage"))
+                for buf in _copy_chunks(frame[list(_COLUMNS)]):
+                    cursor.copy_expert(_COPY_STAGE, buf)
+                connection.execute(_MERGE_STAGE)
+            record_coverage(connection, "weather_asos", frame["timestamp"], frame["station_name"])
+            total += len(frame)
+            logger.info(f"[DB] weather_asos upsert 진행: {total}행")
+        st.rows = total
+    return total
+
+
+def load_asos_frames(frames: Iterable[pd.DataFrame], engine: Optional[Engine] = None) -> int:
+    """DataFrame 묶음(예: read_csv chunksize, 월 파티션)을 한 트랜잭션으로 흘려 적재한다.
+
+    psycopg2 연결이면 frame 마다 COPY 로 임시 스테이징에 넣고 INSERT … SELECT … ON
+    CONFLICT 한 문장으로 병합한다 — 행마다 dict 를 만들거나 SQLAlchemy 가 3000행짜리
+    VALUES 를 컴파일하지 않으므로, 메모리는 frame 하나 + CSV 버퍼(COPY_CHUNK_ROWS)로
+    묶인다. COPY 를 못 쓰는 연결이면 기존 INSERT … VALUES 배치로 돌아간다.
+    같은 키가 여러 frame 에 걸쳐 오면 뒤 frame 이 COALESCE 규칙으로 덮는다.
+
+    Returns:
+        upsert된 행 수 (frame 안 같은 키 중복은 1행으로 센다)
+    """
+    prepared = (_asos_frame(df) for df in frames if df is not None and not df.empty)
+    return _load_prepared(prepared, engine)
+
+
+def load_asos_df(df: pd.DataFrame, engine: Optional[Engine] = None) -> int:
+    """ASOS DataFrame을 weather_asos에 UPSERT한다.
+
+    입력 컬럼은 원본 CSV(`date`, `humidity`, `temperature`, `station_name`,
+    `solar radiation`)나 정규화된 수집 결과(`normalize_weather_data` 출력,
+    `solar radiation` 컬럼이 항상 있다 — icsr 미제공/미관측이면 NaN) 어느
+    쪽이든 받는다. 없는 값 컬럼은 NULL로 채운다.
+
+    (timestamp, station_name) 충돌 시 COALESCE로 갱신한다 — 들어온 값이 NULL이면
+    기존 값을 유지한다(예: 일사계 미관측 지점이나 야간 시간대는 solar_radiation이
+    NULL로 들어오므로, 매일 적재해도 백필로 채워둔 일사량이 지워지지 않는다). 기존
+    upsert_demand_5min과 동일한 패턴. 적재 경로(COPY 스테이징/VALUES 배치)는
+    load_asos_frames 참고.
+
+    Returns:
+        upsert된 행 수 (timestamp/station_name이 없는 행은 제외, 같은 키 중복은
+        마지막 값만 남기고 1행으로 센다)
+    """
+    if df is None or df.empty:
+        logger.info("[DB] 적재할 ASOS 데이터가 없습니다.")
+        return 0
+
+    frame = _asos_frame(df)
+    if frame.empty:
+        logger.info("[DB] 유효한 ASOS 행이 없습니다(timestamp/station_name 결측).")
+        return 0
+
+    total = _load_prepared([frame], engine)
     logger.info(f"[DB] weather_asos upsert 완료: {total}행")
     return total
 
 
+def load_asos_csv(csv_path, chunksize: int = COPY_CHUNK_ROWS, engine: Optional[Engine] = None) -> int:
+    """누적 CSV(asos_all_merged.csv 모양)를 chunksize 씩 읽어 적재 — 다년치 재적재용."""
+    chunks = pd.read_csv(csv_path, encoding="utf-8-sig", chunksize=chunksize)
+    total = load_asos_frames(chunks, engine=engine)
+    logger.info(f"[DB] {csv_path} → weather_asos {total}행")
+    return total
+
+
 if __name__ == "__main__":
+    import sys
+
     logger.info("ASOS 기상 Database 초기화")
     init_db()
+    # python -m fetch_data.weather.database data/asos_all_merged.csv → 스트리밍 재적재
+    for path in sys.argv[1:]:
+        load_asos_csv(path)
@@ -6,7 +6,7 @@
 - DB Upsert: wind_namdong 테이블
 """
 
-import os
+import functools
 import time
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -15,8 +15,9 @@ from typing import List, Optional
 import numpy as np
 import pandas as pd
 import requests
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+from fetch_data.common.config import getenv
 from fetch_data.common.db_utils import resolve_db_url
 from fetch_data.common.generation_core import upsert_generation
 from fetch_data.common.logger import get_logger
@@ -29,10 +30,15 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 # API 설정
 API_BASE = "https://apis.data.go.kr/B551893/wind-power-by-hour/list"
-NAMDONG_WIND_KEY = os.getenv("NAMDONG_WIND_KEY", "")
 PAGE_SIZE = 100
 
 
+@functools.lru_cache(maxsize=1)
+def _wind_key() -> str:
+    """NAMDONG_WIND_KEY (첫 호출 때 1회 읽는다)."""
+    return getenv("NAMDONG_WIND_KEY", "")
+
+
 # =========================================================
 # API 수집
 # =========================================================
@@ -55,7 +61,7 @@ def fetch_namdong_wind_api(
     Returns:
         wide-format DataFrame (API 원본)
     """
-    key = service_key or NAMDONG_WIND_KEY
+    key = service_key or _wind_key()
     if not key:
         raise RuntimeError("NAMDONG_WIND_KEY가 설정되지 않았습니다.")
 
@@ -5,18 +5,19 @@ Slack 알림 유틸리티
 - send_slack_rich_message: Block Kit 리치 메시지 전송
 """
 
-import os
 from datetime import datetime
 
 import requests
 
+from fetch_data.common.config import getenv
+
 
 def send_slack_message(text: str, webhook_url: str | None = None):
     """
     Slack Incoming Webhook으로 단순 텍스트 메시지 전송
     """
     if webhook_url is None:
-        webhook_url = os.getenv("SLACK_WEBHOOK_URL")
+        webhook_url = getenv("SLACK_WEBHOOK_URL")
 
     if not webhook_url:
         print("SLACK_WEBHOOK_URL이 설정되어 있지 않습니다. Slack 전송 스킵.")
@@ -46,7 +47,7 @@ def send_slack_rich_message(
         webhook_url: Webhook URL (미지정 시 환경변수 사용)
     """
     if webhook_url is None:
-        webhook_url = os.getenv("SLACK_WEBHOOK_URL")
+        webhook_url = getenv("SLACK_WEBHOOK_URL")
 
     if not webhook_url:
         print("SLACK_WEBHOOK_URL이 설정되어 있지 않습니다.")
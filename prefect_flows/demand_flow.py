@@ -9,7 +9,8 @@ from prefect import flow, task
 from fetch_data.demand.aggregate import aggregate_demand_weather, refresh_demand_views
 from fetch_data.demand.collect import collect_latest
 from fetch_data.demand.database import get_demand_engine
-from prefect_flows.merge_to_all import DEFAULT_MERGED_CSV
+from fetch_data.demand.weather_source import default_weather_source
+from prefect_flows.merge_to_all import DEFAULT_MERGED_CSV, DEFAULT_STORE_DIR
 from prefect_flows.notify_tasks import notify_slack_failure
 
 
@@ -20,7 +21,11 @@ async def run_demand_collection_task(engine) -> int:
 
 @task(name="수요-기상 시간별 집계 실행", retries=2, retry_delay_seconds=300)
 def run_hourly_aggregation_task(engine, recover: bool = False) -> int:
-    return aggregate_demand_weather(engine, DEFAULT_MERGED_CSV, recover=recover)
+    return aggregate_demand_weather(
+        engine,
+        default_weather_source(DEFAULT_MERGED_CSV, DEFAULT_STORE_DIR),
+        recover=recover,
+    )
 
 
 @flow(name="Unified Demand Collection Flow", log_prints=True)
@@ -34,7 +39,7 @@ async def unified_demand_collection_flow(force_hourly: bool = False) -> dict[str
             demand_weather_1h = run_hourly_aggregation_task(
                 engine, recover=force_hourly
             )
-            refresh_demand_views(engine)
+            refresh_demand_views(engine, force=force_hourly)
         return {
             "demand_5min": demand_5min,
             "demand_weather_1h": demand_weather_1h,
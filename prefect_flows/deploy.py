@@ -160,7 +160,7 @@ DEPLOYMENTS = [
         "label": "매월 10일 10:00 (남동발전 PV)",
         "tags": ["pv", "namdong", "monthly"],
         "description": "매월 10일 오전 10시에 전월 남동발전 PV 데이터를 수집/백필",
-        "parameters": {"target_start": None, "target_end": None, "sleep_sec": 5},
+        "parameters": {"target_start": None, "target_end": None, "concurrency": 4},
     },
     {
         "flow": "prefect_flows.nambu_pv_flow.daily_nambu_collection_flow",
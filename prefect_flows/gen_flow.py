@@ -5,7 +5,7 @@ Prefect Flow: KOEN 비태양광(화력/연료전지/해양소수력) 월별 수
 스케줄: 매월 10일 오전 10시 (KST)
 
 - 수집·변환: fetch_data.gen.pipeline.run_pipeline (latest 증분)
-- 적재      : fetch_data.gen.load_gen.load_all (plants/generation upsert, operator='namdong')
+- 적재      : fetch_data.gen.load_gen.load_all (변경분만 plants/generation upsert, operator='namdong')
 """
 
 from __future__ import annotations
@@ -26,7 +26,7 @@ def collect_transform(gen_keys: Optional[List[str]], mode: str) -> None:
 
 @task(name="비태양광 generation 적재", retries=2, retry_delay_seconds=120)
 def load_generation(gen_keys: Optional[List[str]]) -> int:
-    return load_all(categories=gen_keys)
+    return load_all(categories=gen_keys, delta=True)
 
 
 @flow(name="Monthly KOEN Gen Collection Flow", log_prints=True)
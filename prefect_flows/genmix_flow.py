@@ -2,7 +2,8 @@
 Prefect Flow: KPX 실시간 발전원별 발전량 5분 수집.
 
 KPX 페이지가 **당일치만** 싣고 지나간 날은 다시 못 받으므로 5분마다 돌린다.
-매번 당일 전체를 다시 UPSERT 하므로 한두 번 실패해도 다음 실행이 메운다.
+매번 당일 전체를 다시 받아 새로 생기거나 바뀐 칸만 UPSERT 한다(슬롯 지문 비교).
+한두 번 실패해도 다음 실행이 메운다.
 """
 from __future__ import annotations
 
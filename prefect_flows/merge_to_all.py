@@ -1,5 +1,10 @@
 """
-매일 수집된 데이터를 asos_all_merged.csv에 추가하는 스크립트
+매일 수집된 데이터를 누적본에 추가하는 스크립트
+
+- merge_to_store: 월 파티션 Parquet 저장소(data/asos_store)에 병합 — 닿는 달 파일만 다시 쓴다.
+  일일 플로우가 쓰는 기본 경로. 저장소가 비어 있으면 기존 asos_all_merged.csv 를 먼저 옮긴다.
+- merge_to_all_csv: 예전 방식(누적 CSV 전체를 읽고 다시 씀). CSV 가 꼭 필요할 때만 쓰고,
+  보통은 `python -m fetch_data.weather.asos_store export` 로 저장소에서 뽑는다.
 """
 import pandas as pd
 from pathlib import Path
@@ -7,10 +12,36 @@ from datetime import datetime
 
 # 프로젝트 루트 & data 디렉토리 기준 경로들
 BASE_DIR = Path(__file__).resolve().parents[1]   # /app/fetch_data/merge_to_all.py -> /app
-DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = BASE_DIR / "data"   # 저장 시점에 생성 (import 시 파일시스템을 건드리지 않는다)
 
 DEFAULT_MERGED_CSV = DATA_DIR / "asos_all_merged.csv"
+DEFAULT_STORE_DIR = DATA_DIR / "asos_store"
+
+
+def merge_to_store(new_csv_path: str | Path,
+                   store_dir: str | Path = DEFAULT_STORE_DIR,
+                   legacy_csv_path: str | Path | None = DEFAULT_MERGED_CSV) -> str:
+    """
+    새로 수집된 CSV 를 월 파티션 Parquet 저장소에 병합합니다.
+
+    저장소가 비어 있고 legacy_csv_path 가 있으면 그 누적 CSV 를 먼저 한 번 옮긴다.
+    반환값은 저장소 디렉터리 경로.
+    """
+    from fetch_data.weather.asos_store import AsosStore
+
+    new_csv_path = Path(new_csv_path)
+    if not new_csv_path.exists():
+        raise FileNotFoundError(f"새 파일을 찾을 수 없습니다: {new_csv_path}")
+
+    store = AsosStore(store_dir)
+    if not store.exists() and legacy_csv_path is not None and Path(legacy_csv_path).exists():
+        print(f"저장소가 비어 있어 기존 누적 CSV 를 옮깁니다: {legacy_csv_path}")
+        store.import_csv(legacy_csv_path)
+
+    df_new = pd.read_csv(new_csv_path, encoding="utf-8-sig")
+    touched = store.upsert(df_new)
+    print(f"저장소 병합: {len(df_new)}건 → {', '.join(touched) or '변경 없음'} ({store.root})")
+    return str(store.root)
 
 
 def merge_to_all_csv(new_csv_path: str | Path,
@@ -89,6 +120,7 @@ def merge_to_all_csv(new_csv_path: str | Path,
 
     
     print(f"\n통합 파일 저장 중...")
+    merged_csv_path.parent.mkdir(parents=True, exist_ok=True)
     df_combined.to_csv(merged_csv_path, index=False, encoding="utf-8-sig")
     
     print(f"\n{'='*80}")
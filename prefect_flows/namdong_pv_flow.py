@@ -7,15 +7,20 @@ Prefect Flow: Namdong PV (남동발전 태양광) 월별 수집.
 from pathlib import Path
 from typing import List, Optional
 
-from prefect import flow
+from prefect import flow, task
 
-from fetch_data.pv.namdong_collect import run_namdong_collection
+from fetch_data.pv.namdong_collect import _collect_namdong_csv_sync, run_namdong_collection
+
+# CSV 다운로드만 단독 task 로 쓸 때 (수집기 모듈은 Prefect 를 import 하지 않는다)
+collect_namdong_csv = task(name="남동발전 CSV 수집", retries=3, retry_delay_seconds=300)(
+    _collect_namdong_csv_sync
+)
 
 
 @flow(name="Monthly Namdong PV Collection Flow", log_prints=True)
 def monthly_namdong_pv_flow(
     target_start: Optional[str] = None,
     target_end: Optional[str] = None,
-    sleep_sec: int = 5,
+    concurrency: int = 4,
 ) -> List[Path]:
-    return run_namdong_collection(target_start, target_end, sleep_sec)
+    return run_namdong_collection(target_start, target_end, concurrency)
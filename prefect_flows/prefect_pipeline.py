@@ -16,11 +16,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fetch_data.weather.asos_collect import (
     normalize_weather_data,
+    get_station_ids,
     select_data_async,
-    station_ids,
 )
 from fetch_data.weather.database import load_asos_df
-from prefect_flows.merge_to_all import merge_to_all_csv
+from prefect_flows.merge_to_all import merge_to_store
 from prefect_flows.notify_tasks import notify_slack_success, notify_slack_failure
 
 
@@ -35,7 +35,7 @@ async def collect_weather_data(date_str: str) -> pd.DataFrame:
     print(f"기상 데이터 수집: {date_str}")
     print(f"{'='*60}\n")
 
-    df = await select_data_async(station_ids, date_str, date_str)
+    df = await select_data_async(get_station_ids(), date_str, date_str)
 
     if df.empty:
         raise ValueError(f"날짜 {date_str}에 대해 수집된 데이터가 없습니다.")
@@ -74,8 +74,8 @@ def save_weather_data(df: pd.DataFrame, date_str: str, output_dir: str = "/app/d
 
 @task(name="기상 데이터 병합", retries=2)
 def merge_weather_to_all(output_path: str) -> str:
-    """새로 저장된 CSV를 통합 파일에 병합합니다."""
-    merged_path = merge_to_all_csv(output_path)
+    """새로 저장된 CSV를 월 파티션 Parquet 저장소에 병합합니다(닿는 달만 재작성)."""
+    merged_path = merge_to_store(output_path)
     return merged_path
 
 
@@ -139,7 +139,7 @@ def daily_weather_collection_flow(target_date: str | None = None):
         # 3. 데이터 저장
         output_path_future = save_weather_data.submit(df_processed_future, target_date)
 
-        # 4. 통합 파일에 병합
+        # 4. 누적 저장소에 병합
         merged_path_future = merge_weather_to_all.submit(output_path_future)
 
         # 5. DB 적재 (CSV 저장/병합과 별개로 병렬 진행, 실패해도 플로우에 영향 없음)
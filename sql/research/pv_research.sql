@@ -37,7 +37,8 @@ DROP VIEW IF EXISTS
     research.smp_hourly,
     research.smp_realtime_jeju,
     research.smp_weighted_avg,
-    research.weather_asos
+    research.weather_asos,
+    research.data_coverage
 CASCADE;
 
 
@@ -275,6 +276,37 @@ COMMENT ON COLUMN research.weather_asos.has_solar_sensor IS
     'true 면 일사 관측 지점(63개) — solar_radiation 이 NULL 이면 야간이거나 결측. false 면 미관측 지점(32개) — 사실상 전부 NULL 이며(성산·제천 각 1행, 값 0인 이상치 2건 제외) 결측이 아니다. NULL 이면 2025-07-01 전수조사에 없던 신규 지점.';
 
 
+-- -----------------------------------------------------------------------------
+-- research.data_coverage — 소스·엔티티·일 단위 적재 현황 ("무엇이 비었나")
+--   원장 테이블은 적재 코드(fetch_data/common/coverage.py)가 처음 쓸 때 만든다.
+--   이 파일이 먼저 돌 수도 있어 같은 정의로 미리 만들어 둔다 — 바꿀 때는 둘 다.
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS public.data_coverage (
+    source      TEXT NOT NULL,
+    entity      TEXT NOT NULL,
+    day         DATE NOT NULL,
+    slots       SMALLINT[] NOT NULL,
+    observed    SMALLINT GENERATED ALWAYS AS (cardinality(slots)) STORED,
+    expected    SMALLINT NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source, entity, day)
+);
+
+CREATE VIEW research.data_coverage AS
+SELECT
+    c.source,
+    c.entity,
+    c.day,
+    c.observed,
+    c.expected,
+    (c.observed >= c.expected) AS is_complete
+FROM public.data_coverage c;
+
+COMMENT ON VIEW research.data_coverage IS
+    '소스별 일 단위 적재 현황. 행이 없는 날은 아무것도 적재되지 않은 날이다. source: generation(entity=plant_id) · weather_asos(entity=station_name) · demand_5min(entity=kpx, 이 DB 에는 없음) · smp_realtime(entity=region).';
+COMMENT ON COLUMN research.data_coverage.observed IS
+    '그 날 적재된 서로 다른 슬롯(시·5분·15분 구간) 수. expected 와 같으면 하루가 다 찼다.';
+
 -- -----------------------------------------------------------------------------
 -- 권한 — 그룹 role 에 모아 둔다.
 --   뷰를 DROP/CREATE 하면 개별 GRANT 가 사라지지만, 아래 ALTER DEFAULT PRIVILEGES
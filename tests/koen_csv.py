@@ -0,0 +1,22 @@
+"""KOEN 계열 일별 발전량 CSV 픽스처 — transform 테스트 공용."""
+import pandas as pd
+
+
+def write_month(path, month: str, units, value: float = 1.0, hour_column: str = "{h}시 발전량") -> None:
+    """units [(발전구분, 호기)] 의 month 1·2일치 행(1~24시 = value)을 cp949 CSV 로 쓴다."""
+    rows = [
+        {"일자": f"{month}-{day:02d}", "발전구분": plant, "호기": hogi,
+         **{hour_column.format(h=h): value for h in range(1, 25)}}
+        for day in (1, 2)
+        for plant, hogi in units
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, index=False, encoding="cp949")
+
+
+def record_reads(monkeypatch, module) -> list:
+    """module.read_csv_flexible 이 읽은 파일 이름을 순서대로 모은다."""
+    reads = []
+    original = module.read_csv_flexible
+    monkeypatch.setattr(module, "read_csv_flexible", lambda fp: reads.append(fp.name) or original(fp))
+    return reads
@@ -0,0 +1,135 @@
+"""ASOS 지점 수집: 41일 창 분할, pageNo 페이지네이션, resultCode 신호 (네트워크 없음)."""
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from fetch_data.common import http
+from fetch_data.weather import asos_collect
+from fetch_data.weather.asos_collect import AsosQuotaExceeded, fetch_city, plan_windows
+
+
+def _page(code="00", items=(), total=0):
+    return {
+        "response": {
+            "header": {"resultCode": code, "resultMsg": "MSG"},
+            "body": {"items": {"item": list(items)}, "totalCount": total},
+        }
+    }
+
+
+def _items(n, prefix="x"):
+    return [{"tm": f"{prefix}{i}", "stnNm": "서울", "ta": "1", "hm": "2"} for i in range(n)]
+
+
+def test_plan_windows_fit_one_page_per_call():
+    windows = plan_windows("20250101", "20251231")
+
+    assert windows[0] == ("20250101", "20250210")  # 41일 × 24 = 984 ≤ 999
+    assert windows[-1][1] == "20251231"
+    assert len(windows) == 9
+    assert plan_windows("20260803", "20260803") == [("20260803", "20260803")]
+
+
+def test_fetch_city_pages_until_total_count_is_covered(monkeypatch):
+    calls = []
+    pages = {1: _page(items=_items(999, "a"), total=1500), 2: _page(items=_items(501, "b"), total=1500)}
+
+    async def fetch_page(session, city, start, end, page, key, retries):
+        calls.append((start, end, page))
+        return pages[page]
+
+    monkeypatch.setattr(asos_collect, "_fetch_page", fetch_page)
+
+    df = asyncio.run(fetch_city(None, "108", "20250101", "20250210", "key"))
+
+    assert len(df) == 1500
+    assert calls == [("20250101", "20250210", 1), ("20250101", "20250210", 2)]
+
+
+def test_fetch_city_skips_no_data_and_failed_windows_but_keeps_others(monkeypatch):
+    async def fetch_page(session, city, start, end, page, key, retries):
+        if start == "20250101":
+            return _page(code="03")
+        if start == "20250211":
+            raise http.HttpRequestError("GET", "url", 3, 429)
+        return _page(items=_items(24), total=24)
+
+    monkeypatch.setattr(asos_collect, "_fetch_page", fetch_page)
+
+    df = asyncio.run(fetch_city(None, "108", "20250101", "20250430", "key"))
+
+    assert len(df) == 24
+
+
+def test_strict_fetch_reports_failed_windows_with_partial_result(monkeypatch):
+    async def fetch_page(session, city, start, end, page, key, retries):
+        if start == "20250211":
+            raise http.HttpRequestError("GET", "url", 3, 429)
+        return _page(items=_items(24), total=24)
+
+    monkeypatch.setattr(asos_collect, "_fetch_page", fetch_page)
+
+    with pytest.raises(asos_collect.AsosIncomplete) as exc:
+        asyncio.run(fetch_city(None, "108", "20250101", "20250430", "key", strict=True))
+
+    assert exc.value.failed == [("20250211", "20250323")]
+    assert len(exc.value.partial) == 48
+
+
+def test_quota_exhaustion_stops_the_whole_run(monkeypatch):
+    async def fetch_page(session, city, start, end, page, key, retries):
+        return _page(code="22")
+
+    monkeypatch.setattr(asos_collect, "_fetch_page", fetch_page)
+    monkeypatch.setenv("SERVICE_KEY", "key")
+
+    with pytest.raises(AsosQuotaExceeded):
+        asyncio.run(asos_collect.select_data_async(["108", "112"], "20250101", "20250101"))
+
+
+def test_result_code_05_counts_as_throttle():
+    def response(code):
+        body = json.dumps(_page(code=code)).encode()
+        return http.HttpResponse(status=200, headers={}, body=body, url="u", elapsed=0.0)
+
+    assert asos_collect._is_throttled(response("05"))
+    assert not asos_collect._is_throttled(response("00"))
+
+
+def test_stream_yields_stations_as_they_finish(monkeypatch):
+    async def fake_fetch_city(session, city, start, end, key, max_retries=3, strict=False):
+        await asyncio.sleep(0.02 if city == "slow" else 0)
+        return pd.DataFrame() if city == "empty" else pd.DataFrame(_items(1))
+
+    monkeypatch.setattr(asos_collect, "fetch_city", fake_fetch_city)
+    monkeypatch.setenv("SERVICE_KEY", "key")
+
+    async def collect():
+        return [city async for city, _ in asos_collect.stream_stations(["slow", "empty", "fast"], "20250101", "20250101")]
+
+    assert asyncio.run(collect()) == ["fast", "slow"]
+
+
+@pytest.mark.parametrize("code, error", [("22", AsosQuotaExceeded), ("99", http.HttpRequestError)])
+def test_error_pages_are_never_cached(tmp_path, monkeypatch, code, error):
+    from fetch_data.common import response_cache
+
+    response_cache.configure(tmp_path)
+    calls = []
+
+    async def request(method, url, **kwargs):
+        calls.append(url)
+        body = json.dumps(_page(code=code)).encode()
+        return http.HttpResponse(status=200, headers={}, body=body, url=url, elapsed=0.0)
+
+    monkeypatch.setattr(http, "request", request)
+    try:
+        for _ in range(2):
+            with pytest.raises(error):
+                asyncio.run(asos_collect._fetch_page(None, "108", "20200101", "20200110", 1, "key", 1))
+    finally:
+        response_cache.reset()
+
+    assert len(calls) == 2
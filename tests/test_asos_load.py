@@ -22,8 +22,12 @@ from fetch_data.weather.database import WeatherASOS, load_asos_df
 class _FakeConnection:
     def __init__(self):
         self.statement = None
+        self.coverage = []
 
-    def execute(self, statement):
+    def execute(self, statement, params=None):
+        if "data_coverage" in str(statement):
+            self.coverage.append((str(statement), params))
+            return
         self.statement = statement
 
 
@@ -205,6 +209,80 @@ def test_weather_asos_unique_index_is_timestamp_and_station_name():
     assert ("timestamp", "station_name") in unique_indexes
 
 
+# =========================================================
+# COPY 스테이징 경로 (psycopg2 연결 흉내)
+# =========================================================
+
+class _CopyCursor:
+    def __init__(self):
+        self.copies = []
+        self.closed = False
+
+    def copy_expert(self, sql, buf):
+        self.copies.append((sql, buf.read()))
+
+    def close(self):
+        self.closed = True
+
+
+class _CopyConnection:
+    def __init__(self):
+        self.copy_cursor = _CopyCursor()
+        self.connection = self  # SQLAlchemy Connection.connection -> DBAPI 연결
+        self.statements = []
+
+    def cursor(self):
+        return self.copy_cursor
+
+    def execute(self, statement, *args):
+        self.statements.append(str(statement))
+
+
+class _CopyEngine(_FakeEngine):
+    def __init__(self):
+        self.connection = _CopyConnection()
+
+
+def test_load_asos_df_streams_typed_rows_through_copy_with_empty_fields_as_null():
+    engine = _CopyEngine()
+    df = pd.DataFrame([
+        {"date": "2025-11-01 00:00:00", "station_name": " 강릉 ", "temperature": 13.1, "solar radiation": None},
+        {"date": "2025-11-01 00:00:00", "station_name": "강릉", "temperature": 13.4, "humidity": 80.0},
+        {"date": "2025-11-01 01:00:00", "station_name": "강화", "temperature": float("nan"), "humidity": 70.5},
+    ])
+
+    assert load_asos_df(df, engine=engine) == 2
+
+    (sql, body), = engine.connection.copy_cursor.copies
+    assert sql.startswith("COPY _weather_asos_stage (timestamp, station_name, temperature, humidity, solar_radiation)")
+    assert body.splitlines() == [
+        "2025-11-01 00:00:00,강릉,13.4,80.0,",
+        "2025-11-01 01:00:00,강화,,70.5,",
+    ]
+    merge, = [s for s in engine.connection.statements if "FROM _weather_asos_stage" in s]
+    assert "solar_radiation = COALESCE(EXCLUDED.solar_radiation, weather_asos.solar_radiation)" in merge
+    assert engine.connection.copy_cursor.closed
+
+
+def test_load_asos_csv_merges_each_chunk_in_one_transaction(tmp_path):
+    from fetch_data.weather.database import load_asos_csv
+
+    csv_path = tmp_path / "asos_all_merged.csv"
+    pd.DataFrame({
+        "date": [f"2025-11-01 {h:02d}:00:00" for h in range(5)],
+        "station_name": ["서울"] * 5,
+        "temperature": [1.0, 2.0, 3.0, 4.0, 5.0],
+    }).to_csv(csv_path, index=False, encoding="utf-8-sig")
+    engine = _CopyEngine()
+
+    assert load_asos_csv(csv_path, chunksize=2, engine=engine) == 5
+
+    assert len(engine.connection.copy_cursor.copies) == 3
+    statements = engine.connection.statements
+    assert statements.count("TRUNCATE _weather_asos_stage") == 3
+    assert sum("CREATE TEMP TABLE" in s for s in statements) == 1
+
+
 # =========================================================
 # 실제 DB 라운드트립 (DB 없으면 skip)
 # =========================================================
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pandas as pd
+
+from fetch_data.demand.weather_source import ParquetWeatherSource, default_weather_source
+from fetch_data.weather.asos_store import AsosStore
+from prefect_flows.merge_to_all import merge_to_store
+
+
+def _csv_frame(rows):
+    return pd.DataFrame(rows, columns=["date", "station_name", "temperature", "humidity", "solar radiation"])
+
+
+def test_upsert_rewrites_only_touched_months_and_last_value_wins(tmp_path):
+    store = AsosStore(tmp_path / "store")
+    store.upsert(_csv_frame([
+        ("2026-07-31 23:00", "서울", 25.0, 80.0, None),
+        ("2026-08-01 00:00", "서울", 24.0, 82.0, None),
+        ("2026-08-01 00:00", "부산", 26.0, 75.0, None),
+    ]))
+    july = (tmp_path / "store" / "month=2026-07" / "part.parquet").stat().st_mtime_ns
+
+    touched = store.upsert(_csv_frame([("2026-08-01 00:00", "서울", 24.5, 81.0, 0.0)]))
+
+    assert touched == {"2026-08": 2}
+    assert store.months() == ["2026-07", "2026-08"]
+    assert (tmp_path / "store" / "month=2026-07" / "part.parquet").stat().st_mtime_ns == july
+    august = store.read(datetime(2026, 8, 1), datetime(2026, 9, 1))
+    assert august[["station_name", "temperature"]].values.tolist() == [["부산", 26.0], ["서울", 24.5]]
+
+
+def test_read_window_is_half_open_and_spans_months(tmp_path):
+    store = AsosStore(tmp_path)
+    store.upsert(_csv_frame([
+        ("2026-07-31 22:00", "서울", 1.0, 1.0, None),
+        ("2026-07-31 23:00", "서울", 2.0, 2.0, None),
+        ("2026-08-01 00:00", "서울", 3.0, 3.0, None),
+        ("2026-08-01 01:00", "서울", 4.0, 4.0, None),
+    ]))
+
+    frame = store.read(datetime(2026, 7, 31, 23), datetime(2026, 8, 1, 1), columns=["timestamp", "temperature"])
+
+    assert frame["temperature"].tolist() == [2.0, 3.0]
+    assert list(frame.columns) == ["timestamp", "temperature"]
+
+
+def test_csv_export_round_trips_through_import(tmp_path):
+    store = AsosStore(tmp_path / "a")
+    store.upsert(_csv_frame([
+        ("2026-08-01 00:00", "서울", 24.0, 82.0, None),
+        ("2026-09-01 00:00", "부산", 20.0, 70.0, 1.5),
+    ]))
+    csv_path = tmp_path / "asos_all_merged.csv"
+
+    assert store.export_csv(csv_path) == 2
+    exported = pd.read_csv(csv_path, encoding="utf-8-sig")
+    assert list(exported.columns) == ["date", "hour", "station_name", "temperature", "humidity", "solar radiation"]
+
+    copy = AsosStore(tmp_path / "b")
+    copy.import_csv(csv_path, chunksize=1)
+    pd.testing.assert_frame_equal(copy.read(), store.read())
+
+
+def test_merge_to_store_seeds_from_legacy_csv_once(tmp_path):
+    legacy = tmp_path / "asos_all_merged.csv"
+    _csv_frame([("2026-07-01 00:00", "서울", 20.0, 60.0, None)]).to_csv(legacy, index=False, encoding="utf-8-sig")
+    daily = tmp_path / "asos_20260802_20260802.csv"
+    _csv_frame([("2026-08-02 00:00", "서울", 22.0, 65.0, None)]).to_csv(daily, index=False, encoding="utf-8-sig")
+
+    merge_to_store(daily, tmp_path / "store", legacy)
+
+    assert AsosStore(tmp_path / "store").months() == ["2026-07", "2026-08"]
+
+
+def test_parquet_weather_source_backs_the_aggregation_window(tmp_path):
+    store = AsosStore(tmp_path)
+    store.upsert(_csv_frame([
+        ("2026-08-04 09:00", "서울", 20.0, 60.0, None),
+        ("2026-08-04 10:30", "서울", 22.0, 62.0, None),
+        ("2026-08-04 10:00", "UNKNOWN", 30.0, 70.0, None),
+        ("2026-08-04 12:00", "서울", 25.0, 65.0, None),
+    ]))
+
+    weather = ParquetWeatherSource(tmp_path).load(datetime(2026, 8, 4, 10), datetime(2026, 8, 4, 12))
+
+    assert weather.to_dict(orient="records") == [
+        {"timestamp": pd.Timestamp(2026, 8, 4, 10), "station_name": "서울", "temperature": 22.0, "humidity": 62.0},
+    ]
+    assert isinstance(default_weather_source("unused.csv", tmp_path).fallback, ParquetWeatherSource)
@@ -0,0 +1,87 @@
+"""availability — 월 가용 범위 prober 테스트 (네트워크 불필요)."""
+import asyncio
+import math
+from datetime import date
+
+import pytest
+
+from fetch_data.common import availability
+
+FLOOR = date(2021, 1, 1)
+REF = date(2026, 10, 17)  # 직전 완결월 = 2026-09
+
+
+def _site(first: date, last: date):
+    calls = []
+
+    async def has_data(month: date) -> bool:
+        calls.append(month)
+        return first <= month <= last
+
+    return has_data, calls
+
+
+def test_cold_probe_spends_about_log2_months():
+    has_data, calls = _site(date(2022, 3, 1), date(2026, 8, 1))
+
+    rng = asyncio.run(availability.probe_range("k", has_data, FLOOR, REF))
+
+    assert rng == (date(2022, 3, 1), date(2026, 8, 1))
+    assert len(calls) <= math.ceil(math.log2(69)) + 3  # 2021-01 ~ 2026-09
+
+
+def test_cached_range_is_refreshed_only_at_the_edges(tmp_path):
+    cache = availability.AvailabilityCache(tmp_path / "availability.json")
+    cache.put("k", (date(2022, 3, 1), date(2026, 7, 1)))
+    has_data, calls = _site(date(2022, 3, 1), date(2026, 9, 1))
+
+    rng = asyncio.run(availability.probe_range("k", has_data, FLOOR, REF, cache))
+
+    assert rng == (date(2022, 3, 1), date(2026, 9, 1))
+    assert calls[0] == date(2022, 3, 1) and all(c >= date(2026, 8, 1) for c in calls[1:])
+    assert len(calls) <= 3
+    assert cache.get("k") == rng
+
+
+def test_vanished_first_month_falls_back_to_full_probe(tmp_path):
+    cache = availability.AvailabilityCache(tmp_path / "availability.json")
+    cache.put("k", (date(2022, 3, 1), date(2026, 9, 1)))
+    has_data, _ = _site(date(2023, 1, 1), date(2026, 9, 1))
+
+    assert asyncio.run(availability.probe_range("k", has_data, FLOOR, REF, cache)) == (
+        date(2023, 1, 1), date(2026, 9, 1),
+    )
+
+
+def test_no_data_returns_none():
+    has_data, _ = _site(date(2030, 1, 1), date(2030, 1, 1))
+
+    assert asyncio.run(availability.probe_range("k", has_data, FLOOR, REF)) is None
+
+
+def test_probe_error_propagates_and_leaves_cache_untouched(tmp_path):
+    cache = availability.AvailabilityCache(tmp_path / "availability.json")
+    cache.put("k", (date(2022, 3, 1), date(2026, 7, 1)))
+
+    async def flaky(month: date) -> bool:
+        if month > date(2026, 7, 1):
+            raise TimeoutError("transient")
+        return month >= date(2022, 3, 1)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(availability.probe_range("k", flaky, FLOOR, REF, cache))
+    assert cache.get("k") == (date(2022, 3, 1), date(2026, 7, 1))
+
+
+def test_refresh_cache_reprobes_and_overwrites(tmp_path):
+    path = tmp_path / "availability.json"
+    availability.AvailabilityCache(path).put("k", (date(2024, 1, 1), date(2026, 7, 1)))
+    has_data, calls = _site(date(2022, 3, 1), date(2026, 9, 1))
+
+    rng = asyncio.run(availability.probe_range(
+        "k", has_data, FLOOR, REF, availability.AvailabilityCache(path, refresh=True),
+    ))
+
+    assert rng == (date(2022, 3, 1), date(2026, 9, 1))
+    assert calls[0] == date(2026, 9, 1)  # 캐시를 읽지 않고 직전 완결월부터
+    assert availability.AvailabilityCache(path).get("k") == rng
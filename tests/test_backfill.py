@@ -0,0 +1,173 @@
+import asyncio
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from fetch_data.common import backfill
+from fetch_data.common.backfill import DONE, FAILED, PENDING, DbLedger, MemoryLedger, run_backfill
+
+
+class Quota(Exception):
+    pass
+
+
+class FakeSource:
+    name = "fake"
+    fatal = (Quota,)
+
+    def __init__(self, fail=(), quota=(), parts=1):
+        self.fail = set(fail)
+        self.quota = set(quota)
+        self.parts = parts
+        self.fetched = []
+        self.finished = []
+
+    def shards(self, start, end):
+        return backfill.month_shards(start, end)
+
+    async def fetch(self, start, end):
+        self.fetched.append(start)
+        if start in self.quota:
+            raise Quota()
+        for i in range(self.parts):
+            yield i
+
+    def parse(self, raw, start, end):
+        if start in self.fail:
+            raise ValueError("bad payload")
+        return [raw] * 10
+
+    def load(self, rows, start, end):
+        return len(rows)
+
+    def finish(self, start, end):
+        self.finished.append(start)
+
+
+def test_shard_helpers_cover_range_without_gaps():
+    assert backfill.day_shards(date(2026, 1, 1), date(2026, 1, 5), 2) == [
+        (date(2026, 1, 1), date(2026, 1, 2)),
+        (date(2026, 1, 3), date(2026, 1, 4)),
+        (date(2026, 1, 5), date(2026, 1, 5)),
+    ]
+    assert backfill.month_shards(date(2026, 1, 15), date(2026, 3, 10)) == [
+        (date(2026, 1, 15), date(2026, 1, 31)),
+        (date(2026, 2, 1), date(2026, 2, 28)),
+        (date(2026, 3, 1), date(2026, 3, 10)),
+    ]
+
+
+def test_rerun_resumes_after_failed_shard_and_skips_done():
+    ledger = MemoryLedger()
+    first = FakeSource(fail={date(2025, 2, 1)}, parts=3)
+
+    report = asyncio.run(run_backfill(first, date(2025, 1, 1), date(2025, 3, 31), ledger, concurrency=2))
+
+    assert report.rows == 60
+    assert list(report.failed) == [(date(2025, 2, 1), date(2025, 2, 28))]
+    assert ledger.load("fake")[(date(2025, 2, 1), date(2025, 2, 28))].state == FAILED
+    assert sorted(first.finished) == [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)]
+
+    second = FakeSource(parts=3)
+    report = asyncio.run(run_backfill(second, date(2025, 1, 1), date(2025, 3, 31), ledger))
+
+    assert second.fetched == [date(2025, 2, 1)]
+    assert report.ok and len(report.skipped) == 2
+    records = ledger.load("fake")
+    assert {r.state for r in records.values()} == {DONE}
+    assert records[(date(2025, 2, 1), date(2025, 2, 28))].attempts == 2
+
+
+def test_fatal_error_stops_run_and_leaves_shard_pending():
+    ledger = MemoryLedger()
+    source = FakeSource(quota={date(2025, 2, 1)})
+
+    with pytest.raises(Quota):
+        asyncio.run(run_backfill(source, date(2025, 1, 1), date(2025, 3, 31), ledger))
+
+    states = {shard[0]: record.state for shard, record in ledger.load("fake").items()}
+    assert states == {date(2025, 1, 1): DONE, date(2025, 2, 1): PENDING, date(2025, 3, 1): PENDING}
+
+
+def test_cancellation_propagates_even_if_pending_write_fails():
+    class _BrokenLedger(MemoryLedger):
+        def mark(self, job, shard, state, *args):
+            if state == PENDING:
+                raise RuntimeError("db down")
+            super().mark(job, shard, state, *args)
+
+    class _Hanging(FakeSource):
+        async def fetch(self, start, end):
+            await asyncio.sleep(10)
+            yield 0
+
+    async def scenario():
+        task = asyncio.ensure_future(
+            run_backfill(_Hanging(), date(2025, 1, 1), date(2025, 1, 31), _BrokenLedger())
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(scenario())
+
+
+def test_unsettled_shards_rerun_and_restart_clears_ledger():
+    ledger = MemoryLedger()
+    source = FakeSource()
+    asyncio.run(run_backfill(source, date(2025, 1, 1), date(2025, 2, 28), ledger))
+
+    asyncio.run(run_backfill(source, date(2025, 1, 1), date(2025, 2, 28), ledger, settled_before=date(2025, 2, 28)))
+    asyncio.run(run_backfill(source, date(2025, 1, 1), date(2025, 2, 28), ledger, restart=True))
+
+    assert source.fetched == [date(2025, 1, 1), date(2025, 2, 1), date(2025, 2, 1), date(2025, 1, 1), date(2025, 2, 1)]
+
+
+def test_progress_reports_eta_after_first_shard():
+    seen = []
+    asyncio.run(run_backfill(
+        FakeSource(), date(2025, 1, 1), date(2025, 3, 31), on_progress=lambda p: seen.append((p.finished, p.eta_sec))
+    ))
+
+    assert [finished for finished, _ in seen] == [1, 2, 3]
+    assert seen[-1][1] == 0
+    assert "3/3 (100%)" in str(backfill.BackfillProgress("fake", total=3, done=3))
+
+
+def test_db_ledger_upserts_shard_state_and_counts_attempts():
+    engine = MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+
+    DbLedger(engine).mark("asos_solar", (date(2025, 1, 1), date(2025, 5, 3)), "running")
+
+    statement, params = connection.execute.call_args.args
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (job, shard_start, shard_end) DO UPDATE" in sql
+    assert "attempts = backfill_ledger.attempts + EXCLUDED.attempts" in sql
+    assert params["attempt"] == 1 and params["state"] == "running"
+
+
+def test_asos_backfill_chunks_are_resumable(monkeypatch):
+    import pandas as pd
+
+    from fetch_data.weather import asos_solar_backfill as solar
+
+    calls = []
+
+    async def stream(city_list, start, end, strict=False):
+        calls.append(start)
+        yield "108", pd.DataFrame({"tm": [f"{start[:4]}-{start[4:6]}-{start[6:]} 00:00"]})
+
+    monkeypatch.setattr(solar, "init_db", lambda: None)
+    monkeypatch.setattr(solar, "get_station_ids", lambda: ["108"])
+    monkeypatch.setattr(solar, "stream_stations", stream)
+    monkeypatch.setattr(solar, "normalize_weather_data", lambda raw: raw)
+    monkeypatch.setattr(solar, "load_asos_df", len)
+    ledger = MemoryLedger()
+
+    assert asyncio.run(solar.backfill_range(date(2019, 1, 1), date(2019, 2, 28), 30, ledger=ledger)) == 2
+    assert asyncio.run(solar.backfill_range(date(2019, 1, 1), date(2019, 2, 28), 30, ledger=ledger)) == 0
+    assert calls == ["20190101", "20190131"]
@@ -0,0 +1,24 @@
+"""벤치마크 하네스 스모크 테스트 — 아주 작은 scale 로 모든 케이스가 실제 경로를 통과하는지."""
+from benchmarks import run
+
+
+def test_every_case_runs_on_tiny_inputs():
+    results = run.run_cases(run.CASES, scale=0.02, repeat=1)
+
+    assert [r.name for r in results] == [c.name for c in run.CASES]
+    assert all(r.rows > 0 and r.rows_per_sec > 0 for r in results)
+
+
+def test_compare_flags_throughput_and_memory_regressions():
+    baseline = {"a": {"rows_per_sec": 1000.0, "peak_mb": 10.0}, "b": {"rows_per_sec": 1000.0, "peak_mb": 10.0}}
+    results = [
+        run.Result("a", rows=1, best_sec=1.0, rows_per_sec=700.0, peak_mb=10.0),   # -30%
+        run.Result("b", rows=1, best_sec=1.0, rows_per_sec=900.0, peak_mb=14.0),   # 메모리 +40%
+        run.Result("new", rows=1, best_sec=1.0, rows_per_sec=1.0, peak_mb=999.0),  # 기준선 없음
+    ]
+
+    problems = run.compare(results, baseline, threshold=0.25)
+
+    assert len(problems) == 2
+    assert problems[0].startswith("a: 처리량")
+    assert problems[1].startswith("b: 최대 메모리")
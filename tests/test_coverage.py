@@ -0,0 +1,109 @@
+"""coverage — 데이터 커버리지 원장 테스트 (DB 불필요)."""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pandas as pd
+
+from fetch_data.common import coverage
+
+
+class _Conn:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: self.rows))
+
+
+def _engine(conn):
+    return SimpleNamespace(begin=lambda: conn, connect=lambda: conn)
+
+
+def test_day_slots_groups_distinct_slots_per_entity_and_day():
+    ts = pd.to_datetime([
+        "2026-08-01 00:00", "2026-08-01 00:30", "2026-08-01 13:00",
+        "2026-08-02 01:00", "2026-08-01 05:00", None,
+    ])
+    rows = coverage.day_slots(ts, [7, 7, 7, 7, 8, 8], 60)
+
+    assert rows == [
+        {"entity": "7", "day": date(2026, 8, 1), "slots": [0, 13]},
+        {"entity": "7", "day": date(2026, 8, 2), "slots": [1]},
+        {"entity": "8", "day": date(2026, 8, 1), "slots": [5]},
+    ]
+
+
+def test_record_coverage_merges_slots_with_array_union():
+    conn = _Conn()
+    ts = pd.Series(pd.date_range("2026-08-01 00:00", periods=3, freq="5min"))
+
+    assert coverage.record_coverage(conn, "demand_5min", ts, "kpx") == 1
+
+    sql, params = conn.statements[-1]
+    assert "ON CONFLICT (source, entity, day)" in sql and "unnest(data_coverage.slots" in sql
+    assert params == [{
+        "entity": "kpx", "day": date(2026, 8, 1), "slots": [0, 1, 2],
+        "source": "demand_5min", "expected": 288,
+    }]
+
+
+def test_missing_ranges_reads_only_the_ledger():
+    conn = _Conn([
+        {"day": date(2026, 8, 1), "observed": 24, "expected": 24},
+        {"day": date(2026, 8, 2), "observed": 23, "expected": 24},
+        {"day": date(2026, 8, 5), "observed": 24, "expected": 24},
+    ])
+
+    ranges = coverage.missing_ranges(_engine(conn), "generation", 7, date(2026, 8, 1), date(2026, 8, 6))
+
+    assert ranges == [(date(2026, 8, 2), date(2026, 8, 4)), (date(2026, 8, 6), date(2026, 8, 6))]
+    sql, params = conn.statements[-1]
+    assert "FROM data_coverage" in sql and "generation" not in sql.replace("data_coverage", "")
+    assert params["entity"] == "7"
+
+
+def test_nambu_incomplete_days_use_coverage_before_fact_scan():
+    from fetch_data.pv import nambu_state
+
+    conn = _Conn([{"day": date(2026, 8, 1), "observed": 24, "expected": 24}])
+
+    days = nambu_state.find_incomplete_days(_engine(conn), 7, date(2026, 8, 1), date(2026, 8, 2))
+
+    assert days == [date(2026, 8, 2)]
+    assert not any("FROM generation" in sql for sql, _ in conn.statements)
+
+
+def test_upsert_generation_records_coverage_in_same_transaction():
+    from fetch_data.common import generation_core
+
+    class _GenConn(_Conn):
+        connection = SimpleNamespace(cursor=lambda: SimpleNamespace(close=lambda: None))  # copy_expert 없는 드라이버
+
+        def execute(self, statement, params=None):
+            super().execute(statement, params)
+            if "SELECT plant_name, unit_no, plant_id" in str(statement):
+                return SimpleNamespace(fetchall=lambda: [SimpleNamespace(plant_name="A", unit_no="1", plant_id=7)])
+            return SimpleNamespace(fetchall=list)
+
+    conn = _GenConn()
+    df = pd.DataFrame({
+        "timestamp": [datetime(2026, 8, 1, 0), datetime(2026, 8, 1, 1)],
+        "plant_name": ["A", "A"],
+        "generation": [1.0, 2.0],
+    })
+
+    generation_core.upsert_generation(df, operator="nambu", fuel_type="solar", engine=_engine(conn))
+
+    recorded = [p for sql, p in conn.statements if "INSERT INTO data_coverage" in sql]
+    assert recorded == [[{
+        "entity": "7", "day": date(2026, 8, 1), "slots": [0, 1],
+        "source": "generation", "expected": 24,
+    }]]
@@ -1,10 +1,12 @@
 from datetime import datetime
 from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, OperationalError
 
-from fetch_data.demand import aggregate
+from fetch_data.demand import aggregate, database
 from fetch_data.demand.aggregate import (
     aggregate_demand_weather,
     get_common_end,
@@ -12,7 +14,8 @@ from fetch_data.demand.aggregate import (
     remove_repaired_unknowns,
     refresh_demand_views,
 )
-from fetch_data.demand.database import upsert_demand_weather
+from fetch_data.demand.database import mark_views_dirty, upsert_demand_weather
+from fetch_data.demand.weather_source import CsvWeatherSource, DbWeatherSource
 
 
 def test_recovery_starts_at_earliest_unknown():
@@ -106,6 +109,8 @@ def test_aggregate_uses_complete_hours_and_real_deduplicated_weather(tmp_path, m
         "remove_repaired_unknowns",
         lambda _engine, start, end: cleaned.append((start, end)),
     )
+    marked = []
+    monkeypatch.setattr(aggregate, "mark_views_dirty", lambda _engine, start, end: marked.append((start, end)))
 
     saved = aggregate_demand_weather(engine, weather_csv, now=datetime(2026, 8, 4, 12, 34))
 
@@ -137,6 +142,7 @@ def test_aggregate_uses_complete_hours_and_real_deduplicated_weather(tmp_path, m
         },
     ]
     assert cleaned == [(datetime(2026, 8, 2, 12), datetime(2026, 8, 4, 11))]
+    assert marked == cleaned
 
 
 def test_aggregate_empty_recovery_uses_unknown_boundary_without_writes(tmp_path, monkeypatch):
@@ -186,15 +192,170 @@ def test_hourly_upsert_compiles_conflict_with_exact_update_columns():
     assert update_columns == {"temperature", "humidity", "demand_avg", "is_holiday", "day_type"}
 
 
-def test_refreshes_views_in_order_and_propagates_errors():
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def test_refreshes_only_dirty_views_concurrently_and_clears_marks(monkeypatch):
+    engine = MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+    mark = MagicMock(dirty_from=datetime(2026, 8, 4, 8), dirty_to=datetime(2026, 8, 4, 11),
+                     marked_at=datetime(2026, 8, 4, 11, 5))
+    cleared = []
+    monkeypatch.setattr(aggregate, "get_dirty_views", lambda _engine: {"mv_hourly_national": mark})
+    monkeypatch.setattr(aggregate, "ensure_view_indexes", lambda _engine: None)
+    monkeypatch.setattr(aggregate, "clear_view_dirty", lambda _conn, view, at: cleared.append((view, at)))
+
+    assert refresh_demand_views(engine) == ["mv_hourly_national"]
+
+    assert [str(call.args[0]) for call in connection.execute.call_args_list] == [
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_hourly_national",
+    ]
+    assert cleared == [("mv_hourly_national", datetime(2026, 8, 4, 11, 5))]
+
+
+def test_forced_refresh_keeps_view_order_and_skips_without_dirty_marks(monkeypatch):
     engine = MagicMock()
     connection = engine.begin.return_value.__enter__.return_value
-    connection.execute.side_effect = [None, RuntimeError("refresh failed")]
+    monkeypatch.setattr(aggregate, "get_dirty_views", lambda _engine: {})
+    monkeypatch.setattr(aggregate, "ensure_view_indexes", lambda _engine: None)
 
-    with pytest.raises(RuntimeError, match="refresh failed"):
-        refresh_demand_views(engine)
+    assert refresh_demand_views(engine) == []
+    connection.execute.assert_not_called()
 
+    assert refresh_demand_views(engine, force=True) == ["mv_latest_weather", "mv_hourly_national"]
     assert [str(call.args[0]) for call in connection.execute.call_args_list] == [
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_weather",
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_hourly_national",
+    ]
+
+
+def test_refresh_falls_back_to_blocking_only_when_concurrent_is_unavailable(monkeypatch):
+    engine = MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+    monkeypatch.setattr(aggregate, "get_dirty_views", lambda _engine: {})
+    monkeypatch.setattr(aggregate, "ensure_view_indexes", lambda _engine: None)
+    connection.execute.side_effect = [
+        DBAPIError("REFRESH", {}, _PgError("55000")),
+        None,
+        None,
+    ]
+
+    refresh_demand_views(engine, force=True)
+
+    assert [str(call.args[0]) for call in connection.execute.call_args_list] == [
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_weather",
         "REFRESH MATERIALIZED VIEW mv_latest_weather",
-        "REFRESH MATERIALIZED VIEW mv_hourly_national",
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_hourly_national",
     ]
+
+    connection.execute.reset_mock()
+    connection.execute.side_effect = [DBAPIError("REFRESH", {}, _PgError("57014"))]
+    with pytest.raises(DBAPIError):
+        refresh_demand_views(engine, force=True)
+
+
+def test_mark_views_dirty_widens_existing_range():
+    engine = MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+
+    mark_views_dirty(engine, datetime(2026, 8, 4, 8), datetime(2026, 8, 4, 11))
+
+    sql = str(connection.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (view_name) DO UPDATE SET" in sql
+    assert "dirty_from = least(demand_view_dirty.dirty_from, excluded.dirty_from)" in sql
+    assert "dirty_to = greatest(demand_view_dirty.dirty_to, excluded.dirty_to)" in sql
+
+
+def test_dirty_table_is_created_once_per_engine(monkeypatch):
+    created = []
+    monkeypatch.setattr(database, "_ready_tables", set())
+    monkeypatch.setattr(database.DemandViewDirty.__table__, "create",
+                        lambda engine, checkfirst: created.append(engine))
+    engine, other = MagicMock(), MagicMock()
+
+    mark_views_dirty(engine, datetime(2026, 8, 4, 8), datetime(2026, 8, 4, 11))
+    mark_views_dirty(engine, datetime(2026, 8, 4, 11), datetime(2026, 8, 4, 12))
+    database.get_dirty_views(engine)
+    mark_views_dirty(other, datetime(2026, 8, 4, 8), datetime(2026, 8, 4, 11))
+
+    assert created == [engine, other]
+
+class _FakeSource:
+    def __init__(self, frame):
+        self.frame = frame
+        self.windows = []
+
+    def load(self, start, end):
+        self.windows.append((start, end))
+        return self.frame
+
+
+def test_aggregate_loads_only_the_aggregation_window(monkeypatch):
+    engine = MagicMock()
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.mappings.return_value.all.return_value = [
+        {"timestamp": datetime(2026, 8, 4, 10), "demand_avg": 100.0, "is_holiday": False, "day_type": 0},
+    ]
+    source = _FakeSource(
+        pd.DataFrame(
+            [{"timestamp": datetime(2026, 8, 4, 10), "station_name": "Seoul", "temperature": 21.0, "humidity": 61.0}]
+        )
+    )
+    records = []
+    monkeypatch.setattr(aggregate, "upsert_demand_weather", lambda _engine, rows: records.extend(rows) or len(rows))
+    monkeypatch.setattr(aggregate, "remove_repaired_unknowns", lambda *_args: 0)
+
+    saved = aggregate_demand_weather(engine, source, now=datetime(2026, 8, 4, 12, 34))
+
+    assert saved == 1
+    assert source.windows == [(datetime(2026, 8, 2, 12), datetime(2026, 8, 4, 12))]
+    assert records[0]["station_name"] == "Seoul"
+
+
+def test_csv_source_filters_window_and_normalizes(tmp_path):
+    path = _weather_csv(
+        tmp_path,
+        "date,station_name,temperature,humidity\n"
+        "2026-08-03 23:00:00,Seoul,18,55\n"
+        "2026-08-04 10:00:00,Seoul,21,61\n"
+        "2026-08-04 10:30:00,Seoul,22,62\n"
+        "2026-08-04 10:00:00,UNKNOWN,30,70\n"
+        "2026-08-04 12:00:00,Seoul,25,65\n",
+    )
+
+    weather = CsvWeatherSource(path, chunksize=2).load(datetime(2026, 8, 4), datetime(2026, 8, 4, 12))
+
+    assert weather.to_dict(orient="records") == [
+        {"timestamp": pd.Timestamp(2026, 8, 4, 10), "station_name": "Seoul", "temperature": 22, "humidity": 62},
+    ]
+
+
+def test_db_source_pushes_window_down_to_weather_asos():
+    engine = MagicMock()
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.mappings.return_value.all.return_value = [
+        {"timestamp": datetime(2026, 8, 4, 10), "station_name": "Seoul", "temperature": 21.0, "humidity": None},
+        {"timestamp": datetime(2026, 8, 4, 11), "station_name": "Seoul", "temperature": 22.0, "humidity": 60.0},
+    ]
+    start, end = datetime(2026, 8, 4), datetime(2026, 8, 4, 12)
+
+    weather = DbWeatherSource(engine).load(start, end)
+
+    statement, params = connection.execute.call_args.args
+    assert "FROM weather_asos" in str(statement)
+    assert "timestamp >= :start AND timestamp < :end" in str(statement)
+    assert params == {"start": start, "end": end}
+    assert weather["timestamp"].tolist() == [pd.Timestamp(2026, 8, 4, 11)]
+
+
+def test_db_source_falls_back_on_database_error():
+    engine = MagicMock()
+    engine.connect.side_effect = OperationalError("SELECT", {}, Exception("down"))
+    fallback = _FakeSource(pd.DataFrame(columns=["timestamp", "station_name", "temperature", "humidity"]))
+
+    DbWeatherSource(engine, fallback=fallback).load(datetime(2026, 8, 4), datetime(2026, 8, 5))
+
+    assert fallback.windows == [(datetime(2026, 8, 4), datetime(2026, 8, 5))]
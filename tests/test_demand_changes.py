@@ -0,0 +1,138 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from fetch_data.demand import changes
+from fetch_data.demand.changes import SlotChangeTracker, fingerprint
+
+
+@pytest.fixture
+def store(monkeypatch):
+    saved = {}
+    loads = []
+
+    def load(engine, source, days):
+        loads.append(list(days))
+        return {day: dict(saved[(source, day)]) for day in days if (source, day) in saved}
+
+    def save(engine, source, by_day):
+        for day, prints in by_day.items():
+            saved[(source, day)] = dict(prints)
+
+    monkeypatch.setattr(changes, "_memory", {})
+    monkeypatch.setattr(changes, "load_slot_fingerprints", load)
+    monkeypatch.setattr(changes, "save_slot_fingerprints", save)
+    return SimpleNamespace(saved=saved, loads=loads)
+
+
+def _records(values):
+    return [
+        {"timestamp": datetime(2026, 8, 4, 0, 5 * i), "current_demand": value}
+        for i, value in enumerate(values)
+    ]
+
+
+def _upsert(written):
+    return lambda engine, rows: written.append([row["current_demand"] for row in rows]) or len(rows)
+
+
+def test_only_new_and_revised_slots_are_written(store):
+    engine = SimpleNamespace(url="postgresql://demand")
+    written = []
+
+    first = SlotChangeTracker(engine, "demand_5min", ("current_demand",)).ingest(
+        _records([1.0, 2.0]), _upsert(written)
+    )
+    # A later run in a fresh process: memory is empty, fingerprints come from the state table.
+    changes._memory.clear()
+    second = SlotChangeTracker(engine, "demand_5min", ("current_demand",)).ingest(
+        _records([1.0, 2.5, 3.0]), _upsert(written)
+    )
+
+    assert (first.new, first.revised, first.unchanged) == (2, 0, 0)
+    assert (second.new, second.revised, second.unchanged) == (1, 1, 1)
+    assert second.written == 2
+    assert written == [[1.0, 2.0], [2.5, 3.0]]
+    assert store.loads == [[date(2026, 8, 4)], [date(2026, 8, 4)]]
+
+
+def test_unchanged_run_writes_nothing_and_reuses_memory(store):
+    engine = SimpleNamespace(url="postgresql://demand")
+    written = []
+    tracker = SlotChangeTracker(engine, "gen_mix_5min", ("current_demand",))
+    tracker.ingest(_records([1.0, 2.0]), _upsert(written))
+
+    stats = tracker.ingest(_records([1.0, 2.0]), _upsert(written))
+
+    assert (stats.new, stats.revised, stats.unchanged) == (0, 0, 2)
+    assert written == [[1.0, 2.0]]
+    assert len(store.loads) == 1
+
+
+def test_failed_upsert_does_not_record_fingerprints(store):
+    engine = SimpleNamespace(url="postgresql://demand")
+
+    def failing(engine, rows):
+        raise RuntimeError("db down")
+
+    tracker = SlotChangeTracker(engine, "demand_5min", ("current_demand",))
+    with pytest.raises(RuntimeError):
+        tracker.ingest(_records([1.0]), failing)
+
+    assert store.saved == {}
+    assert tracker.diff(_records([1.0]))[1].new == 1
+
+
+def test_fingerprint_ignores_scalar_type_differences():
+    columns = ("current_demand", "is_holiday", "day_type")
+    assert fingerprint(
+        {"current_demand": 70000, "is_holiday": np.bool_(True), "day_type": np.int8(2)}, columns
+    ) == fingerprint({"current_demand": 70000.0, "is_holiday": True, "day_type": 2}, columns)
+    assert fingerprint({"current_demand": None}, ("current_demand",)) != fingerprint(
+        {"current_demand": 0.0}, ("current_demand",)
+    )
+
+
+def test_fingerprint_state_upsert_replaces_day():
+    from unittest.mock import MagicMock
+
+    from fetch_data.demand.database import save_slot_fingerprints
+
+    engine = MagicMock()
+    connection = engine.begin.return_value.__enter__.return_value
+
+    save_slot_fingerprints(engine, "demand_5min", {date(2026, 8, 4): {"00:05": "ab"}})
+
+    sql = str(connection.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (source, day) DO UPDATE SET fingerprints = excluded.fingerprints" in sql
+
+
+def test_collect_range_with_tracker_reports_written_rows(store, monkeypatch):
+    import asyncio
+
+    import pandas as pd
+
+    from fetch_data.demand import collect
+
+    day = date(2026, 8, 4)
+    frames = [
+        pd.DataFrame({"기준일시": ["2026-08-04 00:05:00"], "현재수요(MW)": [70000.0]}),
+        pd.DataFrame({"기준일시": ["2026-08-04 00:05:00", "2026-08-04 00:10:00"],
+                      "현재수요(MW)": [70000.0, 71000.0]}),
+    ]
+    written = []
+
+    async def download(start, end):
+        return frames.pop(0)
+
+    monkeypatch.setattr(collect, "download_range", download)
+    monkeypatch.setattr(collect, "upsert_demand_5min", lambda engine, rows: written.append(len(rows)) or len(rows))
+    engine = SimpleNamespace(url="postgresql://demand")
+    tracker = SlotChangeTracker(engine, "demand_5min", collect.VALUE_COLUMNS)
+
+    assert asyncio.run(collect.collect_range(engine, day, day, tracker=tracker)) == 1
+    assert asyncio.run(collect.collect_range(engine, day, day, tracker=tracker)) == 1
+    assert written == [1, 1]
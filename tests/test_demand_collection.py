@@ -416,3 +416,76 @@ def test_upsert_compiles_timestamp_conflict_with_exact_update_columns():
         f"{column} = coalesce(excluded.{column}" in sql.lower()
         for column in expected_columns
     )
+
+
+def test_backfill_fetches_days_concurrently_on_separate_sessions(monkeypatch):
+    from fetch_data.demand import collect
+
+    first_day = date.today() - pd.Timedelta(days=5)
+    days = [first_day + pd.Timedelta(days=offset) for offset in range(4)]
+    sessions = []
+    in_flight = {"now": 0, "max": 0}
+    upserted = []
+
+    class Session:
+        async def __aenter__(self):
+            sessions.append(self)
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+    async def download_segment(session, start, end):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.02 if start == days[0] else 0)  # 첫날이 가장 늦게 끝난다
+        in_flight["now"] -= 1
+        return _demand_frame(start)
+
+    monkeypatch.setattr(collect.aiohttp, "ClientSession", lambda **kwargs: Session())
+    monkeypatch.setattr(collect, "download_segment", download_segment)
+    monkeypatch.setattr(
+        collect,
+        "upsert_demand_5min",
+        lambda engine, records: upserted.append(records[0]["timestamp"].date()) or len(records),
+    )
+
+    total = asyncio.run(collect.backfill_range(object(), days[0], days[-1], concurrency=2))
+
+    assert total == 288 * 4
+    assert len(sessions) == 4
+    assert in_flight["max"] == 2
+    assert sorted(upserted) == days
+    assert upserted[-1] == days[0]  # 완료 순서대로 적재
+
+
+def test_backfill_reports_failed_days_after_persisting_the_rest(monkeypatch):
+    from fetch_data.demand import collect
+
+    first_day = date.today() - pd.Timedelta(days=4)
+    days = [first_day + pd.Timedelta(days=offset) for offset in range(3)]
+    upserted = []
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+    async def download_segment(session, start, end):
+        return pd.DataFrame() if start == days[1] else _demand_frame(start)
+
+    monkeypatch.setattr(collect.aiohttp, "ClientSession", lambda **kwargs: Session())
+    monkeypatch.setattr(collect, "download_segment", download_segment)
+    monkeypatch.setattr(
+        collect,
+        "upsert_demand_5min",
+        lambda engine, records: upserted.append(records[0]["timestamp"].date()) or len(records),
+    )
+    monkeypatch.setattr(collect.asyncio, "sleep", _no_sleep)
+
+    with pytest.raises(RuntimeError, match=f"1/3 days: {days[1].isoformat()}"):
+        asyncio.run(collect.backfill_range(object(), days[0], days[-1]))
+
+    assert sorted(upserted) == [days[0], days[2]]
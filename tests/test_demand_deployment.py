@@ -119,7 +119,7 @@ def test_unified_flow_runs_hourly_work_in_first_ten_minutes(monkeypatch):
     monkeypatch.setattr(
         demand_flow,
         "refresh_demand_views",
-        lambda engine: calls.append(("refresh", engine)),
+        lambda engine, force=False: calls.append(("refresh", engine, force)),
     )
 
     assert asyncio.run(demand_flow.unified_demand_collection_flow.fn()) == {
@@ -129,7 +129,7 @@ def test_unified_flow_runs_hourly_work_in_first_ten_minutes(monkeypatch):
     assert calls == [
         ("collect", "engine"),
         ("aggregate", "engine", False),
-        ("refresh", "engine"),
+        ("refresh", "engine", False),
     ]
 
 
@@ -157,7 +157,7 @@ def test_unified_flow_forces_hourly_work_outside_first_ten_minutes(monkeypatch):
     monkeypatch.setattr(
         demand_flow,
         "refresh_demand_views",
-        lambda engine: calls.append(("refresh", engine)),
+        lambda engine, force=False: calls.append(("refresh", engine, force)),
     )
 
     assert asyncio.run(demand_flow.unified_demand_collection_flow.fn(force_hourly=True)) == {
@@ -167,7 +167,7 @@ def test_unified_flow_forces_hourly_work_outside_first_ten_minutes(monkeypatch):
     assert calls == [
         ("collect", "engine"),
         ("aggregate", "engine", True),
-        ("refresh", "engine"),
+        ("refresh", "engine", True),
     ]
 
 
@@ -183,20 +183,25 @@ def test_demand_collection_task_awaits_collect_latest(monkeypatch):
     assert asyncio.run(demand_flow.run_demand_collection_task.fn("engine")) == 12
 
 
-def test_hourly_aggregation_task_forwards_recovery_flag(monkeypatch):
+def test_hourly_aggregation_task_forwards_recovery_flag(monkeypatch, tmp_path):
+    from fetch_data.demand.weather_source import DbWeatherSource
     from prefect_flows import demand_flow
 
     calls = []
+    monkeypatch.setattr(demand_flow, "DEFAULT_STORE_DIR", tmp_path / "empty_store")
     monkeypatch.setattr(
         demand_flow,
         "aggregate_demand_weather",
-        lambda engine, weather_csv, recover=False: calls.append(
-            (engine, weather_csv, recover)
+        lambda engine, weather_source, recover=False: calls.append(
+            (engine, weather_source, recover)
         ) or 7,
     )
 
     assert demand_flow.run_hourly_aggregation_task.fn("engine", recover=True) == 7
-    assert calls == [("engine", demand_flow.DEFAULT_MERGED_CSV, True)]
+    [(engine, source, recover)] = calls
+    assert (engine, recover) == ("engine", True)
+    assert isinstance(source, DbWeatherSource)
+    assert source.fallback.path == demand_flow.DEFAULT_MERGED_CSV
 
 
 @pytest.mark.parametrize(
@@ -231,7 +236,7 @@ def test_unified_flow_notifies_and_reraises_boundary_failures(
             raise RuntimeError("aggregate failure")
         return 7
 
-    def refresh(engine):
+    def refresh(engine, force=False):
         calls.append("refresh")
         if failing_stage == "refresh":
             raise RuntimeError("refresh failure")
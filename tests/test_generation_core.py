@@ -0,0 +1,161 @@
+"""generation_core — COPY 스테이징 병합 / 수집 경계 조회 테스트 (DB 불필요)."""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+
+from fetch_data.common import generation_core
+
+
+class _Cursor:
+    def __init__(self):
+        self.copied = None
+        self.closed = False
+
+    def copy_expert(self, sql, buf):
+        self.copied = (sql, buf.read())
+
+    def close(self):
+        self.closed = True
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class _Conn:
+    def __init__(self, cursor=None):
+        self.statements = []
+        self.cursor_obj = cursor
+        self.connection = SimpleNamespace(cursor=self._cursor)
+
+    def _cursor(self):
+        if self.cursor_obj is None:
+            return SimpleNamespace(close=lambda: None)  # copy_expert 없는 드라이버
+        return self.cursor_obj
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        if "SELECT plant_name, unit_no, plant_id" in str(statement):
+            return _Result([SimpleNamespace(plant_name="A", unit_no="1", plant_id=7)])
+        return _Result([])
+
+
+class _Engine:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def begin(self):
+        conn = self.conn
+
+        class _Tx:
+            def __enter__(self):
+                return conn
+
+            def __exit__(self, *args):
+                pass
+
+        return _Tx()
+
+
+def _frame():
+    return pd.DataFrame({
+        "timestamp": [datetime(2026, 8, 1, 0), datetime(2026, 8, 1, 1), datetime(2026, 8, 1, 1),
+                      datetime(2026, 8, 1, 2)],
+        "plant_name": ["A", "A", "A", "B"],
+        "generation": [1.5, None, 3.0, 9.0],
+    })
+
+
+def test_upsert_generation_copies_into_stage_and_merges_once():
+    cursor = _Cursor()
+    conn = _Conn(cursor)
+
+    n = generation_core.upsert_generation(_frame(), operator="nambu", fuel_type="solar",
+                                          engine=_Engine(conn))
+
+    assert n == 3  # B 는 미매핑으로 제외, 중복 키도 반환값에는 그대로 센다
+    sql, body = cursor.copied
+    assert sql.startswith("COPY _generation_stage")
+    # 같은 (timestamp, plant_id) 는 마지막 값만, NaN 은 빈 칸(NULL)
+    assert body.splitlines() == [
+        "2026-08-01 00:00:00,7,1.5",
+        "2026-08-01 01:00:00,7,3.0",
+    ]
+    merges = [s for s, _ in conn.statements if "FROM _generation_stage" in s]
+    assert len(merges) == 1
+    assert "ON CONFLICT (timestamp, plant_id)" in merges[0]
+    assert not any("VALUES (:ts, :pid, :kwh" in s for s, _ in conn.statements)
+    assert cursor.closed
+
+
+def test_upsert_generation_falls_back_to_executemany_without_copy():
+    conn = _Conn(cursor=None)
+
+    n = generation_core.upsert_generation(_frame(), operator="nambu", fuel_type="solar",
+                                          engine=_Engine(conn))
+
+    assert n == 3
+    batches = [p for s, p in conn.statements if "VALUES (:ts, :pid, :kwh" in s]
+    assert len(batches) == 1
+    assert [r["kwh"] for r in batches[0]] == [1.5, None, 3.0]
+
+
+class _FrontierConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: self.rows))
+
+
+def test_collection_frontier_is_one_lateral_query():
+    conn = _FrontierConn([
+        {"plant_id": 3, "plant_code": "997N", "unit_no": " 2", "plant_name": "삼천포태양광#2",
+         "last_ts": datetime(2026, 8, 2, 22), "last_day_hours": 23},
+        {"plant_id": 4, "plant_code": "998N", "unit_no": "1", "plant_name": "신규",
+         "last_ts": None, "last_day_hours": None},
+    ])
+    engine = SimpleNamespace(connect=lambda: conn)
+
+    rows = generation_core.collection_frontier(engine, "nambu", "solar", require_code=True)
+
+    assert len(conn.statements) == 1
+    sql, params = conn.statements[0]
+    assert sql.count("LEFT JOIN LATERAL") == 2
+    assert "GROUP BY" not in sql
+    assert "p.fuel_type = :fuel_type" in sql and "p.plant_code IS NOT NULL" in sql
+    assert params == {"operator": "nambu", "fuel_type": "solar"}
+    assert rows[0].last_day_hours == 23 and rows[1].last_ts is None
+    assert rows[1].last_day_hours == 0
+
+
+def test_nambu_targets_carry_frontier_hours():
+    from fetch_data.pv import nambu_state
+
+    conn = _FrontierConn([
+        {"plant_id": 3, "plant_code": "997N ", "unit_no": " 2", "plant_name": "A",
+         "last_ts": datetime(2026, 8, 2, 22), "last_day_hours": 23},
+        {"plant_id": 4, "plant_code": "998N", "unit_no": "1", "plant_name": "B",
+         "last_ts": None, "last_day_hours": 0},
+    ])
+    engine = SimpleNamespace(connect=lambda: conn)
+
+    targets = nambu_state.get_nambu_targets(engine, hogi=2)
+
+    assert targets == [{
+        "plant_id": 3, "gencd": "997N", "hogi": 2, "plant_name": "A",
+        "last_dt": datetime(2026, 8, 2, 22), "last_day_hours": 23,
+    }]
@@ -0,0 +1,146 @@
+"""공통 HTTP 클라이언트 — 토큰 버킷·AIMD 동시성·재시도 테스트 (네트워크 불필요)."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from fetch_data.common import http
+
+_real_sleep = asyncio.sleep
+
+
+async def _no_sleep(*args, **kwargs):
+    return None
+
+
+@pytest.fixture(autouse=True)
+def _fresh_hosts(monkeypatch):
+    http.reset_hosts()
+    monkeypatch.setattr(http.asyncio, "sleep", _no_sleep)
+    yield
+    http.reset_hosts()
+
+
+class _Response:
+    def __init__(self, status=200, body=b"ok", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self):
+        return self._body
+
+
+class _Session:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_token_bucket_reserves_future_tokens(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(http.time, "monotonic", lambda: now[0])
+    bucket = http.TokenBucket(rate=2.0, burst=2)
+
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(0.5)  # 세 번째는 0.5초 뒤 토큰 예약
+    assert bucket._reserve() == pytest.approx(1.0)
+    now[0] += 1.0
+    assert bucket._reserve() == pytest.approx(0.5)
+
+
+def test_limiter_is_additive_increase_multiplicative_decrease():
+    limiter = http.AdaptiveLimiter(http.HostPolicy(concurrency=4, max_concurrency=5, increase_every=2))
+
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 5
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 5  # 상한
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 1  # 하한
+
+
+def test_limiter_blocks_beyond_limit_until_release():
+    async def scenario():
+        limiter = http.AdaptiveLimiter(http.HostPolicy(concurrency=1))
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await _real_sleep(0.01)
+        assert not waiter.done()
+        limiter.release()
+        await waiter
+        return limiter.in_flight
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_limiter_passes_slot_on_when_woken_waiter_is_cancelled():
+    async def scenario():
+        limiter = http.AdaptiveLimiter(http.HostPolicy(concurrency=1))
+        await limiter.acquire()
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await _real_sleep(0.01)
+        limiter.release()  # first 를 깨우지만 실행되기 전에 취소
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+        return first.cancelled(), limiter.in_flight
+
+    assert asyncio.run(scenario()) == (True, 1)
+
+
+def test_request_retries_throttle_and_halves_concurrency():
+    session = _Session([_Response(429, b"slow down"), aiohttp.ClientError("reset"), _Response(200, b"data")])
+
+    resp = asyncio.run(http.request("GET", "https://openapi.kpx.or.kr/x", session=session))
+
+    assert resp.body == b"data"
+    assert session.calls == 3
+    stats = http.http_stats()["openapi.kpx.or.kr"]
+    assert stats["throttled"] == 1
+    assert stats["failures"] == 2
+    assert stats["successes"] == 1
+    assert stats["concurrency_limit"] == 1  # kpx 시작 2 → 429 로 절반
+
+
+def test_request_treats_custom_block_page_as_throttle():
+    session = _Session([_Response(200, b"<html>Firewall</html>"), _Response(200, b"a,b,c")])
+
+    resp = asyncio.run(http.request(
+        "POST", "https://www.koenergy.kr/csv", session=session,
+        is_blocked=lambda r: http.looks_blocked(r.status, r.text()),
+    ))
+
+    assert resp.body == b"a,b,c"
+    assert http.http_stats()["www.koenergy.kr"]["throttled"] == 1
+
+
+def test_request_raises_after_exhausting_attempts():
+    session = _Session([_Response(500), _Response(500)])
+
+    with pytest.raises(http.HttpRequestError) as info:
+        asyncio.run(http.request(
+            "GET", "https://example.test/a", session=session, retry=http.RetryPolicy(attempts=2),
+        ))
+
+    assert info.value.last_status == 500
+    assert session.calls == 2
@@ -0,0 +1,97 @@
+"""import 시간 예산 — `python -X importtime` 으로 수집기/flow 진입점의 import 비용을 잰다.
+
+수집기 모듈은 import 만으로 파일 I/O·로그·Prefect 로딩을 하면 안 된다(5분 주기 작업의
+기동 시간이 작업 자체보다 길어진다). flow 진입점은 Prefect 로딩이 대부분이라 느리므로
+기본 실행에서는 대표 flow(REPRESENTATIVE_FLOW) 하나만 재고, 나머지는
+PYTEST_IMPORT_BUDGET=1 로 옵트인했을 때 잰다. 느린 CI 에서는 IMPORT_BUDGET_SCALE 로
+예산을 배로 늘린다.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+COLLECTOR_BUDGET_MS = 3000   # 모듈 전체(pandas/aiohttp 포함) 누적
+FLOW_BUDGET_MS = 9000        # Prefect 포함 누적
+OWN_BUDGET_MS = 200          # 저장소 코드(fetch_data/prefect_flows/notify) 자체 실행 시간 합
+
+COLLECTORS = [
+    "fetch_data.weather.asos_collect",
+    "fetch_data.pv.nambu_collect",
+    "fetch_data.pv.namdong_collect",
+    "fetch_data.wind.namdong_collect",
+    "fetch_data.demand.collect",
+    "fetch_data.smp.smp_realtime",
+    "fetch_data.gen.namdong_collect",
+    "fetch_data.jeju.jeju_sukub_collect",
+    "prefect_flows.merge_to_all",
+]
+FLOWS = sorted(
+    f"prefect_flows.{p.stem}"
+    for p in (ROOT / "prefect_flows").glob("*.py")
+    if p.stem.endswith("_flow") or p.stem == "prefect_pipeline"
+)
+OWN_PREFIXES = ("fetch_data", "prefect_flows", "notify")
+REPRESENTATIVE_FLOW = "prefect_flows.nambu_pv_flow"
+_ALL_FLOWS = os.getenv("PYTEST_IMPORT_BUDGET") == "1"
+
+
+def _import_profile(module: str):
+    """(stdout, {모듈: (self_us, cumulative_us)}) — 새 인터프리터에서 한 번 import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=False,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return proc.stdout, timings
+
+
+def _own_ms(timings) -> float:
+    return sum(s for name, (s, _) in timings.items() if name.split(".")[0] in OWN_PREFIXES) / 1000
+
+
+@pytest.mark.parametrize("module", COLLECTORS)
+def test_collector_import_is_side_effect_free_and_within_budget(module):
+    stdout, timings = _import_profile(module)
+
+    assert stdout == "", f"import 시점 출력/로그: {stdout[:500]}"
+    assert "prefect" not in timings, f"{module} 이 Prefect 를 import 한다"
+    assert "dotenv" not in timings, f"{module} 이 import 시점에 .env 를 읽는다"
+    total_ms = timings[module][1] / 1000
+    assert total_ms < COLLECTOR_BUDGET_MS * SCALE, f"{module} import {total_ms:.0f}ms"
+    assert _own_ms(timings) < OWN_BUDGET_MS * SCALE
+
+
+@pytest.mark.parametrize("module", [
+    pytest.param(
+        module,
+        marks=pytest.mark.skipif(
+            module != REPRESENTATIVE_FLOW and not _ALL_FLOWS,
+            reason="PYTEST_IMPORT_BUDGET=1 옵트인 시에만 실행 (flow 마다 Prefect 를 새로 로딩해 느림)",
+        ),
+    )
+    for module in FLOWS
+])
+def test_flow_entrypoint_import_within_budget(module):
+    stdout, timings = _import_profile(module)
+
+    assert stdout == "", f"import 시점 출력/로그: {stdout[:500]}"
+    total_ms = timings[module][1] / 1000
+    assert total_ms < FLOW_BUDGET_MS * SCALE, f"{module} import {total_ms:.0f}ms"
+    assert _own_ms(timings) < OWN_BUDGET_MS * SCALE
+
+
+def test_representative_flow_exists():
+    assert REPRESENTATIVE_FLOW in FLOWS  # 이름이 바뀌면 기본 실행이 flow 를 하나도 재지 않는다
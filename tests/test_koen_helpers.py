@@ -62,3 +62,27 @@ def test_read_csv_flexible_cp949(tmp_path):
     df = read_csv_flexible(fp)
     assert list(df.columns) == ["날짜", "호기", "발전량"]  # skipinitialspace 로 ' 호기' 정리
     assert len(df) == 1
+
+
+def test_read_csv_flexible_sniffs_utf8_and_salvages_overlong_rows(tmp_path):
+    """필드가 넘치는 행만 python 엔진으로 보정(초과 필드 버림)하고 순서·보고서를 유지한다."""
+    from fetch_data.common.koen import read_csv_report
+    fp = tmp_path / "koen_utf8.csv"
+    fp.write_bytes("날짜, 호기,발전량\n20260101,1,2.5\n20260102,1,2.5,9\n20260103,2\n".encode("utf-8"))
+
+    df, report = read_csv_report(fp)
+
+    assert report.encoding == "utf-8"
+    assert report.engine == "c+python"
+    assert report.bad_lines == [(3, "20260102,1,2.5,9")]
+    assert df["날짜"].tolist() == [20260101, 20260102, 20260103]
+    assert df["발전량"].tolist()[:2] == [2.5, 2.5]
+
+
+def test_read_csv_flexible_can_return_arrow_table(tmp_path):
+    from fetch_data.common.koen import read_csv_flexible
+    fp = tmp_path / "koen.csv"
+    fp.write_bytes("날짜,발전량\n20260101,2.5\n".encode("cp949"))
+    table = read_csv_flexible(fp, as_arrow=True)
+    assert table.column_names == ["날짜", "발전량"]
+    assert table.num_rows == 1
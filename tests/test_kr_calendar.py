@@ -0,0 +1,52 @@
+"""한국 달력 테이블 — workalendar 와의 일치, 대체공휴일·징검다리, 범위 밖 처리."""
+import warnings
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from workalendar.asia import SouthKorea
+
+from fetch_data.common.kr_calendar import calendar_features, substitute_holidays
+
+
+def test_features_match_workalendar_day_by_day():
+    days = pd.date_range("2023-01-01", "2026-12-31", freq="D")
+    calendar = SouthKorea()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        expected = [calendar.is_holiday(d.date()) for d in days]
+
+    features = calendar_features(pd.Series(days))
+
+    assert features["is_holiday"].tolist() == expected
+    assert features["day_type"].tolist() == [
+        2 if h else (1 if d.weekday() >= 5 else 0) for d, h in zip(days, expected)
+    ]
+
+
+def test_substitute_holidays_follow_korean_rules():
+    assert substitute_holidays(2013) == []
+    assert substitute_holidays(2024) == [date(2024, 2, 12), date(2024, 5, 6)]
+    assert substitute_holidays(2025) == [date(2025, 3, 3), date(2025, 5, 6), date(2025, 10, 8)]
+    assert substitute_holidays(2026) == [
+        date(2026, 3, 2), date(2026, 5, 25), date(2026, 8, 17), date(2026, 10, 5),
+    ]
+
+
+def test_extras_flag_substitute_and_bridge_days():
+    ts = pd.Series([datetime(2024, 2, 12, 10), datetime(2024, 8, 16, 0, 5), datetime(2024, 8, 14, 12)])
+
+    features = calendar_features(ts, extras=True)
+
+    assert features["is_substitute_holiday"].tolist() == [True, False, False]
+    assert features["is_holiday"].tolist() == [False, False, False]  # is_holiday 는 workalendar 기준 유지
+    assert features["is_bridge_day"].tolist() == [False, True, False]  # 8/15(목) 광복절 ~ 8/17(토)
+
+
+def test_out_of_range_dates_fall_back_and_nat_is_rejected():
+    features = calendar_features(pd.Series([datetime(1999, 12, 25), datetime(2041, 1, 5)]))
+
+    assert features["is_holiday"].tolist() == [True, False]
+    assert features["day_type"].tolist() == [2, 1]
+    with pytest.raises(ValueError, match="NaT"):
+        calendar_features(pd.Series([pd.NaT], dtype="datetime64[ns]"))
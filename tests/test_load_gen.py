@@ -0,0 +1,37 @@
+import pandas as pd
+
+from fetch_data.gen import load_gen
+
+
+def test_load_category_delta_skips_when_nothing_pending(tmp_path):
+    assert load_gen.load_category(object(), "thermal", tmp_path, delta=True) == 0
+
+
+def test_diff_against_core_keeps_new_and_changed_rows_up_to_last_ts():
+    ts = pd.to_datetime([
+        "2026-06-30 23:00",  # 코어에 없음
+        "2026-07-10 00:00",  # 코어와 같음
+        "2026-07-10 01:00",  # 값 다름
+        "2026-07-31 23:00",  # last_ts 이후 → 신규
+    ])
+    frame = pd.DataFrame({"timestamp": ts, "plant_id": [7] * 4, "gen_kwh": [9.0, 1.0, 5.0, 3.0]})
+    frame = pd.concat([frame, pd.DataFrame({"timestamp": ts[:1], "plant_id": [8], "gen_kwh": [1.0]})],
+                      ignore_index=True)
+    overlap = pd.DataFrame({
+        "timestamp": ts[1:3], "plant_id": [7, 7], "gen_kwh": [1.0, 2.0],
+    })
+
+    changes = load_gen.diff_against_core(frame, {7: pd.Timestamp("2026-07-10 01:00")}, overlap)
+
+    assert list(zip(changes["plant_id"], changes["gen_kwh"])) == [(7, 9.0), (7, 5.0), (7, 3.0), (8, 1.0)]
+
+
+def test_diff_against_core_compares_revised_month_before_hour24_rollover():
+    # 8월 적재 후 last_ts 는 hour 24 → 09-01 00:00. 재수집한 8월 정정값이 빠지면 안 된다.
+    ts = pd.to_datetime(["2026-08-15 10:00", "2026-08-15 11:00", "2026-09-01 00:00"])
+    frame = pd.DataFrame({"timestamp": ts, "plant_id": [7] * 3, "gen_kwh": [4.0, 2.0, 1.0]})
+    overlap = pd.DataFrame({"timestamp": ts, "plant_id": [7] * 3, "gen_kwh": [3.0, 2.0, 1.0]})
+
+    changes = load_gen.diff_against_core(frame, {7: pd.Timestamp("2026-09-01 00:00")}, overlap)
+
+    assert changes["timestamp"].tolist() == [pd.Timestamp("2026-08-15 10:00")]
@@ -0,0 +1,71 @@
+"""metrics — 단계 타이머·카운터·Prometheus 텍스트 내보내기 테스트."""
+import asyncio
+import json
+import logging
+
+import pytest
+
+from fetch_data.common import metrics
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_stage_records_duration_rows_and_json_log(caplog):
+    caplog.set_level(logging.INFO, logger="fetch_data.common.metrics")
+
+    with metrics.tags(flow="demand"):
+        with metrics.stage("load", source="kpx", table="demand_5min") as st:
+            st.rows = 288
+
+    snap = metrics.snapshot()
+    labels = (("flow", "demand"), ("source", "kpx"), ("stage", "load"), ("table", "demand_5min"))
+    assert snap["counters"][("pipeline_rows_total", labels)] == 288
+    hist_labels = tuple(sorted(labels + (("status", "ok"),)))
+    assert snap["histograms"][("pipeline_stage_seconds", hist_labels)]["count"] == 1
+    payload = json.loads(caplog.records[-1].getMessage())
+    assert payload["stage"] == "load" and payload["rows"] == 288 and payload["flow"] == "demand"
+
+
+def test_stage_marks_errors_and_reraises():
+    with pytest.raises(ValueError):
+        with metrics.stage("parse", source="asos"):
+            raise ValueError("boom")
+
+    keys = list(metrics.snapshot()["histograms"])
+    assert keys == [("pipeline_stage_seconds", (("source", "asos"), ("stage", "parse"), ("status", "error")))]
+
+
+def test_timed_decorator_counts_int_results_for_sync_and_async():
+    @metrics.timed("transform", source="koen")
+    def sync_fn():
+        return 10
+
+    @metrics.timed("fetch", source="koen")
+    async def async_fn():
+        return 5
+
+    assert sync_fn() == 10
+    assert asyncio.run(async_fn()) == 5
+    counters = metrics.snapshot()["counters"]
+    assert counters[("pipeline_rows_total", (("source", "koen"), ("stage", "transform")))] == 10
+    assert counters[("pipeline_rows_total", (("source", "koen"), ("stage", "fetch")))] == 5
+
+
+def test_render_prometheus_and_textfile(tmp_path):
+    metrics.incr("http_requests_total", host="a.kr", outcome="ok")
+    metrics.observe("http_request_seconds", 0.2, host="a.kr", status=200)
+
+    text = metrics.render_prometheus()
+    assert '# TYPE http_requests_total counter' in text
+    assert 'http_requests_total{host="a.kr",outcome="ok"} 1' in text
+    assert 'http_request_seconds_bucket{host="a.kr",status="200",le="0.25"} 1' in text
+    assert 'http_request_seconds_bucket{host="a.kr",status="200",le="0.1"} 0' in text
+    assert 'http_request_seconds_count{host="a.kr",status="200"} 1' in text
+
+    out = metrics.write_textfile(str(tmp_path / "pipeline.prom"))
+    assert out.read_text(encoding="utf-8") == text
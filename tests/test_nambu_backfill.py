@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from fetch_data.common import response_cache
+from fetch_data.pv import nambu_backfill
+
+OK = b"<response><header><resultCode>00</resultCode></header><body><items><item><ymd>20200101</ymd></item></items></body></response>"
+QUOTA = (
+    b"<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+    b"<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+    b"<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+
+
+class _Session:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.calls = 0
+
+    def get(self, **kwargs):
+        session = self
+
+        class _Resp:
+            status = 200
+
+            async def __aenter__(self):
+                session.calls += 1
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def read(self):
+                return session.body
+
+        return _Resp()
+
+
+def test_only_normal_responses_are_cached(tmp_path):
+    response_cache.configure(tmp_path)
+    ok, quota = _Session(OK), _Session(QUOTA)
+    try:
+        for _ in range(2):
+            asyncio.run(nambu_backfill._fetch_api_days(ok, "key", "20200101", "20200101", "A", 1))
+            with pytest.raises(nambu_backfill.NambuFetchError):
+                asyncio.run(nambu_backfill._fetch_api_days(quota, "key", "20200102", "20200102", "A", 1))
+    finally:
+        response_cache.reset()
+
+    assert (ok.calls, quota.calls) == (1, 2)
+
+
+def test_failed_day_marks_the_shard_failed_after_loading_the_rest(monkeypatch):
+    from datetime import date
+
+    from fetch_data.common.backfill import FAILED, MemoryLedger, run_backfill
+
+    async def fetch_days(session, key, start, end, gencd, hogi, **kwargs):
+        if start == "20200102":
+            raise nambu_backfill.NambuFetchError("timeout")
+        return [{"ymd": start}]
+
+    monkeypatch.setattr(nambu_backfill, "_fetch_api_days", fetch_days)
+    monkeypatch.setattr(
+        nambu_backfill, "find_incomplete_days",
+        lambda engine, pid, s, e: [date(2020, 1, 1), date(2020, 1, 2), date(2020, 1, 3)],
+    )
+    source = nambu_backfill.NambuBackfillSource(
+        None, "key", [{"plant_id": 1, "plant_name": "A", "gencd": "A", "hogi": 1}], None, 0, False,
+    )
+    loaded = []
+    monkeypatch.setattr(source, "parse", lambda raw, s, e: raw[1])
+    monkeypatch.setattr(source, "load", lambda day, s, e: loaded.append(day) or 1)
+    ledger = MemoryLedger()
+
+    report = asyncio.run(run_backfill(source, date(2020, 1, 1), date(2020, 1, 3), ledger=ledger))
+
+    assert loaded == ["20200101", "20200103"]
+    assert list(report.failed) == [(date(2020, 1, 1), date(2020, 1, 3))]
+    assert ledger.load(source.name)[(date(2020, 1, 1), date(2020, 1, 3))].state == FAILED
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date, datetime
+
+from fetch_data.pv import nambu_collect
+
+
+def _item(ymd, gencd="A100", hogi="1"):
+    return {"ymd": ymd, "hogi": hogi, "gencd": gencd, "ipptnm": None, "qvodgen": "0", "qvodavg": "0",
+            "qvodmax": "0", "qvodmin": "0", **{f"qhorgen{h:02d}": str(h) for h in range(1, 25)}}
+
+
+def test_plan_windows_cover_days_with_multi_day_requests():
+    windows = nambu_collect.plan_windows(date(2026, 7, 1), date(2026, 8, 3))
+
+    assert windows == [("20260701", "20260731"), ("20260801", "20260803")]
+
+
+def test_parse_items_accepts_multi_day_and_single_day_formats():
+    multi = b"<r><items><item><ymd>20260801</ymd></item><item><ymd>20260802</ymd></item></items></r>"
+    single = b"<r><items><ymd>20260801</ymd><hogi>1</hogi></items></r>"
+
+    assert [i["ymd"] for i in nambu_collect._parse_items(multi)] == ["20260801", "20260802"]
+    assert nambu_collect._parse_items(single) == [{"ymd": "20260801", "hogi": "1"}]
+    assert nambu_collect._parse_items(b"<r><items/></r>") == []
+
+
+def test_collect_and_save_fans_out_plants_and_loads_once_per_wave(monkeypatch):
+    calls = []
+    loads = []
+
+    async def fetch(session, start_str, end_str, gencd, hogi):
+        calls.append((gencd, start_str, end_str))
+        if gencd == "EMPTY":
+            return []
+        return [_item(start_str, gencd, str(hogi))]
+
+    monkeypatch.setattr(nambu_collect, "fetch_api_data", fetch)
+    monkeypatch.setattr(nambu_collect, "now_kst", lambda: datetime(2026, 8, 4, 9, 30))
+    monkeypatch.setattr(nambu_collect, "WAVE_SIZE", 2)
+    monkeypatch.setattr(
+        nambu_collect, "upsert_generation",
+        lambda df, **kwargs: loads.append(sorted(set(df["plant_name"]))) or len(df),
+    )
+    targets = [
+        {"gencd": "A100", "hogi": 1, "plant_name": "하동태양광", "start_dt": datetime(2026, 7, 1)},
+        {"gencd": "B200", "hogi": 2, "plant_name": "삼천포태양광", "start_dt": datetime(2026, 8, 3)},
+        {"gencd": "EMPTY", "hogi": 1, "plant_name": "빈응답", "start_dt": datetime(2026, 8, 3)},
+    ]
+
+    rows = asyncio.run(nambu_collect.collect_and_save(object(), targets))
+
+    assert sorted(calls) == [
+        ("A100", "20260701", "20260731"),
+        ("A100", "20260801", "20260803"),
+        ("B200", "20260803", "20260803"),
+        ("EMPTY", "20260803", "20260803"),
+    ]
+    assert loads == [["하동태양광"], ["삼천포태양광"]]
+    assert rows == 3 * 24
+
+
+def test_failed_window_keeps_later_windows_of_that_plant_unloaded(monkeypatch):
+    calls = []
+    loaded = []
+
+    async def fetch(session, start_str, end_str, gencd, hogi):
+        calls.append((gencd, start_str))
+        if (gencd, start_str) == ("A100", "20260601"):
+            return None
+        return [_item(start_str, gencd, str(hogi))]
+
+    monkeypatch.setattr(nambu_collect, "fetch_api_data", fetch)
+    monkeypatch.setattr(nambu_collect, "now_kst", lambda: datetime(2026, 8, 4, 9, 30))
+    monkeypatch.setattr(nambu_collect, "WAVE_SIZE", 2)
+    monkeypatch.setattr(
+        nambu_collect, "upsert_generation",
+        lambda df, **kwargs: loaded.extend(zip(df["plant_name"], df["timestamp"].dt.strftime("%Y%m%d"))) or len(df),
+    )
+    targets = [
+        {"gencd": "A100", "hogi": 1, "plant_name": "하동", "start_dt": datetime(2026, 6, 1)},
+        {"gencd": "B200", "hogi": 2, "plant_name": "삼천포", "start_dt": datetime(2026, 8, 3)},
+    ]
+
+    asyncio.run(nambu_collect.collect_and_save(object(), targets))
+
+    assert {day for name, day in loaded if name == "하동"} == set()
+    assert ("A100", "20260731") not in calls  # 다음 웨이브의 창은 요청하지도 않는다
+    assert {day for name, day in loaded if name == "삼천포"} == {"20260803"}
@@ -0,0 +1,40 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from fetch_data.common import backfill, response_cache
+from fetch_data.gen import namdong_collect
+
+
+def test_failed_months_fail_the_download(tmp_path, monkeypatch):
+    async def run_backfill(source, start, end, **kwargs):
+        return backfill.BackfillReport(job="namdong_gen:thermal", failed={(date(2026, 7, 1), date(2026, 7, 31)): "x"})
+
+    monkeypatch.setattr(response_cache, "is_replay", lambda: True)  # 쿠키 GET 생략
+    monkeypatch.setattr(namdong_collect, "get_koen_ssl_context", lambda: False)
+    monkeypatch.setattr(backfill, "run_backfill", run_backfill)
+
+    with pytest.raises(RuntimeError, match="2026-07-01~2026-07-31"):
+        asyncio.run(namdong_collect.download_all(
+            ["thermal"], 2, tmp_path, start=date(2026, 7, 1), end=date(2026, 7, 31),
+        ))
+
+
+def test_one_failed_type_does_not_cancel_the_others(tmp_path, monkeypatch):
+    finished = []
+
+    async def download_type(key, cfg, sem, out_root, **kwargs):
+        if key == "thermal":
+            raise RuntimeError("화력 실패")
+        await asyncio.sleep(0.01)
+        finished.append(key)
+        return []
+
+    monkeypatch.setattr(namdong_collect, "_download_type", download_type)
+
+    with pytest.raises(RuntimeError, match="화력 실패"):
+        asyncio.run(namdong_collect.download_all(
+            ["thermal", "fuel_cell"], 2, tmp_path, start=date(2026, 7, 1), end=date(2026, 7, 31),
+        ))
+    assert finished == ["fuel_cell"]
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from fetch_data.pv import namdong_collect
+
+
+def _csv(n_rows: int, value: str = "1") -> bytes:
+    header = "일자,발전구분,호기," + ",".join(f"{h}시 발전량(KWh)" for h in range(1, 25))
+    rows = [f"2026-08-{d:02d},A,1," + ",".join([value] * 24) for d in range(1, n_rows + 1)]
+    return ("\n".join([header, *rows]) + "\n").encode("utf-8")
+
+
+def test_manifest_adopts_existing_csvs_and_resumes_from_latest_end(tmp_path):
+    (tmp_path / "south_pv_전체_20260701-20260731.csv").write_bytes(_csv(3))
+    (tmp_path / "south_pv_전체_20260801-20260831.csv").write_bytes(_csv(2))
+    (tmp_path / "note.csv").write_bytes(b"x")
+
+    assert namdong_collect.get_latest_collected_date(tmp_path).isoformat() == "2026-08-31"
+
+    saved = json.loads((tmp_path / namdong_collect.MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
+    entry = saved["south_pv_전체_20260701-20260731.csv"]
+    assert entry["rows"] == 3 and entry["bytes"] == len(_csv(3))
+    assert entry["loaded_sha256"] == entry["sha256"]
+
+
+def test_manifest_reports_change_until_loaded(tmp_path):
+    manifest = namdong_collect.DownloadManifest(tmp_path)
+    path = tmp_path / "south_pv_전체_20260801-20260831.csv"
+
+    assert manifest.record(path, _csv(2), "20260801", "20260831")
+    manifest.mark_loaded([path])
+    assert not manifest.record(path, _csv(2), "20260801", "20260831")
+    assert manifest.record(path, _csv(2, value="2"), "20260801", "20260831")
+
+
+def test_download_fetches_months_concurrently_and_returns_changed_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(namdong_collect, "output_dir", lambda: tmp_path)
+    monkeypatch.setattr(namdong_collect, "get_koen_ssl_context", lambda: False)
+    bodies = {"20260601": _csv(1), "20260701": _csv(2), "20260801": None}
+    active = []
+    peak = []
+
+    async def fetch(session, sem, page, org, hs, he, ds, de):
+        async with sem:
+            active.append(ds)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(ds)
+        return bodies[ds]
+
+    monkeypatch.setattr(namdong_collect, "_fetch_month", fetch)
+    manifest = namdong_collect.DownloadManifest(tmp_path)
+    manifest.record(tmp_path / "south_pv_전체_20260601-20260630.csv", _csv(1), "20260601", "20260630")
+    manifest.mark_loaded([tmp_path / "south_pv_전체_20260601-20260630.csv"])
+
+    files = asyncio.run(namdong_collect.download_monthly_csvs(
+        "1", "", "", "", "20260601", "20260815", concurrency=2, manifest=manifest,
+    ))
+
+    assert [f.name for f in files] == ["south_pv_전체_20260701-20260731.csv"]
+    assert max(peak) == 2
+    assert files[0].read_bytes() == _csv(2)
+    assert manifest.latest_end().isoformat() == "2026-07-31"
+
+
+def test_failed_month_is_resumed_even_after_a_later_success(tmp_path, monkeypatch):
+    monkeypatch.setattr(namdong_collect, "output_dir", lambda: tmp_path)
+    monkeypatch.setattr(namdong_collect, "get_koen_ssl_context", lambda: False)
+    bodies = {"20260601": _csv(1), "20260701": None, "20260801": _csv(2)}
+
+    async def fetch(session, sem, page, org, hs, he, ds, de):
+        return bodies[ds]
+
+    monkeypatch.setattr(namdong_collect, "_fetch_month", fetch)
+    asyncio.run(namdong_collect.download_monthly_csvs("1", "", "", "", "20260601", "20260831"))
+
+    start, _ = namdong_collect.resolve_backfill_range(tmp_path, None, "20260831")
+    assert start.isoformat() == "2026-07-01"
+
+    bodies["20260701"] = _csv(3)
+    asyncio.run(namdong_collect.download_monthly_csvs("1", "", "", "", "20260701", "20260831"))
+    start, _ = namdong_collect.resolve_backfill_range(tmp_path, None, "20260831")
+    assert start.isoformat() == "2026-09-01"
+
+
+def test_finished_months_survive_a_crash_partway(tmp_path, monkeypatch):
+    monkeypatch.setattr(namdong_collect, "output_dir", lambda: tmp_path)
+    monkeypatch.setattr(namdong_collect, "get_koen_ssl_context", lambda: False)
+
+    async def fetch(session, sem, page, org, hs, he, ds, de):
+        if ds == "20260801":
+            await asyncio.sleep(0.01)
+            raise RuntimeError("connection reset")
+        return _csv(1)
+
+    monkeypatch.setattr(namdong_collect, "_fetch_month", fetch)
+    with pytest.raises(RuntimeError):
+        asyncio.run(namdong_collect.download_monthly_csvs("1", "", "", "", "20260601", "20260831"))
+
+    assert (tmp_path / "south_pv_전체_20260701-20260731.csv").exists()
+    start, _ = namdong_collect.resolve_backfill_range(tmp_path, None, "20260831")
+    assert start.isoformat() == "2026-08-01"
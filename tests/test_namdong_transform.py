@@ -0,0 +1,51 @@
+import pandas as pd
+
+from fetch_data.pv import namdong_transform
+from tests.koen_csv import record_reads, write_month
+
+
+UNITS = [("영흥태양광", " 1"), ("영흥태양광", " 2"), ("삼천포태양광", " 1")]
+
+
+def _write_month(path, month: str, value: float = 1.0) -> None:
+    write_month(path, month, UNITS, value, hour_column="{h}시 발전량(KWh)")
+
+
+def test_to_long_suffixes_only_multi_unit_plants():
+    wide = pd.DataFrame([
+        {"일자": "2026-08-01", "발전구분": "영흥태양광", "호기": "1", "1시 발전량(KWh)": 1, "2시 발전량(KWh)": "2"},
+        {"일자": "2026-08-01", "발전구분": "영흥태양광", "호기": "2", "1시 발전량(KWh)": 3, "2시 발전량(KWh)": None},
+        {"일자": "2026-08-01", "발전구분": "삼천포태양광", "호기": "1", "1시 발전량(KWh)": 5, "2시 발전량(KWh)": 6},
+    ])
+
+    long = namdong_transform.to_long(wide)
+
+    assert list(long.columns) == ["일자", "발전소명", "시간", "발전량"]
+    assert sorted(long["발전소명"].unique()) == ["삼천포태양광", "영흥태양광_1", "영흥태양광_2"]
+    assert long["시간"].tolist() == [1, 1, 1, 2, 2, 2]
+    assert long["발전량"].isna().sum() == 1
+
+
+def test_merge_to_long_transforms_only_new_or_changed_files(tmp_path, monkeypatch):
+    raw, out = tmp_path / "raw", tmp_path / "long"
+    raw.mkdir()
+    _write_month(raw / "south_pv_전체_20260701-20260731.csv", "2026-07")
+    reads = record_reads(monkeypatch, namdong_transform)
+
+    assert namdong_transform.merge_to_long(raw, out) == {"2026-07": 144}
+
+    _write_month(raw / "south_pv_전체_20260801-20260831.csv", "2026-08")
+    reads.clear()
+    assert namdong_transform.merge_to_long(raw, out) == {"2026-08": 144}
+    assert reads == ["south_pv_전체_20260801-20260831.csv"]
+
+    assert namdong_transform.merge_to_long(raw, out) == {}
+
+    _write_month(raw / "south_pv_전체_20260801-20260831.csv", "2026-08", value=2.0)
+    (raw / "south_pv_전체_20260701-20260731.csv").unlink()
+    assert namdong_transform.merge_to_long(raw, out) == {"2026-07": 0, "2026-08": 144}
+
+    long = namdong_transform.read_long(out)
+    assert set(long["일자"].str[:7]) == {"2026-08"}
+    assert (long["발전량"] == 2.0).all()
+    assert len(list((out / "_cache").glob("*.parquet"))) == 1
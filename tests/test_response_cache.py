@@ -0,0 +1,82 @@
+"""response_cache — 키 정규화·만료 정책·재생 모드 테스트 (네트워크 불필요)."""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from fetch_data.common import response_cache as rc
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    rc.reset()
+    yield
+    rc.reset()
+
+
+def test_request_key_ignores_secrets_and_param_order():
+    a = rc.request_key("asos", "https://x/api", {"stnIds": "108", "serviceKey": "k1", "startDt": "20190101"})
+    b = rc.request_key("asos", "https://x/api", {"startDt": "20190101", "stnIds": 108, "serviceKey": "k2"})
+    c = rc.request_key("asos", "https://x/api", {"startDt": "20190102", "stnIds": "108"})
+
+    assert a == b
+    assert a != c
+
+
+def test_closed_period_is_immutable_and_open_period_expires(tmp_path, monkeypatch):
+    cache = rc.ResponseCache(tmp_path)
+    old = date(2020, 1, 31)
+    cache.put("jeju_sukub", "u", {"m": "old"}, b"closed", period_end=old)
+    cache.put("jeju_sukub", "u", {"m": "now"}, b"open", period_end=rc.today_kst())
+
+    later = rc.time.time() + 10 * 24 * 3600
+    monkeypatch.setattr(rc.time, "time", lambda: later)
+
+    assert cache.get("jeju_sukub", "u", {"m": "old"}) == b"closed"
+    assert cache.get("jeju_sukub", "u", {"m": "now"}) is None
+    # 재생 모드는 만료를 무시하고 마지막 바이트를 돌려준다
+    assert rc.ResponseCache(tmp_path, replay=True).get("jeju_sukub", "u", {"m": "now"}) == b"open"
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    cache = rc.ResponseCache(tmp_path)
+    cache.put("asos", "u", {"p": 1}, b"same")
+    cache.put("asos", "u", {"p": 2}, b"same")
+
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert len(list((tmp_path / "index").rglob("*.json"))) == 2
+
+
+def test_fetch_cached_hits_cache_on_second_call(tmp_path):
+    rc.configure(tmp_path)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return b"payload"
+
+    async def twice():
+        first = await rc.fetch_cached("nambu", "u", {"d": "20200101"}, fetch, period_end=date(2020, 1, 1))
+        second = await rc.fetch_cached("nambu", "u", {"d": "20200101"}, fetch, period_end=date(2020, 1, 1))
+        return first, second
+
+    assert asyncio.run(twice()) == (b"payload", b"payload")
+    assert len(calls) == 1
+
+
+def test_failed_fetch_is_not_cached(tmp_path):
+    rc.configure(tmp_path)
+
+    assert rc.fetch_cached_sync("smp_realtime", "u", {}, lambda: None) is None
+    assert not (tmp_path / "index").exists()
+
+
+def test_replay_miss_raises_without_calling_fetch(tmp_path):
+    rc.configure(tmp_path, replay=True)
+
+    def fetch():
+        raise AssertionError("재생 모드에서 네트워크 호출")
+
+    with pytest.raises(rc.CacheMiss):
+        rc.fetch_cached_sync("koen_gen", "u", {"strDateS": "20240101"}, fetch,
+                             period_end=date.today() - timedelta(days=30))
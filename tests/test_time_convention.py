@@ -12,7 +12,7 @@
   · 라벨 N -> (N-1)시  (구간시작, 보정 불필요)
       fetch_data/common/utils.py::parse_hour_column        (남부 두 경로가 공유하는 라벨 파서)
       fetch_data/pv/nambu_backfill.py::_rows_from_api_payload
-      fetch_data/pv/nambu_collect.py::collect_and_save     (위와 동일 로직의 인라인 복제본)
+      fetch_data/pv/nambu_collect.py::_to_core_frame       (위와 동일 로직의 인라인 복제본)
       fetch_data/pv/ekr_collect.py::_to_long
   · 라벨 N -> N시      (구간종료 그대로, 1시간 늦음 -> 뷰에서 -1h 필요)
       fetch_data/gen/transform_gen.py::transform_wide_to_long
@@ -192,8 +192,8 @@ def test_koen_라벨_파서는_1based_원본값을_반환(col, expected):
     """KOEN CSV 헤더는 태양광(KWh)·비태양광(MWh)이 동일 포맷.
 
     태양광 경로는 이 값에서 -1 해 구간시작으로 적재하고
-    (fetch_data/pv/namdong_collect.py:310),
-    비태양광 경로는 -1 하지 않는다(fetch_data/gen/transform_gen.py:93).
+    (fetch_data/pv/namdong_collect.py load_namdong_to_db),
+    비태양광 경로는 -1 하지 않는다(fetch_data/gen/transform_gen.py transform_wide_to_long).
     같은 원천·같은 헤더인데 처리가 갈리는 지점이므로 파서 반환값을 고정한다.
     """
     assert extract_hour(col) == expected
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from fetch_data.gen import transform_gen
+from tests.koen_csv import record_reads, write_month
+
+UNITS = [("삼천포", "3")]
+
+
+def _write_month(path, month: str, value: float = 1.0) -> None:
+    write_month(path, month, UNITS, value)
+
+
+def test_run_parses_only_changed_files_and_accumulates_delta(tmp_path, monkeypatch):
+    raw, out = tmp_path / "raw", tmp_path / "gen_data"
+    _write_month(raw / "thermal" / "koen_thermal_20260701-20260731.csv", "2026-07")
+    reads = record_reads(monkeypatch, transform_gen)
+
+    transform_gen.run(["thermal"], raw, out)
+    delta = transform_gen.delta_path("thermal", out)
+    assert len(pd.read_parquet(delta)) == 48
+
+    _write_month(raw / "thermal" / "koen_thermal_20260801-20260831.csv", "2026-08", value=2.0)
+    reads.clear()
+    paths = transform_gen.run(["thermal"], raw, out)
+
+    assert reads == ["koen_thermal_20260801-20260831.csv"]
+    assert len(pd.read_parquet(paths["thermal"])) == 96
+    assert len(pd.read_parquet(delta)) == 96  # 적재 전이라 7월 변경분도 남아 있다
+
+    delta.unlink()  # load_gen --delta 가 적재 후 지운 상태
+    reads.clear()
+    transform_gen.run(["thermal"], raw, out)
+    assert reads == [] and not delta.exists()
+
+
+def test_sources_are_committed_only_after_outputs_are_written(tmp_path, monkeypatch):
+    raw, out = tmp_path / "raw", tmp_path / "gen_data"
+    _write_month(raw / "thermal" / "koen_thermal_20260701-20260731.csv", "2026-07")
+    original = transform_gen._write_parquet
+
+    def failing_write(df, path):
+        if path.name.endswith("_delta.parquet"):
+            raise OSError("disk full")
+        original(df, path)
+
+    monkeypatch.setattr(transform_gen, "_write_parquet", failing_write)
+    with pytest.raises(OSError):
+        transform_gen.run(["thermal"], raw, out)
+
+    monkeypatch.setattr(transform_gen, "_write_parquet", original)
+    transform_gen.run(["thermal"], raw, out)
+    assert len(pd.read_parquet(transform_gen.delta_path("thermal", out))) == 48